@@ -0,0 +1,152 @@
+"""
+Binary section files used for the scripture caches.
+
+A section file is a small JSON header followed by named, 8-byte aligned
+binary sections (typed arrays or raw bytes).  Files are opened with mmap so
+sections can be used as zero-copy ``memoryview`` objects.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Union
+
+MAGIC = b"GMLSECT\x00"
+FORMAT_VERSION = 1
+
+_PREAMBLE = struct.Struct("<8sII")  # magic, format version, header length
+_ALIGNMENT = 8
+
+SectionData = Union[array, bytes, bytearray, memoryview]
+
+
+class SectionFileError(Exception):
+    """Raised when a section file is missing, truncated or incompatible."""
+
+
+def _padding(offset: int) -> int:
+    return -offset % _ALIGNMENT
+
+
+def _default_file_mode() -> int:
+    """Mode of a newly created file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_open(path: Union[str, Path]) -> Iterator[BinaryIO]:
+    """Open a temporary file that atomically replaces ``path`` on success.
+
+    Readers never observe a partially written file: the data is fsynced and
+    renamed over the destination only when the block exits cleanly.  The
+    file gets the umask-based mode of a plain ``open`` instead of mkstemp's
+    private 0600.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if hasattr(os, "fchmod"):  # Not on Windows, where modes don't apply
+                os.fchmod(f.fileno(), _default_file_mode())
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_sections(
+    path: Union[str, Path], meta: Dict[str, Any], sections: Dict[str, SectionData]
+):
+    """Atomically write ``sections`` and JSON-serializable ``meta`` to ``path``."""
+    layout = {}
+    payloads = []
+    offset = 0
+    for name, data in sections.items():
+        if isinstance(data, array):
+            typecode = data.typecode
+        elif isinstance(data, memoryview):
+            typecode = data.format
+        else:
+            typecode = "B"
+        payload = memoryview(data).cast("B")
+        offset += _padding(offset)
+        layout[name] = [offset, payload.nbytes, typecode]
+        payloads.append((offset, payload))
+        offset += payload.nbytes
+
+    header = json.dumps(
+        {"byteorder": sys.byteorder, "meta": meta, "sections": layout},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    data_start = _PREAMBLE.size + len(header)
+    data_start += _padding(data_start)
+
+    with atomic_open(path) as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.write(b"\x00" * (data_start - f.tell()))
+        for section_offset, payload in payloads:
+            f.write(b"\x00" * (data_start + section_offset - f.tell()))
+            f.write(payload)
+
+
+class SectionFile:
+    """Read-only, memory-mapped view of a file written by ``write_sections``."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._mmap: Optional[mmap.mmap] = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError as e:  # empty file
+                raise SectionFileError(f"{self.path}: {e}")
+
+        if len(self._mmap) < _PREAMBLE.size:
+            raise SectionFileError(f"{self.path}: file is truncated")
+        magic, version, header_length = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise SectionFileError(f"{self.path}: unsupported section file format")
+
+        header_end = _PREAMBLE.size + header_length
+        header = json.loads(self._mmap[_PREAMBLE.size : header_end].decode("utf-8"))
+        if header["byteorder"] != sys.byteorder:
+            raise SectionFileError(f"{self.path}: written with a different byte order")
+
+        self.meta: Dict[str, Any] = header["meta"]
+        self._layout = header["sections"]
+        self._data_start = header_end + _padding(header_end)
+        self._view = memoryview(self._mmap)
+        if self._data_start + max(
+            (offset + size for offset, size, _ in self._layout.values()), default=0
+        ) > len(self._mmap):
+            raise SectionFileError(f"{self.path}: file is truncated")
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._layout
+
+    def __getitem__(self, name: str) -> memoryview:
+        """Return a zero-copy typed view of a section."""
+        offset, size, typecode = self._layout[name]
+        start = self._data_start + offset
+        return self._view[start : start + size].cast(typecode)
+
+    def close(self):
+        """Release the mapping (views still in use keep it alive)."""
+        try:
+            self._view.release()
+            self._mmap.close()
+        except BufferError:
+            pass
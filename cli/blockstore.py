@@ -0,0 +1,154 @@
+"""
+Block-compressed text with random access and a decompression cache.
+
+The corpus text is cut into blocks of about ``BLOCK_SIZE`` bytes, always
+between two verses, and every block is compressed on its own with a
+standard library codec.  Two offset tables locate a block in the text and
+in the compressed data, so reading a verse or a chapter decompresses only
+the block (rarely two) it falls in.  The most recently used decompressed
+blocks are kept, so repeated reads of nearby verses cost a slice.
+
+A ``BlockStore`` slices like the raw ``bytes`` it replaces, which lets a
+``Corpus`` keep either one as its text.
+"""
+
+import lzma
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Callable, Dict, Sequence, Tuple
+
+from .binfile import SectionFile
+
+# Codecs: (compress, decompress)
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+    "lzma": (lambda data: lzma.compress(data, preset=9), lzma.decompress),
+}
+
+# Text compression settings: raw text, or blocks compressed with a codec
+COMPRESSIONS = ("none",) + tuple(CODECS)
+
+# Uncompressed bytes per block: a few chapters, which decompress in well
+# under a millisecond
+BLOCK_SIZE = 32 * 1024
+
+# Decompressed blocks kept in memory
+CACHED_BLOCKS = 16
+
+_ARRAY_SECTIONS = ("block_starts", "block_offsets")
+
+
+class BlockStore:
+    """Text stored as independently compressed blocks.
+
+    Block ``i`` holds text bytes ``block_starts[i]:block_starts[i + 1]``,
+    compressed into ``blocks[block_offsets[i]:block_offsets[i + 1]]``.
+    """
+
+    def __init__(
+        self,
+        codec: str,
+        blocks,
+        block_starts: Sequence[int],
+        block_offsets: Sequence[int],
+        cached_blocks: int = CACHED_BLOCKS,
+    ):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec}. Use one of: {', '.join(CODECS)}")
+        self.codec = codec
+        self.blocks = blocks
+        self.block_starts = block_starts
+        self.block_offsets = block_offsets
+        self.cached_blocks = max(cached_blocks, 1)
+        self._decompress = CODECS[codec][1]
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+
+    @classmethod
+    def build(
+        cls,
+        text: bytes,
+        codec: str,
+        boundaries: Sequence[int] = (),
+        block_size: int = BLOCK_SIZE,
+    ) -> "BlockStore":
+        """Compress ``text``, cutting blocks only at sorted ``boundaries``.
+
+        A block ends at the last boundary within ``block_size`` bytes of its
+        start (or the first one after it, for very long records); without
+        boundaries blocks are cut every ``block_size`` bytes.
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec}. Use one of: {', '.join(CODECS)}")
+        compress = CODECS[codec][0]
+        cuts = sorted(set(boundaries) | {len(text)}) if boundaries else None
+
+        blocks = bytearray()
+        block_starts = array("I", [0])
+        block_offsets = array("I", [0])
+        start = 0
+        while start < len(text):
+            end = min(start + block_size, len(text))
+            if cuts is not None:
+                i = bisect_right(cuts, end) - 1
+                end = cuts[i] if cuts[i] > start else cuts[bisect_right(cuts, start)]
+            blocks += compress(bytes(text[start:end]))
+            block_starts.append(end)
+            block_offsets.append(len(blocks))
+            start = end
+        return cls(codec, bytes(blocks), block_starts, block_offsets)
+
+    def __len__(self) -> int:
+        return self.block_starts[-1]
+
+    def __getitem__(self, key: slice) -> bytes:
+        """Return the uncompressed bytes of a slice (steps are not supported)."""
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("BlockStore only supports contiguous slices")
+        start, stop, _ = key.indices(len(self))
+        if start >= stop:
+            return b""
+
+        first = bisect_right(self.block_starts, start) - 1
+        last = bisect_right(self.block_starts, stop - 1) - 1
+        if first == last:
+            base = self.block_starts[first]
+            return self.block(first)[start - base : stop - base]
+        parts = [self.block(first)[start - self.block_starts[first] :]]
+        parts += [self.block(i) for i in range(first + 1, last)]
+        parts.append(self.block(last)[: stop - self.block_starts[last]])
+        return b"".join(parts)
+
+    def block(self, i: int) -> bytes:
+        """Return a decompressed block, from the cache when possible."""
+        data = self._cache.get(i)
+        if data is not None:
+            self._cache.move_to_end(i)
+            return data
+        data = self._decompress(
+            self.blocks[self.block_offsets[i] : self.block_offsets[i + 1]]
+        )
+        self._cache[i] = data
+        if len(self._cache) > self.cached_blocks:
+            self._cache.popitem(last=False)
+        return data
+
+    @property
+    def compressed_size(self) -> int:
+        return self.block_offsets[-1]
+
+    def to_sections(self) -> Tuple[Dict, Dict]:
+        """Return ``(meta, sections)`` for ``write_sections``."""
+        sections = {name: getattr(self, name) for name in _ARRAY_SECTIONS}
+        sections["blocks"] = self.blocks
+        return {"codec": self.codec}, sections
+
+    @classmethod
+    def from_sections(cls, section_file: SectionFile, codec: str) -> "BlockStore":
+        """Create a store backed by the sections of a mapped file."""
+        return cls(
+            codec,
+            section_file["blocks"],
+            *(section_file[name] for name in _ARRAY_SECTIONS),
+        )
@@ -10,7 +10,10 @@ from pathlib import Path
 
 from .agent import SimpleAgent
 from .config import Config
-from .scripture import get_bsb_parser
+from .references import parse_reference, parse_references
+from .scope import TESTAMENTS
+from .scripture import SEMANTIC_SCORERS, BSBParser, get_bsb_parser
+from .semantic_index import BM25_B, BM25_K1
 from .tools import execute_tool
 
 
@@ -27,6 +30,13 @@ Examples:
   %(prog)s test-template chat_agent --input "Hello" --render-only
   %(prog)s scripture get "John 3:16"
   %(prog)s scripture search "love your enemies"
+  %(prog)s scripture search --scorer bm25 "steadfast love"
+  %(prog)s scripture search --granularity passage "love your enemies"
+  %(prog)s scripture search --testament NT "suffering servant"
+  %(prog)s scripture regex "LORD of (hosts|Hosts)"
+  %(prog)s scripture complete righte
+  %(prog)s scripture related "Isaiah 53"
+  %(prog)s scripture index --source ./bsb.txt
   %(prog)s validate
   %(prog)s clean-cache
         """,
@@ -88,11 +98,94 @@ Examples:
     search_parser.add_argument(
         "--max-results", "-n", type=int, default=5, help="Maximum results"
     )
+    search_parser.add_argument("--book", help="Only search this book")
+    search_parser.add_argument(
+        "--testament", choices=TESTAMENTS, help="Only search this testament"
+    )
+    search_parser.add_argument(
+        "--range",
+        dest="book_range",
+        help="Only search a canonical range (e.g. 'Isaiah 40-55')",
+    )
+    search_parser.add_argument(
+        "--granularity",
+        choices=("chapter", "passage"),
+        default="chapter",
+        help="Return whole chapters or only the matching verse ranges",
+    )
+    search_parser.add_argument(
+        "--scorer",
+        choices=SEMANTIC_SCORERS,
+        help="Ranking function (default: tfidf, or bm25 with GAMALIEL_STORAGE=sqlite)",
+    )
+    search_parser.add_argument(
+        "--k1",
+        type=float,
+        default=BM25_K1,
+        help=f"BM25 term frequency saturation (default: {BM25_K1})",
+    )
+    search_parser.add_argument(
+        "--b",
+        type=float,
+        default=BM25_B,
+        help=f"BM25 length normalization (default: {BM25_B})",
+    )
+
+    # Scripture regex command
+    regex_parser = scripture_subparsers.add_parser(
+        "regex", help="Search verses with a regular expression"
+    )
+    regex_parser.add_argument("pattern", help="Python regular expression")
+    regex_parser.add_argument(
+        "--max-results", "-n", type=int, default=20, help="Maximum verses"
+    )
+    regex_parser.add_argument(
+        "--ignore-case", "-i", action="store_true", help="Match case-insensitively"
+    )
+    regex_parser.add_argument("--book", help="Only search this book")
+    regex_parser.add_argument(
+        "--testament", choices=TESTAMENTS, help="Only search this testament"
+    )
+    regex_parser.add_argument(
+        "--range",
+        dest="book_range",
+        help="Only search a canonical range (e.g. 'Isaiah 40-55')",
+    )
+
+    # Scripture complete command
+    complete_parser = scripture_subparsers.add_parser(
+        "complete", help="Complete book names and search words"
+    )
+    complete_parser.add_argument("prefix", help="First letters of a book or word")
+    complete_parser.add_argument(
+        "--max-results", "-n", type=int, default=10, help="Maximum completions"
+    )
+
+    # Scripture related command
+    related_parser = scripture_subparsers.add_parser(
+        "related", help="List the chapters most similar to a chapter"
+    )
+    related_parser.add_argument(
+        "reference", help="Chapter reference (e.g. 'Isaiah 53')"
+    )
+    related_parser.add_argument(
+        "--max-results", "-n", type=int, default=5, help="Maximum chapters"
+    )
 
     # Scripture index command
-    index_parser = scripture_subparsers.add_parser(  # noqa: F841
+    index_parser = scripture_subparsers.add_parser(
         "index", help="Build/rebuild search index"
     )
+    index_parser.add_argument(
+        "--source",
+        help="BSB text URL, local file or directory (default: $GAMALIEL_BSB_SOURCE "
+        "or the bereanbible.com download)",
+    )
+    index_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-check the source and re-ingest it if it changed",
+    )
 
     # Validate command
     validate_parser = subparsers.add_parser(
@@ -247,10 +340,19 @@ def handle_scripture(args: argparse.Namespace) -> int:
         return handle_scripture_get(args)
     elif args.scripture_command == "search":
         return handle_scripture_search(args)
+    elif args.scripture_command == "regex":
+        return handle_scripture_regex(args)
+    elif args.scripture_command == "complete":
+        return handle_scripture_complete(args)
+    elif args.scripture_command == "related":
+        return handle_scripture_related(args)
     elif args.scripture_command == "index":
-        return handle_scripture_index()
+        return handle_scripture_index(args)
     else:
-        print("Please specify a scripture subcommand: get, search, or index")
+        print(
+            "Please specify a scripture subcommand: get, search, regex, complete, "
+            "related or index"
+        )
         return 1
 
 
@@ -258,44 +360,56 @@ def handle_scripture_get(args: argparse.Namespace) -> int:
     """Handle scripture get command."""
     reference = args.reference
 
-    # Parse reference (simple parsing for now)
-    import re
-
-    match = re.match(r"([A-Za-z\s]+)\s+(\d+)(?::(\d+))?", reference)
-    if not match:
+    try:
+        passages = parse_references(reference)
+    except ValueError:
         print(f"Invalid reference format: {reference}")
-        print("Expected format: 'Book Chapter' or 'Book Chapter:Verse'")
-        return 1
-
-    book = match.group(1).strip()
-    chapter = int(match.group(2))
-    verse = int(match.group(3)) if match.group(3) else None
-
-    # Get scripture (always fetch entire chapter, ignore verse parameter)
-    result = execute_tool("get_scripture", book=book, chapter=chapter)
-
-    if "error" in result:
-        print(f"Error: {result['error']}")
+        print(
+            "Expected format: 'Book Chapter', 'Book Chapter:Verse', a range "
+            "such as 'John 3:16-4:2' or a list such as 'Jn 3:16-18; Rom 8:28'"
+        )
         return 1
 
-    # Format output
-    if verse:
-        print(f"{book} {chapter}:{verse}")
-        print(
-            f"Note: System fetches entire chapters. Showing full chapter {chapter} of {book}:"
+    status = 0
+    for i, ref in enumerate(passages):
+        kwargs = {}
+        if ref.verse is not None:
+            kwargs["begin_verse"] = ref.verse
+        if ref.end_chapter is not None and ref.end_chapter != ref.chapter:
+            kwargs["end_chapter"] = ref.end_chapter
+        if ref.end_verse is not None:
+            kwargs["end_verse"] = ref.end_verse
+
+        result = execute_tool(
+            "get_scripture", book=ref.book, chapter=ref.chapter, **kwargs
         )
-        print()
 
-    print(f"{result['reference']}")
-    print(result["text"])
+        if i:
+            print()
+        if "error" in result:
+            print(f"Error: {result['error']}")
+            status = 1
+            continue
 
-    return 0
+        print(f"{result['reference']}")
+        print(result.get("highlighted_text", result["text"]))
+
+    return status
 
 
 def handle_scripture_search(args: argparse.Namespace) -> int:
     """Handle scripture search command."""
     result = execute_tool(
-        "search_scripture_semantic", query=args.query, n_results=args.max_results
+        "search_scripture_semantic",
+        query=args.query,
+        n_results=args.max_results,
+        scorer=args.scorer,
+        k1=args.k1,
+        b=args.b,
+        granularity=args.granularity,
+        book=args.book,
+        testament=args.testament,
+        book_range=args.book_range,
     )
 
     if "error" in result:
@@ -313,12 +427,79 @@ def handle_scripture_search(args: argparse.Namespace) -> int:
     return 0
 
 
-def handle_scripture_index() -> int:
+def handle_scripture_regex(args: argparse.Namespace) -> int:
+    """Handle scripture regex command."""
+    result = execute_tool(
+        "search_scripture_regex",
+        pattern=args.pattern,
+        n_results=args.max_results,
+        ignore_case=args.ignore_case,
+        book=args.book,
+        testament=args.testament,
+        book_range=args.book_range,
+    )
+
+    if "error" in result:
+        print(f"Error: {result['error']}")
+        return 1
+
+    print(f"Verses matching: {args.pattern}")
+    print(f"Found {result['count']} verses:\n")
+
+    for item in result["results"]:
+        print(f"{item['reference']}  {item['text']}")
+
+    return 0
+
+
+def handle_scripture_complete(args: argparse.Namespace) -> int:
+    """Handle scripture complete command (one completion per line)."""
+    completions = get_bsb_parser().complete(args.prefix, args.max_results)
+    for completion in completions["books"] + completions["words"]:
+        print(completion)
+    return 0
+
+
+def handle_scripture_related(args: argparse.Namespace) -> int:
+    """Handle scripture related command."""
+    try:
+        ref = parse_reference(args.reference)
+    except ValueError:
+        ref = None
+    if ref is None or ref.verse is not None or ref.end_chapter is not None:
+        print(f"Invalid reference format: {args.reference}")
+        print("Expected format: 'Book Chapter'")
+        return 1
+
+    result = execute_tool(
+        "get_scripture_context",
+        book=ref.book,
+        chapter=ref.chapter,
+        related=args.max_results,
+    )
+
+    if "error" in result:
+        print(f"Error: {result['error']}")
+        return 1
+
+    print(f"Chapters related to {result['reference']}:\n")
+    for i, item in enumerate(result["context"]["related"], 1):
+        print(f"{i}. {item['reference']} (similarity {item['similarity']:.2f})")
+        print(f"   {item['text'][:100]}...")
+        print()
+
+    return 0
+
+
+def handle_scripture_index(args: argparse.Namespace = None) -> int:
     """Handle scripture index command."""
     print("Building scripture index...")
 
-    parser = get_bsb_parser()
-    success = parser.download_and_parse()
+    source = getattr(args, "source", None)
+    parser = BSBParser(url=source) if source else get_bsb_parser()
+    if getattr(args, "refresh", False):
+        parser.refresh()
+    success = parser.download_and_parse() and parser.build_indexes()
 
     if success:
         books = parser.list_books()
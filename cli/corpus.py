@@ -0,0 +1,372 @@
+"""
+Contiguous scripture text corpus.
+
+All verse texts live in one UTF-8 buffer, each followed by a single space,
+so a chapter is a single slice of the buffer.  Offset tables map books to
+chapter ids, chapters to verse ids and verse ids to byte offsets.
+
+The buffer may also be a ``BlockStore`` of compressed blocks cut between
+verses; it slices like ``bytes``, so lookups work the same on either.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .binfile import SectionFile
+from .blockstore import BLOCK_SIZE, BlockStore
+from .references import VerseRef
+
+VERSE_SEPARATOR = b" "
+
+
+def numbered_text(verses: Iterable[Tuple[int, int, str]]) -> str:
+    """Join ``(chapter, verse, text)`` tuples as ``"verse: text"``.
+
+    Verses of the chapters after the first are numbered ``"chapter:verse"``.
+    """
+    parts = []
+    first_chapter = None
+    for chapter, verse, text in verses:
+        if first_chapter is None:
+            first_chapter = chapter
+        number = verse if chapter == first_chapter else f"{chapter}:{verse}"
+        parts.append(f"{number}: {text}")
+    return VERSE_SEPARATOR.decode().join(parts)
+
+
+class Corpus:
+    """Scripture text with book/chapter/verse offset tables."""
+
+    # Bump when the cached section layout changes
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        books: Sequence[str],
+        text,
+        book_chapter_indptr: Sequence[int],
+        chapter_numbers: Sequence[int],
+        chapter_verse_indptr: Sequence[int],
+        verse_numbers: Sequence[int],
+        verse_offsets: Sequence[int],
+    ):
+        self.books = list(books)
+        self.text = text
+        self.book_chapter_indptr = book_chapter_indptr
+        self.chapter_numbers = chapter_numbers
+        self.chapter_verse_indptr = chapter_verse_indptr
+        self.verse_numbers = verse_numbers
+        self.verse_offsets = verse_offsets
+        self._book_ids = {name: i for i, name in enumerate(self.books)}
+
+    @property
+    def num_chapters(self) -> int:
+        return len(self.chapter_numbers)
+
+    @property
+    def num_verses(self) -> int:
+        return len(self.verse_numbers)
+
+    def book_id(self, book: str) -> Optional[int]:
+        """Return the id of a book by exact name."""
+        return self._book_ids.get(book)
+
+    def chapter_ids(self, book_id: int) -> range:
+        """Return the contiguous range of chapter ids of a book."""
+        return range(
+            self.book_chapter_indptr[book_id], self.book_chapter_indptr[book_id + 1]
+        )
+
+    def verse_ids(self, chapter_id: int) -> range:
+        """Return the contiguous range of verse ids of a chapter."""
+        return range(
+            self.chapter_verse_indptr[chapter_id],
+            self.chapter_verse_indptr[chapter_id + 1],
+        )
+
+    def chapter_id(self, book_id: int, chapter: int) -> Optional[int]:
+        """Find a chapter id by book id and chapter number."""
+        return self._find(self.chapter_ids(book_id), self.chapter_numbers, chapter)
+
+    def verse_id(self, chapter_id: int, verse: int) -> Optional[int]:
+        """Find a verse id by chapter id and verse number."""
+        return self._find(self.verse_ids(chapter_id), self.verse_numbers, verse)
+
+    def verse_span(
+        self,
+        first_chapter: int,
+        first_verse: Optional[int],
+        last_chapter: int,
+        last_verse: Optional[int],
+    ) -> range:
+        """Return the verse ids from a verse of one chapter to one of another.
+
+        A verse number of None stands for the first (or last) verse of its
+        chapter, and an end past the last verse stops there.  The range is
+        empty when the first verse does not exist or comes after the last.
+        """
+        first = self.verse_ids(first_chapter)
+        last = self.verse_ids(last_chapter)
+        start = first.start
+        if first_verse is not None:
+            start = bisect_left(
+                self.verse_numbers, first_verse, first.start, first.stop
+            )
+        stop = last.stop
+        if last_verse is not None:
+            stop = bisect_right(self.verse_numbers, last_verse, last.start, last.stop)
+        if start == first.stop:
+            return range(start, start)
+        return range(start, max(stop, start))
+
+    def ref_span(self, first: VerseRef, last: VerseRef) -> range:
+        """Return the verse ids from one packed reference to another (inclusive).
+
+        Verse 0 and ``LAST_VERSE`` stand for the start and the end of their
+        chapters (see ``PassageRef.bounds``).  The chapters of both ends must
+        exist; the range is empty otherwise, and in the cases ``verse_span``
+        leaves empty.
+        """
+        chapters = []
+        for ref in (first, last):
+            book_id = self.book_id(ref.book)
+            chapter_id = (
+                None if book_id is None else self.chapter_id(book_id, ref.chapter)
+            )
+            if chapter_id is None:
+                return range(0)
+            chapters.append(chapter_id)
+        return self.verse_span(chapters[0], first.verse, chapters[1], last.verse)
+
+    @staticmethod
+    def _find(ids: range, numbers: Sequence[int], number: int) -> Optional[int]:
+        # Numbering is almost always 1..n, so try the direct position first
+        guess = ids.start + number - 1
+        if guess in ids and numbers[guess] == number:
+            return guess
+        for i in ids:
+            if numbers[i] == number:
+                return i
+        return None
+
+    def chapter_book(self, chapter_id: int) -> int:
+        """Return the book id of a chapter."""
+        return bisect_right(self.book_chapter_indptr, chapter_id) - 1
+
+    def verse_chapter(self, verse_id: int) -> int:
+        """Return the chapter id of a verse."""
+        return bisect_right(self.chapter_verse_indptr, verse_id) - 1
+
+    def chapter_ref(self, chapter_id: int) -> Tuple[str, int]:
+        """Return ``(book name, chapter number)`` for a chapter id."""
+        return (
+            self.books[self.chapter_book(chapter_id)],
+            self.chapter_numbers[chapter_id],
+        )
+
+    def verse_ref(self, verse_id: int) -> Tuple[str, int, int]:
+        """Return ``(book name, chapter number, verse number)`` for a verse id."""
+        book, chapter = self.chapter_ref(self.verse_chapter(verse_id))
+        return book, chapter, self.verse_numbers[verse_id]
+
+    def text_range(self, first_verse: int, last_verse: int) -> str:
+        """Decode verses ``first_verse..last_verse`` (inclusive) as one slice."""
+        start = self.verse_offsets[first_verse]
+        end = self.verse_offsets[last_verse + 1] - len(VERSE_SEPARATOR)
+        return str(self.text[start:end], "utf-8")
+
+    def verse_text(self, verse_id: int) -> str:
+        """Return the text of a single verse."""
+        return self.text_range(verse_id, verse_id)
+
+    def chapter_text(self, chapter_id: int) -> str:
+        """Return the text of a whole chapter."""
+        verses = self.verse_ids(chapter_id)
+        return self.text_range(verses.start, verses.stop - 1)
+
+    @property
+    def compression(self) -> str:
+        """Return the codec of the text blocks, or "none" for raw text."""
+        return self.text.codec if isinstance(self.text, BlockStore) else "none"
+
+    def compressed(self, codec: str, block_size: int = BLOCK_SIZE) -> "Corpus":
+        """Return this corpus with its text stored as ``codec`` blocks.
+
+        A codec of "none" returns it with raw text.  The offset tables are
+        shared; only the text is re-encoded, and only if the codec differs.
+        """
+        if codec == self.compression:
+            return self
+        text = self.text[:]
+        if codec != "none":
+            text = BlockStore.build(text, codec, self.verse_offsets, block_size)
+        return Corpus(
+            self.books,
+            text,
+            self.book_chapter_indptr,
+            self.chapter_numbers,
+            self.chapter_verse_indptr,
+            self.verse_numbers,
+            self.verse_offsets,
+        )
+
+    def to_sections(self) -> Tuple[Dict, Dict]:
+        """Return ``(meta, sections)`` for ``write_sections``."""
+        meta = {"books": self.books}
+        if isinstance(self.text, BlockStore):
+            text_meta, sections = self.text.to_sections()
+            meta.update(text_meta)
+        else:
+            sections = {"text": self.text}
+        sections.update(
+            {
+                "book_chapter_indptr": array("I", self.book_chapter_indptr),
+                "chapter_numbers": array("H", self.chapter_numbers),
+                "chapter_verse_indptr": array("I", self.chapter_verse_indptr),
+                "verse_numbers": array("H", self.verse_numbers),
+                "verse_offsets": array("I", self.verse_offsets),
+            }
+        )
+        return meta, sections
+
+    @classmethod
+    def from_sections(cls, section_file: SectionFile) -> "Corpus":
+        """Create a corpus backed by the sections of a mapped file."""
+        if "blocks" in section_file:
+            text = BlockStore.from_sections(section_file, section_file.meta["codec"])
+        else:
+            text = section_file["text"]
+        return cls(
+            section_file.meta["books"],
+            text,
+            section_file["book_chapter_indptr"],
+            section_file["chapter_numbers"],
+            section_file["chapter_verse_indptr"],
+            section_file["verse_numbers"],
+            section_file["verse_offsets"],
+        )
+
+
+class CorpusBuilder:
+    """Collect verses in source order and lay them out as a ``Corpus``."""
+
+    def __init__(self):
+        self._books: Dict[str, Dict[int, Dict[int, str]]] = {}
+
+    def add_verse(self, book: str, chapter: int, verse: int, text: str):
+        self._books.setdefault(book, {}).setdefault(chapter, {})[verse] = text
+
+    def build(self) -> Corpus:
+        books = list(self._books)
+        book_chapter_indptr = array("I", [0])
+        chapter_numbers = array("H")
+        chapter_verse_indptr = array("I", [0])
+        verse_numbers = array("H")
+        verse_offsets = array("I", [0])
+        parts: List[bytes] = []
+
+        for book in books:
+            for chapter, verses in self._books[book].items():
+                chapter_numbers.append(chapter)
+                for verse, text in verses.items():
+                    encoded = text.encode("utf-8") + VERSE_SEPARATOR
+                    parts.append(encoded)
+                    verse_numbers.append(verse)
+                    verse_offsets.append(verse_offsets[-1] + len(encoded))
+                chapter_verse_indptr.append(len(verse_numbers))
+            book_chapter_indptr.append(len(chapter_numbers))
+
+        return Corpus(
+            books,
+            b"".join(parts),
+            book_chapter_indptr,
+            chapter_numbers,
+            chapter_verse_indptr,
+            verse_numbers,
+            verse_offsets,
+        )
+
+
+class CorpusVerses(Mapping):
+    """Read-only ``{book: {chapter: {verse: text}}}`` view of a corpus."""
+
+    def __init__(self, corpus: Corpus):
+        self._corpus = corpus
+
+    def __getitem__(self, book: str) -> "_BookVerses":
+        book_id = self._corpus.book_id(book)
+        if book_id is None:
+            raise KeyError(book)
+        return _BookVerses(self._corpus, book_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._corpus.books)
+
+    def __len__(self) -> int:
+        return len(self._corpus.books)
+
+
+class CorpusChapters(CorpusVerses):
+    """Read-only ``{book: {chapter: text}}`` view of a corpus."""
+
+    def __getitem__(self, book: str) -> "_BookChapters":
+        book_id = self._corpus.book_id(book)
+        if book_id is None:
+            raise KeyError(book)
+        return _BookChapters(self._corpus, book_id)
+
+
+class _BookVerses(Mapping):
+    def __init__(self, corpus: Corpus, book_id: int):
+        self._corpus = corpus
+        self._book_id = book_id
+
+    def _chapter_id(self, chapter: int) -> int:
+        chapter_id = (
+            self._corpus.chapter_id(self._book_id, chapter)
+            if isinstance(chapter, int)
+            else None
+        )
+        if chapter_id is None:
+            raise KeyError(chapter)
+        return chapter_id
+
+    def __getitem__(self, chapter: int) -> "_ChapterVerses":
+        return _ChapterVerses(self._corpus, self._chapter_id(chapter))
+
+    def __iter__(self) -> Iterator[int]:
+        for chapter_id in self._corpus.chapter_ids(self._book_id):
+            yield self._corpus.chapter_numbers[chapter_id]
+
+    def __len__(self) -> int:
+        return len(self._corpus.chapter_ids(self._book_id))
+
+
+class _BookChapters(_BookVerses):
+    def __getitem__(self, chapter: int) -> str:
+        return self._corpus.chapter_text(self._chapter_id(chapter))
+
+
+class _ChapterVerses(Mapping):
+    def __init__(self, corpus: Corpus, chapter_id: int):
+        self._corpus = corpus
+        self._chapter_id = chapter_id
+
+    def __getitem__(self, verse: int) -> str:
+        verse_id = (
+            self._corpus.verse_id(self._chapter_id, verse)
+            if isinstance(verse, int)
+            else None
+        )
+        if verse_id is None:
+            raise KeyError(verse)
+        return self._corpus.verse_text(verse_id)
+
+    def __iter__(self) -> Iterator[int]:
+        for verse_id in self._corpus.verse_ids(self._chapter_id):
+            yield self._corpus.verse_numbers[verse_id]
+
+    def __len__(self) -> int:
+        return len(self._corpus.verse_ids(self._chapter_id))
@@ -0,0 +1,191 @@
+"""
+Typo-tolerant term lookup over the corpus vocabulary.
+
+Misspelled names ("Nebuchadnezar", "Melchizadek") match no postings.  The
+vocabulary is indexed by character bigrams so that a word resolves to its
+closest spellings before any postings are read: candidates must share
+enough bigrams (the q-gram lemma) and have a compatible length, and only
+those few are checked with a bounded edit distance.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .binfile import SectionFile
+
+_ARRAY_SECTIONS = ("length_indptr", "gram_indptr", "gram_terms", "frequencies")
+
+# Word boundary marker, so that first and last letters get their own grams
+_PAD = "$"
+
+
+def max_edits(word: str) -> int:
+    """Edits tolerated for a word: none below 3 letters, 2 above 5."""
+    if len(word) < 3:
+        return 0
+    return 1 if len(word) <= 5 else 2
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance of two words.
+
+    Gives up early: any distance above ``max_distance`` is returned as
+    ``max_distance + 1``.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(row[j] + 1, current[j - 1] + 1, row[j - 1] + cost)
+            if (
+                i > 1
+                and j > 1
+                and a[i - 1] == b[j - 2]
+                and a[i - 2] == b[j - 1]
+                and previous[j - 2] + 1 < current[j]
+            ):
+                current[j] = previous[j - 2] + 1
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous, row = row, current
+    return min(row[-1], max_distance + 1)
+
+
+def _grams(word: str) -> List[str]:
+    padded = f"{_PAD}{word}{_PAD}"
+    return sorted({padded[i : i + 2] for i in range(len(padded) - 1)})
+
+
+class FuzzyVocabulary:
+    """Bigram index over the distinct words of the corpus.
+
+    Terms are ordered by (length, word), so the words of a given length are a
+    contiguous range of term ids (``length_indptr``) and every bigram's
+    posting list (``gram_indptr`` into ``gram_terms``) can be sliced to the
+    lengths within reach of the misspelling.  ``frequencies`` holds the
+    occurrence count of each term and breaks ties between corrections.
+    """
+
+    # Bump when the cached section layout changes
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        terms: Sequence[str],
+        grams: Sequence[str],
+        length_indptr: Sequence[int],
+        gram_indptr: Sequence[int],
+        gram_terms: Sequence[int],
+        frequencies: Sequence[int],
+    ):
+        self.terms = tuple(terms)
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(self.terms)}
+        self.grams = tuple(grams)
+        self.gram_ids: Dict[str, int] = {gram: i for i, gram in enumerate(self.grams)}
+        self.length_indptr = length_indptr
+        self.gram_indptr = gram_indptr
+        self.gram_terms = gram_terms
+        self.frequencies = frequencies
+
+    @classmethod
+    def build(cls, words: Iterable[str]) -> "FuzzyVocabulary":
+        """Build the index from every word occurrence of the corpus."""
+        counts = Counter(words)
+        terms = sorted(counts, key=lambda term: (len(term), term))
+
+        length_indptr = array("I", [0])
+        postings: Dict[str, List[int]] = {}
+        for term_id, term in enumerate(terms):
+            while len(length_indptr) <= len(term):
+                length_indptr.append(term_id)
+            for gram in _grams(term):
+                postings.setdefault(gram, []).append(term_id)
+        length_indptr.append(len(terms))
+
+        grams = sorted(postings)
+        gram_indptr = array("I", [0])
+        gram_terms = array("I")
+        for gram in grams:
+            gram_terms.extend(postings[gram])
+            gram_indptr.append(len(gram_terms))
+
+        frequencies = array("I", (counts[term] for term in terms))
+        return cls(terms, grams, length_indptr, gram_indptr, gram_terms, frequencies)
+
+    def to_sections(self) -> Tuple[Dict, Dict]:
+        """Return ``(meta, sections)`` for ``write_sections``."""
+        sections = {
+            "terms": "\n".join(self.terms).encode("utf-8"),
+            "grams": "\n".join(self.grams).encode("utf-8"),
+        }
+        for name in _ARRAY_SECTIONS:
+            sections[name] = getattr(self, name)
+        return {"num_terms": len(self.terms)}, sections
+
+    @classmethod
+    def from_sections(cls, section_file: SectionFile) -> "FuzzyVocabulary":
+        """Create an index backed by the sections of a mapped file."""
+        terms, grams = (str(section_file[name], "utf-8") for name in ("terms", "grams"))
+        return cls(
+            terms.split("\n") if terms else [],
+            grams.split("\n") if grams else [],
+            *(section_file[name] for name in _ARRAY_SECTIONS),
+        )
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.term_ids
+
+    def candidates(
+        self, word: str, max_distance: Optional[int] = None, limit: int = 3
+    ) -> List[str]:
+        """Return the vocabulary words closest to ``word``, best first.
+
+        ``max_distance`` defaults to ``max_edits(word)``.  Closer words come
+        first, then more frequent ones.  A known word is its own only
+        candidate.
+        """
+        if word in self.term_ids:
+            return [word]
+        if max_distance is None:
+            max_distance = max_edits(word)
+        if max_distance <= 0 or not word:
+            return []
+
+        # Only terms within max_distance letters of the word's length
+        lengths = self.length_indptr
+        low = lengths[min(max(len(word) - max_distance, 0), len(lengths) - 1)]
+        high = lengths[min(len(word) + max_distance + 1, len(lengths) - 1)]
+
+        shared = Counter()
+        grams = _grams(word)
+        for gram in grams:
+            gram_id = self.gram_ids.get(gram)
+            if gram_id is None:
+                continue
+            start, stop = self.gram_indptr[gram_id], self.gram_indptr[gram_id + 1]
+            shared.update(
+                self.gram_terms[
+                    bisect_left(self.gram_terms, low, start, stop) : bisect_left(
+                        self.gram_terms, high, start, stop
+                    )
+                ]
+            )
+
+        # Each edit changes at most three bigrams (a transposition)
+        threshold = max(len(grams) - 3 * max_distance, 1)
+        matches = []
+        for term_id, count in shared.items():
+            if count < threshold:
+                continue
+            term = self.terms[term_id]
+            distance = edit_distance(word, term, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, -self.frequencies[term_id], term))
+        matches.sort()
+        return [term for _, _, term in matches[:limit]]
@@ -0,0 +1,156 @@
+"""
+Streaming ingest of the BSB text.
+
+Lines are read one at a time from an HTTP response or from local files, so
+ingest never holds the raw download in memory.  HTTP sources support
+conditional requests (ETag / Last-Modified) to skip unchanged downloads.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import requests
+
+from .corpus import CorpusBuilder
+from .references import book_number, normalize_book
+
+# Parse verse lines with format: "Book Chapter:Verse Text"
+VERSE_LINE_RE = re.compile(r"^([A-Za-z0-9\s]+)\s+(\d+):(\d+)\s+(.+)$")
+
+HEADER_PREFIXES = ("The Holy Bible", "This text", "Verse")
+
+BOM = "\ufeff"
+
+
+def is_remote(source: str) -> bool:
+    """Check whether a source is an HTTP(S) URL rather than a local path."""
+    return source.startswith(("http://", "https://"))
+
+
+def parse_verse_line(line: str) -> Optional[Tuple[str, int, int, str]]:
+    """Parse one line of bsb.txt into ``(book, chapter, verse, text)``.
+
+    Book names are canonicalized (``Psalm`` becomes ``Psalms``); unknown
+    names are returned as written.
+    """
+    line = line.strip()
+    if not line or line.startswith(HEADER_PREFIXES):
+        return None
+    verse_match = VERSE_LINE_RE.match(line)
+    if not verse_match:
+        return None
+    return (
+        normalize_book(verse_match.group(1).strip()),
+        int(verse_match.group(2)),
+        int(verse_match.group(3)),
+        verse_match.group(4),
+    )
+
+
+class SourceStream:
+    """Iterate the lines of a BSB text source while hashing its content.
+
+    ``source`` is an HTTP(S) URL, a ``file://`` URL, a local file, or a
+    directory whose ``*.txt`` files are read in name order.  For HTTP
+    sources, passing the ``etag``/``last_modified`` of a previous download
+    makes the request conditional; ``not_modified`` is set when the server
+    answers 304 and no lines are produced.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        timeout: int = 30,
+    ):
+        self.source = source
+        self.timeout = timeout
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = False
+        self._digest = hashlib.sha256()
+
+    @property
+    def source_hash(self) -> str:
+        """SHA-256 of the lines read so far (the whole source once exhausted)."""
+        return self._digest.hexdigest()
+
+    def __iter__(self) -> Iterator[str]:
+        lines = self._remote_lines() if is_remote(self.source) else self._local_lines()
+        for line in lines:
+            line = line.rstrip("\r\n")
+            self._digest.update(line.encode("utf-8"))
+            self._digest.update(b"\n")
+            yield line
+
+    def _remote_lines(self) -> Iterator[str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        response = requests.get(
+            self.source, headers=headers, stream=True, timeout=self.timeout
+        )
+        try:
+            if response.status_code == 304:
+                self.not_modified = True
+                return
+            response.raise_for_status()
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+
+            # Force UTF-8 encoding to handle the BOM and proper character decoding
+            response.encoding = "utf-8"
+            first = True
+            for line in response.iter_lines(decode_unicode=True):
+                if first:
+                    line = line.lstrip(BOM)
+                    first = False
+                yield line
+        finally:
+            response.close()
+
+    def _local_paths(self) -> List[Path]:
+        path = Path(
+            self.source[len("file://") :]
+            if self.source.startswith("file://")
+            else self.source
+        )
+        if path.is_dir():
+            return sorted(path.glob("*.txt"))
+        if not path.exists():
+            raise FileNotFoundError(f"BSB source not found: {path}")
+        return [path]
+
+    def _local_lines(self) -> Iterator[str]:
+        for path in self._local_paths():
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                yield from f
+
+
+def ingest(stream: SourceStream) -> Optional[CorpusBuilder]:
+    """Parse a source stream into a corpus builder.
+
+    Returns None when a conditional request found the source unchanged.
+    Verses of books outside the canon are skipped with a warning.
+    """
+    builder = CorpusBuilder()
+    unknown_books = set()
+    for line in stream:
+        verse = parse_verse_line(line)
+        if not verse:
+            continue
+        if book_number(verse[0]) is None:
+            unknown_books.add(verse[0])
+            continue
+        builder.add_verse(*verse)
+    if stream.not_modified:
+        return None
+    if unknown_books:
+        print(f"Skipped verses of unknown books: {', '.join(sorted(unknown_books))}")
+    return builder
@@ -0,0 +1,190 @@
+"""
+Positional inverted index used for keyword scripture search.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .binfile import SectionFile
+
+_ARRAY_SECTIONS = ("term_indptr", "post_verses", "post_pos_indptr", "positions")
+
+
+class PositionalIndex:
+    """Word -> (verse id, token positions) postings over the whole corpus.
+
+    Postings are stored CSR-style: ``term_indptr`` maps a term id to its
+    range of postings, each posting is a verse id (ascending within a term)
+    and ``post_pos_indptr`` maps it to its slice of ``positions``.  Word and
+    phrase counts are answered by intersecting postings instead of scanning
+    verse text.
+    """
+
+    # Bump when the cached section layout changes
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        terms: Sequence[str],
+        term_indptr: Sequence[int],
+        post_verses: Sequence[int],
+        post_pos_indptr: Sequence[int],
+        positions: Sequence[int],
+    ):
+        self.terms = tuple(terms)
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(self.terms)}
+        self.term_indptr = term_indptr
+        self.post_verses = post_verses
+        self.post_pos_indptr = post_pos_indptr
+        self.positions = positions
+
+    @classmethod
+    def build(cls, verses: Iterable[List[str]]) -> "PositionalIndex":
+        """Build the index from the token lists of every verse, in verse id order."""
+        occurrences: Dict[str, List[Tuple[int, List[int]]]] = {}
+        for verse_id, tokens in enumerate(verses):
+            verse_positions: Dict[str, List[int]] = {}
+            for position, word in enumerate(tokens):
+                verse_positions.setdefault(word, []).append(position)
+            for word, word_positions in verse_positions.items():
+                occurrences.setdefault(word, []).append((verse_id, word_positions))
+
+        terms = sorted(occurrences)
+        term_indptr = array("I", [0])
+        post_verses = array("I")
+        post_pos_indptr = array("I", [0])
+        positions = array("H")
+        for term in terms:
+            for verse_id, word_positions in occurrences[term]:
+                post_verses.append(verse_id)
+                positions.extend(word_positions)
+                post_pos_indptr.append(len(positions))
+            term_indptr.append(len(post_verses))
+
+        return cls(terms, term_indptr, post_verses, post_pos_indptr, positions)
+
+    def to_sections(self) -> Tuple[Dict, Dict]:
+        """Return ``(meta, sections)`` for ``write_sections``."""
+        sections = {"terms": "\n".join(self.terms).encode("utf-8")}
+        for name in _ARRAY_SECTIONS:
+            sections[name] = getattr(self, name)
+        return {"num_terms": len(self.terms)}, sections
+
+    @classmethod
+    def from_sections(cls, section_file: SectionFile) -> "PositionalIndex":
+        """Create an index backed by the sections of a mapped file."""
+        terms = str(section_file["terms"], "utf-8")
+        return cls(
+            terms.split("\n") if terms else [],
+            *(section_file[name] for name in _ARRAY_SECTIONS),
+        )
+
+    def postings(self, term: str, verse_range: Optional[range] = None) -> range:
+        """Return the range of posting ids of a term, optionally limited to verses."""
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return range(0)
+        start, stop = self.term_indptr[term_id], self.term_indptr[term_id + 1]
+        if verse_range is not None:
+            start = bisect_left(self.post_verses, verse_range.start, start, stop)
+            stop = bisect_left(self.post_verses, verse_range.stop, start, stop)
+        return range(start, stop)
+
+    def prefix_terms(self, prefix: str) -> range:
+        """Return the ids of the terms starting with ``prefix``.
+
+        Terms are sorted, so they form one contiguous run of term ids.
+        """
+        if not prefix:
+            return range(len(self.terms))
+        # The smallest string greater than every string with this prefix
+        successor = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return range(
+            bisect_left(self.terms, prefix), bisect_left(self.terms, successor)
+        )
+
+    def document_frequency(self, term_id: int) -> int:
+        """Return the number of verses containing a term."""
+        return self.term_indptr[term_id + 1] - self.term_indptr[term_id]
+
+    def posting_positions(self, posting: int) -> Sequence[int]:
+        """Return the token positions of one posting."""
+        return self.positions[
+            self.post_pos_indptr[posting] : self.post_pos_indptr[posting + 1]
+        ]
+
+    def word_counts(
+        self, word: str, verse_range: Optional[range] = None
+    ) -> Dict[int, int]:
+        """Return ``{verse id: occurrences}`` of a whole word."""
+        pos_indptr = self.post_pos_indptr
+        return {
+            self.post_verses[posting]: pos_indptr[posting + 1] - pos_indptr[posting]
+            for posting in self.postings(word, verse_range)
+        }
+
+    def prefix_counts(
+        self, prefix: str, verse_range: Optional[range] = None
+    ) -> Dict[int, int]:
+        """Return ``{verse id: occurrences}`` of every word starting with ``prefix``."""
+        counts = Counter()
+        for term_id in self.prefix_terms(prefix):
+            counts.update(self.word_counts(self.terms[term_id], verse_range))
+        return counts
+
+    def phrase_counts(
+        self, words: List[str], verse_range: Optional[range] = None
+    ) -> Dict[int, int]:
+        """Return ``{verse id: occurrences}`` of consecutive ``words``."""
+        if len(words) == 1:
+            return self.word_counts(words[0], verse_range)
+        return {
+            verse_id: len(starts)
+            for verse_id, starts in self.phrase_starts(words, verse_range).items()
+        }
+
+    def phrase_starts(
+        self, words: List[str], verse_range: Optional[range] = None
+    ) -> Dict[int, List[int]]:
+        """Return ``{verse id: [start position, ...]}`` of consecutive ``words``."""
+        if not words:
+            return {}
+
+        ranges = [self.postings(word, verse_range) for word in words]
+        if not all(ranges):
+            return {}
+
+        # Drive the intersection with the rarest word, binary searching the rest
+        order = sorted(range(len(words)), key=lambda k: len(ranges[k]))
+        matches = {}
+        for posting in ranges[order[0]]:
+            verse_id = self.post_verses[posting]
+            located = {order[0]: posting}
+            for k in order[1:]:
+                candidate = bisect_left(
+                    self.post_verses, verse_id, ranges[k].start, ranges[k].stop
+                )
+                if (
+                    candidate == ranges[k].stop
+                    or self.post_verses[candidate] != verse_id
+                ):
+                    break
+                located[k] = candidate
+            else:
+                following = [
+                    set(self.posting_positions(located[k]))
+                    for k in range(1, len(words))
+                ]
+                starts = [
+                    start
+                    for start in self.posting_positions(located[0])
+                    if all(
+                        start + offset in positions
+                        for offset, positions in enumerate(following, 1)
+                    )
+                ]
+                if starts:
+                    matches[verse_id] = starts
+        return matches
@@ -0,0 +1,279 @@
+"""
+Latent semantic (truncated SVD) index used for concept-level scripture search.
+
+Requires the optional NumPy/SciPy extra (``pip install -e ".[fast]"``).
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .binfile import SectionFile
+from .semantic_index import TfidfIndex, top_k_scores
+from .text_analysis import SEMANTIC_TOKENIZER_HASH, fingerprint
+
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.linalg import svds
+except ImportError:
+    np = None
+
+LSA_AVAILABLE = np is not None
+
+DEFAULT_DIMS = 128
+
+# Storage of the dense document vectors
+DTYPES = ("int8", "float32")
+DEFAULT_DTYPE = "int8"
+
+# Stamps the cached index with the tokenizer and the shape of its vectors
+LSA_INDEX_HASH = fingerprint(SEMANTIC_TOKENIZER_HASH, DEFAULT_DIMS, DEFAULT_DTYPE)
+
+
+class LsaIndex:
+    """Dense LSA embeddings of the chapters and verses of a TF-IDF index.
+
+    The normalized chapter TF-IDF matrix ``X`` is factorized as
+    ``X ~ U S V^T`` and ``V`` (terms x dims) is kept as the projection:
+    chapters, verses and queries are all embedded as ``tfidf(text) @ V``
+    and L2-normalized, so cosine search is one matrix-vector product.
+    Document vectors are stored as float32 or as int8 with one float32
+    scale per row.
+    """
+
+    # Bump when the cached section layout changes
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        terms: Iterable[str],
+        idf,
+        doc_keys,
+        projection,
+        chapter_vectors,
+        chapter_scales=None,
+        verse_vectors=None,
+        verse_scales=None,
+    ):
+        _require_numpy()
+        self.terms = tuple(terms)
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(self.terms)}
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.doc_keys = doc_keys
+        self.projection = projection
+        self.chapter_vectors = chapter_vectors
+        self.chapter_scales = chapter_scales
+        self.verse_vectors = verse_vectors
+        self.verse_scales = verse_scales
+
+    @property
+    def dims(self) -> int:
+        return self.projection.shape[1]
+
+    @property
+    def dtype(self) -> str:
+        return str(self.chapter_vectors.dtype)
+
+    @classmethod
+    def build(
+        cls,
+        semantic_index: TfidfIndex,
+        verses: Optional[Iterable[List[str]]] = None,
+        dims: int = DEFAULT_DIMS,
+        dtype: str = DEFAULT_DTYPE,
+    ) -> "LsaIndex":
+        """Factorize a chapter TF-IDF index and embed its chapters and verses.
+
+        ``verses`` are the semantic tokens of every verse in verse id order;
+        they are folded into the chapter space without changing it.
+        """
+        _require_numpy()
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown LSA dtype: {dtype}")
+
+        idf = np.asarray(semantic_index.idf, dtype=np.float64)
+        doc_indptr = np.asarray(semantic_index.doc_indptr, dtype=np.int64)
+        doc_terms = np.asarray(semantic_index.doc_terms)
+        rows = np.repeat(np.arange(len(semantic_index)), np.diff(doc_indptr))
+        lengths = np.asarray(semantic_index.doc_lengths, dtype=np.float64)
+        norms = np.asarray(semantic_index.doc_norms)
+        data = np.asarray(semantic_index.doc_counts, dtype=np.float64)
+        data *= idf[doc_terms] / lengths[rows]
+        data /= np.where(norms > 0, norms, 1.0)[rows]
+        matrix = csr_matrix(
+            (data, doc_terms, doc_indptr),
+            shape=(len(semantic_index), len(semantic_index.terms)),
+        )
+
+        projection = _truncated_svd(matrix, dims)
+        index = cls(
+            semantic_index.terms,
+            idf,
+            semantic_index.doc_keys,
+            projection,
+            *_encode(matrix @ projection, dtype),
+        )
+        if verses is not None:
+            index.verse_vectors, index.verse_scales = _encode(
+                index._tfidf_matrix(verses) @ projection, dtype
+            )
+        return index
+
+    def to_sections(self) -> Tuple[Dict, Dict]:
+        """Return ``(meta, sections)`` for ``write_sections``."""
+        sections = {
+            "terms": "\n".join(self.terms).encode("utf-8"),
+            "idf": np.ascontiguousarray(self.idf),
+            "doc_keys": self.doc_keys,
+            "projection": np.ascontiguousarray(self.projection).reshape(-1),
+            "chapter_vectors": np.ascontiguousarray(self.chapter_vectors).reshape(-1),
+        }
+        if self.chapter_scales is not None:
+            sections["chapter_scales"] = self.chapter_scales
+        if self.verse_vectors is not None:
+            sections["verse_vectors"] = np.ascontiguousarray(
+                self.verse_vectors
+            ).reshape(-1)
+            if self.verse_scales is not None:
+                sections["verse_scales"] = self.verse_scales
+        return {"dims": self.dims, "dtype": self.dtype}, sections
+
+    @classmethod
+    def from_sections(cls, section_file: SectionFile) -> "LsaIndex":
+        """Create an index backed by the sections of a mapped file."""
+        _require_numpy()
+        dims = section_file.meta["dims"]
+        dtype = section_file.meta["dtype"]
+
+        def matrix(name: str, matrix_dtype: str):
+            if name not in section_file:
+                return None
+            return np.frombuffer(section_file[name], dtype=matrix_dtype).reshape(
+                -1, dims
+            )
+
+        def vector(name: str):
+            if name not in section_file:
+                return None
+            return np.frombuffer(section_file[name], dtype=np.float32)
+
+        terms = str(section_file["terms"], "utf-8")
+        return cls(
+            terms.split("\n") if terms else [],
+            np.frombuffer(section_file["idf"], dtype=np.float64),
+            section_file["doc_keys"],
+            matrix("projection", "float32"),
+            matrix("chapter_vectors", dtype),
+            vector("chapter_scales"),
+            matrix("verse_vectors", dtype),
+            vector("verse_scales"),
+        )
+
+    def embed(self, tokens: List[str]):
+        """Return the normalized embedding of query tokens (None if unknown)."""
+        vector = self._tfidf_matrix([tokens]) @ self.projection
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return None
+        return (vector[0] / norm).astype(np.float32)
+
+    def search(
+        self,
+        tokens: List[str],
+        max_results: int = 5,
+        min_score: float = 0.01,
+        granularity: str = "chapter",
+        doc_ranges: Optional[Sequence[range]] = None,
+    ) -> List[Tuple[int, float]]:
+        """Return ``(doc id, cosine similarity)`` pairs for the best documents.
+
+        ``granularity`` is ``"chapter"`` (document ids, see ``doc_keys``) or
+        ``"verse"`` (verse ids).  ``doc_ranges`` (sorted, disjoint ranges of
+        those ids) limits scoring to the matching rows.
+        """
+        if granularity == "chapter":
+            vectors, scales = self.chapter_vectors, self.chapter_scales
+        elif granularity == "verse":
+            vectors, scales = self.verse_vectors, self.verse_scales
+            if vectors is None:
+                raise ValueError("LSA index was built without verse vectors")
+        else:
+            raise ValueError(f"Unknown granularity: {granularity}")
+
+        query = self.embed(tokens)
+        if query is None or max_results <= 0:
+            return []
+        if doc_ranges is None:
+            scores = vectors @ query
+            if scales is not None:
+                scores = scores * scales
+            return top_k_scores(scores, max_results, min_score)
+
+        doc_ids = np.concatenate(
+            [np.arange(r.start, r.stop) for r in doc_ranges] + [np.zeros(0, int)]
+        )
+        scores = vectors[doc_ids] @ query
+        if scales is not None:
+            scores = scores * scales[doc_ids]
+        return [
+            (int(doc_ids[i]), score)
+            for i, score in top_k_scores(scores, max_results, min_score)
+        ]
+
+    def _tfidf_matrix(self, documents: Iterable[List[str]]):
+        """Normalized TF-IDF rows (same weighting as ``TfidfIndex``)."""
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for tokens in documents:
+            counts: Dict[int, int] = {}
+            for word in tokens:
+                term_id = self.term_ids.get(word)
+                if term_id is not None:
+                    counts[term_id] = counts.get(term_id, 0) + 1
+            # Rows are normalized below, so the TF denominator cancels out
+            indices.extend(counts)
+            data.extend(count * self.idf[term_id] for term_id, count in counts.items())
+            indptr.append(len(indices))
+        matrix = csr_matrix(
+            (np.asarray(data, dtype=np.float64), indices, indptr),
+            shape=(len(indptr) - 1, len(self.terms)),
+        )
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        return csr_matrix(matrix.multiply(scale[:, None]))
+
+
+def _require_numpy():
+    if not LSA_AVAILABLE:
+        raise RuntimeError(
+            'LSA search requires NumPy and SciPy (pip install -e ".[fast]")'
+        )
+
+
+def _truncated_svd(matrix, dims: int):
+    """Return the top ``dims`` right singular vectors as a float32 matrix."""
+    smallest = min(matrix.shape)
+    if dims < smallest - 1:
+        _, singular_values, vt = svds(matrix, k=dims, random_state=0)
+        order = np.argsort(singular_values)[::-1]
+        vt = vt[order]
+    else:
+        # Tiny corpora: the exact decomposition is cheaper and svds needs
+        # k < min(shape)
+        _, _, vt = np.linalg.svd(matrix.toarray(), full_matrices=False)
+        vt = vt[:dims]
+    return np.ascontiguousarray(vt.T, dtype=np.float32)
+
+
+def _encode(vectors, dtype: str):
+    """L2-normalize rows and store them as ``dtype`` (int8 rows get a scale)."""
+    vectors = np.asarray(vectors, dtype=np.float64)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+    if dtype == "float32":
+        return vectors.astype(np.float32), None
+
+    peaks = np.abs(vectors).max(axis=1)
+    scales = np.where(peaks > 0, peaks / 127.0, 1.0)
+    quantized = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
@@ -0,0 +1,129 @@
+"""
+Cache manifest for the scripture caches.
+
+The manifest records which source the cached text came from and, for every
+cached artifact, the size, modification time and checksum of the file plus
+the format version and tokenizer it was built with.  Artifacts whose stamps
+no longer match are rebuilt individually instead of re-ingesting everything.
+
+Loading compares only the size and modification time, so opening a cache
+never reads it whole (the section file header is checked when it is
+mapped); the checksum is compared on request, e.g. by ``scripture index``.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .binfile import atomic_open
+
+MANIFEST_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """Return the hex SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CacheManifest:
+    """JSON manifest describing the artifacts in a cache directory."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.data: Dict[str, Any] = self._read()
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format_version") == MANIFEST_VERSION:
+                return data
+        except (OSError, ValueError):
+            pass
+        return {"format_version": MANIFEST_VERSION, "artifacts": {}}
+
+    @property
+    def source_hash(self) -> Optional[str]:
+        return self.data.get("source_hash")
+
+    def matches_source(self, source_url: str) -> bool:
+        """Check that the cached text was ingested from ``source_url``."""
+        return self.data.get("source_url") == source_url and bool(self.source_hash)
+
+    def set_source(self, source_url: str, source_hash: str, **details: Any):
+        """Record a freshly ingested source.
+
+        Artifacts built from a different source are forgotten; when the
+        source content is unchanged they stay valid.
+        """
+        if self.source_hash != source_hash or self.data.get("source_url") != source_url:
+            self.data["artifacts"] = {}
+        self.data["source_url"] = source_url
+        self.data["source_hash"] = source_hash
+        self.data.update(details)
+
+    def verify(
+        self,
+        name: str,
+        path: Union[str, Path],
+        format_version: int,
+        tokenizer_hash: Optional[str] = None,
+        checksum: bool = False,
+    ) -> bool:
+        """Check that an artifact is recorded, current and unchanged on disk.
+
+        The file must have its recorded size and modification time; with
+        ``checksum`` (or for entries recorded without a modification time)
+        its SHA-256 digest is compared too.
+        """
+        entry = self.data["artifacts"].get(name)
+        if (
+            not entry
+            or entry.get("source_hash") != self.source_hash
+            or entry.get("format") != format_version
+            or entry.get("tokenizer_hash") != tokenizer_hash
+        ):
+            return False
+        try:
+            stat = os.stat(path)
+            if stat.st_size != entry.get("size"):
+                return False
+            if entry.get("mtime_ns") is None:
+                checksum = True
+            elif stat.st_mtime_ns != entry["mtime_ns"]:
+                return False
+            return not checksum or file_sha256(path) == entry.get("sha256")
+        except OSError:
+            return False
+
+    def record(
+        self,
+        name: str,
+        path: Union[str, Path],
+        format_version: int,
+        tokenizer_hash: Optional[str] = None,
+    ):
+        """Record an artifact that was just written to ``path``."""
+        stat = os.stat(path)
+        self.data["artifacts"][name] = {
+            "file": Path(path).name,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_sha256(path),
+            "format": format_version,
+            "source_hash": self.source_hash,
+            "tokenizer_hash": tokenizer_hash,
+        }
+
+    def save(self):
+        """Atomically write the manifest."""
+        with atomic_open(self.path) as f:
+            f.write(json.dumps(self.data, indent=2, sort_keys=True).encode("utf-8"))
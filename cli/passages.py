@@ -0,0 +1,68 @@
+"""
+Overlapping verse windows ("passages") for passage-level semantic search.
+
+Every verse is a passage of its own, and each chapter is also covered by
+windows of ``PASSAGE_WINDOW`` consecutive verses every ``PASSAGE_STRIDE``
+verses, so a match is reported as the tightest verse range around it.
+Windows never cross chapter boundaries.
+"""
+
+from typing import Iterator, List, Tuple
+
+from .corpus import Corpus
+from .text_analysis import SEMANTIC_TOKENIZER_HASH, fingerprint
+
+PASSAGE_WINDOW = 4
+PASSAGE_STRIDE = 2
+
+# Passage keys pack the first verse id and the number of extra verses
+_SPAN_BITS = 8
+
+# Stamps the cached passage index with its tokenizer and window layout
+PASSAGE_INDEX_HASH = fingerprint(
+    SEMANTIC_TOKENIZER_HASH, PASSAGE_WINDOW, PASSAGE_STRIDE, _SPAN_BITS
+)
+
+
+def pack_span(first_verse: int, last_verse: int) -> int:
+    """Encode an inclusive verse id range as one integer key."""
+    return (first_verse << _SPAN_BITS) | (last_verse - first_verse)
+
+
+def unpack_span(key: int) -> Tuple[int, int]:
+    """Decode a key from ``pack_span`` into ``(first verse, last verse)``."""
+    first_verse = key >> _SPAN_BITS
+    return first_verse, first_verse + (key & ((1 << _SPAN_BITS) - 1))
+
+
+def passage_spans(corpus: Corpus) -> Iterator[Tuple[int, int]]:
+    """Yield the inclusive verse id ranges of every passage, in corpus order."""
+    for chapter_id in range(corpus.num_chapters):
+        verses = corpus.verse_ids(chapter_id)
+        for verse_id in verses:
+            yield verse_id, verse_id
+        if len(verses) <= 1:
+            continue
+        # The last window is aligned to the chapter end so that every verse
+        # is covered by a full-size window
+        window = min(PASSAGE_WINDOW, len(verses))
+        starts = list(range(verses.start, verses.stop - window + 1, PASSAGE_STRIDE))
+        if starts[-1] != verses.stop - window:
+            starts.append(verses.stop - window)
+        for first in starts:
+            yield first, first + window - 1
+
+
+def select_non_overlapping(spans: List[Tuple[int, int]], max_results: int) -> List[int]:
+    """Greedily pick spans (best first) that do not overlap earlier picks.
+
+    Returns the indexes of the picked spans.
+    """
+    picked: List[int] = []
+    for i, (first, last) in enumerate(spans):
+        if any(first <= spans[j][1] and spans[j][0] <= last for j in picked):
+            continue
+        picked.append(i)
+        if len(picked) == max_results:
+            break
+    return picked
@@ -0,0 +1,444 @@
+"""
+Keyword query language: boolean operators, phrases, proximity and scoping.
+
+    king OR ruler             either word (juxtaposed terms mean OR, too)
+    faith AND works           both, in the same verse
+    Philistines NOT Samson    verses without the excluded term
+    "king of the Philistines" exact phrase
+    righteous*                any word starting with "righteous"
+    love NEAR/3 enemies       within 3 words of each other
+    (a OR b) AND c            grouping
+    book:John chapter:3-5     restrict the whole query to books/chapters
+
+Operators are upper case so that ordinary words like "and" still search.
+A query compiles to a tree that is evaluated with postings operations
+(``PositionalIndex`` intersections, or one scan for every term).
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import (
+    AbstractSet,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Tuple,
+    Union,
+)
+
+from .scope import SearchScope
+from .text_analysis import tokenize_words
+
+# Shorter prefixes would expand to a large part of the vocabulary
+MIN_PREFIX_LENGTH = 2
+
+_TOKEN_RE = re.compile(
+    r"""
+    \s*(?:
+        (?P<filter>book|chapter):(?:"(?P<quoted_value>[^"]*)"|(?P<value>[^\s()"]+))
+      | "(?P<phrase>[^"]*)"?
+      | (?P<paren>[()])
+      | NEAR/(?P<near>\d+)
+      | (?P<operator>AND|OR|NOT)(?=[\s()"]|$)
+      | (?P<word>[^\s()"]+)
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+class Term(NamedTuple):
+    """A word or phrase: consecutive lowercase words."""
+
+    words: Tuple[str, ...]
+
+
+class Prefix(NamedTuple):
+    """Every word starting with ``prefix`` (written ``prefix*``)."""
+
+    prefix: str
+
+
+class Near(NamedTuple):
+    """Two terms at most ``distance`` words apart, in either order."""
+
+    left: Term
+    right: Term
+    distance: int
+
+
+class Not(NamedTuple):
+    child: "Node"
+
+
+class And(NamedTuple):
+    children: Tuple["Node", ...]
+
+
+class Or(NamedTuple):
+    children: Tuple["Node", ...]
+
+
+Node = Union[Term, Prefix, Near, Not, And, Or]
+
+
+class KeywordQuery:
+    """A parsed keyword query: an expression tree plus its book scope."""
+
+    def __init__(self, root: Optional[Node], scope: Optional[SearchScope] = None):
+        self.root = root
+        self.scope = scope
+
+    @classmethod
+    def parse(cls, query: str) -> "KeywordQuery":
+        """Parse a query string; raises ``ValueError`` on syntax errors."""
+        parser = _Parser(query)
+        root = parser.parse()
+        return cls(root, parser.scope())
+
+    def terms(self, positive: bool = False) -> List[Tuple[str, ...]]:
+        """Every distinct term of the query, in order of appearance.
+
+        With ``positive``, terms that are only excluded (NOT) are left out.
+        """
+        return [leaf.words for leaf in self.leaves(positive) if isinstance(leaf, Term)]
+
+    def leaves(self, positive: bool = False) -> List[Union[Term, Prefix]]:
+        """Every distinct term and prefix of the query, in order of appearance.
+
+        With ``positive``, the ones that are only excluded (NOT) are left out.
+        """
+        found: Dict[Union[Term, Prefix], None] = {}
+
+        def visit(node: Node):
+            if isinstance(node, (Term, Prefix)):
+                found[node] = None
+            elif isinstance(node, Near):
+                visit(node.left)
+                visit(node.right)
+            elif isinstance(node, Not):
+                if not positive:
+                    visit(node.child)
+            else:
+                for child in node.children:
+                    visit(child)
+
+        if self.root is not None:
+            visit(self.root)
+        return list(found)
+
+    def without(self, words: AbstractSet[str]) -> "KeywordQuery":
+        """Drop the single-word terms in ``words`` (e.g. stop words).
+
+        Phrases and NEAR operands are kept whole, and so is the query if
+        nothing else would remain of it.
+        """
+
+        def visit(node: Node) -> Optional[Node]:
+            if isinstance(node, Term):
+                return None if len(node.words) == 1 and node.words[0] in words else node
+            if isinstance(node, Not):
+                child = visit(node.child)
+                return None if child is None else Not(child)
+            if isinstance(node, (And, Or)):
+                children = [visit(child) for child in node.children]
+                if all(isinstance(child, Not) for child in children if child):
+                    return None
+                return _group(type(node), children)
+            return node
+
+        root = None if self.root is None else visit(self.root)
+        return self if root is None else KeywordQuery(root, self.scope)
+
+    def correct(self, corrections: Dict[str, List[str]]) -> "KeywordQuery":
+        """Replace misspelled words with their ``corrections`` (best first).
+
+        A word searched on its own matches any of its corrections; inside a
+        phrase or a NEAR operand it is replaced by the best one.
+        """
+        if not corrections or self.root is None:
+            return self
+
+        def best(term: Term) -> Term:
+            return Term(
+                tuple(
+                    corrections[word][0] if corrections.get(word) else word
+                    for word in term.words
+                )
+            )
+
+        def visit(node: Node) -> Node:
+            if isinstance(node, Term):
+                alternatives = (
+                    corrections.get(node.words[0]) if len(node.words) == 1 else None
+                )
+                if alternatives:
+                    return _group(Or, [Term((word,)) for word in alternatives])
+                return best(node)
+            if isinstance(node, Prefix):
+                return node
+            if isinstance(node, Near):
+                return Near(best(node.left), best(node.right), node.distance)
+            if isinstance(node, Not):
+                return Not(visit(node.child))
+            return type(node)(tuple(visit(child) for child in node.children))
+
+        return KeywordQuery(visit(self.root), self.scope)
+
+    def evaluate(self, postings: "Postings") -> Dict[int, int]:
+        """Return ``{verse id: occurrences}`` of the matching verses.
+
+        Counts add up over the terms that matched, so verses (and chapters)
+        matching more of an OR query rank higher.
+        """
+        if self.root is None:
+            return {}
+        if isinstance(self.root, Not):
+            raise ValueError("NOT needs a term to exclude from")
+        return _evaluate(self.root, postings)
+
+
+class Postings(Protocol):
+    """Term and proximity counts over a set of verse ranges.
+
+    ``IndexPostings`` and ``ScanPostings`` implement it; every method
+    returns ``{verse id: occurrences}``.
+    """
+
+    def counts(self, words: Tuple[str, ...]) -> Dict[int, int]: ...
+
+    def prefix_counts(self, prefix: str) -> Dict[int, int]: ...
+
+    def near_counts(self, left: Term, right: Term, distance: int) -> Dict[int, int]: ...
+
+
+class IndexPostings:
+    """Postings read from a ``PositionalIndex``, limited to verse ranges."""
+
+    def __init__(self, index, verse_ranges: Optional[List[range]] = None):
+        self.index = index
+        self.verse_ranges = [None] if verse_ranges is None else verse_ranges
+
+    def counts(self, words: Tuple[str, ...]) -> Dict[int, int]:
+        counts = {}
+        for verse_range in self.verse_ranges:
+            counts.update(self.index.phrase_counts(list(words), verse_range))
+        return counts
+
+    def prefix_counts(self, prefix: str) -> Dict[int, int]:
+        counts = {}
+        for verse_range in self.verse_ranges:
+            counts.update(self.index.prefix_counts(prefix, verse_range))
+        return counts
+
+    def near_counts(self, left: Term, right: Term, distance: int) -> Dict[int, int]:
+        counts = {}
+        for verse_range in self.verse_ranges:
+            left_starts = self.index.phrase_starts(list(left.words), verse_range)
+            if not left_starts:
+                continue
+            right_starts = self.index.phrase_starts(list(right.words), verse_range)
+            for verse_id, starts in left_starts.items():
+                others = right_starts.get(verse_id)
+                if others is None:
+                    continue
+                count = sum(
+                    1
+                    for start in starts
+                    if _has_neighbor(
+                        start, len(left.words), others, len(right.words), distance
+                    )
+                )
+                if count:
+                    counts[verse_id] = count
+        return counts
+
+
+class ScanPostings:
+    """Counts of every query term from a single ``CorpusScanner`` pass."""
+
+    def __init__(self, scanner, terms: List[Tuple[str, ...]], verse_ranges=None):
+        term_counts = scanner.term_counts(
+            [list(words) for words in terms], verse_ranges
+        )
+        self._counts = dict(zip(terms, term_counts))
+
+    def counts(self, words: Tuple[str, ...]) -> Dict[int, int]:
+        return self._counts[words]
+
+    def prefix_counts(self, prefix: str) -> Dict[int, int]:
+        raise ValueError("Wildcard queries need the keyword index")
+
+    def near_counts(self, left: Term, right: Term, distance: int) -> Dict[int, int]:
+        raise ValueError("NEAR queries need the keyword index")
+
+
+def _has_neighbor(
+    start: int, length: int, others: List[int], other_length: int, distance: int
+) -> bool:
+    """Whether an occurrence in ``others`` is within ``distance`` words."""
+    # Candidates end at most ``distance`` words before this occurrence starts
+    # or start at most ``distance`` words after it ends; overlaps don't count
+    candidates = others[
+        bisect_left(others, start - distance - other_length) : bisect_right(
+            others, start + length + distance
+        )
+    ]
+    return any(
+        other + other_length <= start or other >= start + length for other in candidates
+    )
+
+
+def _evaluate(node: Node, postings: Postings) -> Dict[int, int]:
+    if isinstance(node, Term):
+        return postings.counts(node.words)
+    if isinstance(node, Prefix):
+        return postings.prefix_counts(node.prefix)
+    if isinstance(node, Near):
+        return postings.near_counts(node.left, node.right, node.distance)
+
+    positive = [child for child in node.children if not isinstance(child, Not)]
+    negative = [child.child for child in node.children if isinstance(child, Not)]
+    if not positive:
+        raise ValueError("NOT needs a term to exclude from")
+
+    results = [_evaluate(child, postings) for child in positive]
+    counts = Counter()
+    if isinstance(node, And):
+        # Drive the intersection with the smallest result
+        results.sort(key=len)
+        for verse_id in results[0]:
+            if all(verse_id in result for result in results[1:]):
+                counts[verse_id] = sum(result[verse_id] for result in results)
+    else:
+        for result in results:
+            counts.update(result)
+
+    for child in negative:
+        for verse_id in _evaluate(child, postings):
+            counts.pop(verse_id, None)
+    return counts
+
+
+class _Parser:
+    """Recursive descent parser; precedence NOT > NEAR > AND > OR."""
+
+    def __init__(self, query: str):
+        self.query = query
+        self.tokens: List[Tuple[str, str]] = []
+        self.books: List[str] = []
+        self.chapters: Optional[str] = None
+        self.position = 0
+
+        for match in _TOKEN_RE.finditer(query.strip()):
+            kind = match.lastgroup
+            if kind in ("value", "quoted_value"):
+                value = match.group("quoted_value") or match.group("value")
+                if not value:
+                    raise ValueError(f"Empty {match.group('filter')}: filter")
+                if match.group("filter") == "book":
+                    self.books.append(value)
+                elif not re.fullmatch(r"\d+(?:-\d+)?", value):
+                    raise ValueError(f"Invalid chapter filter: {value}")
+                else:
+                    self.chapters = value
+            elif kind == "phrase":
+                self.tokens.append(("term", match.group("phrase")))
+            elif kind == "near":
+                self.tokens.append(("near", match.group("near")))
+            elif kind in ("paren", "operator", "word"):
+                self.tokens.append((kind, match.group(kind)))
+
+    def scope(self) -> Optional[SearchScope]:
+        if self.chapters is not None:
+            if len(self.books) != 1:
+                raise ValueError("chapter: needs exactly one book: filter")
+            return SearchScope(book_range=f"{self.books[0]} {self.chapters}")
+        if self.books:
+            return SearchScope(books=self.books)
+        return None
+
+    def parse(self) -> Optional[Node]:
+        if not self.tokens:
+            return None
+        node = self._or()
+        if self.position < len(self.tokens):
+            raise ValueError(f"Unexpected {self.tokens[self.position][1]!r} in query")
+        return node
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise ValueError(f"Incomplete query: {self.query}")
+        self.position += 1
+        return token
+
+    def _or(self) -> Optional[Node]:
+        children = [self._and()]
+        while self._peek() is not None and self._peek() != ("paren", ")"):
+            if self._peek() == ("operator", "OR"):
+                self._next()
+            children.append(self._and())
+        return _group(Or, children)
+
+    def _and(self) -> Optional[Node]:
+        children = [self._unary()]
+        while self._peek() == ("operator", "AND"):
+            self._next()
+            children.append(self._unary())
+        return _group(And, children)
+
+    def _unary(self) -> Optional[Node]:
+        if self._peek() == ("operator", "NOT"):
+            self._next()
+            child = self._unary()
+            return None if child is None else Not(child)
+        return self._near()
+
+    def _near(self) -> Optional[Node]:
+        left = self._primary()
+        while self._peek() is not None and self._peek()[0] == "near":
+            distance = int(self._next()[1])
+            right = self._primary()
+            if not isinstance(left, Term) or not isinstance(right, Term):
+                raise ValueError("NEAR joins two words or phrases")
+            left = Near(left, right, distance)
+        return left
+
+    def _primary(self) -> Optional[Node]:
+        kind, value = self._next()
+        if (kind, value) == ("paren", "("):
+            node = self._or() if self._peek() != ("paren", ")") else None
+            if self._next() != ("paren", ")"):
+                raise ValueError(f"Missing ')' in query: {self.query}")
+            return node
+        if kind == "word" and value.endswith("*"):
+            words = tokenize_words(value[:-1])
+            if len(words) != 1 or len(words[0]) < MIN_PREFIX_LENGTH:
+                raise ValueError(
+                    f"Wildcards need a word of at least {MIN_PREFIX_LENGTH} "
+                    f"letters: {value}"
+                )
+            return Prefix(words[0])
+        if kind in ("term", "word"):
+            words = tuple(tokenize_words(value))
+            return Term(words) if words else None
+        raise ValueError(f"Unexpected {value!r} in query")
+
+
+def _group(kind, children: List[Optional[Node]]) -> Optional[Node]:
+    """Build an And/Or node, dropping empty operands (e.g. punctuation)."""
+    children = [child for child in children if child is not None]
+    if not children:
+        return None
+    if len(children) == 1:
+        return children[0]
+    return kind(tuple(children))
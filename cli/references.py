@@ -0,0 +1,327 @@
+"""
+Scripture references: book names, packed verse references and reference
+parsing.
+
+    John 3            a whole chapter
+    John 3-4          whole chapters
+    John 3:16         one verse
+    Psalms 119:1-40   a verse range
+    John 3:16-4:2     a range across chapters
+    Jn 3:16-18; Rom 8:28, 31
+                      a list: after "," a bare number continues the verses
+                      of the previous chapter, after ";" it is a chapter
+
+Book names and their abbreviations are resolved through one table built at
+import time, so normalizing a name is a single dictionary lookup.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Three-letter book codes, in canonical order
+BOOK_ABBREVIATIONS = {
+    "gen": "Genesis",
+    "exo": "Exodus",
+    "lev": "Leviticus",
+    "num": "Numbers",
+    "deu": "Deuteronomy",
+    "jos": "Joshua",
+    "jud": "Judges",
+    "rut": "Ruth",
+    "1sa": "1 Samuel",
+    "2sa": "2 Samuel",
+    "1ki": "1 Kings",
+    "2ki": "2 Kings",
+    "1ch": "1 Chronicles",
+    "2ch": "2 Chronicles",
+    "ezr": "Ezra",
+    "neh": "Nehemiah",
+    "est": "Esther",
+    "job": "Job",
+    "psa": "Psalms",
+    "pro": "Proverbs",
+    "ecc": "Ecclesiastes",
+    "sng": "Song of Solomon",
+    "isa": "Isaiah",
+    "jer": "Jeremiah",
+    "lam": "Lamentations",
+    "ezk": "Ezekiel",
+    "dan": "Daniel",
+    "hos": "Hosea",
+    "jol": "Joel",
+    "amo": "Amos",
+    "oba": "Obadiah",
+    "jon": "Jonah",
+    "mic": "Micah",
+    "nah": "Nahum",
+    "hab": "Habakkuk",
+    "zep": "Zephaniah",
+    "hag": "Haggai",
+    "zec": "Zechariah",
+    "mal": "Malachi",
+    "mat": "Matthew",
+    "mrk": "Mark",
+    "luk": "Luke",
+    "jhn": "John",
+    "act": "Acts",
+    "rom": "Romans",
+    "1co": "1 Corinthians",
+    "2co": "2 Corinthians",
+    "gal": "Galatians",
+    "eph": "Ephesians",
+    "php": "Philippians",
+    "col": "Colossians",
+    "1th": "1 Thessalonians",
+    "2th": "2 Thessalonians",
+    "1ti": "1 Timothy",
+    "2ti": "2 Timothy",
+    "tit": "Titus",
+    "phm": "Philemon",
+    "heb": "Hebrews",
+    "jas": "James",
+    "1pe": "1 Peter",
+    "2pe": "2 Peter",
+    "1jn": "1 John",
+    "2jn": "2 John",
+    "3jn": "3 John",
+    "jde": "Jude",
+    "rev": "Revelation",
+}
+
+# Common short forms beyond the three-letter codes and unambiguous prefixes
+_SHORT_FORMS = {
+    "jn": "John",
+    "1jn": "1 John",
+    "2jn": "2 John",
+    "3jn": "3 John",
+    "mt": "Matthew",
+    "mk": "Mark",
+    "lk": "Luke",
+    "ps": "Psalms",
+    "jdg": "Judges",
+    "phil": "Philippians",
+    "phlm": "Philemon",
+    "songofsongs": "Song of Solomon",
+}
+
+# The canonical books, in order; a book's number is its position plus one
+BOOKS: Tuple[str, ...] = tuple(BOOK_ABBREVIATIONS.values())
+
+_compact = re.compile(r"[\s.]+").sub
+
+
+def _book_keys() -> Dict[str, int]:
+    """Map the compact spelling of every accepted book name to its number."""
+    prefixes: Dict[str, set] = {}
+    for number, book in enumerate(BOOKS, 1):
+        key = _compact("", book.lower())
+        for length in range(2, len(key)):
+            prefixes.setdefault(key[:length], set()).add(number)
+    keys = {
+        key: numbers.pop() for key, numbers in prefixes.items() if len(numbers) == 1
+    }
+    numbers = {book: number for number, book in enumerate(BOOKS, 1)}
+    for short, book in (*BOOK_ABBREVIATIONS.items(), *_SHORT_FORMS.items()):
+        keys[short] = numbers[book]
+    for book, number in numbers.items():
+        keys[_compact("", book.lower())] = number
+    return keys
+
+
+_BOOK_KEYS = _book_keys()
+
+
+def book_number(book: str) -> Optional[int]:
+    """Return the canonical number (1-66) of a book name or abbreviation."""
+    return _BOOK_KEYS.get(_compact("", book.lower()))
+
+
+def normalize_book(book: str) -> str:
+    """Return the canonical name of a book, or ``book`` itself if unknown."""
+    number = _BOOK_KEYS.get(_compact("", book.lower()))
+    return book if number is None else BOOKS[number - 1]
+
+
+# Packing of VerseRef: BBCCCVVV
+_BOOK_FACTOR = 1_000_000
+_CHAPTER_FACTOR = 1_000
+
+# Verse number standing for "the end of the chapter" in range bounds
+LAST_VERSE = _CHAPTER_FACTOR - 1
+
+
+class VerseRef(int):
+    """A verse packed into one integer, ``book * 10**6 + chapter * 1000 + verse``.
+
+    Ordering the integers orders verses canonically, so sorting, range
+    checks and lookups are plain integer operations.  Verse 0 (and
+    ``LAST_VERSE``) stand for the start (end) of a chapter in range bounds.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, book: str, chapter: int, verse: int = 0) -> "VerseRef":
+        """Pack a reference; raises ``ValueError`` for unknown books."""
+        number = book_number(book)
+        if number is None:
+            raise ValueError(f"Unknown book: {book}")
+        if not (
+            0 <= chapter < _BOOK_FACTOR // _CHAPTER_FACTOR and 0 <= verse <= LAST_VERSE
+        ):
+            raise ValueError(f"Invalid reference: {book} {chapter}:{verse}")
+        return cls(number * _BOOK_FACTOR + chapter * _CHAPTER_FACTOR + verse)
+
+    @property
+    def book_number(self) -> int:
+        return self // _BOOK_FACTOR
+
+    @property
+    def book(self) -> str:
+        return BOOKS[self // _BOOK_FACTOR - 1]
+
+    @property
+    def chapter(self) -> int:
+        return self % _BOOK_FACTOR // _CHAPTER_FACTOR
+
+    @property
+    def verse(self) -> int:
+        return self % _CHAPTER_FACTOR
+
+    def __str__(self) -> str:
+        return f"{self.book} {self.chapter}:{self.verse}"
+
+    def __repr__(self) -> str:
+        return f"VerseRef({self.book!r}, {self.chapter}, {self.verse})"
+
+
+_REFERENCE_RE = re.compile(
+    r"""
+    ^\s*
+    (?:(?P<book>(?:[1-3]\s*)?[^\W\d_]+(?:\s+[^\W\d_]+)*)\.?\s*)?
+    (?P<chapter>\d+)
+    (?::(?P<verse>\d+))?
+    (?:\s*[-–]\s*(?:(?P<end_chapter>\d+):)?(?P<end>\d+))?
+    \s*$
+    """,
+    re.VERBOSE,
+)
+
+_SEPARATOR_RE = re.compile(r"\s*([;,])\s*")
+
+
+class PassageRef(NamedTuple):
+    """A parsed reference; verse and end fields are None when not given.
+
+    A missing ``verse`` starts at the beginning of ``chapter``; a missing
+    ``end_verse`` runs to the end of ``end_chapter``, or covers only
+    ``verse`` when there is no ``end_chapter`` either.
+    """
+
+    book: str
+    chapter: int
+    verse: Optional[int] = None
+    end_chapter: Optional[int] = None
+    end_verse: Optional[int] = None
+
+    @property
+    def last_chapter(self) -> int:
+        return self.chapter if self.end_chapter is None else self.end_chapter
+
+    def bounds(self) -> Tuple[VerseRef, VerseRef]:
+        """Return the first and last verse as ``VerseRef`` (inclusive).
+
+        Whole chapters are bounded by verse 0 and ``LAST_VERSE``.  Raises
+        ``ValueError`` for books outside the canon.
+        """
+        end_verse = self.end_verse
+        if end_verse is None:
+            end_verse = self.verse if self.end_chapter is None else None
+        return (
+            VerseRef.of(self.book, self.chapter, self.verse or 0),
+            VerseRef.of(
+                self.book,
+                self.last_chapter,
+                LAST_VERSE if end_verse is None else end_verse,
+            ),
+        )
+
+    def __str__(self) -> str:
+        text = f"{self.book} {self.chapter}"
+        if self.verse is not None:
+            text += f":{self.verse}"
+        if self.end_chapter is not None and (
+            self.end_chapter != self.chapter or self.end_verse is None
+        ):
+            text += f"-{self.end_chapter}"
+            if self.end_verse is not None:
+                text += f":{self.end_verse}"
+        elif self.end_verse is not None and self.end_verse != self.verse:
+            text += f"-{self.end_verse}"
+        return text
+
+
+def parse_reference(reference: str) -> PassageRef:
+    """Parse ``"Book C"``, ``"Book C:V"`` and their ranges.
+
+    Known books and abbreviations are returned under their canonical names,
+    other names as written.  Raises ``ValueError`` for malformed references.
+    """
+    match = _REFERENCE_RE.match(reference)
+    if not match or match.group("book") is None:
+        raise ValueError(f"Invalid reference: {reference}")
+    return _passage(match, normalize_book(" ".join(match.group("book").split())))
+
+
+def parse_references(text: str) -> List[PassageRef]:
+    """Parse a list of references separated by ``;`` or ``,``.
+
+    A part without a book continues the previous one: after ``,`` and a
+    verse reference a bare number is a verse (``John 3:16, 18``), otherwise
+    it is a chapter (``Romans 8:28; 12``).  Raises ``ValueError`` for
+    malformed parts or a first part without a book.
+    """
+    parts = _SEPARATOR_RE.split(text.strip())
+    passages: List[PassageRef] = []
+    for i in range(0, len(parts), 2):
+        separator = parts[i - 1] if i else None
+        match = _REFERENCE_RE.match(parts[i])
+        if not match:
+            raise ValueError(f"Invalid reference: {parts[i]}")
+        if match.group("book") is not None:
+            passages.append(parse_reference(parts[i]))
+            continue
+        if not passages:
+            raise ValueError(f"Invalid reference: {text}")
+
+        previous = passages[-1]
+        if separator == "," and previous.verse is not None and not match.group("verse"):
+            # "John 3:16, 18-20": verses of the chapter the previous part ended in
+            chapter = previous.last_chapter
+            verse, end = int(match.group("chapter")), match.group("end")
+            if match.group("end_chapter") is not None:
+                raise ValueError(f"Invalid reference: {parts[i]}")
+            passages.append(
+                PassageRef(previous.book, chapter, verse)
+                if end is None
+                else PassageRef(previous.book, chapter, verse, chapter, int(end))
+            )
+        else:
+            passages.append(_passage(match, previous.book))
+    return passages
+
+
+def _passage(match: "re.Match", book: str) -> PassageRef:
+    chapter = int(match.group("chapter"))
+    verse, end_chapter, end = (
+        None if match.group(name) is None else int(match.group(name))
+        for name in ("verse", "end_chapter", "end")
+    )
+    if end is None:
+        return PassageRef(book, chapter, verse)
+    if end_chapter is not None:
+        return PassageRef(book, chapter, verse, end_chapter, end)
+    if verse is None:
+        # "John 3-4": the end is a chapter
+        return PassageRef(book, chapter, None, end)
+    return PassageRef(book, chapter, verse, chapter, end)
@@ -0,0 +1,301 @@
+"""
+Trigram index for regular expression search over verse text.
+
+A regex is analyzed for the literal strings every match must contain
+(``trigram_query``), those literals become a boolean query over the
+trigrams of the case-folded verses, and only the verses that pass this
+prefilter are matched with the real regex.  Case folding makes the same
+index serve case-sensitive and case-insensitive patterns.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+try:  # Python 3.11+
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+from .binfile import SectionFile
+from .text_analysis import fingerprint
+
+_ARRAY_SECTIONS = ("gram_indptr", "gram_verses")
+
+# Stamps the cached trigram index with its normalization
+REGEX_INDEX_HASH = fingerprint("casefold", 3)
+
+# Literal sets larger than these are summarized by their trigrams instead
+_MAX_EXACT = 16
+_MAX_CLASS = 8
+
+
+class AllOf(NamedTuple):
+    children: Tuple["TrigramQuery", ...]
+
+
+class AnyOf(NamedTuple):
+    children: Tuple["TrigramQuery", ...]
+
+
+# A trigram, a combination of queries, or None when every verse may match
+TrigramQuery = Optional[Union[str, AllOf, AnyOf]]
+
+
+class TrigramIndex:
+    """Trigram -> verse ids over the case-folded text of every verse.
+
+    Postings are stored CSR-style: ``gram_indptr`` maps a trigram id (its
+    position in the sorted ``grams``) to an ascending run of ``gram_verses``.
+    """
+
+    # Bump when the cached section layout changes
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        grams: Sequence[str],
+        gram_indptr: Sequence[int],
+        gram_verses: Sequence[int],
+        num_verses: int,
+    ):
+        self.grams = tuple(grams)
+        self.gram_ids: Dict[str, int] = {gram: i for i, gram in enumerate(self.grams)}
+        self.gram_indptr = gram_indptr
+        self.gram_verses = gram_verses
+        self.num_verses = num_verses
+
+    @classmethod
+    def build(cls, verses: Iterable[str]) -> "TrigramIndex":
+        """Build the index from the text of every verse, in verse id order."""
+        postings: Dict[str, List[int]] = {}
+        num_verses = 0
+        for verse_id, text in enumerate(verses):
+            for gram in _trigrams(text.casefold()):
+                postings.setdefault(gram, []).append(verse_id)
+            num_verses = verse_id + 1
+
+        grams = sorted(postings)
+        gram_indptr = array("I", [0])
+        gram_verses = array("I")
+        for gram in grams:
+            gram_verses.extend(postings[gram])
+            gram_indptr.append(len(gram_verses))
+        return cls(grams, gram_indptr, gram_verses, num_verses)
+
+    def to_sections(self) -> Tuple[Dict, Dict]:
+        """Return ``(meta, sections)`` for ``write_sections``."""
+        sections = {"grams": "\n".join(self.grams).encode("utf-8")}
+        for name in _ARRAY_SECTIONS:
+            sections[name] = getattr(self, name)
+        return {"num_grams": len(self.grams), "num_verses": self.num_verses}, sections
+
+    @classmethod
+    def from_sections(cls, section_file: SectionFile) -> "TrigramIndex":
+        """Create an index backed by the sections of a mapped file."""
+        grams = str(section_file["grams"], "utf-8")
+        return cls(
+            grams.split("\n") if grams else [],
+            *(section_file[name] for name in _ARRAY_SECTIONS),
+            section_file.meta["num_verses"],
+        )
+
+    def postings(self, gram: str) -> Sequence[int]:
+        """Return the ascending ids of the verses containing a trigram."""
+        gram_id = self.gram_ids.get(gram)
+        if gram_id is None:
+            return ()
+        return self.gram_verses[
+            self.gram_indptr[gram_id] : self.gram_indptr[gram_id + 1]
+        ]
+
+    def candidates(
+        self, query: TrigramQuery, verse_ranges: Optional[Sequence[range]] = None
+    ) -> Iterable[int]:
+        """Return the ascending ids of the verses that may satisfy ``query``."""
+        verses = self._evaluate(query)
+        if verses is None:
+            if verse_ranges is None:
+                return range(self.num_verses)
+            return (verse_id for r in verse_ranges for verse_id in r)
+        if verse_ranges is None:
+            return verses
+        starts = [r.start for r in verse_ranges]
+        return [
+            verse_id
+            for verse_id in verses
+            if _in_ranges(verse_ranges, starts, verse_id)
+        ]
+
+    def _evaluate(self, query: TrigramQuery) -> Optional[Sequence[int]]:
+        if query is None:
+            return None
+        if isinstance(query, str):
+            return self.postings(query)
+        results = [self._evaluate(child) for child in query.children]
+        if isinstance(query, AnyOf):
+            if any(result is None for result in results):
+                return None
+            return sorted(set().union(*results))
+
+        # Intersect starting from the rarest trigram, probing the others
+        results = sorted((r for r in results if r is not None), key=len)
+        if not results:
+            return None
+        verses = results[0]
+        for other in results[1:]:
+            verses = [verse_id for verse_id in verses if _contains(other, verse_id)]
+            if not verses:
+                break
+        return verses
+
+
+def _trigrams(text: str) -> set:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _contains(verses: Sequence[int], verse_id: int) -> bool:
+    i = bisect_left(verses, verse_id)
+    return i < len(verses) and verses[i] == verse_id
+
+
+def _in_ranges(ranges: Sequence[range], starts: List[int], verse_id: int) -> bool:
+    i = bisect_left(starts, verse_id + 1) - 1
+    return i >= 0 and verse_id in ranges[i]
+
+
+class _Info(NamedTuple):
+    """What is known about the strings a regex node matches.
+
+    ``exact`` is the (case-folded) set of every string it can match, when
+    that set is small; ``query`` is a trigram query every match satisfies.
+    """
+
+    exact: Optional[frozenset]
+    query: TrigramQuery
+
+
+_REPEATS = tuple(
+    op
+    for op in (
+        sre_parse.MAX_REPEAT,
+        sre_parse.MIN_REPEAT,
+        getattr(sre_parse, "POSSESSIVE_REPEAT", None),
+    )
+    if op is not None
+)
+
+_UNKNOWN = _Info(None, None)
+_EMPTY = _Info(frozenset([""]), None)
+
+
+def trigram_query(pattern: str, flags: int = 0) -> TrigramQuery:
+    """Derive the trigram query that any match of ``pattern`` satisfies.
+
+    Raises ``re.error`` for invalid patterns.
+    """
+    return _info(sre_parse.parse(pattern, flags)).query
+
+
+def _exact_query(strings: Iterable[str]) -> TrigramQuery:
+    alternatives = []
+    for string in sorted(strings):
+        if len(string) < 3:
+            return None
+        alternatives.append(_all_of(sorted(_trigrams(string))))
+    return _any_of(alternatives)
+
+
+def _exact(strings) -> _Info:
+    strings = frozenset(strings)
+    return _Info(strings, _exact_query(strings))
+
+
+def _all_of(queries: Iterable[TrigramQuery]) -> TrigramQuery:
+    children = []
+    for query in queries:
+        if isinstance(query, AllOf):
+            children.extend(query.children)
+        elif query is not None:
+            children.append(query)
+    children = list(dict.fromkeys(children))
+    if not children:
+        return None
+    return children[0] if len(children) == 1 else AllOf(tuple(children))
+
+
+def _any_of(queries: Iterable[TrigramQuery]) -> TrigramQuery:
+    children = list(dict.fromkeys(queries))
+    if not children or None in children:
+        return None
+    return children[0] if len(children) == 1 else AnyOf(tuple(children))
+
+
+def _info(subpattern) -> _Info:
+    """Analyze a parsed sequence of regex items."""
+    parts: List[TrigramQuery] = []
+    run = frozenset([""])
+    exact = True
+    for op, av in subpattern:
+        item = _item_info(op, av)
+        if item.exact is not None and len(run) * len(item.exact) <= _MAX_EXACT:
+            run = frozenset(a + b for a in run for b in item.exact)
+            continue
+        exact = False
+        parts.append(_exact_query(run))
+        if item.exact is not None:
+            run = item.exact
+        else:
+            parts.append(item.query)
+            run = frozenset([""])
+    if exact:
+        return _exact(run)
+    parts.append(_exact_query(run))
+    return _Info(None, _all_of(parts))
+
+
+def _item_info(op, av) -> _Info:
+    if op is sre_parse.LITERAL:
+        return _exact([chr(av).casefold()])
+    if op is sre_parse.IN:
+        return _class_info(av)
+    if op is sre_parse.AT:
+        return _EMPTY
+    if op is sre_parse.SUBPATTERN:
+        return _info(av[-1])
+    if op is getattr(sre_parse, "ATOMIC_GROUP", None):
+        return _info(av)
+    if op is sre_parse.BRANCH:
+        branches = [_info(branch) for branch in av[1]]
+        if all(branch.exact is not None for branch in branches):
+            strings = frozenset().union(*(branch.exact for branch in branches))
+            if len(strings) <= _MAX_EXACT:
+                return _exact(strings)
+        return _Info(None, _any_of(branch.query for branch in branches))
+    if op in _REPEATS:
+        low, high, item = av
+        if low == 0:
+            return _UNKNOWN
+        info = _info(item)
+        if low == high and info.exact is not None:
+            if len(info.exact) ** low <= _MAX_EXACT:
+                strings = frozenset([""])
+                for _ in range(low):
+                    strings = frozenset(a + b for a in strings for b in info.exact)
+                return _exact(strings)
+        return _Info(None, info.query)
+    return _UNKNOWN
+
+
+def _class_info(items) -> _Info:
+    chars = set()
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            chars.add(chr(av).casefold())
+        elif op is sre_parse.RANGE and av[1] - av[0] < _MAX_CLASS:
+            chars.update(chr(c).casefold() for c in range(av[0], av[1] + 1))
+        else:
+            return _UNKNOWN
+        if len(chars) > _MAX_CLASS:
+            return _UNKNOWN
+    return _exact(chars)
@@ -0,0 +1,103 @@
+"""
+Precomputed chapter similarity graph for related-passage lookups.
+
+Every chapter's nearest neighbours under TF-IDF cosine similarity are found
+once, when the index is built, by scoring all pairs of chapters of the
+chapter index.  Looking up the chapters related to a chapter is then a
+slice of a CSR array instead of a semantic search per call.
+"""
+
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .binfile import SectionFile
+from .semantic_index import TfidfIndex
+from .text_analysis import SEMANTIC_TOKENIZER_HASH, fingerprint
+
+# Neighbours kept per chapter
+RELATED_CHAPTERS = 10
+
+# Similarities are stored as one byte: round(score * _SCORE_LEVELS)
+_SCORE_LEVELS = 255
+
+_ARRAY_SECTIONS = ("indptr", "neighbors", "scores")
+
+# Stamps the cached graph with the tokenizer and neighbourhood size
+RELATED_CHAPTERS_HASH = fingerprint(
+    SEMANTIC_TOKENIZER_HASH, RELATED_CHAPTERS, _SCORE_LEVELS
+)
+
+
+class RelatedChapters:
+    """Top-N most similar chapters of every chapter.
+
+    Rows are indexed by chapter id: ``indptr`` maps a chapter to a run of
+    ``neighbors`` (chapter ids, most similar first) and of ``scores`` (the
+    cosine similarities, quantized to one byte each).
+    """
+
+    # Bump when the cached section layout changes
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        indptr: Sequence[int],
+        neighbors: Sequence[int],
+        scores: Sequence[int],
+    ):
+        self.indptr = indptr
+        self.neighbors = neighbors
+        self.scores = scores
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    @classmethod
+    def build(
+        cls,
+        index: TfidfIndex,
+        max_neighbors: int = RELATED_CHAPTERS,
+        min_score: float = 0.01,
+    ) -> "RelatedChapters":
+        """Find the nearest chapters of every document of a chapter index."""
+        batch_hits = index.similar_documents(max_neighbors, min_score)
+
+        rows: Dict[int, List[Tuple[int, float]]] = {}
+        for doc_id, hits in enumerate(batch_hits):
+            rows[index.doc_keys[doc_id]] = [
+                (index.doc_keys[hit], score) for hit, score in hits
+            ]
+
+        indptr = array("I", [0])
+        neighbors = array("I")
+        scores = array("B")
+        for chapter_id in range(max(rows, default=-1) + 1):
+            for neighbor, score in rows.get(chapter_id, ()):
+                neighbors.append(neighbor)
+                scores.append(round(min(score, 1.0) * _SCORE_LEVELS))
+            indptr.append(len(neighbors))
+        return cls(indptr, neighbors, scores)
+
+    def to_sections(self) -> Tuple[Dict, Dict]:
+        """Return ``(meta, sections)`` for ``write_sections``."""
+        sections = {name: getattr(self, name) for name in _ARRAY_SECTIONS}
+        return {"num_chapters": len(self)}, sections
+
+    @classmethod
+    def from_sections(cls, section_file: SectionFile) -> "RelatedChapters":
+        """Create a graph backed by the sections of a mapped file."""
+        return cls(*(section_file[name] for name in _ARRAY_SECTIONS))
+
+    def related(
+        self, chapter_id: int, max_results: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """Return ``(chapter id, similarity)`` pairs, most similar first."""
+        if not 0 <= chapter_id < len(self):
+            return []
+        start, end = self.indptr[chapter_id], self.indptr[chapter_id + 1]
+        if max_results is not None:
+            end = min(end, start + max(max_results, 0))
+        return [
+            (self.neighbors[i], self.scores[i] / _SCORE_LEVELS)
+            for i in range(start, end)
+        ]
@@ -0,0 +1,108 @@
+"""
+Single-pass keyword scanner over a case-folded copy of the corpus.
+
+A fallback for keyword search that needs no index on disk: the lowercased
+text of every verse is joined once, and all query terms are matched by one
+compiled pattern in a single pass over it (or over the scoped slices).
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+from .corpus import Corpus
+
+# Verses never contain newlines, so phrases cannot match across verses
+_VERSE_SEPARATOR = "\n"
+_WORD_GAP = r"[^\w\n]+"
+
+
+class CorpusScanner:
+    """Lowercased corpus text with verse start offsets for whole-word scans.
+
+    Matches agree with ``PositionalIndex``: a term is a list of consecutive
+    words (see ``tokenize_words``), each occurrence counts once per term,
+    and occurrences of different terms may overlap.
+    """
+
+    def __init__(self, text: str, verse_starts: Sequence[int]):
+        self.text = text
+        self.verse_starts = verse_starts
+
+    @classmethod
+    def build(cls, corpus: Corpus) -> "CorpusScanner":
+        """Case-fold every verse of a corpus into one searchable string."""
+        verse_starts = array("I")
+        parts = []
+        position = 0
+        for verse_id in range(corpus.num_verses):
+            verse = corpus.verse_text(verse_id).lower()
+            verse_starts.append(position)
+            parts.append(verse)
+            position += len(verse) + len(_VERSE_SEPARATOR)
+        return cls(_VERSE_SEPARATOR.join(parts), verse_starts)
+
+    @staticmethod
+    def compile(terms: List[List[str]]) -> Optional["re.Pattern"]:
+        """Compile terms into one pattern with a capture group per term.
+
+        The pattern only stops where at least one term starts; every term
+        that matches at that position sets its own group, so overlapping
+        terms are all counted in the same pass.
+        """
+        alternatives = [
+            _WORD_GAP.join(re.escape(word) for word in words) + r"(?!\w)"
+            for words in terms
+            if words
+        ]
+        if not alternatives:
+            return None
+        return re.compile(
+            r"(?<!\w)(?="
+            + "|".join(alternatives)
+            + ")"
+            + "".join(f"(?:(?=({alternative})))?" for alternative in alternatives)
+        )
+
+    def verse_counts(
+        self, terms: List[List[str]], verse_ranges: Optional[Sequence[range]] = None
+    ) -> Dict[int, int]:
+        """Return ``{verse id: occurrences}`` summed over all terms."""
+        counts = Counter()
+        for term_counts in self.term_counts(terms, verse_ranges):
+            counts.update(term_counts)
+        return counts
+
+    def term_counts(
+        self, terms: List[List[str]], verse_ranges: Optional[Sequence[range]] = None
+    ) -> List[Dict[int, int]]:
+        """Return ``{verse id: occurrences}`` of each term, from a single pass."""
+        counts = [Counter() for _ in terms]
+        pattern = self.compile(terms)
+        if pattern is None:
+            return counts
+
+        spans = [(0, len(self.text))]
+        if verse_ranges is not None:
+            spans = [
+                (self._start(r.start), self._start(r.stop) - len(_VERSE_SEPARATOR))
+                for r in verse_ranges
+                if r
+            ]
+
+        # Group g belongs to the g-th non-empty term
+        group_counts = [counts[i] for i, words in enumerate(terms) if words]
+        for start, end in spans:
+            for match in pattern.finditer(self.text, start, end):
+                verse_id = bisect_right(self.verse_starts, match.start()) - 1
+                for group, term_counts in enumerate(group_counts, 1):
+                    if match.group(group) is not None:
+                        term_counts[verse_id] += 1
+        return counts
+
+    def _start(self, verse_id: int) -> int:
+        if verse_id < len(self.verse_starts):
+            return self.verse_starts[verse_id]
+        return len(self.text) + len(_VERSE_SEPARATOR)
@@ -0,0 +1,189 @@
+"""
+Search scopes: restrict scripture searches to books, a testament or a
+canonical range.
+
+Books and chapters are stored contiguously in canonical order, so a scope
+resolves to a few ranges of chapter ids.  Every index keeps its documents in
+corpus order, which lets a search walk only the postings inside those ranges
+instead of scoring the whole Bible and filtering afterwards.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Callable, List, Optional, Sequence
+
+from .corpus import Corpus
+from .references import BOOKS
+
+TESTAMENTS = ("OT", "NT")
+
+NEW_TESTAMENT_BOOKS = frozenset(BOOKS[BOOKS.index("Matthew") :])
+
+# "Isaiah 40", "1 Samuel" or a bare chapter number after the dash
+_ENDPOINT_RE = re.compile(r"^\s*(?:(.*?[^\d\s].*?)\s*)?(\d+)?\s*$")
+
+
+class SearchScope:
+    """Books, testament and/or canonical range a search is restricted to.
+
+    ``book_range`` is ``"Genesis-Deuteronomy"``, ``"Isaiah 40-55"``,
+    ``"Matthew 5-Luke 2"`` or a single ``"Book [chapter]"``.  When several
+    criteria are given a chapter must match all of them.  Malformed values
+    raise ``ValueError``; unknown book names simply match nothing.
+    """
+
+    def __init__(
+        self,
+        book: Optional[str] = None,
+        books: Optional[Sequence[str]] = None,
+        testament: Optional[str] = None,
+        book_range: Optional[str] = None,
+    ):
+        self.book = book or None
+        self.books = list(books) if books else None
+        self.testament = testament.upper() if testament else None
+        if self.testament is not None and self.testament not in TESTAMENTS:
+            raise ValueError(
+                f"Unknown testament: {testament}. Use one of: {', '.join(TESTAMENTS)}"
+            )
+        self.book_range = book_range or None
+        self._endpoints = (
+            _parse_book_range(book_range) if self.book_range is not None else None
+        )
+
+    def __bool__(self) -> bool:
+        return any(
+            value is not None
+            for value in (self.book, self.books, self.testament, self.book_range)
+        )
+
+    def chapter_ranges(
+        self, corpus: Corpus, normalize_book: Callable[[str], str] = str
+    ) -> Optional[List[range]]:
+        """Resolve to sorted, disjoint chapter id ranges (None: no restriction)."""
+        if not self:
+            return None
+
+        def book_ids(names: Sequence[str]) -> List[int]:
+            found = (corpus.book_id(normalize_book(name)) for name in names)
+            return sorted({book_id for book_id in found if book_id is not None})
+
+        def book_ranges(ids: Sequence[int]) -> List[range]:
+            return merge_ranges([corpus.chapter_ids(book_id) for book_id in ids])
+
+        ranges = [range(corpus.num_chapters)]
+        if self.book is not None:
+            ranges = intersect_ranges(ranges, book_ranges(book_ids([self.book])))
+        if self.books is not None:
+            ranges = intersect_ranges(ranges, book_ranges(book_ids(self.books)))
+        if self.testament is not None:
+            new_testament = self.testament == "NT"
+            ids = [
+                book_id
+                for book_id, name in enumerate(corpus.books)
+                if (name in NEW_TESTAMENT_BOOKS) == new_testament
+            ]
+            ranges = intersect_ranges(ranges, book_ranges(ids))
+        if self._endpoints is not None:
+            ranges = intersect_ranges(
+                ranges, self._range_chapters(corpus, normalize_book)
+            )
+        return ranges
+
+    def _range_chapters(
+        self, corpus: Corpus, normalize_book: Callable[[str], str]
+    ) -> List[range]:
+        (first_book, first_chapter), (last_book, last_chapter) = self._endpoints
+        first_book_id = corpus.book_id(normalize_book(first_book))
+        last_book_id = corpus.book_id(normalize_book(last_book))
+        if first_book_id is None or last_book_id is None:
+            return []
+
+        first_chapters = corpus.chapter_ids(first_book_id)
+        last_chapters = corpus.chapter_ids(last_book_id)
+        start, stop = first_chapters.start, last_chapters.stop
+        if first_chapter is not None:
+            start = corpus.chapter_id(first_book_id, first_chapter)
+        if last_chapter is not None:
+            stop = corpus.chapter_id(last_book_id, last_chapter)
+            stop = None if stop is None else stop + 1
+        if start is None or stop is None or start >= stop:
+            return []
+        return [range(start, stop)]
+
+
+def _parse_book_range(book_range: str):
+    """Split a canonical range into ``((book, chapter), (book, chapter))``."""
+    first, dash, last = book_range.partition("-")
+    first_match = _ENDPOINT_RE.match(first)
+    last_match = _ENDPOINT_RE.match(last) if dash else first_match
+    if (
+        first_match is None
+        or last_match is None
+        or not first_match.group(1)
+        or not (last_match.group(1) or last_match.group(2))
+    ):
+        raise ValueError(
+            f"Invalid range: {book_range}. Use e.g. 'Genesis-Deuteronomy' or "
+            "'Isaiah 40-55'"
+        )
+
+    first_book = first_match.group(1)
+    first_chapter = _chapter_number(first_match.group(2))
+    if dash and not last_match.group(1):
+        # "Isaiah 40-55": the end chapter is in the same book
+        return (first_book, first_chapter), (first_book, int(last_match.group(2)))
+    return (first_book, first_chapter), (
+        last_match.group(1),
+        _chapter_number(last_match.group(2)),
+    )
+
+
+def _chapter_number(value: Optional[str]) -> Optional[int]:
+    return int(value) if value is not None else None
+
+
+def merge_ranges(ranges: Sequence[range]) -> List[range]:
+    """Sort ranges and merge the ones that touch or overlap."""
+    merged: List[range] = []
+    for r in sorted((r for r in ranges if r), key=lambda r: r.start):
+        if merged and r.start <= merged[-1].stop:
+            merged[-1] = range(merged[-1].start, max(merged[-1].stop, r.stop))
+        else:
+            merged.append(r)
+    return merged
+
+
+def intersect_ranges(a: Sequence[range], b: Sequence[range]) -> List[range]:
+    """Intersect two sorted lists of disjoint ranges."""
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i].start, b[j].start)
+        stop = min(a[i].stop, b[j].stop)
+        if start < stop:
+            result.append(range(start, stop))
+        if a[i].stop < b[j].stop:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def verse_ranges(corpus: Corpus, chapter_ranges: Sequence[range]) -> List[range]:
+    """Map chapter id ranges to the verse id ranges they contain."""
+    indptr = corpus.chapter_verse_indptr
+    return [range(indptr[r.start], indptr[r.stop]) for r in chapter_ranges]
+
+
+def doc_id_ranges(doc_keys: Sequence[int], key_ranges: Sequence[range]) -> List[range]:
+    """Map ranges of document keys to ranges of document ids.
+
+    ``doc_keys`` only has to be ordered block by block: every key range
+    boundary must fall on a block edge, which holds for the chapter-ordered
+    keys of every index (documents never span chapters).
+    """
+    return [
+        range(bisect_left(doc_keys, r.start), bisect_left(doc_keys, r.stop))
+        for r in key_ranges
+    ]
@@ -3,70 +3,216 @@ Scripture data management for the Gamaliel Prompts CLI tool.
 Uses Berean Standard Bible (BSB, Open Source) for scripture text.
 """
 
-import math
-import pickle
+import heapq
+import os
 import re
-from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-
-import requests
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .binfile import SectionFile, write_sections
+from .blockstore import COMPRESSIONS
+from .corpus import Corpus, CorpusBuilder, CorpusChapters, CorpusVerses, numbered_text
+from .fuzzy import FuzzyVocabulary
+from .ingest import SourceStream, ingest
+from .keyword_index import PositionalIndex
+from .lsa_index import LSA_AVAILABLE, LSA_INDEX_HASH, LsaIndex
+from .manifest import CacheManifest
+from .passages import (
+    PASSAGE_INDEX_HASH,
+    pack_span,
+    passage_spans,
+    select_non_overlapping,
+    unpack_span,
+)
+from .query import IndexPostings, KeywordQuery, Postings, Prefix, ScanPostings
+from .references import BOOK_ABBREVIATIONS, PassageRef, normalize_book
+from .regex_index import REGEX_INDEX_HASH, TrigramIndex, trigram_query
+from .related import RELATED_CHAPTERS_HASH, RelatedChapters
+from .scan import CorpusScanner
+from .scope import SearchScope, doc_id_ranges, intersect_ranges, verse_ranges
+from .semantic_index import BM25_B, BM25_K1, SCORERS, TfidfIndex
+from .snippets import SNIPPET_HASH, SnippetStore, highlight
+from .storage import PreviewedSearch, SqliteBackend
+from .text_analysis import (
+    KEYWORD_TOKENIZER_HASH,
+    SEMANTIC_TOKENIZER_HASH,
+    STOP_WORDS,
+    tokenize_semantic,
+    tokenize_words,
+)
+from .translations import TranslationRegistry
+
+DEFAULT_BSB_URL = "https://bereanbible.com/bsb.txt"
+
+# Use .cli-cache in the project root
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".cli-cache"
+
+# Storage backends of the core scripture tools: the cached index files, or
+# one SQLite FTS5 database per translation (file name in its cache dir)
+STORAGE_BACKENDS = ("files", "sqlite")
+SQLITE_DATABASE = "bsb.sqlite"
+
+# Ranking functions accepted by search_semantic; "lsa" needs the fast extra
+SEMANTIC_SCORERS = SCORERS + (("lsa",) if LSA_AVAILABLE else ())
+
+# Keyword search backends: the positional index, or a single-pass scan of
+# the case-folded text when no index should be built
+KEYWORD_ENGINES = ("index", "scan")
+
+# Chapters taken from each ranking by hybrid search, and the reciprocal rank
+# fusion constant that damps the influence of the very first ranks
+HYBRID_DEPTH = 50
+RRF_K = 60
+
+# Matching verses shown in a result snippet
+SNIPPET_VERSES = 3
+
+# Pickle caches written by earlier versions of the CLI
+LEGACY_CACHE_FILES = (
+    "bsb_verses.pkl",
+    "bsb_chapters.pkl",
+    "bsb_embeddings.pkl",
+    "bsb_vocabulary.pkl",
+    "bsb_metadata.pkl",
+)
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[int]], k: int = RRF_K
+) -> List[Tuple[int, float, Tuple[Optional[int], ...]]]:
+    """Fuse rankings of ids: each one adds ``1 / (k + rank)`` to an id's score.
+
+    Returns ``(id, score, (rank in each ranking or None, ...))`` best first;
+    ties keep the order in which ids first appear.
+    """
+    ranks: Dict[int, List[Optional[int]]] = {}
+    for i, ranking in enumerate(rankings):
+        for rank, item in enumerate(ranking, 1):
+            ranks.setdefault(item, [None] * len(rankings))[i] = rank
+    fused = [
+        (
+            item,
+            sum(1.0 / (k + rank) for rank in item_ranks if rank is not None),
+            tuple(item_ranks),
+        )
+        for item, item_ranks in ranks.items()
+    ]
+    fused.sort(key=lambda result: -result[1])
+    return fused
 
 
 class BSBParser:
-    """Parser for Berean Standard Bible (BSB) text."""
-
-    def __init__(
-        self, url: str = "https://bereanbible.com/bsb.txt", cache_dir: str = None
-    ):
-        self.url = url
-        self.verses: Dict[str, Dict[int, Dict[int, str]]] = {}
-        self.chapters: Dict[str, Dict[int, str]] = {}
-        self.chapter_embeddings: Dict[str, Dict[int, List[float]]] = {}
-        self.vocabulary: Dict[str, float] = {}
+    """Parser for Berean Standard Bible (BSB) text.
+
+    The scripture text and every search index are separate components that
+    are memory-mapped (or built and cached) the first time they are used, so
+    a plain verse lookup never pays for the semantic index.
+    """
+
+    # Lazily loaded components: attribute -> (cache file, component class,
+    # tokenizer hash).  Each one is built by the matching ``_build_<attribute>``
+    # method and rebuilt on its own when its manifest entry is stale.
+    COMPONENTS = {
+        "semantic_index": ("bsb_semantic.bin", TfidfIndex, SEMANTIC_TOKENIZER_HASH),
+        "keyword_index": ("bsb_keywords.bin", PositionalIndex, KEYWORD_TOKENIZER_HASH),
+        "passage_index": ("bsb_passages.bin", TfidfIndex, PASSAGE_INDEX_HASH),
+        "fuzzy_vocabulary": (
+            "bsb_fuzzy.bin",
+            FuzzyVocabulary,
+            KEYWORD_TOKENIZER_HASH,
+        ),
+        "regex_index": ("bsb_trigrams.bin", TrigramIndex, REGEX_INDEX_HASH),
+        "chapter_graph": (
+            "bsb_related.bin",
+            RelatedChapters,
+            RELATED_CHAPTERS_HASH,
+        ),
+        "snippets": ("bsb_snippets.bin", SnippetStore, SNIPPET_HASH),
+    }
+    if LSA_AVAILABLE:
+        COMPONENTS["lsa_index"] = ("bsb_lsa.bin", LsaIndex, LSA_INDEX_HASH)
+
+    def __init__(self, url: str = None, cache_dir: str = None, compression: str = None):
+        # The source can be a URL, a local bsb.txt or a directory of .txt
+        # files (for build machines without network access).  Without an
+        # explicit source any cached text is used, whatever it was ingested
+        # from (e.g. ``scripture index --source``), until ``refresh``
+        if url is None:
+            url = os.getenv("GAMALIEL_BSB_SOURCE")
+        self.source_pinned = url is not None
+        self.url = url if url is not None else DEFAULT_BSB_URL
+
+        # Codec of the cached text blocks ("none" keeps the text raw)
+        if compression is None:
+            compression = os.getenv("GAMALIEL_TEXT_COMPRESSION", "none")
+        if compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression: {compression}. "
+                f"Use one of: {', '.join(COMPRESSIONS)}"
+            )
+        self.compression = compression
+        self.corpus: Optional[Corpus] = None
+        self.verses = {}
+        self.chapters = {}
+        self.semantic_index: Optional[TfidfIndex] = None
+        self.keyword_index: Optional[PositionalIndex] = None
+        self.lsa_index: Optional[LsaIndex] = None
+        self.passage_index: Optional[TfidfIndex] = None
+        self.fuzzy_vocabulary: Optional[FuzzyVocabulary] = None
+        self.regex_index: Optional[TrigramIndex] = None
+        self.chapter_graph: Optional[RelatedChapters] = None
+        self.snippets: Optional[SnippetStore] = None
+        self._scanner: Optional[CorpusScanner] = None
+        self._sqlite_backend: Optional[SqliteBackend] = None
         self._loaded = False
-        self._semantic_index_built = False
+        self._section_files: List[SectionFile] = []
 
         # Set up cache directory
         if cache_dir is None:
-            # Use .cli-cache in the project root
-            cache_dir = Path(__file__).parent.parent / ".cli-cache"
+            cache_dir = DEFAULT_CACHE_DIR
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
         # Cache file paths
-        self.verses_cache = self.cache_dir / "bsb_verses.pkl"
-        self.chapters_cache = self.cache_dir / "bsb_chapters.pkl"
-        self.embeddings_cache = self.cache_dir / "bsb_embeddings.pkl"
-        self.vocabulary_cache = self.cache_dir / "bsb_vocabulary.pkl"
-        self.metadata_cache = self.cache_dir / "bsb_metadata.pkl"
-
-    def _load_from_cache(self) -> bool:
-        """Load parsed BSB data from disk cache if available."""
+        self.corpus_cache = self.cache_dir / "bsb_text.bin"
+        self.manifest = CacheManifest(self.cache_dir / "bsb_manifest.json")
+
+    def _set_corpus(self, corpus: Corpus):
+        """Install a corpus and the dict-like views over it."""
+        self.corpus = corpus
+        self.verses = CorpusVerses(corpus)
+        self.chapters = CorpusChapters(corpus)
+
+    def _open_section_file(self, path: Path) -> SectionFile:
+        section_file = SectionFile(path)
+        self._section_files.append(section_file)
+        return section_file
+
+    def _load_from_cache(self, checksum: bool = False) -> bool:
+        """Memory-map the parsed BSB text from the disk cache if available.
+
+        The cache must come from ``url`` when the source was given
+        explicitly.  With ``checksum`` the whole file is hashed first (see
+        ``CacheManifest.verify``).
+        """
         try:
-            if (
-                self.verses_cache.exists()
-                and self.chapters_cache.exists()
-                and self.embeddings_cache.exists()
-                and self.vocabulary_cache.exists()
-                and self.metadata_cache.exists()
+            source_url = (
+                self.url if self.source_pinned else self.manifest.data.get("source_url")
+            )
+            if self.manifest.matches_source(source_url) and self.manifest.verify(
+                "text", self.corpus_cache, Corpus.FORMAT_VERSION, checksum=checksum
             ):
-
-                # Load cached data
-                with open(self.verses_cache, "rb") as f:
-                    self.verses = pickle.load(f)
-                with open(self.chapters_cache, "rb") as f:
-                    self.chapters = pickle.load(f)
-                with open(self.embeddings_cache, "rb") as f:
-                    self.chapter_embeddings = pickle.load(f)
-                with open(self.vocabulary_cache, "rb") as f:
-                    self.vocabulary = pickle.load(f)
-                with open(self.metadata_cache, "rb") as f:
-                    metadata = pickle.load(f)
-
+                corpus_file = self._open_section_file(self.corpus_cache)
+                self._set_corpus(Corpus.from_sections(corpus_file))
                 self._loaded = True
-                self._semantic_index_built = metadata.get("semantic_index_built", False)
                 print(f"Loaded BSB data from cache ({len(self.verses)} books)")
+                if self.corpus.compression != self.compression:
+                    # Re-encode the cached text; the mapped file stays valid
+                    # until it is closed, as the cache is replaced atomically
+                    try:
+                        self._write_text_cache()
+                    except Exception as e:
+                        print(f"Cache saving failed: {e}")
                 return True
 
         except Exception as e:
@@ -74,307 +220,573 @@ class BSBParser:
 
         return False
 
-    def _save_to_cache(self):
-        """Save parsed BSB data to disk cache."""
+    def _save_to_cache(self, source_hash: str, **validators):
+        """Save the parsed BSB text to the binary disk cache."""
         try:
-            # Save all data structures
-            with open(self.verses_cache, "wb") as f:
-                pickle.dump(self.verses, f)
-            with open(self.chapters_cache, "wb") as f:
-                pickle.dump(self.chapters, f)
-            with open(self.embeddings_cache, "wb") as f:
-                pickle.dump(self.chapter_embeddings, f)
-            with open(self.vocabulary_cache, "wb") as f:
-                pickle.dump(self.vocabulary, f)
-
-            # Save metadata
-            metadata = {
-                "semantic_index_built": self._semantic_index_built,
-                "url": self.url,
-            }
-            with open(self.metadata_cache, "wb") as f:
-                pickle.dump(metadata, f)
+            # Indexes stay valid when the re-ingested source is unchanged
+            self.manifest.set_source(self.url, source_hash, **validators)
+            self._write_text_cache()
+
+            # Drop pickle caches left behind by older versions
+            for name in LEGACY_CACHE_FILES:
+                (self.cache_dir / name).unlink(missing_ok=True)
 
             print(f"Saved BSB data to cache ({len(self.verses)} books)")
 
         except Exception as e:
             print(f"Cache saving failed: {e}")
 
-    def download_and_parse(self) -> bool:
-        """Download BSB text and parse into structured format."""
+    def _write_text_cache(self):
+        """Write the text cache in the configured compression and record it."""
+        meta, sections = self.corpus.compressed(self.compression).to_sections()
+        meta["url"] = self.manifest.data.get("source_url", self.url)
+        write_sections(self.corpus_cache, meta, sections)
+        self.manifest.record("text", self.corpus_cache, Corpus.FORMAT_VERSION)
+        self.manifest.save()
+
+    def _component(self, name: str, checksum: bool = False):
+        """Return a component, mapping it from cache or building it on first use.
+
+        With ``checksum`` a cached file is hashed before it is used.
+        """
+        component = getattr(self, name)
+        if component is not None:
+            return component
+        if not self._loaded and not self.download_and_parse(checksum):
+            return None
+        if self.corpus is None:
+            return None
+
+        cache_name, component_class, tokenizer_hash = self.COMPONENTS[name]
+        cache_path = self.cache_dir / cache_name
+        if self.manifest.verify(
+            name, cache_path, component_class.FORMAT_VERSION, tokenizer_hash, checksum
+        ):
+            try:
+                component = component_class.from_sections(
+                    self._open_section_file(cache_path)
+                )
+            except Exception as e:
+                print(f"Cache loading failed for {cache_name}: {e}, rebuilding")
+
+        if component is None:
+            component = getattr(self, f"_build_{name}")()
+            try:
+                meta, sections = component.to_sections()
+                write_sections(cache_path, meta, sections)
+                self.manifest.record(
+                    name, cache_path, component_class.FORMAT_VERSION, tokenizer_hash
+                )
+                self.manifest.save()
+            except Exception as e:
+                print(f"Cache saving failed for {cache_name}: {e}")
+
+        setattr(self, name, component)
+        return component
+
+    def build_indexes(self) -> bool:
+        """Load or build every search index (used by ``scripture index``).
+
+        Cached files are checked against their checksums, so corrupt ones
+        are rebuilt.
+        """
+        if not self._loaded and not self.download_and_parse(checksum=True):
+            return False
+        for name in self.COMPONENTS:
+            self._component(name, checksum=True)
+        return True
+
+    def close(self):
+        """Release memory-mapped cache files and the SQLite backend."""
+        for section_file in self._section_files:
+            section_file.close()
+        self._section_files = []
+        if self._sqlite_backend is not None:
+            self._sqlite_backend.close()
+            self._sqlite_backend = None
+
+    def sqlite_backend(self) -> SqliteBackend:
+        """Return the SQLite backend over this text, building its database if needed.
+
+        The backend is closed with the parser, so translations evicted from
+        the registry release their database too.  Raises ``ValueError`` when
+        the text cannot be loaded.
+        """
+        if self._sqlite_backend is None:
+            backend = SqliteBackend.open_or_build(
+                self.cache_dir / SQLITE_DATABASE, self
+            )
+            if backend is None:
+                raise ValueError("Scripture text could not be loaded")
+            self._sqlite_backend = backend
+        return self._sqlite_backend
+
+    def download_and_parse(self, checksum: bool = False) -> bool:
+        """Load the BSB text, downloading and parsing it if it is not cached.
+
+        With ``checksum`` the cached text is hashed before it is used.
+        """
+        if self._loaded:
+            return True
+
         # Try to load from cache first
-        if self._load_from_cache():
+        if self._load_from_cache(checksum):
             return True
 
         try:
-            print("Downloading BSB text...")
-            response = requests.get(self.url, timeout=30)
-            response.raise_for_status()
-
-            # Force UTF-8 encoding to handle the BOM and proper character decoding
-            response.encoding = "utf-8"
-
-            lines = response.text.split("\n")
-
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-
-                # Skip header lines
-                if (
-                    line.startswith("The Holy Bible")
-                    or line.startswith("This text")
-                    or line.startswith("Verse")
-                ):
-                    continue
-
-                # Parse verse lines with format: "Book Chapter:Verse Text"
-                verse_match = re.match(r"^([A-Za-z0-9\s]+)\s+(\d+):(\d+)\s+(.+)$", line)
-                if verse_match:
-                    book_name = verse_match.group(1).strip()
-                    chapter_num = int(verse_match.group(2))
-                    verse_num = int(verse_match.group(3))
-                    verse_text = verse_match.group(4)
-
-                    # Initialize book and chapter if needed
-                    if book_name not in self.verses:
-                        self.verses[book_name] = {}
-                        self.chapters[book_name] = {}
-
-                    if chapter_num not in self.verses[book_name]:
-                        self.verses[book_name][chapter_num] = {}
-                        self.chapters[book_name][chapter_num] = ""
-
-                    # Store verse
-                    self.verses[book_name][chapter_num][verse_num] = verse_text
-                    self.chapters[book_name][chapter_num] += verse_text + " "
-
-            print("Building semantic search index...")
-            # Build semantic search index after parsing
-            self._build_semantic_index()
-            self._loaded = True
-
-            # Save to cache for future use
-            self._save_to_cache()
-
+            print(f"Downloading BSB text from {self.url}...")
+            stream = SourceStream(self.url)
+            self._install_source(ingest(stream), stream)
             return True
 
         except Exception as e:
             print(f"Error downloading/parsing BSB: {e}")
             return False
 
-    def _build_semantic_index(self):
-        """Build TF-IDF based semantic search index for chapters."""
-        if self._semantic_index_built:
-            return  # Skip if already built
-
-        # Collect all words across all chapters
-        all_words = Counter()
-        chapter_word_counts = {}
-
-        for book in self.chapters:
-            for chapter in self.chapters[book]:
-                chapter_text = self.chapters[book][chapter]
-                words = self._tokenize_text(chapter_text)
-                chapter_word_counts[(book, chapter)] = Counter(words)
-                all_words.update(words)
-
-        # Calculate IDF for each word
-        total_chapters = len(chapter_word_counts)
-        for word in all_words:
-            chapters_with_word = sum(
-                1 for counts in chapter_word_counts.values() if word in counts
-            )
-            self.vocabulary[word] = (
-                math.log(total_chapters / chapters_with_word)
-                if chapters_with_word > 0
-                else 0
-            )
-
-        # Calculate TF-IDF vectors for each chapter
-        for (book, chapter), word_counts in chapter_word_counts.items():
-            if book not in self.chapter_embeddings:
-                self.chapter_embeddings[book] = {}
-
-            # Create TF-IDF vector
-            vector = []
-            total_words = sum(word_counts.values())
-
-            for word in sorted(self.vocabulary.keys()):
-                tf = word_counts.get(word, 0) / total_words if total_words > 0 else 0
-                tfidf = tf * self.vocabulary[word]
-                vector.append(tfidf)
-
-            self.chapter_embeddings[book][chapter] = vector
+    def refresh(self) -> bool:
+        """Re-ingest the source if it changed since it was cached.
+
+        The configured source is checked even when the cached text was
+        ingested from another one.  HTTP sources are re-requested
+        conditionally with the cached ETag and Last-Modified values.  Returns
+        True when new text was ingested.
+        """
+        if not self._loaded and not self._load_from_cache(checksum=True):
+            return self.download_and_parse(checksum=True)
+
+        validators = {}
+        if self.manifest.data.get("source_url") == self.url:
+            validators = {
+                "etag": self.manifest.data.get("etag"),
+                "last_modified": self.manifest.data.get("last_modified"),
+            }
+        stream = SourceStream(self.url, **validators)
+        builder = ingest(stream)
+        if builder is None or stream.source_hash == self.manifest.source_hash:
+            print("BSB text is up to date")
+            return False
 
-        self._semantic_index_built = True
+        self.close()
+        for name in self.COMPONENTS:
+            setattr(self, name, None)
+        self._scanner = None
+        self._install_source(builder, stream)
+        return True
+
+    def _install_source(self, builder: CorpusBuilder, stream: SourceStream):
+        """Use freshly ingested text and save it to the cache."""
+        self._set_corpus(builder.build())
+        self._loaded = True
+
+        # Save to cache for future use
+        self._save_to_cache(
+            stream.source_hash, etag=stream.etag, last_modified=stream.last_modified
+        )
+
+    def _build_semantic_index(self) -> TfidfIndex:
+        """Build the sparse TF-IDF semantic search index for chapters."""
+        print("Building semantic search index...")
+        return TfidfIndex.build(
+            (chapter_id, self._tokenize_text(self.corpus.chapter_text(chapter_id)))
+            for chapter_id in range(self.corpus.num_chapters)
+        )
+
+    def _build_keyword_index(self) -> PositionalIndex:
+        """Build the positional inverted index over every verse."""
+        print("Building keyword search index...")
+        return PositionalIndex.build(
+            tokenize_words(self.corpus.verse_text(verse_id))
+            for verse_id in range(self.corpus.num_verses)
+        )
+
+    def _build_fuzzy_vocabulary(self) -> FuzzyVocabulary:
+        """Build the bigram index over the keyword search vocabulary."""
+        print("Building spelling correction index...")
+        # Corrections must be terms with keyword postings, so the vocabulary
+        # comes from the keyword tokenizer: the semantic one drops stop words,
+        # words under MIN_TERM_LENGTH letters and any non-ASCII-letter word
+        return FuzzyVocabulary.build(
+            word
+            for verse_id in range(self.corpus.num_verses)
+            for word in tokenize_words(self.corpus.verse_text(verse_id))
+        )
+
+    def _build_regex_index(self) -> TrigramIndex:
+        """Build the trigram index over the case-folded verse text."""
+        print("Building regex search index...")
+        return TrigramIndex.build(
+            self.corpus.verse_text(verse_id)
+            for verse_id in range(self.corpus.num_verses)
+        )
+
+    def _build_passage_index(self) -> TfidfIndex:
+        """Build the TF-IDF index over single verses and verse windows."""
+        print("Building passage search index...")
+        verse_tokens = [
+            self._tokenize_text(self.corpus.verse_text(verse_id))
+            for verse_id in range(self.corpus.num_verses)
+        ]
+        return TfidfIndex.build(
+            (
+                pack_span(first, last),
+                [
+                    token
+                    for tokens in verse_tokens[first : last + 1]
+                    for token in tokens
+                ],
+            )
+            for first, last in passage_spans(self.corpus)
+        )
+
+    def _build_chapter_graph(self) -> RelatedChapters:
+        """Precompute the most similar chapters of every chapter."""
+        semantic_index = self._component("semantic_index")
+        print("Building related chapters graph...")
+        return RelatedChapters.build(semantic_index)
+
+    def _build_snippets(self) -> SnippetStore:
+        """Precompute the lead snippet of every chapter."""
+        print("Building result snippets...")
+        return SnippetStore.build(
+            self.corpus.chapter_text(chapter_id)
+            for chapter_id in range(self.corpus.num_chapters)
+        )
+
+    def _build_lsa_index(self) -> LsaIndex:
+        """Factorize the chapter TF-IDF matrix into dense chapter/verse vectors."""
+        semantic_index = self._component("semantic_index")
+        print("Building latent semantic index...")
+        return LsaIndex.build(
+            semantic_index,
+            (
+                self._tokenize_text(self.corpus.verse_text(verse_id))
+                for verse_id in range(self.corpus.num_verses)
+            ),
+        )
 
     def _tokenize_text(self, text: str) -> List[str]:
         """Tokenize text into words, removing common stop words."""
-        # Simple tokenization - split on whitespace and remove punctuation
-        words = re.findall(r"\b[a-zA-Z]+\b", text.lower())
-
-        # Remove common stop words
-        stop_words = {
-            "the",
-            "and",
-            "of",
-            "to",
-            "in",
-            "a",
-            "is",
-            "that",
-            "it",
-            "with",
-            "as",
-            "for",
-            "was",
-            "on",
-            "be",
-            "at",
-            "this",
-            "by",
-            "i",
-            "have",
-            "or",
-            "an",
-            "he",
-            "from",
-            "they",
-            "we",
-            "say",
-            "her",
-            "she",
-            "or",
-            "an",
-            "will",
-            "my",
-            "one",
-            "all",
-            "would",
-            "there",
-            "their",
-            "what",
-            "so",
-            "up",
-            "out",
-            "if",
-            "about",
-            "who",
-            "get",
-            "which",
-            "go",
-            "me",
-            "when",
-            "make",
-            "can",
-            "like",
-            "time",
-            "no",
-            "just",
-            "him",
-            "know",
-            "take",
-            "people",
-            "into",
-            "year",
-            "your",
-            "good",
-            "some",
-            "could",
-            "them",
-            "see",
-            "other",
-            "than",
-            "then",
-            "now",
-            "look",
-            "only",
-            "come",
-            "its",
-            "over",
-            "think",
-            "also",
-            "back",
-            "after",
-            "use",
-            "two",
-            "how",
-            "our",
-            "work",
-            "first",
-            "well",
-            "way",
-            "even",
-            "new",
-            "want",
-            "because",
-            "any",
-            "these",
-            "give",
-            "day",
-            "most",
-            "us",
-        }
-
-        return [word for word in words if word not in stop_words and len(word) > 2]
-
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors."""
-        if len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        magnitude1 = math.sqrt(sum(a * a for a in vec1))
-        magnitude2 = math.sqrt(sum(a * a for a in vec2))
-
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0.0
-
-        return dot_product / (magnitude1 * magnitude2)
+        return tokenize_semantic(text)
 
     def search_semantic(
-        self, query: str, max_results: int = 5
+        self,
+        query: str,
+        max_results: int = 5,
+        scorer: str = "tfidf",
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        scope: Optional[SearchScope] = None,
     ) -> List[Tuple[str, int, float, str]]:
-        """Semantic search using TF-IDF and cosine similarity."""
+        """Semantic search using TF-IDF cosine similarity, BM25 or LSA.
+
+        ``scope`` restricts the search to books, a testament or a range;
+        only the matching chapters are scored.
+        """
+        index_name = "lsa_index" if scorer == "lsa" else "semantic_index"
+        if index_name not in self.COMPONENTS:
+            raise ValueError(f"Unknown scorer: {scorer}")
+        index = self._component(index_name)
+        if index is None:
+            return []
+
+        doc_ranges = self._chapter_doc_ranges(index.doc_keys, scope)
+        tokens = self._tokenize_text(query)
+        if scorer == "lsa":
+            hits = index.search(tokens, max_results, doc_ranges=doc_ranges)
+        else:
+            hits = index.search(
+                tokens, max_results, scorer=scorer, k1=k1, b=b, doc_ranges=doc_ranges
+            )
+        return self._chapter_hits(index.doc_keys, hits)
+
+    def search_semantic_many(
+        self,
+        queries: List[str],
+        max_results: int = 5,
+        scorer: str = "tfidf",
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        scope: Optional[SearchScope] = None,
+    ) -> List[List[Tuple[str, int, float, str]]]:
+        """Run ``search_semantic`` for many queries in one batch.
+
+        Scoring uses sparse matrix products when the optional NumPy/SciPy
+        extra is installed; results are the same as one call per query.
+        """
+        if scorer == "lsa":
+            # Already one matrix-vector product per query
+            return [
+                self.search_semantic(query, max_results, scorer, scope=scope)
+                for query in queries
+            ]
+
+        semantic_index = self._component("semantic_index")
+        if semantic_index is None:
+            return [[] for _ in queries]
+
+        batch_hits = semantic_index.search_many(
+            [self._tokenize_text(query) for query in queries],
+            max_results,
+            scorer=scorer,
+            k1=k1,
+            b=b,
+            doc_ranges=self._chapter_doc_ranges(semantic_index.doc_keys, scope),
+        )
+        return [
+            self._chapter_hits(semantic_index.doc_keys, hits) for hits in batch_hits
+        ]
+
+    def related_chapters(
+        self, book: str, chapter: int, max_results: int = 5
+    ) -> List[Tuple[str, int, float, str]]:
+        """Return the chapters most similar to a chapter, best first.
+
+        Results are ``(book, chapter, similarity, text)`` tuples read from
+        the precomputed similarity graph (TF-IDF cosine similarity).
+        """
         if not self._loaded:
             self.download_and_parse()
+        chapter_id = self._find_chapter(book, chapter)
+        if chapter_id is None:
+            return []
+        graph = self._component("chapter_graph")
+        if graph is None:
+            return []
+
+        results = []
+        for related_id, similarity in graph.related(chapter_id, max_results):
+            related_book, related_chapter = self.corpus.chapter_ref(related_id)
+            results.append(
+                (
+                    related_book,
+                    related_chapter,
+                    similarity,
+                    self.corpus.chapter_text(related_id),
+                )
+            )
+        return results
 
-        # Tokenize and vectorize the query
-        query_words = self._tokenize_text(query)
-        query_vector = []
-
-        for word in sorted(self.vocabulary.keys()):
-            tf = query_words.count(word) / len(query_words) if query_words else 0
-            tfidf = tf * self.vocabulary.get(word, 0)
-            query_vector.append(tfidf)
-
-        # Calculate similarity with all chapters
-        similarities = []
-        for book in self.chapter_embeddings:
-            for chapter in self.chapter_embeddings[book]:
-                chapter_vector = self.chapter_embeddings[book][chapter]
-                similarity = self._cosine_similarity(query_vector, chapter_vector)
-                if similarity > 0.01:  # Only include relevant results
-                    similarities.append(
-                        (book, chapter, similarity, self.chapters[book][chapter])
+    def snippet(
+        self,
+        query: str,
+        book: str,
+        chapter: int,
+        max_verses: int = SNIPPET_VERSES,
+        fuzzy: bool = False,
+    ) -> Optional[str]:
+        """Return a preview of a chapter for a search result.
+
+        Up to ``max_verses`` verses matching the query's words (those with
+        the most matched words, in verse order) are shown as ``"verse:
+        text"`` with the matches highlighted; the query is read as a keyword
+        query (see ``search_keyword``) without its stop words.  Chapters
+        without matching words get their precomputed lead snippet.  Returns
+        None for unknown chapters.
+        """
+        if not self._loaded:
+            self.download_and_parse()
+        chapter_id = self._find_chapter(book, chapter)
+        if chapter_id is None:
+            return None
+        try:
+            keyword_query = self._parse_keyword_query(query, fuzzy)[0]
+        except ValueError:
+            keyword_query = None
+        return self._chapter_snippet(keyword_query, chapter_id, max_verses)
+
+    def _chapter_snippet(
+        self,
+        keyword_query: Optional[KeywordQuery],
+        chapter_id: int,
+        max_verses: int = SNIPPET_VERSES,
+    ) -> Optional[str]:
+        """Build the preview of a chapter from a parsed and corrected query."""
+        matches = {}
+        if keyword_query is not None:
+            matches = self._match_positions(keyword_query, chapter_id)
+        if not matches:
+            snippets = self._component("snippets")
+            return None if snippets is None else snippets.lead(chapter_id)
+
+        best = heapq.nsmallest(
+            max_verses, matches, key=lambda verse_id: -len(matches[verse_id])
+        )
+        return " ".join(
+            f"{self.corpus.verse_numbers[verse_id]}: "
+            f"{highlight(self.corpus.verse_text(verse_id), matches[verse_id])}"
+            for verse_id in sorted(best)
+        )
+
+    def _match_positions(
+        self, keyword_query: KeywordQuery, chapter_id: int
+    ) -> Dict[int, Set[int]]:
+        """Return ``{verse id: word positions}`` of a query's words in a chapter.
+
+        Stop words are left out.
+        """
+        keyword_query = keyword_query.without(STOP_WORDS)
+        index = self._component("keyword_index")
+        if index is None:
+            return {}
+
+        verses = self.corpus.verse_ids(chapter_id)
+        matches: Dict[int, Set[int]] = {}
+        for leaf in keyword_query.leaves(positive=True):
+            if isinstance(leaf, Prefix):
+                for term_id in index.prefix_terms(leaf.prefix):
+                    for posting in index.postings(index.terms[term_id], verses):
+                        matches.setdefault(index.post_verses[posting], set()).update(
+                            index.posting_positions(posting)
+                        )
+                continue
+            length = len(leaf.words)
+            for verse_id, starts in index.phrase_starts(
+                list(leaf.words), verses
+            ).items():
+                matches.setdefault(verse_id, set()).update(
+                    position
+                    for start in starts
+                    for position in range(start, start + length)
+                )
+        return matches
+
+    def search_semantic_verses(
+        self, query: str, max_results: int = 10, scope: Optional[SearchScope] = None
+    ) -> List[Tuple[str, int, int, float, str]]:
+        """Concept-level verse search over the LSA verse embeddings.
+
+        Returns ``(book, chapter, verse, similarity, text)`` tuples.  Requires
+        the optional NumPy/SciPy extra.
+        """
+        if "lsa_index" not in self.COMPONENTS:
+            raise ValueError("Verse-level semantic search requires NumPy and SciPy")
+        lsa_index = self._component("lsa_index")
+        if lsa_index is None:
+            return []
+
+        chapters = self._chapter_ranges(scope)
+        return [
+            self.corpus.verse_ref(verse_id)
+            + (similarity, self.corpus.verse_text(verse_id))
+            for verse_id, similarity in lsa_index.search(
+                self._tokenize_text(query),
+                max_results,
+                granularity="verse",
+                doc_ranges=(
+                    None if chapters is None else verse_ranges(self.corpus, chapters)
+                ),
+            )
+        ]
+
+    def search_passages(
+        self,
+        query: str,
+        max_results: int = 5,
+        scorer: str = "tfidf",
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        scope: Optional[SearchScope] = None,
+    ) -> List[Tuple[str, int, int, int, float, str]]:
+        """Semantic search returning tight verse ranges instead of chapters.
+
+        Results are ``(book, chapter, first verse, last verse, score, text)``
+        tuples that never overlap each other.  With ``scorer="lsa"`` the
+        passages are single verses from the LSA verse embeddings.
+        """
+        if scorer == "lsa":
+            return [
+                (book, chapter, verse, verse, similarity, text)
+                for book, chapter, verse, similarity, text in (
+                    self.search_semantic_verses(query, max_results, scope)
+                )
+            ]
+        passage_index = self._component("passage_index")
+        if passage_index is None or max_results <= 0:
+            return []
+
+        # Passage keys of a chapter all lie between the keys of its first
+        # verse and of the next chapter's first verse
+        doc_ranges = None
+        chapters = self._chapter_ranges(scope)
+        if chapters is not None:
+            doc_ranges = doc_id_ranges(
+                passage_index.doc_keys,
+                [
+                    range(
+                        pack_span(verses.start, verses.start),
+                        pack_span(verses.stop, verses.stop),
                     )
+                    for verses in verse_ranges(self.corpus, chapters)
+                ],
+            )
+
+        # Overlapping windows around the same match compete for the same
+        # slot, so widen the candidate list until enough distinct ones remain
+        tokens = self._tokenize_text(query)
+        limit = max_results * 4
+        while True:
+            hits = passage_index.search(
+                tokens, limit, scorer=scorer, k1=k1, b=b, doc_ranges=doc_ranges
+            )
+            spans = [unpack_span(passage_index.doc_keys[doc_id]) for doc_id, _ in hits]
+            picked = select_non_overlapping(spans, max_results)
+            if len(picked) == max_results or len(hits) < limit:
+                break
+            limit *= 4
 
-        # Sort by similarity and return top results
-        similarities.sort(key=lambda x: x[2], reverse=True)
-        return similarities[:max_results]
+        results = []
+        for i in picked:
+            first, last = spans[i]
+            book, chapter, first_verse = self.corpus.verse_ref(first)
+            results.append(
+                (
+                    book,
+                    chapter,
+                    first_verse,
+                    self.corpus.verse_numbers[last],
+                    hits[i][1],
+                    self.corpus.text_range(first, last),
+                )
+            )
+        return results
+
+    def _chapter_ranges(self, scope: Optional[SearchScope]) -> Optional[List[range]]:
+        """Resolve a search scope to chapter id ranges (None: whole corpus)."""
+        if not scope:
+            return None
+        return scope.chapter_ranges(self.corpus, self._normalize_book_name)
+
+    def _chapter_doc_ranges(
+        self, doc_keys: Sequence[int], scope: Optional[SearchScope]
+    ) -> Optional[List[range]]:
+        """Resolve a search scope to doc id ranges of a chapter-keyed index."""
+        chapters = self._chapter_ranges(scope)
+        if chapters is None:
+            return None
+        return doc_id_ranges(doc_keys, chapters)
+
+    def _chapter_hits(
+        self, doc_keys: Sequence[int], hits: List[Tuple[int, float]]
+    ) -> List[Tuple[str, int, float, str]]:
+        results = []
+        for doc_id, similarity in hits:
+            chapter_id = doc_keys[doc_id]
+            book, chapter = self.corpus.chapter_ref(chapter_id)
+            results.append(
+                (book, chapter, similarity, self.corpus.chapter_text(chapter_id))
+            )
+        return results
 
     def get_verse(self, book: str, chapter: int, verse: int) -> Optional[str]:
         """Get specific verse text."""
         if not self._loaded:
             self.download_and_parse()
 
-        book_key = self._normalize_book_name(book)
-        if book_key in self.verses:
-            if chapter in self.verses[book_key]:
-                if verse in self.verses[book_key][chapter]:
-                    return self.verses[book_key][chapter][verse]
+        chapter_id = self._find_chapter(book, chapter)
+        if chapter_id is not None:
+            verse_id = self.corpus.verse_id(chapter_id, verse)
+            if verse_id is not None:
+                return self.corpus.verse_text(verse_id)
         return None
 
     def get_chapter(self, book: str, chapter: int) -> Optional[str]:
@@ -382,133 +794,499 @@ class BSBParser:
         if not self._loaded:
             self.download_and_parse()
 
-        book_key = self._normalize_book_name(book)
-        if book_key in self.chapters:
-            if chapter in self.chapters[book_key]:
-                return self.chapters[book_key][chapter].strip()
+        chapter_id = self._find_chapter(book, chapter)
+        if chapter_id is not None:
+            return self.corpus.chapter_text(chapter_id)
         return None
 
+    def get_passage(
+        self,
+        book: str,
+        chapter: int,
+        begin_verse: Optional[int] = None,
+        end_chapter: Optional[int] = None,
+        end_verse: Optional[int] = None,
+        numbered: bool = False,
+    ) -> Optional[Tuple[str, int, int, int, int, str]]:
+        """Get a verse range, possibly spanning chapters, as one text slice.
+
+        Without ``begin_verse`` the passage starts at the beginning of
+        ``chapter``; without ``end_verse`` it runs to the end of
+        ``end_chapter``, or is the single ``begin_verse`` when no
+        ``end_chapter`` is given either (see ``parse_reference``).  An end
+        past the last verse of a chapter stops there.  With ``numbered`` the
+        verses are prefixed with their numbers (see ``numbered_text``).
+        Returns ``(book, first chapter, first verse, last chapter, last
+        verse, text)``, or None when the passage does not exist.
+        """
+        if not self._loaded:
+            self.download_and_parse()
+        if self.corpus is None:
+            return None
+
+        try:
+            first, last = PassageRef(
+                self._normalize_book_name(book),
+                chapter,
+                begin_verse,
+                end_chapter,
+                end_verse,
+            ).bounds()
+        except ValueError:
+            # Books outside the canon have no packed references
+            return None
+        verses = self.corpus.ref_span(first, last)
+        if not verses:
+            return None
+        first_ref = self.corpus.verse_ref(verses.start)
+        last_ref = self.corpus.verse_ref(verses.stop - 1)
+        if numbered:
+            text = numbered_text(
+                self.corpus.verse_ref(verse_id)[1:]
+                + (self.corpus.verse_text(verse_id),)
+                for verse_id in verses
+            )
+        else:
+            text = self.corpus.text_range(verses.start, verses.stop - 1)
+        return first_ref + last_ref[1:] + (text,)
+
+    def _find_chapter(self, book: str, chapter: int) -> Optional[int]:
+        """Resolve a book name and chapter number to a corpus chapter id."""
+        if self.corpus is None:
+            return None
+        book_id = self.corpus.book_id(self._normalize_book_name(book))
+        if book_id is None:
+            return None
+        return self.corpus.chapter_id(book_id, chapter)
+
     def _normalize_book_name(self, book: str) -> str:
         """Normalize book names for consistent lookup."""
-        # Handle common abbreviations
-        book_lower = book.strip().lower()
-
-        book_mapping = {
-            "gen": "Genesis",
-            "exo": "Exodus",
-            "lev": "Leviticus",
-            "num": "Numbers",
-            "deu": "Deuteronomy",
-            "jos": "Joshua",
-            "jud": "Judges",
-            "rut": "Ruth",
-            "1sa": "1 Samuel",
-            "2sa": "2 Samuel",
-            "1ki": "1 Kings",
-            "2ki": "2 Kings",
-            "1ch": "1 Chronicles",
-            "2ch": "2 Chronicles",
-            "ezr": "Ezra",
-            "neh": "Nehemiah",
-            "est": "Esther",
-            "job": "Job",
-            "psa": "Psalms",
-            "pro": "Proverbs",
-            "ecc": "Ecclesiastes",
-            "sng": "Song of Solomon",
-            "isa": "Isaiah",
-            "jer": "Jeremiah",
-            "lam": "Lamentations",
-            "ezk": "Ezekiel",
-            "dan": "Daniel",
-            "hos": "Hosea",
-            "jol": "Joel",
-            "amo": "Amos",
-            "oba": "Obadiah",
-            "jon": "Jonah",
-            "mic": "Micah",
-            "nah": "Nahum",
-            "hab": "Habakkuk",
-            "zep": "Zephaniah",
-            "hag": "Haggai",
-            "zec": "Zechariah",
-            "mal": "Malachi",
-            "mat": "Matthew",
-            "mrk": "Mark",
-            "luk": "Luke",
-            "jhn": "John",
-            "act": "Acts",
-            "rom": "Romans",
-            "1co": "1 Corinthians",
-            "2co": "2 Corinthians",
-            "gal": "Galatians",
-            "eph": "Ephesians",
-            "php": "Philippians",
-            "col": "Colossians",
-            "1th": "1 Thessalonians",
-            "2th": "2 Thessalonians",
-            "1ti": "1 Timothy",
-            "2ti": "2 Timothy",
-            "tit": "Titus",
-            "phm": "Philemon",
-            "heb": "Hebrews",
-            "jas": "James",
-            "1pe": "1 Peter",
-            "2pe": "2 Peter",
-            "1jn": "1 John",
-            "2jn": "2 John",
-            "3jn": "3 John",
-            "jde": "Jude",
-            "rev": "Revelation",
-        }
-
-        # If it's an abbreviation, return the full name
-        if book_lower in book_mapping:
-            return book_mapping[book_lower]
-
-        # If it's a full name, return it as-is (preserve case)
-        return book
+        return normalize_book(book.strip())
 
     def list_books(self) -> List[str]:
         """List available Bible books."""
         if not self._loaded:
             self.download_and_parse()
 
-        return list(self.verses.keys())
+        return list(self.corpus.books) if self.corpus else []
+
+    def complete(self, prefix: str, limit: int = 10) -> Dict[str, List[str]]:
+        """Complete a book name and a search word from their first letters.
+
+        Books match their full names or three-letter abbreviations; words
+        come from the sorted keyword index vocabulary, most widespread
+        first.  Returns ``{"books": [...], "words": [...]}``.
+        """
+        key = prefix.strip().lower()
+        if not key or (not self._loaded and not self.download_and_parse()):
+            return {"books": [], "words": []}
+
+        books = [book for book in self.corpus.books if book.lower().startswith(key)]
+        for abbreviation, book in BOOK_ABBREVIATIONS.items():
+            if abbreviation.startswith(key) and book not in books:
+                if self.corpus.book_id(book) is not None:
+                    books.append(book)
+
+        words = []
+        keyword_index = self._component("keyword_index")
+        if keyword_index is not None:
+            term_ids = heapq.nsmallest(
+                limit,
+                keyword_index.prefix_terms(key),
+                key=lambda term_id: -keyword_index.document_frequency(term_id),
+            )
+            words = [keyword_index.terms[term_id] for term_id in term_ids]
+        return {"books": books[:limit], "words": words}
+
+    def _scanner_component(self) -> Optional[CorpusScanner]:
+        """Return the case-folded corpus scanner, building it on first use."""
+        if self._scanner is None:
+            if not self._loaded and not self.download_and_parse():
+                return None
+            if self.corpus is None:
+                return None
+            self._scanner = CorpusScanner.build(self.corpus)
+        return self._scanner
+
+    def _keyword_postings(
+        self,
+        terms: List[Tuple[str, ...]],
+        verse_ranges: Optional[List[range]],
+        engine: str,
+    ) -> Optional[Postings]:
+        """Term postings over the scoped verses from the chosen keyword engine."""
+        if engine == "scan":
+            scanner = self._scanner_component()
+            if scanner is None:
+                return None
+            return ScanPostings(scanner, terms, verse_ranges)
+        if engine != "index":
+            raise ValueError(f"Unknown keyword engine: {engine}")
+
+        keyword_index = self._component("keyword_index")
+        if keyword_index is None:
+            return None
+        return IndexPostings(keyword_index, verse_ranges)
+
+    def keyword_corrections(self, query: str) -> Dict[str, List[str]]:
+        """Return ``{misspelled word: [correction, ...]}`` for a keyword query.
+
+        Words found in the corpus are not listed, nor are words without a
+        close enough spelling.  Raises ``ValueError`` for malformed queries.
+        """
+        return self._parse_keyword_query(query, fuzzy=True)[1]
+
+    def _parse_keyword_query(
+        self, query: str, fuzzy: bool
+    ) -> Tuple[KeywordQuery, Dict[str, List[str]]]:
+        """Parse a keyword query, resolving its misspelled words with ``fuzzy``.
+
+        Returns the query and the corrections applied to it.  Raises
+        ``ValueError`` for malformed queries.
+        """
+        keyword_query = KeywordQuery.parse(query)
+        if not fuzzy:
+            return keyword_query, {}
+        corrections = self._corrections(
+            [word for term in keyword_query.terms() for word in term]
+        )
+        return keyword_query.correct(corrections), corrections
+
+    def _corrections(self, words: Sequence[str]) -> Dict[str, List[str]]:
+        """Resolve the words missing from the vocabulary to close spellings."""
+        vocabulary = self._component("fuzzy_vocabulary")
+        if vocabulary is None:
+            return {}
+        corrections = {}
+        for word in dict.fromkeys(words):
+            if word not in vocabulary:
+                candidates = vocabulary.candidates(word)
+                if candidates:
+                    corrections[word] = candidates
+        return corrections
 
     def search_text(
-        self, query: str, max_results: int = 5
+        self,
+        query: str,
+        max_results: int = 5,
+        engine: str = "index",
+        fuzzy: bool = False,
     ) -> List[Tuple[str, int, int, str]]:
-        """Simple text search in scripture."""
-        if not self._loaded:
-            self.download_and_parse()
+        """Whole-word (or consecutive words) text search in scripture.
+
+        With ``fuzzy`` every misspelled word is replaced by its closest
+        spelling in the corpus before the postings are read.
+        """
+        words = tuple(tokenize_words(query))
+        if fuzzy:
+            corrections = self._corrections(words)
+            words = tuple(corrections.get(word, [word])[0] for word in words)
+        postings = self._keyword_postings([words], None, engine)
+        if postings is None:
+            return []
+
+        matches = postings.counts(words)
+        return [
+            self.corpus.verse_ref(verse_id) + (self.corpus.verse_text(verse_id),)
+            for verse_id in sorted(matches)[:max_results]
+        ]
+
+    def search_regex(
+        self,
+        pattern: str,
+        max_results: int = 20,
+        scope: Optional[SearchScope] = None,
+        ignore_case: bool = False,
+    ) -> List[Tuple[str, int, int, str]]:
+        """Verses matching a regular expression, in canonical order.
+
+        The literals every match must contain are looked up in the trigram
+        index, so the regex only runs on the few verses that contain them.
+        Matches never span verses.  Raises ``ValueError`` for invalid
+        patterns.
+        """
+        flags = re.IGNORECASE if ignore_case else 0
+        try:
+            compiled = re.compile(pattern, flags)
+            query = trigram_query(pattern, flags)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern: {e}") from e
+
+        regex_index = self._component("regex_index")
+        if regex_index is None:
+            return []
+        scoped = self._chapter_ranges(scope)
+        if scoped is not None:
+            scoped = verse_ranges(self.corpus, scoped)
 
         results = []
-        query_lower = query.lower()
-
-        for book in self.verses:
-            for chapter in self.verses[book]:
-                for verse in self.verses[book][chapter]:
-                    verse_text = self.verses[book][chapter][verse]
-                    if query_lower in verse_text.lower():
-                        results.append((book, chapter, verse, verse_text))
-                        if len(results) >= max_results:
-                            break
+        for verse_id in regex_index.candidates(query, scoped):
+            text = self.corpus.verse_text(verse_id)
+            if compiled.search(text):
+                results.append(self.corpus.verse_ref(verse_id) + (text,))
                 if len(results) >= max_results:
                     break
-            if len(results) >= max_results:
-                break
-
         return results
 
+    def search_keyword(
+        self,
+        query: str,
+        max_results: int = 10,
+        book: Optional[str] = None,
+        scope: Optional[SearchScope] = None,
+        engine: str = "index",
+        fuzzy: bool = False,
+    ) -> List[Tuple[str, int, int, List[Tuple[int, str]]]]:
+        """Keyword search ranked by occurrence count per chapter.
+
+        The query language (see ``cli.query``) supports AND/OR/NOT, quoted
+        phrases, ``prefix*`` wildcards, ``NEAR/n`` and ``book:``/``chapter:``
+        filters; plain words match any of them.  ``book`` (a shorthand for a
+        book scope), ``scope`` and the query filters limit the postings
+        walked to the matching verses.  ``engine="scan"`` answers from the
+        case-folded text in one pass instead of the positional index.  With
+        ``fuzzy``, misspelled words match their closest spellings (see
+        ``keyword_corrections``).  Returns ``(book, chapter, match count,
+        [(verse, text), ...])`` tuples, best first.  Raises ``ValueError``
+        for malformed queries.
+        """
+        return self._search_keyword(query, max_results, book, scope, engine, fuzzy)[0]
+
+    def search_keyword_previews(
+        self,
+        query: str,
+        max_results: int = 10,
+        book: Optional[str] = None,
+        scope: Optional[SearchScope] = None,
+        fuzzy: bool = False,
+        max_verses: int = SNIPPET_VERSES,
+    ) -> PreviewedSearch:
+        """``search_keyword`` with the preview of each result (see ``snippet``).
+
+        The query is parsed and its spelling corrected once, for the search
+        and all the previews.
+        """
+        results, chapter_ids, keyword_query, corrections = self._search_keyword(
+            query, max_results, book, scope, "index", fuzzy
+        )
+        previews = [
+            self._chapter_snippet(keyword_query, chapter_id, max_verses)
+            for chapter_id in chapter_ids
+        ]
+        return PreviewedSearch(results, previews, corrections)
+
+    def _search_keyword(
+        self,
+        query: str,
+        max_results: int,
+        book: Optional[str],
+        scope: Optional[SearchScope],
+        engine: str,
+        fuzzy: bool,
+    ) -> Tuple[List[Tuple], List[int], KeywordQuery, Dict[str, List[str]]]:
+        """Run ``search_keyword``; also returns the chapter ids of its results,
+        and the corrected query with its corrections."""
+        if engine not in KEYWORD_ENGINES:
+            raise ValueError(f"Unknown keyword engine: {engine}")
+        keyword_query, corrections = self._parse_keyword_query(query, fuzzy)
+        if not self._loaded and not self.download_and_parse():
+            return [], [], keyword_query, corrections
+
+        chapters = self._query_chapters(keyword_query, scope, SearchScope(book=book))
+        results = []
+        chapter_ids = []
+        for chapter_id, count, verse_ids in self._keyword_chapters(
+            keyword_query, chapters, engine
+        )[:max_results]:
+            book_name, chapter = self.corpus.chapter_ref(chapter_id)
+            verses = [
+                (self.corpus.verse_numbers[verse_id], self.corpus.verse_text(verse_id))
+                for verse_id in verse_ids
+            ]
+            results.append((book_name, chapter, count, verses))
+            chapter_ids.append(chapter_id)
+        return results, chapter_ids, keyword_query, corrections
+
+    def search_hybrid(
+        self,
+        query: str,
+        max_results: int = 5,
+        scorer: str = "tfidf",
+        scope: Optional[SearchScope] = None,
+        fuzzy: bool = False,
+        depth: int = HYBRID_DEPTH,
+    ) -> List[Tuple[str, int, float, Optional[int], Optional[int], str]]:
+        """Keyword and semantic chapter search fused into one ranking.
+
+        The query is parsed once as a keyword query (see ``search_keyword``);
+        its positive terms are also scored by the semantic ``scorer``.  The
+        top ``depth`` chapters of each ranking are combined with reciprocal
+        rank fusion, so chapters found by both come first.  Stop words are
+        left out of the keyword ranking when the query has other words.
+        Returns ``(book, chapter, fused score, keyword rank, semantic rank,
+        text)`` tuples, with 1-based ranks (None when a ranking missed the
+        chapter).  Raises ``ValueError`` for malformed queries.
+        """
+        return self._search_hybrid(query, max_results, scorer, scope, fuzzy, depth)[0]
+
+    def search_hybrid_previews(
+        self,
+        query: str,
+        max_results: int = 5,
+        scorer: str = "tfidf",
+        scope: Optional[SearchScope] = None,
+        fuzzy: bool = False,
+        max_verses: int = SNIPPET_VERSES,
+    ) -> PreviewedSearch:
+        """``search_hybrid`` with the preview of each result (see ``snippet``).
+
+        The query is parsed and its spelling corrected once, for the search
+        and all the previews.
+        """
+        results, chapter_ids, keyword_query, corrections = self._search_hybrid(
+            query, max_results, scorer, scope, fuzzy, HYBRID_DEPTH
+        )
+        previews = [
+            self._chapter_snippet(keyword_query, chapter_id, max_verses)
+            for chapter_id in chapter_ids
+        ]
+        return PreviewedSearch(results, previews, corrections)
+
+    def _search_hybrid(
+        self,
+        query: str,
+        max_results: int,
+        scorer: str,
+        scope: Optional[SearchScope],
+        fuzzy: bool,
+        depth: int,
+    ) -> Tuple[List[Tuple], List[int], KeywordQuery, Dict[str, List[str]]]:
+        """Run ``search_hybrid``; also returns the chapter ids of its results,
+        and the corrected query with its corrections."""
+        index_name = "lsa_index" if scorer == "lsa" else "semantic_index"
+        if index_name not in self.COMPONENTS:
+            raise ValueError(f"Unknown scorer: {scorer}")
+        keyword_query, corrections = self._parse_keyword_query(query, fuzzy)
+        if not self._loaded and not self.download_and_parse():
+            return [], [], keyword_query, corrections
+        chapters = self._query_chapters(keyword_query, scope)
+
+        keyword_ranking = [
+            chapter_id
+            for chapter_id, _, _ in self._keyword_chapters(
+                keyword_query.without(STOP_WORDS), chapters, "index"
+            )[:depth]
+        ]
+
+        semantic_ranking = []
+        index = self._component(index_name)
+        if index is not None:
+            doc_ranges = (
+                None if chapters is None else doc_id_ranges(index.doc_keys, chapters)
+            )
+            tokens = self._tokenize_text(
+                " ".join(
+                    word for term in keyword_query.terms(positive=True) for word in term
+                )
+            )
+            if scorer == "lsa":
+                hits = index.search(tokens, depth, doc_ranges=doc_ranges)
+            else:
+                hits = index.search(tokens, depth, scorer=scorer, doc_ranges=doc_ranges)
+            semantic_ranking = [index.doc_keys[doc_id] for doc_id, _ in hits]
+
+        fused = reciprocal_rank_fusion([keyword_ranking, semantic_ranking])[
+            :max_results
+        ]
+        results = []
+        for chapter_id, score, (keyword_rank, semantic_rank) in fused:
+            book, chapter = self.corpus.chapter_ref(chapter_id)
+            results.append(
+                (
+                    book,
+                    chapter,
+                    score,
+                    keyword_rank,
+                    semantic_rank,
+                    self.corpus.chapter_text(chapter_id),
+                )
+            )
+        return (
+            results,
+            [chapter_id for chapter_id, _, _ in fused],
+            keyword_query,
+            corrections,
+        )
+
+    def _query_chapters(
+        self, keyword_query: KeywordQuery, *scopes: Optional[SearchScope]
+    ) -> Optional[List[range]]:
+        """Intersect the chapter ranges of search scopes and query filters."""
+        chapters = None
+        for restriction in scopes + (keyword_query.scope,):
+            restricted = self._chapter_ranges(restriction)
+            if restricted is not None:
+                chapters = (
+                    restricted
+                    if chapters is None
+                    else intersect_ranges(chapters, restricted)
+                )
+        return chapters
+
+    def _keyword_chapters(
+        self,
+        keyword_query: KeywordQuery,
+        chapters: Optional[List[range]],
+        engine: str,
+    ) -> List[Tuple[int, int, List[int]]]:
+        """Rank chapters by query occurrences: ``(chapter id, count, verse ids)``."""
+        scoped = None if chapters is None else verse_ranges(self.corpus, chapters)
+        postings = self._keyword_postings(keyword_query.terms(), scoped, engine)
+        if postings is None:
+            return []
+        verse_counts = keyword_query.evaluate(postings)
+
+        # Aggregate by chapter; the stable sort keeps canonical order on ties
+        chapter_matches: Dict[int, List] = {}
+        for verse_id in sorted(verse_counts):
+            match = chapter_matches.setdefault(
+                self.corpus.verse_chapter(verse_id), [0, []]
+            )
+            match[0] += verse_counts[verse_id]
+            match[1].append(verse_id)
+        ranked = sorted(chapter_matches.items(), key=lambda item: -item[1][0])
+        return [
+            (chapter_id, count, verse_ids) for chapter_id, (count, verse_ids) in ranked
+        ]
+
+
+# Global registry of translations
+_translation_registry: Optional[TranslationRegistry] = None
+
+
+def get_translation_registry() -> TranslationRegistry:
+    """Get the global translation registry (configured from the environment)."""
+    global _translation_registry
+    if _translation_registry is None:
+        _translation_registry = TranslationRegistry.from_env(
+            lambda source, cache_dir: BSBParser(url=source, cache_dir=cache_dir),
+            DEFAULT_CACHE_DIR,
+        )
+    return _translation_registry
+
+
+def get_bsb_parser(bible_id: Optional[str] = None) -> BSBParser:
+    """Get the parser of a translation (the global BSB parser by default).
+
+    Raises ``ValueError`` for unknown translations.
+    """
+    return get_translation_registry().get(bible_id)
 
-# Global instance
-_bsb_parser = None
 
+def get_sqlite_backend(bible_id: Optional[str] = None) -> SqliteBackend:
+    """Get the SQLite backend of a translation, building its database if needed.
 
-def get_bsb_parser() -> BSBParser:
-    """Get the global BSB parser instance."""
-    global _bsb_parser
-    if _bsb_parser is None:
-        _bsb_parser = BSBParser()
-    return _bsb_parser
+    Raises ``ValueError`` for unknown translations or when the text cannot be
+    loaded.
+    """
+    return get_bsb_parser(bible_id).sqlite_backend()
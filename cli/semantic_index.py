@@ -0,0 +1,571 @@
+"""
+Sparse TF-IDF / BM25 index used for semantic scripture search.
+"""
+
+import heapq
+import math
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .binfile import SectionFile
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    # Optional "fast" extra; search_many falls back to per-query search
+    np = None
+    sparse = None
+
+SCORERS = ("tfidf", "bm25")
+
+# Okapi BM25 defaults
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_ARRAY_SECTIONS = (
+    "idf",
+    "bm25_idf",
+    "doc_keys",
+    "doc_indptr",
+    "doc_terms",
+    "doc_counts",
+    "doc_lengths",
+    "doc_norms",
+    "doc_length_ratios",
+    "term_indptr",
+    "term_docs",
+    "term_weights",
+    "term_counts",
+    "term_max_weights",
+    "term_max_counts",
+    "term_min_length_ratios",
+)
+
+# Queries scored per sparse matrix product in search_many
+_BATCH_SIZE = 256
+
+# (upper bound, first posting, end posting, posting -> score contribution)
+_QueryTerm = Tuple[float, int, int, Callable[[int], float]]
+
+
+class TfidfIndex:
+    """Sparse TF-IDF index over a collection of tokenized documents.
+
+    Terms are mapped to dense integer ids (sorted term order) and every
+    document is stored as CSR-style postings of ``(term id, count)``.  The
+    transposed, term-major postings carry the TF-IDF weight of each term
+    already divided by the document norm, so cosine scoring only has to
+    walk the postings of the query's terms.  Documents are identified by
+    integer keys (e.g. corpus chapter ids).
+
+    The same postings also carry raw term counts, and the BM25 document
+    statistics (IDF and document length relative to the average) are
+    precomputed.  Per-term upper bounds (largest weight, largest count and
+    shortest document) let top-k search skip documents that cannot make
+    the result list (MaxScore).
+    """
+
+    # Bump when the cached section layout changes
+    FORMAT_VERSION = 3
+
+    def __init__(
+        self,
+        terms: Sequence[str],
+        idf: Sequence[float],
+        bm25_idf: Sequence[float],
+        doc_keys: Sequence[int],
+        doc_indptr: Sequence[int],
+        doc_terms: Sequence[int],
+        doc_counts: Sequence[int],
+        doc_lengths: Sequence[int],
+        doc_norms: Sequence[float],
+        doc_length_ratios: Sequence[float],
+        term_indptr: Sequence[int],
+        term_docs: Sequence[int],
+        term_weights: Sequence[float],
+        term_counts: Sequence[int],
+        term_max_weights: Sequence[float],
+        term_max_counts: Sequence[int],
+        term_min_length_ratios: Sequence[float],
+    ):
+        self.terms = tuple(terms)
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(self.terms)}
+        self.idf = idf
+        self.bm25_idf = bm25_idf
+        self.doc_keys = doc_keys
+        self.doc_indptr = doc_indptr
+        self.doc_terms = doc_terms
+        self.doc_counts = doc_counts
+        self.doc_lengths = doc_lengths
+        self.doc_norms = doc_norms
+        self.doc_length_ratios = doc_length_ratios
+        self.term_indptr = term_indptr
+        self.term_docs = term_docs
+        self.term_weights = term_weights
+        self.term_counts = term_counts
+        self.term_max_weights = term_max_weights
+        self.term_max_counts = term_max_counts
+        self.term_min_length_ratios = term_min_length_ratios
+        # (scorer, k1, b) and the matching term x document weight matrix
+        self._weight_matrix_cache = None
+
+    def __len__(self) -> int:
+        return len(self.doc_keys)
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[int, List[str]]]) -> "TfidfIndex":
+        """Build the index from ``(key, tokens)`` pairs."""
+        doc_keys = array("I")
+        doc_word_counts = []
+        document_frequency = Counter()
+
+        for key, tokens in documents:
+            counts = Counter(tokens)
+            doc_keys.append(key)
+            doc_word_counts.append(counts)
+            document_frequency.update(counts.keys())
+
+        terms = sorted(document_frequency)
+        term_ids = {term: i for i, term in enumerate(terms)}
+        total_docs = len(doc_keys)
+        idf = array(
+            "d", (math.log(total_docs / document_frequency[term]) for term in terms)
+        )
+        bm25_idf = array(
+            "d",
+            (
+                math.log(
+                    1
+                    + (total_docs - document_frequency[term] + 0.5)
+                    / (document_frequency[term] + 0.5)
+                )
+                for term in terms
+            ),
+        )
+
+        # Term-major postings are filled in document order, so every posting
+        # list ends up sorted by document id.
+        term_indptr = array("I", [0])
+        for term in terms:
+            term_indptr.append(term_indptr[-1] + document_frequency[term])
+        nnz = term_indptr[-1]
+        cursor = list(term_indptr[:-1])
+        term_docs = array("I", bytes(4 * nnz))
+        term_weights = array("d", bytes(8 * nnz))
+        term_counts = array("I", bytes(4 * nnz))
+
+        doc_indptr = array("I", [0])
+        doc_terms = array("I")
+        doc_counts = array("I")
+        doc_lengths = array("I")
+        doc_norms = array("d")
+
+        for doc_id, counts in enumerate(doc_word_counts):
+            total_words = sum(counts.values())
+            ids = sorted(term_ids[word] for word in counts)
+            weights = [counts[terms[i]] / total_words * idf[i] for i in ids]
+            norm = math.sqrt(sum(w * w for w in weights))
+
+            doc_terms.extend(ids)
+            doc_counts.extend(counts[terms[i]] for i in ids)
+            doc_indptr.append(len(doc_terms))
+            doc_lengths.append(total_words)
+            doc_norms.append(norm)
+
+            for term_id, weight in zip(ids, weights):
+                position = cursor[term_id]
+                term_docs[position] = doc_id
+                term_weights[position] = weight / norm if norm else 0.0
+                term_counts[position] = counts[terms[term_id]]
+                cursor[term_id] = position + 1
+
+        average_length = sum(doc_lengths) / total_docs if total_docs else 0.0
+        doc_length_ratios = array(
+            "d",
+            (
+                length / average_length if average_length else 1.0
+                for length in doc_lengths
+            ),
+        )
+
+        term_max_weights = array("d")
+        term_max_counts = array("I")
+        term_min_length_ratios = array("d")
+        for term_id in range(len(terms)):
+            start, end = term_indptr[term_id], term_indptr[term_id + 1]
+            term_max_weights.append(max(term_weights[start:end]))
+            term_max_counts.append(max(term_counts[start:end]))
+            term_min_length_ratios.append(
+                min(doc_length_ratios[doc_id] for doc_id in term_docs[start:end])
+            )
+
+        return cls(
+            terms,
+            idf,
+            bm25_idf,
+            doc_keys,
+            doc_indptr,
+            doc_terms,
+            doc_counts,
+            doc_lengths,
+            doc_norms,
+            doc_length_ratios,
+            term_indptr,
+            term_docs,
+            term_weights,
+            term_counts,
+            term_max_weights,
+            term_max_counts,
+            term_min_length_ratios,
+        )
+
+    def to_sections(self) -> Tuple[Dict, Dict]:
+        """Return ``(meta, sections)`` for ``write_sections``."""
+        sections = {"terms": "\n".join(self.terms).encode("utf-8")}
+        for name in _ARRAY_SECTIONS:
+            sections[name] = getattr(self, name)
+        return {"num_docs": len(self), "num_terms": len(self.terms)}, sections
+
+    @classmethod
+    def from_sections(cls, section_file: SectionFile) -> "TfidfIndex":
+        """Create an index backed by the sections of a mapped file."""
+        terms = str(section_file["terms"], "utf-8")
+        return cls(
+            terms.split("\n") if terms else [],
+            *(section_file[name] for name in _ARRAY_SECTIONS),
+        )
+
+    def query_vector(self, tokens: List[str]) -> Dict[int, float]:
+        """Vectorize query tokens into a sparse ``{term id: weight}`` map."""
+        weights = {}
+        if not tokens:
+            return weights
+
+        for word, count in Counter(tokens).items():
+            term_id = self.term_ids.get(word)
+            if term_id is None:
+                continue
+            weight = count / len(tokens) * self.idf[term_id]
+            if weight:
+                weights[term_id] = weight
+        return weights
+
+    def search(
+        self,
+        tokens: List[str],
+        max_results: int = 5,
+        min_score: float = 0.01,
+        scorer: str = "tfidf",
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        doc_ranges: Optional[Sequence[range]] = None,
+    ) -> List[Tuple[int, float]]:
+        """Return ``(doc id, score)`` pairs for the best documents.
+
+        ``scorer`` is ``"tfidf"`` (cosine similarity) or ``"bm25"`` (Okapi
+        BM25 with parameters ``k1`` and ``b``).  ``doc_ranges`` (sorted,
+        disjoint ranges of doc ids) limits scoring to those documents.
+        """
+        if scorer == "tfidf":
+            query_terms = self._tfidf_terms(tokens)
+        elif scorer == "bm25":
+            query_terms = self._bm25_terms(tokens, k1, b)
+        else:
+            raise ValueError(f"Unknown scorer: {scorer}")
+        if max_results <= 0:
+            return []
+        return self._max_score(query_terms, max_results, min_score, doc_ranges)
+
+    def _tfidf_terms(self, tokens: List[str]) -> List[_QueryTerm]:
+        query = self.query_vector(tokens)
+        query_norm = math.sqrt(sum(w * w for w in query.values()))
+        if not query_norm:
+            return []
+
+        query_terms = []
+        for term_id, query_weight in query.items():
+            query_weight /= query_norm
+            query_terms.append(
+                (
+                    query_weight * self.term_max_weights[term_id],
+                    self.term_indptr[term_id],
+                    self.term_indptr[term_id + 1],
+                    lambda posting, w=query_weight: w * self.term_weights[posting],
+                )
+            )
+        return query_terms
+
+    def _bm25_terms(self, tokens: List[str], k1: float, b: float) -> List[_QueryTerm]:
+        ratios = self.doc_length_ratios
+        docs = self.term_docs
+        counts = self.term_counts
+
+        def contribution(posting: int, weight: float) -> float:
+            # Length normalization: k1 * (1 - b + b * |d| / avgdl)
+            count = counts[posting]
+            return weight * count / (count + k1 * (1 - b + b * ratios[docs[posting]]))
+
+        query_terms = []
+        for word, query_count in Counter(tokens).items():
+            term_id = self.term_ids.get(word)
+            if term_id is None:
+                continue
+            weight = query_count * self.bm25_idf[term_id] * (k1 + 1)
+            # The contribution grows with the count and shrinks with the
+            # document length, so the largest count in the shortest document
+            # bounds every posting of the term.
+            max_count = self.term_max_counts[term_id]
+            bound = (
+                weight
+                * max_count
+                / (max_count + k1 * (1 - b + b * self.term_min_length_ratios[term_id]))
+            )
+            query_terms.append(
+                (
+                    bound,
+                    self.term_indptr[term_id],
+                    self.term_indptr[term_id + 1],
+                    lambda posting, w=weight: contribution(posting, w),
+                )
+            )
+        return query_terms
+
+    def _max_score(
+        self,
+        query_terms: List[_QueryTerm],
+        max_results: int,
+        min_score: float,
+        doc_ranges: Optional[Sequence[range]] = None,
+    ) -> List[Tuple[int, float]]:
+        """Document-at-a-time top-k with MaxScore pruning.
+
+        Query terms are ordered by upper bound.  The longest prefix whose
+        summed bounds cannot reach the current k-th score is "non-essential":
+        only documents of the remaining terms are visited, and non-essential
+        postings are binary searched for them only while the document can
+        still make the list.  Ties are ranked by document id.  With
+        ``doc_ranges`` every posting list is first cut down to each range.
+        """
+        query_terms = sorted(query_terms, key=lambda term: term[0])
+        prefix_bounds = list(accumulate(term[0] for term in query_terms))
+        docs = self.term_docs
+        # Min-heap of (score, -doc id): the root is the worst result kept
+        heap: List[Tuple[float, int]] = []
+
+        def can_enter(bound: float) -> bool:
+            return bound > min_score and (
+                len(heap) < max_results or bound >= heap[0][0]
+            )
+
+        if doc_ranges is None:
+            slices = [[(term[1], term[2]) for term in query_terms]]
+        else:
+            slices = [
+                [
+                    (
+                        bisect_left(docs, r.start, term[1], term[2]),
+                        bisect_left(docs, r.stop, term[1], term[2]),
+                    )
+                    for term in query_terms
+                ]
+                for r in doc_ranges
+            ]
+
+        for bounds in slices:
+            cursors = [start for start, _ in bounds]
+            ends = [end for _, end in bounds]
+            first_essential = 0
+            while True:
+                while first_essential < len(query_terms) and not can_enter(
+                    prefix_bounds[first_essential]
+                ):
+                    first_essential += 1
+                essential = [
+                    i
+                    for i in range(first_essential, len(query_terms))
+                    if cursors[i] < ends[i]
+                ]
+                if not essential:
+                    break
+
+                doc_id = min(docs[cursors[i]] for i in essential)
+                score = 0.0
+                for i in essential:
+                    if docs[cursors[i]] == doc_id:
+                        score += query_terms[i][3](cursors[i])
+                        cursors[i] += 1
+
+                for i in range(first_essential - 1, -1, -1):
+                    if not can_enter(score + prefix_bounds[i]):
+                        break
+                    position = bisect_left(docs, doc_id, cursors[i], ends[i])
+                    cursors[i] = position
+                    if position < ends[i] and docs[position] == doc_id:
+                        score += query_terms[i][3](position)
+                        cursors[i] = position + 1
+                else:
+                    entry = (score, -doc_id)
+                    if score > min_score:
+                        if len(heap) < max_results:
+                            heapq.heappush(heap, entry)
+                        elif entry > heap[0]:
+                            heapq.heapreplace(heap, entry)
+
+        return [
+            (-neg_doc_id, score) for score, neg_doc_id in sorted(heap, reverse=True)
+        ]
+
+    def search_many(
+        self,
+        queries: List[List[str]],
+        max_results: int = 5,
+        min_score: float = 0.01,
+        scorer: str = "tfidf",
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        doc_ranges: Optional[Sequence[range]] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """Run ``search`` for a batch of tokenized queries.
+
+        With NumPy/SciPy installed, each batch of queries is scored by a
+        single sparse query x term by term x document product; otherwise
+        every query goes through ``search``.  Both paths return the same
+        top-k lists.
+        """
+        if scorer not in SCORERS:
+            raise ValueError(f"Unknown scorer: {scorer}")
+        if sparse is None or max_results <= 0:
+            return [
+                self.search(tokens, max_results, min_score, scorer, k1, b, doc_ranges)
+                for tokens in queries
+            ]
+
+        weights = self._weight_matrix(scorer, k1, b)
+        doc_ids = None
+        if doc_ranges is not None:
+            # Score only the scoped columns, then map back to doc ids
+            doc_ids = np.concatenate(
+                [np.arange(r.start, r.stop) for r in doc_ranges] + [np.zeros(0, int)]
+            )
+            weights = weights[:, doc_ids]
+        results = []
+        for start in range(0, len(queries), _BATCH_SIZE):
+            batch = self._query_matrix(queries[start : start + _BATCH_SIZE], scorer)
+            for scores in (batch @ weights).toarray():
+                hits = top_k_scores(scores, max_results, min_score)
+                if doc_ids is not None:
+                    hits = [(int(doc_ids[i]), score) for i, score in hits]
+                results.append(hits)
+        return results
+
+    def similar_documents(
+        self, max_results: int = 10, min_score: float = 0.01
+    ) -> List[List[Tuple[int, float]]]:
+        """Return the most similar other documents of every document.
+
+        Scores are TF-IDF cosine similarities, ties broken by doc id.  With
+        NumPy/SciPy installed, batches of documents are scored by sparse
+        document x term by term x document products; otherwise each
+        document's scores are accumulated over the postings of its terms.
+        """
+        if max_results <= 0:
+            return [[] for _ in range(len(self))]
+        if sparse is not None:
+            weights = self._weight_matrix("tfidf", BM25_K1, BM25_B)
+            documents = weights.T.tocsr()
+            results = []
+            for start in range(0, len(self), _BATCH_SIZE):
+                batch = documents[start : start + _BATCH_SIZE] @ weights
+                for doc_id, scores in enumerate(batch.toarray(), start):
+                    scores[doc_id] = 0.0
+                    results.append(top_k_scores(scores, max_results, min_score))
+            return results
+
+        indptr = self.term_indptr
+        term_docs = list(self.term_docs)
+        term_weights = list(self.term_weights)
+        doc_weights: List[List[Tuple[int, float]]] = [[] for _ in range(len(self))]
+        for term_id in range(len(self.terms)):
+            for posting in range(indptr[term_id], indptr[term_id + 1]):
+                doc_weights[term_docs[posting]].append((term_id, term_weights[posting]))
+
+        results = []
+        for doc_id, weights in enumerate(doc_weights):
+            scores = [0.0] * len(self)
+            for term_id, weight in weights:
+                start, end = indptr[term_id], indptr[term_id + 1]
+                for other, other_weight in zip(
+                    term_docs[start:end], term_weights[start:end]
+                ):
+                    scores[other] += weight * other_weight
+            scores[doc_id] = 0.0
+            hits = heapq.nsmallest(
+                max_results,
+                (
+                    (-score, other)
+                    for other, score in enumerate(scores)
+                    if score > min_score
+                ),
+            )
+            results.append([(other, -score) for score, other in hits])
+        return results
+
+    def _query_matrix(self, queries: List[List[str]], scorer: str):
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for tokens in queries:
+            if scorer == "tfidf":
+                query = self.query_vector(tokens)
+                query_norm = math.sqrt(sum(w * w for w in query.values()))
+                row = (
+                    {t: w / query_norm for t, w in query.items()} if query_norm else {}
+                )
+            else:
+                row = {}
+                for word, count in Counter(tokens).items():
+                    term_id = self.term_ids.get(word)
+                    if term_id is not None:
+                        row[term_id] = float(count)
+            indices.extend(row)
+            data.extend(row.values())
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (data, indices, indptr), shape=(len(queries), len(self.terms))
+        )
+
+    def _weight_matrix(self, scorer: str, k1: float, b: float):
+        key = (scorer,) if scorer == "tfidf" else (scorer, k1, b)
+        if self._weight_matrix_cache and self._weight_matrix_cache[0] == key:
+            return self._weight_matrix_cache[1]
+
+        # The term-major postings already are a CSR term x document matrix
+        indptr = np.asarray(self.term_indptr)
+        docs = np.asarray(self.term_docs)
+        if scorer == "tfidf":
+            data = np.asarray(self.term_weights)
+        else:
+            counts = np.asarray(self.term_counts, dtype=np.float64)
+            ratios = np.asarray(self.doc_length_ratios)[docs]
+            idf = np.repeat(np.asarray(self.bm25_idf), np.diff(indptr))
+            data = idf * (k1 + 1) * counts / (counts + k1 * (1 - b + b * ratios))
+        matrix = sparse.csr_matrix(
+            (data, docs, indptr), shape=(len(self.terms), len(self))
+        )
+        self._weight_matrix_cache = (key, matrix)
+        return matrix
+
+
+def top_k_scores(scores, max_results: int, min_score: float) -> List[Tuple[int, float]]:
+    """Best ``(doc id, score)`` pairs of a dense NumPy score row, ties by doc id."""
+    candidates = np.flatnonzero(scores > min_score)
+    if len(candidates) > max_results:
+        cut = len(candidates) - max_results
+        kth_score = np.partition(scores[candidates], cut)[cut]
+        candidates = candidates[scores[candidates] >= kth_score]
+    order = np.lexsort((candidates, -scores[candidates]))[:max_results]
+    return [(int(doc_id), float(scores[doc_id])) for doc_id in candidates[order]]
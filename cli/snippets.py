@@ -0,0 +1,130 @@
+"""
+Search result previews: precomputed chapter leads and highlighted verses.
+
+Every chapter's lead (its opening text, cut at a word boundary) is stored
+once at index time, so a result preview never decodes the whole chapter.
+When the query's words occur in a chapter, the matching verses are shown
+instead, with the matched words (located by their positional index
+postings) marked up and the verse trimmed around them.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .binfile import SectionFile
+from .text_analysis import fingerprint, word_spans
+
+# Longest lead snippet, in characters
+SNIPPET_LENGTH = 200
+
+# Words kept before the first and after the last highlighted word, and the
+# longest highlighted excerpt of a verse
+CONTEXT_WORDS = 6
+MAX_SNIPPET_WORDS = 30
+
+HIGHLIGHT = "**"
+ELLIPSIS = "..."
+
+# Stamps the cached leads with how they were cut
+SNIPPET_HASH = fingerprint(SNIPPET_LENGTH, ELLIPSIS)
+
+
+def truncate(text: str, length: int = SNIPPET_LENGTH) -> str:
+    """Cut ``text`` to at most ``length`` characters at a word boundary."""
+    if len(text) <= length:
+        return text
+    cut = text.rfind(" ", 0, length - len(ELLIPSIS) + 1)
+    if cut <= 0:
+        cut = length - len(ELLIPSIS)
+    return text[:cut].rstrip() + ELLIPSIS
+
+
+def highlight(
+    text: str,
+    positions: Iterable[int],
+    context: int = CONTEXT_WORDS,
+    max_words: int = MAX_SNIPPET_WORDS,
+) -> str:
+    """Mark the words at ``positions`` and trim ``text`` around them.
+
+    Positions are word offsets as in ``tokenize_words`` (and the positional
+    index).  Runs of consecutive marked words, such as a phrase, are marked
+    as one.  Text without marked words is truncated like a lead.
+    """
+    spans = word_spans(text)
+    marked = sorted({position for position in positions if position < len(spans)})
+    if not marked:
+        return truncate(text)
+
+    first = max(marked[0] - context, 0)
+    last = min(marked[-1] + context, len(spans) - 1, first + max_words - 1)
+    start = 0 if first == 0 else spans[first][0]
+    end = len(text) if last == len(spans) - 1 else spans[last][1]
+
+    parts = [ELLIPSIS] if first > 0 else []
+    cursor = start
+    runs = _runs(position for position in marked if position <= last)
+    for run_first, run_last in runs:
+        run_start, run_end = spans[run_first][0], spans[run_last][1]
+        parts += [text[cursor:run_start], HIGHLIGHT, text[run_start:run_end], HIGHLIGHT]
+        cursor = run_end
+    parts.append(text[cursor:end])
+    if end < len(text):
+        parts.append(ELLIPSIS)
+    return "".join(parts)
+
+
+def _runs(positions: Iterable[int]) -> List[Tuple[int, int]]:
+    runs: List[List[int]] = []
+    for position in positions:
+        if runs and runs[-1][1] + 1 == position:
+            runs[-1][1] = position
+        else:
+            runs.append([position, position])
+    return [(first, last) for first, last in runs]
+
+
+class SnippetStore:
+    """The lead snippet of every chapter, as one UTF-8 blob.
+
+    ``offsets`` maps a chapter id to its byte range of ``text``.
+    """
+
+    # Bump when the cached section layout changes
+    FORMAT_VERSION = 1
+
+    def __init__(self, text: bytes, offsets: Sequence[int]):
+        self.text = text
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @classmethod
+    def build(cls, chapters: Iterable[str]) -> "SnippetStore":
+        """Build the store from the text of every chapter, in chapter id order."""
+        text = bytearray()
+        offsets = array("I", [0])
+        for chapter_text in chapters:
+            text += truncate(chapter_text).encode("utf-8")
+            offsets.append(len(text))
+        return cls(bytes(text), offsets)
+
+    def to_sections(self) -> Tuple[Dict, Dict]:
+        """Return ``(meta, sections)`` for ``write_sections``."""
+        return {"num_chapters": len(self)}, {
+            "text": self.text,
+            "offsets": self.offsets,
+        }
+
+    @classmethod
+    def from_sections(cls, section_file: SectionFile) -> "SnippetStore":
+        """Create a store backed by the sections of a mapped file."""
+        return cls(section_file["text"], section_file["offsets"])
+
+    def lead(self, chapter_id: int) -> str:
+        """Return the opening snippet of a chapter."""
+        return str(
+            self.text[self.offsets[chapter_id] : self.offsets[chapter_id + 1]],
+            "utf-8",
+        )
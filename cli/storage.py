@@ -0,0 +1,659 @@
+"""
+Storage backends: the scripture operations the tools rely on, and a SQLite
+implementation of them.
+
+``BSBParser`` keeps its corpus and indexes in memory-mapped cache files and
+is the default backend.  ``SqliteBackend`` answers the same calls from one
+SQLite database with FTS5 full-text tables instead: many processes can share
+the file through the OS page cache, opening it costs nothing, and phrase,
+prefix, NEAR and boolean queries are evaluated by FTS5 itself.
+
+The keyword query language (see ``cli.query``) is compiled to FTS5 match
+expressions, and semantic search ranks chapters with the FTS5 BM25 function
+over Porter-stemmed words.  Ids are the corpus ids: books, chapters and
+verses keep their canonical order.
+"""
+
+import os
+import sqlite3
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Protocol, Tuple, Union
+
+from .corpus import VERSE_SEPARATOR, Corpus, numbered_text
+from .keyword_index import PositionalIndex
+from .query import And, IndexPostings, KeywordQuery, Near, Node, Not, Prefix, Term
+from .references import PassageRef, VerseRef, normalize_book
+from .scope import SearchScope, intersect_ranges
+from .semantic_index import BM25_B, BM25_K1
+from .snippets import highlight, truncate
+from .text_analysis import STOP_WORDS, tokenize_words, word_spans
+
+try:
+    _connection = sqlite3.connect(":memory:")
+    _connection.execute("CREATE VIRTUAL TABLE probe USING fts5(text)")
+    FTS5_AVAILABLE = True
+except sqlite3.OperationalError:
+    FTS5_AVAILABLE = False
+finally:
+    _connection.close()
+
+# Ranking functions accepted by SqliteBackend.search_semantic: FTS5 has only
+# its built-in BM25, with the default parameters of ``semantic_index``
+SQLITE_SCORERS = ("bm25",)
+
+# Bump when the database schema changes
+SQLITE_FORMAT_VERSION = 2
+
+# Markers around matched phrases in FTS5 highlight() output
+_MATCH_START, _MATCH_END = "\x01", "\x02"
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE books (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE chapters (
+    id INTEGER PRIMARY KEY,
+    book_id INTEGER NOT NULL,
+    number INTEGER NOT NULL
+);
+CREATE TABLE verses (
+    id INTEGER PRIMARY KEY,
+    chapter_id INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    ref INTEGER,
+    text TEXT NOT NULL
+);
+CREATE INDEX verses_by_chapter ON verses (chapter_id, number);
+CREATE INDEX verses_by_ref ON verses (ref);
+CREATE VIRTUAL TABLE verses_fts USING fts5(
+    text, content='verses', content_rowid='id', tokenize='unicode61'
+);
+CREATE VIRTUAL TABLE chapters_fts USING fts5(
+    text, content='', tokenize='porter unicode61'
+);
+"""
+
+
+class PreviewedSearch(NamedTuple):
+    """Search results with the preview of each result chapter.
+
+    ``previews`` follow the order of ``results`` (see ``snippet``);
+    ``corrections`` maps the misspelled words of the query to the spellings
+    searched instead.
+    """
+
+    results: List[Tuple]
+    previews: List[Optional[str]]
+    corrections: Dict[str, List[str]]
+
+
+class ScriptureBackend(Protocol):
+    """The scripture operations used by the tools (see ``cli.tools``).
+
+    Books are canonical names or abbreviations; search results and
+    snippets use the formats of ``BSBParser``, which implements this
+    protocol (and more: hybrid, regex, passage and related-chapter search).
+    """
+
+    def get_verse(self, book: str, chapter: int, verse: int) -> Optional[str]: ...
+
+    def get_chapter(self, book: str, chapter: int) -> Optional[str]: ...
+
+    def get_passage(
+        self,
+        book: str,
+        chapter: int,
+        begin_verse: Optional[int] = None,
+        end_chapter: Optional[int] = None,
+        end_verse: Optional[int] = None,
+        numbered: bool = False,
+    ) -> Optional[Tuple[str, int, int, int, int, str]]: ...
+
+    def list_books(self) -> List[str]: ...
+
+    def search_keyword(
+        self,
+        query: str,
+        max_results: int = 10,
+        book: Optional[str] = None,
+        scope: Optional[SearchScope] = None,
+        fuzzy: bool = False,
+    ) -> List[Tuple[str, int, int, List[Tuple[int, str]]]]: ...
+
+    def search_keyword_previews(
+        self,
+        query: str,
+        max_results: int = 10,
+        book: Optional[str] = None,
+        scope: Optional[SearchScope] = None,
+        fuzzy: bool = False,
+        max_verses: int = 3,
+    ) -> PreviewedSearch: ...
+
+    def search_semantic(
+        self,
+        query: str,
+        max_results: int = 5,
+        scorer: str = "tfidf",
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        scope: Optional[SearchScope] = None,
+    ) -> List[Tuple[str, int, float, str]]: ...
+
+    def snippet(
+        self,
+        query: str,
+        book: str,
+        chapter: int,
+        max_verses: int = 3,
+        fuzzy: bool = False,
+    ) -> Optional[str]: ...
+
+    def close(self): ...
+
+
+def to_fts5(node: Node) -> str:
+    """Compile a keyword query tree to an FTS5 match expression.
+
+    Raises ``ValueError`` when NOT has nothing to exclude from.
+    """
+    if isinstance(node, Term):
+        return _fts5_string(" ".join(node.words))
+    if isinstance(node, Prefix):
+        return f"{_fts5_string(node.prefix)} *"
+    if isinstance(node, Near):
+        return f"NEAR({to_fts5(node.left)} {to_fts5(node.right)}, {node.distance})"
+    if isinstance(node, Not):
+        raise ValueError("NOT needs a term to exclude from")
+
+    positive = [child for child in node.children if not isinstance(child, Not)]
+    negative = [child.child for child in node.children if isinstance(child, Not)]
+    if not positive:
+        raise ValueError("NOT needs a term to exclude from")
+    operator = " AND " if isinstance(node, And) else " OR "
+    expression = "(" + operator.join(to_fts5(child) for child in positive) + ")"
+    for child in negative:
+        expression = f"({expression} NOT {to_fts5(child)})"
+    return expression
+
+
+def _packed_ref(book: str, chapter: int, verse: int) -> Optional[VerseRef]:
+    """Pack a verse reference; None for books outside the canon."""
+    try:
+        return VerseRef.of(book, chapter, verse)
+    except ValueError:
+        return None
+
+
+def _fts5_string(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+class _Chapters:
+    """The book and chapter tables, with the lookups ``SearchScope`` needs."""
+
+    def __init__(self, books: List[str], chapters: List[Tuple[int, int]]):
+        self.books = books
+        self.chapter_numbers = [number for _, number in chapters]
+        self.book_chapter_indptr = [0] * (len(books) + 1)
+        for book_id, _ in chapters:
+            self.book_chapter_indptr[book_id + 1] += 1
+        for book_id in range(len(books)):
+            self.book_chapter_indptr[book_id + 1] += self.book_chapter_indptr[book_id]
+        self._book_ids = {name: i for i, name in enumerate(books)}
+        self._chapter_ids = {
+            chapter: chapter_id for chapter_id, chapter in enumerate(chapters)
+        }
+
+    @property
+    def num_chapters(self) -> int:
+        return len(self.chapter_numbers)
+
+    def book_id(self, book: str) -> Optional[int]:
+        return self._book_ids.get(book)
+
+    def chapter_ids(self, book_id: int) -> range:
+        return range(
+            self.book_chapter_indptr[book_id], self.book_chapter_indptr[book_id + 1]
+        )
+
+    def chapter_id(self, book_id: int, chapter: int) -> Optional[int]:
+        return self._chapter_ids.get((book_id, chapter))
+
+    def chapter_ref(self, chapter_id: int) -> Tuple[str, int]:
+        book_id = bisect_right(self.book_chapter_indptr, chapter_id) - 1
+        return self.books[book_id], self.chapter_numbers[chapter_id]
+
+
+class SqliteBackend:
+    """Scripture text and full-text search in one SQLite FTS5 database.
+
+    Build the database once with ``build`` (or ``open_or_build``); every
+    instance then opens it read-only.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._db = sqlite3.connect(
+            f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        if int(meta.get("format_version", 0)) != SQLITE_FORMAT_VERSION:
+            self._db.close()
+            raise ValueError(f"Unsupported database format: {self.path}")
+        self.source_hash = meta.get("source_hash")
+        self._chapters: Optional[_Chapters] = None
+
+    @classmethod
+    def build(
+        cls, path: Union[str, Path], corpus: Corpus, source_hash: str = ""
+    ) -> "SqliteBackend":
+        """Write a corpus to a new database at ``path`` and open it.
+
+        The database is written next to ``path`` and moved into place, so
+        processes reading an older one are not disturbed.
+        """
+        path = Path(path)
+        building = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        if building.exists():
+            building.unlink()
+        db = sqlite3.connect(building)
+        try:
+            db.executescript(_SCHEMA)
+            db.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [
+                    ("format_version", str(SQLITE_FORMAT_VERSION)),
+                    ("source_hash", source_hash),
+                ],
+            )
+            db.executemany("INSERT INTO books VALUES (?, ?)", enumerate(corpus.books))
+            db.executemany(
+                "INSERT INTO chapters VALUES (?, ?, ?)",
+                (
+                    (chapter_id, book_id, corpus.chapter_numbers[chapter_id])
+                    for book_id in range(len(corpus.books))
+                    for chapter_id in corpus.chapter_ids(book_id)
+                ),
+            )
+            db.executemany(
+                "INSERT INTO verses VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        verse_id,
+                        chapter_id,
+                        corpus.verse_numbers[verse_id],
+                        _packed_ref(*corpus.verse_ref(verse_id)),
+                        corpus.verse_text(verse_id),
+                    )
+                    for chapter_id in range(corpus.num_chapters)
+                    for verse_id in corpus.verse_ids(chapter_id)
+                ),
+            )
+            db.execute("INSERT INTO verses_fts (verses_fts) VALUES ('rebuild')")
+            db.executemany(
+                "INSERT INTO chapters_fts (rowid, text) VALUES (?, ?)",
+                (
+                    (chapter_id, corpus.chapter_text(chapter_id))
+                    for chapter_id in range(corpus.num_chapters)
+                ),
+            )
+            db.execute("INSERT INTO verses_fts (verses_fts) VALUES ('optimize')")
+            db.execute("INSERT INTO chapters_fts (chapters_fts) VALUES ('optimize')")
+            db.commit()
+        finally:
+            db.close()
+        os.replace(building, path)
+        return cls(path)
+
+    @classmethod
+    def open_or_build(cls, path: Union[str, Path], parser) -> Optional["SqliteBackend"]:
+        """Open the database of a parser's source, (re)building it if stale.
+
+        ``parser`` is a ``BSBParser``; it is only loaded when the database
+        is missing or was built from other text.  Returns None when the
+        text cannot be loaded.
+        """
+        path = Path(path)
+        if path.exists():
+            try:
+                backend = cls(path)
+            except (sqlite3.DatabaseError, ValueError):
+                backend = None
+            if backend is not None:
+                current = parser.manifest.source_hash
+                if current is not None and backend.source_hash == current:
+                    return backend
+                backend.close()
+
+        if not parser.download_and_parse():
+            return None
+        print("Building SQLite database...")
+        return cls.build(path, parser.corpus, parser.manifest.source_hash or "")
+
+    def close(self):
+        """Close the database connection."""
+        self._db.close()
+
+    def _chapter_table(self) -> _Chapters:
+        if self._chapters is None:
+            books = [
+                name
+                for (name,) in self._db.execute("SELECT name FROM books ORDER BY id")
+            ]
+            chapters = list(
+                self._db.execute("SELECT book_id, number FROM chapters ORDER BY id")
+            )
+            self._chapters = _Chapters(books, chapters)
+        return self._chapters
+
+    def _find_chapter(self, book: str, chapter: int) -> Optional[int]:
+        table = self._chapter_table()
+        book_id = table.book_id(normalize_book(book.strip()))
+        return None if book_id is None else table.chapter_id(book_id, chapter)
+
+    def list_books(self) -> List[str]:
+        """List available Bible books."""
+        return list(self._chapter_table().books)
+
+    def get_verse(self, book: str, chapter: int, verse: int) -> Optional[str]:
+        """Get specific verse text."""
+        ref = _packed_ref(book, chapter, verse)
+        if ref is None:
+            return None
+        row = self._db.execute(
+            "SELECT text FROM verses WHERE ref = ?", (ref,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def get_chapter(self, book: str, chapter: int) -> Optional[str]:
+        """Get full chapter text."""
+        chapter_id = self._find_chapter(book, chapter)
+        if chapter_id is None:
+            return None
+        return self._join(
+            self._db.execute(
+                "SELECT text FROM verses WHERE chapter_id = ? ORDER BY id",
+                (chapter_id,),
+            )
+        )
+
+    def get_passage(
+        self,
+        book: str,
+        chapter: int,
+        begin_verse: Optional[int] = None,
+        end_chapter: Optional[int] = None,
+        end_verse: Optional[int] = None,
+        numbered: bool = False,
+    ) -> Optional[Tuple[str, int, int, int, int, str]]:
+        """Get a verse range, possibly spanning chapters (see ``BSBParser``).
+
+        The bounds are packed references, so the verses are one range scan
+        of the ``ref`` index.
+        """
+        try:
+            first, last = PassageRef(
+                normalize_book(book.strip()),
+                chapter,
+                begin_verse,
+                end_chapter,
+                end_verse,
+            ).bounds()
+        except ValueError:
+            return None
+        # Both chapters must exist, and the passage must start in the first
+        first_chapter = self._find_chapter(first.book, first.chapter)
+        if first_chapter is None or self._find_chapter(last.book, last.chapter) is None:
+            return None
+        rows = list(
+            self._db.execute(
+                "SELECT chapter_id, number, text FROM verses "
+                "WHERE ref BETWEEN ? AND ? ORDER BY ref",
+                (first, last),
+            )
+        )
+        if not rows or rows[0][0] != first_chapter:
+            return None
+
+        table = self._chapter_table()
+        book_name, first_number = table.chapter_ref(rows[0][0])
+        if numbered:
+            text = numbered_text(
+                (table.chapter_numbers[chapter_id], verse, verse_text)
+                for chapter_id, verse, verse_text in rows
+            )
+        else:
+            text = self._join(row[2:] for row in rows)
+        return (
+            book_name,
+            first_number,
+            rows[0][1],
+            table.chapter_numbers[rows[-1][0]],
+            rows[-1][1],
+            text,
+        )
+
+    @staticmethod
+    def _join(rows) -> str:
+        return VERSE_SEPARATOR.decode().join(text for (text,) in rows)
+
+    def _chapter_filter(
+        self, column: str, *scopes: Optional[SearchScope]
+    ) -> Optional[Tuple[str, List[int]]]:
+        """SQL condition restricting ``column`` (a chapter id) to the scopes.
+
+        Returns None without restrictions, and a condition that is always
+        false when the scopes match nothing.
+        """
+        chapters = None
+        for scope in scopes:
+            if scope:
+                ranges = scope.chapter_ranges(self._chapter_table(), normalize_book)
+                chapters = (
+                    ranges if chapters is None else intersect_ranges(chapters, ranges)
+                )
+        if chapters is None:
+            return None
+        if not chapters:
+            return "0", []
+        condition = " OR ".join(f"{column} BETWEEN ? AND ?" for _ in chapters)
+        return f"({condition})", [
+            bound for r in chapters for bound in (r.start, r.stop - 1)
+        ]
+
+    def _matching_verses(
+        self, match: str, condition: Optional[Tuple[str, List[int]]]
+    ) -> List[Tuple[int, int, int, str, str]]:
+        """``(verse id, chapter id, verse, text, highlighted text)`` in order."""
+        sql = (
+            "SELECT v.id, v.chapter_id, v.number, v.text, "
+            "highlight(verses_fts, 0, ?, ?) "
+            "FROM verses_fts JOIN verses v ON v.id = verses_fts.rowid "
+            "WHERE verses_fts MATCH ?"
+        )
+        params: List = [_MATCH_START, _MATCH_END, match]
+        if condition is not None:
+            sql += f" AND {condition[0]}"
+            params += condition[1]
+        try:
+            return list(self._db.execute(sql + " ORDER BY v.id", params))
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid query: {e}") from e
+
+    def search_keyword(
+        self,
+        query: str,
+        max_results: int = 10,
+        book: Optional[str] = None,
+        scope: Optional[SearchScope] = None,
+        fuzzy: bool = False,
+    ) -> List[Tuple[str, int, int, List[Tuple[int, str]]]]:
+        """Keyword search ranked by occurrence count per chapter.
+
+        Accepts the keyword query language of ``BSBParser.search_keyword``.
+        FTS5 selects the verses; their occurrences are counted by evaluating
+        the query over their words, so they match the positional index (a
+        NEAR match counts once).  There is no spelling index, so ``fuzzy``
+        has no effect.  Raises ``ValueError`` for malformed queries.
+        """
+        keyword_query = KeywordQuery.parse(query)
+        if keyword_query.root is None:
+            return []
+        match = to_fts5(keyword_query.root)
+        condition = self._chapter_filter(
+            "v.chapter_id", scope, SearchScope(book=book), keyword_query.scope
+        )
+
+        rows = self._matching_verses(match, condition)
+        matches = PositionalIndex.build(tokenize_words(row[3]) for row in rows)
+        counts = keyword_query.evaluate(IndexPostings(matches))
+
+        # Aggregate by chapter; the stable sort keeps canonical order on ties
+        chapter_matches: Dict[int, List] = {}
+        for i, count in sorted(counts.items()):
+            _, chapter_id, verse, text, _ = rows[i]
+            found = chapter_matches.setdefault(chapter_id, [0, []])
+            found[0] += count
+            found[1].append((verse, text))
+        ranked = sorted(chapter_matches.items(), key=lambda item: -item[1][0])
+
+        table = self._chapter_table()
+        return [
+            (*table.chapter_ref(chapter_id), count, verses)
+            for chapter_id, (count, verses) in ranked[:max_results]
+        ]
+
+    def search_keyword_previews(
+        self,
+        query: str,
+        max_results: int = 10,
+        book: Optional[str] = None,
+        scope: Optional[SearchScope] = None,
+        fuzzy: bool = False,
+        max_verses: int = 3,
+    ) -> PreviewedSearch:
+        """``search_keyword`` with the preview of each result (see
+        ``snippet``); the previews are read in one query.  There are no
+        spelling corrections."""
+        results = self.search_keyword(query, max_results, book, scope, fuzzy)
+        chapter_ids = [
+            self._find_chapter(name, chapter) for name, chapter, *_ in results
+        ]
+        snippets = self._snippets(query, chapter_ids, max_verses)
+        return PreviewedSearch(
+            results, [snippets[chapter_id] for chapter_id in chapter_ids], {}
+        )
+
+    def search_semantic(
+        self,
+        query: str,
+        max_results: int = 5,
+        scorer: str = "bm25",
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        scope: Optional[SearchScope] = None,
+    ) -> List[Tuple[str, int, float, str]]:
+        """Rank chapters with the FTS5 BM25 function over stemmed words.
+
+        Every word of the query but the stop words may match.  Returns
+        ``(book, chapter, score, text)``.  Raises ``ValueError`` for scorers
+        other than "bm25" and for other ``k1`` and ``b`` values than the
+        defaults, which FTS5 fixes.
+        """
+        if scorer not in SQLITE_SCORERS:
+            raise ValueError(
+                f"Scorer {scorer} is not supported by the SQLite backend. "
+                f"Use one of: {', '.join(SQLITE_SCORERS)}"
+            )
+        if (k1, b) != (BM25_K1, BM25_B):
+            raise ValueError(
+                f"The SQLite backend ranks with k1={BM25_K1} and b={BM25_B} only"
+            )
+        words = [word for word in tokenize_words(query) if word not in STOP_WORDS]
+        if not words:
+            return []
+
+        sql = "SELECT rowid, bm25(chapters_fts) FROM chapters_fts WHERE chapters_fts MATCH ?"
+        params: List = [
+            " OR ".join(_fts5_string(word) for word in dict.fromkeys(words))
+        ]
+        condition = self._chapter_filter("rowid", scope)
+        if condition is not None:
+            sql += f" AND {condition[0]}"
+            params += condition[1]
+        params.append(max_results)
+        ranked = list(self._db.execute(sql + " ORDER BY rank LIMIT ?", params))
+
+        table = self._chapter_table()
+        results = []
+        for chapter_id, score in ranked:
+            book, chapter = table.chapter_ref(chapter_id)
+            results.append((book, chapter, -score, self.get_chapter(book, chapter)))
+        return results
+
+    def snippet(
+        self,
+        query: str,
+        book: str,
+        chapter: int,
+        max_verses: int = 3,
+        fuzzy: bool = False,
+    ) -> Optional[str]:
+        """Return a preview of a chapter for a search result (see ``BSBParser``)."""
+        chapter_id = self._find_chapter(book, chapter)
+        if chapter_id is None:
+            return None
+        return self._snippets(query, [chapter_id], max_verses)[chapter_id]
+
+    def _snippets(
+        self, query: str, chapter_ids: List[int], max_verses: int
+    ) -> Dict[int, str]:
+        """Previews of chapters, their matching verses read in one query."""
+        verses: Dict[int, List] = {chapter_id: [] for chapter_id in chapter_ids}
+        try:
+            keyword_query = KeywordQuery.parse(query).without(STOP_WORDS)
+            leaves = keyword_query.leaves(positive=True)
+            if leaves and verses:
+                match = " OR ".join(to_fts5(leaf) for leaf in leaves)
+                marks = ", ".join("?" * len(verses))
+                for row in self._matching_verses(
+                    match, (f"v.chapter_id IN ({marks})", list(verses))
+                ):
+                    verses[row[1]].append(row)
+        except ValueError:
+            pass
+
+        snippets = {}
+        for chapter_id, rows in verses.items():
+            if not rows:
+                book, chapter = self._chapter_table().chapter_ref(chapter_id)
+                snippets[chapter_id] = truncate(self.get_chapter(book, chapter))
+                continue
+            best = sorted(rows, key=lambda row: -row[4].count(_MATCH_START))
+            snippets[chapter_id] = " ".join(
+                f"{verse}: {highlight(text, _marked_positions(text, marked))}"
+                for _, _, verse, text, marked in sorted(best[:max_verses])
+            )
+        return snippets
+
+
+def _marked_positions(text: str, marked: str) -> List[int]:
+    """Word positions of ``text`` inside the highlighted runs of ``marked``."""
+    runs = []
+    offset = 0
+    start = None
+    for i, char in enumerate(marked):
+        if char == _MATCH_START:
+            start = i - offset
+            offset += 1
+        elif char == _MATCH_END:
+            runs.append((start, i - offset))
+            offset += 1
+    return [
+        position
+        for position, (word_start, word_end) in enumerate(word_spans(text))
+        if any(
+            run_start < word_end and word_start < run_end for run_start, run_end in runs
+        )
+    ]
@@ -0,0 +1,90 @@
+"""
+Tests for the binary section file module.
+"""
+
+import os
+import stat
+from array import array
+
+import pytest
+
+from .binfile import SectionFile, SectionFileError, write_sections
+
+
+class TestSectionFile:
+    """Test cases for section files."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that sections and metadata survive a write/open cycle."""
+        path = tmp_path / "data.bin"
+        write_sections(
+            path,
+            {"books": ["Genesis"]},
+            {
+                "text": "héllo".encode("utf-8"),
+                "ids": array("I", [1, 2, 3]),
+                "weights": array("d", [0.5, 1.5]),
+                "empty": array("H"),
+            },
+        )
+
+        section_file = SectionFile(path)
+
+        assert section_file.meta == {"books": ["Genesis"]}
+        assert str(section_file["text"], "utf-8") == "héllo"
+        assert list(section_file["ids"]) == [1, 2, 3]
+        assert list(section_file["weights"]) == [0.5, 1.5]
+        assert len(section_file["empty"]) == 0
+        assert "ids" in section_file
+        assert "missing" not in section_file
+
+    def test_sections_are_aligned(self, tmp_path):
+        """Test that typed sections can be cast after an odd-sized section."""
+        path = tmp_path / "data.bin"
+        write_sections(path, {}, {"odd": b"abc", "values": array("d", [2.0])})
+
+        assert list(SectionFile(path)["values"]) == [2.0]
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Test that files in another format are rejected."""
+        path = tmp_path / "data.pkl"
+        path.write_bytes(b"not a section file at all")
+
+        with pytest.raises(SectionFileError):
+            SectionFile(path)
+
+    def test_rejects_truncated_file(self, tmp_path):
+        """Test that truncated files are rejected."""
+        path = tmp_path / "data.bin"
+        write_sections(path, {}, {"ids": array("I", range(100))})
+        path.write_bytes(path.read_bytes()[:-16])
+
+        with pytest.raises(SectionFileError):
+            SectionFile(path)
+
+    def test_views_outlive_close(self, tmp_path):
+        """Test that closing keeps views that are still referenced valid."""
+        path = tmp_path / "data.bin"
+        write_sections(path, {}, {"ids": array("I", [7, 8])})
+        section_file = SectionFile(path)
+        ids = section_file["ids"]
+
+        section_file.close()
+
+        assert list(ids) == [7, 8]
+
+    @pytest.mark.skipif(not hasattr(os, "fchmod"), reason="POSIX file modes")
+    def test_file_mode_follows_umask(self, tmp_path):
+        """Test that written files get the umask mode, not mkstemp's 0600."""
+        path = tmp_path / "data.bin"
+        umask = os.umask(0o022)
+        try:
+            write_sections(path, {}, {})
+        finally:
+            os.umask(umask)
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,70 @@
+"""
+Tests for the blockstore module.
+"""
+
+import pytest
+
+from .binfile import SectionFile, write_sections
+from .blockstore import BlockStore
+
+TEXT = "".join(f"Verse {i} of the text, with ünïcode. " for i in range(200)).encode()
+BOUNDARIES = [i for i in range(len(TEXT)) if i == 0 or TEXT[i - 1 : i] == b" "]
+
+
+class TestBlockStore:
+    """Test cases for BlockStore."""
+
+    @pytest.mark.parametrize("codec", ["zlib", "lzma"])
+    def test_slices_match_text(self, codec):
+        """Test that slices within and across blocks match the raw text."""
+        store = BlockStore.build(TEXT, codec, block_size=256)
+
+        assert len(store) == len(TEXT)
+        assert len(store.block_starts) > 10
+        assert store.compressed_size < len(TEXT)
+        for start, stop in [(0, 10), (250, 270), (100, 1500), (0, len(TEXT))]:
+            assert store[start:stop] == TEXT[start:stop]
+        assert store[-5:] == TEXT[-5:]
+        assert store[20:10] == b""
+        with pytest.raises(TypeError):
+            store[0:10:2]
+
+    def test_blocks_end_at_boundaries(self):
+        """Test that blocks are cut only at the given boundaries."""
+        store = BlockStore.build(TEXT, "zlib", BOUNDARIES, block_size=100)
+
+        assert set(store.block_starts[:-1]) <= set(BOUNDARIES)
+        assert all(
+            b - a <= 100 for a, b in zip(store.block_starts, store.block_starts[1:])
+        )
+        # A record longer than a block gets a block of its own
+        long = BlockStore.build(b"a" * 50 + b"b" * 10, "zlib", [0, 50], 20)
+        assert list(long.block_starts) == [0, 50, 60]
+
+    def test_reads_decompress_only_touched_blocks(self):
+        """Test the decompression cache and its LRU eviction."""
+        store = BlockStore.build(TEXT, "zlib", BOUNDARIES, block_size=256)
+        store.cached_blocks = 2
+
+        store[300:310]
+        store[300:320]
+        assert list(store._cache) == [1]
+        store[0:10]
+        store[600:610]
+        assert list(store._cache) == [0, 2]
+
+    def test_unknown_codec(self):
+        """Test that unknown codecs are rejected."""
+        with pytest.raises(ValueError, match="Unknown codec"):
+            BlockStore.build(TEXT, "brotli")
+
+    def test_mapped_store(self, tmp_path):
+        """Test that a memory-mapped store reads like the built one."""
+        store = BlockStore.build(TEXT, "lzma", BOUNDARIES, block_size=512)
+        meta, sections = store.to_sections()
+        write_sections(tmp_path / "blocks.bin", meta, sections)
+
+        section_file = SectionFile(tmp_path / "blocks.bin")
+        mapped = BlockStore.from_sections(section_file, section_file.meta["codec"])
+        assert mapped[1000:3000] == TEXT[1000:3000]
+        assert mapped[:] == TEXT
@@ -2,13 +2,16 @@
 Tests for the CLI module.
 """
 
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 import pytest
 from cli.cli import (
     handle_chat,
+    handle_scripture_complete,
     handle_scripture_get,
     handle_scripture_index,
+    handle_scripture_regex,
+    handle_scripture_related,
     handle_scripture_search,
     handle_test_template,
 )
@@ -95,9 +98,79 @@ class TestCLIHandlers:
 
         assert result == 0
         mock_execute_tool.assert_called_once_with(
-            "get_scripture", book="John", chapter=3
+            "get_scripture", book="John", chapter=3, begin_verse=16
         )
 
+    @patch("cli.cli.execute_tool")
+    def test_handle_scripture_get_ranges(self, mock_execute_tool, capsys):
+        """Test that chapters and verse ranges are passed on to the tool."""
+        mock_execute_tool.return_value = {
+            "book": "John",
+            "chapter": 3,
+            "text": "Now there was a Pharisee named Nicodemus...",
+            "highlighted_text": "Whoever believes in the Son has eternal life...",
+            "reference": "John 3:36-4:2",
+        }
+        args = Mock()
+
+        args.reference = "John 3:36-4:2"
+        assert handle_scripture_get(args) == 0
+        mock_execute_tool.assert_called_with(
+            "get_scripture",
+            book="John",
+            chapter=3,
+            begin_verse=36,
+            end_chapter=4,
+            end_verse=2,
+        )
+        output = capsys.readouterr().out
+        assert output.startswith("John 3:36-4:2\nWhoever believes in the Son")
+        assert "Nicodemus" not in output
+
+        args.reference = "1 John 3-4"
+        assert handle_scripture_get(args) == 0
+        mock_execute_tool.assert_called_with(
+            "get_scripture", book="1 John", chapter=3, end_chapter=4
+        )
+
+        args.reference = "Genesis 1"
+        assert handle_scripture_get(args) == 0
+        mock_execute_tool.assert_called_with("get_scripture", book="Genesis", chapter=1)
+
+    @patch("cli.cli.execute_tool")
+    def test_handle_scripture_get_list(self, mock_execute_tool, capsys):
+        """Test that every reference of a list is fetched and errors reported."""
+        mock_execute_tool.side_effect = [
+            {
+                "book": "John",
+                "chapter": 3,
+                "text": "For God so loved the world...",
+                "highlighted_text": "For God so loved the world...",
+                "reference": "John 3:16-18",
+            },
+            {"error": "Verse range not found: Romans 8:99-99"},
+        ]
+        args = Mock()
+        args.reference = "Jn 3:16-18; Rom 8:99"
+
+        assert handle_scripture_get(args) == 1
+        assert mock_execute_tool.call_args_list == [
+            call("get_scripture", book="John", chapter=3, begin_verse=16, end_verse=18),
+            call("get_scripture", book="Romans", chapter=8, begin_verse=99),
+        ]
+        output = capsys.readouterr().out
+        assert "John 3:16-18\nFor God so loved" in output
+        assert "Error: Verse range not found: Romans 8:99-99" in output
+
+    @patch("cli.cli.execute_tool")
+    def test_handle_scripture_get_invalid_reference(self, mock_execute_tool):
+        """Test that a malformed reference is rejected before any lookup."""
+        args = Mock()
+        args.reference = "John three"
+
+        assert handle_scripture_get(args) == 1
+        mock_execute_tool.assert_not_called()
+
     @patch("cli.cli.execute_tool")
     def test_handle_scripture_get_error(self, mock_execute_tool):
         """Test scripture get command handler error."""
@@ -120,6 +193,13 @@ class TestCLIHandlers:
         args = Mock()
         args.query = "love"
         args.max_results = 3
+        args.scorer = "bm25"
+        args.k1 = 1.5
+        args.b = 0.5
+        args.granularity = "passage"
+        args.book = None
+        args.testament = "NT"
+        args.book_range = None
 
         # Mock tool execution
         mock_execute_tool.return_value = {
@@ -141,7 +221,122 @@ class TestCLIHandlers:
 
         assert result == 0
         mock_execute_tool.assert_called_once_with(
-            "search_scripture_semantic", query="love", n_results=3
+            "search_scripture_semantic",
+            query="love",
+            n_results=3,
+            scorer="bm25",
+            k1=1.5,
+            b=0.5,
+            granularity="passage",
+            book=None,
+            testament="NT",
+            book_range=None,
+        )
+
+    @patch("cli.cli.execute_tool")
+    def test_handle_scripture_regex(self, mock_execute_tool):
+        """Test scripture regex command handler."""
+        args = Mock()
+        args.pattern = "LORD of (hosts|Hosts)"
+        args.max_results = 20
+        args.ignore_case = False
+        args.book = None
+        args.testament = "OT"
+        args.book_range = None
+
+        mock_execute_tool.return_value = {
+            "pattern": args.pattern,
+            "results": [
+                {
+                    "book": "Haggai",
+                    "chapter": 1,
+                    "verse": 7,
+                    "text": "This is what the LORD of Hosts says.",
+                    "reference": "Haggai 1:7",
+                }
+            ],
+            "count": 1,
+        }
+
+        assert handle_scripture_regex(args) == 0
+        mock_execute_tool.assert_called_once_with(
+            "search_scripture_regex",
+            pattern="LORD of (hosts|Hosts)",
+            n_results=20,
+            ignore_case=False,
+            book=None,
+            testament="OT",
+            book_range=None,
+        )
+
+        mock_execute_tool.return_value = {"error": "Invalid pattern: nothing to repeat"}
+        assert handle_scripture_regex(args) == 1
+
+    @patch("cli.cli.get_bsb_parser")
+    def test_handle_scripture_complete(self, mock_get_parser, capsys):
+        """Test that completions are printed one per line, books first."""
+        mock_parser = Mock()
+        mock_parser.complete.return_value = {
+            "books": ["Ruth"],
+            "words": ["ruler", "rulers"],
+        }
+        mock_get_parser.return_value = mock_parser
+
+        args = Mock()
+        args.prefix = "ru"
+        args.max_results = 5
+
+        assert handle_scripture_complete(args) == 0
+        mock_parser.complete.assert_called_once_with("ru", 5)
+        assert capsys.readouterr().out == "Ruth\nruler\nrulers\n"
+
+    @patch("cli.cli.execute_tool")
+    def test_handle_scripture_related(self, mock_execute_tool, capsys):
+        """Test scripture related command handler."""
+        args = Mock()
+        args.reference = "1 John 4"
+        args.max_results = 3
+
+        mock_execute_tool.return_value = {
+            "book": "1 John",
+            "chapter": 4,
+            "text": "Beloved, do not believe every spirit.",
+            "context": {
+                "related": [
+                    {
+                        "book": "John",
+                        "chapter": 15,
+                        "similarity": 0.412,
+                        "text": "I am the true vine.",
+                        "reference": "John 15",
+                    }
+                ]
+            },
+            "reference": "1 John 4",
+        }
+
+        assert handle_scripture_related(args) == 0
+        mock_execute_tool.assert_called_once_with(
+            "get_scripture_context", book="1 John", chapter=4, related=3
+        )
+        output = capsys.readouterr().out
+        assert "Chapters related to 1 John 4" in output
+        assert "1. John 15 (similarity 0.41)" in output
+
+        mock_execute_tool.return_value = {"error": "Chapter not found: 1 John 9"}
+        assert handle_scripture_related(args) == 1
+
+        args.reference = "1 John"
+        assert handle_scripture_related(args) == 1
+        args.reference = "1 John 4:7"
+        assert handle_scripture_related(args) == 1
+
+        # Abbreviations resolve to the canonical book
+        mock_execute_tool.reset_mock()
+        args.reference = "1 Jn 4"
+        handle_scripture_related(args)
+        mock_execute_tool.assert_called_once_with(
+            "get_scripture_context", book="1 John", chapter=4, related=3
         )
 
     @patch("cli.cli.get_bsb_parser")
@@ -150,6 +345,7 @@ class TestCLIHandlers:
         # Mock parser
         mock_parser = Mock()
         mock_parser.download_and_parse.return_value = True
+        mock_parser.build_indexes.return_value = True
         mock_parser.list_books.return_value = ["Genesis", "Exodus", "John"]
         mock_get_parser.return_value = mock_parser
 
@@ -158,6 +354,7 @@ class TestCLIHandlers:
 
         assert result == 0
         mock_parser.download_and_parse.assert_called_once()
+        mock_parser.build_indexes.assert_called_once()
         mock_parser.list_books.assert_called_once()
 
     @patch("cli.cli.get_bsb_parser")
@@ -0,0 +1,165 @@
+"""
+Tests for the corpus module.
+"""
+
+import pytest
+
+from .binfile import SectionFile, write_sections
+from .corpus import (
+    Corpus,
+    CorpusBuilder,
+    CorpusChapters,
+    CorpusVerses,
+    numbered_text,
+)
+from .references import LAST_VERSE, PassageRef, VerseRef
+
+
+def build_corpus():
+    builder = CorpusBuilder()
+    builder.add_verse("Genesis", 1, 1, "In the beginning God created the heavens.")
+    builder.add_verse("Genesis", 1, 2, "The earth was formless—and void.")
+    builder.add_verse("Genesis", 2, 1, "Thus the heavens were completed.")
+    builder.add_verse("John", 3, 16, "For God so loved the world.")
+    return builder.build()
+
+
+class TestCorpus:
+    """Test cases for Corpus and CorpusBuilder."""
+
+    def test_lookups(self):
+        """Test book, chapter and verse id lookups."""
+        corpus = build_corpus()
+
+        assert corpus.books == ["Genesis", "John"]
+        assert corpus.num_chapters == 3
+        assert corpus.num_verses == 4
+
+        genesis = corpus.book_id("Genesis")
+        chapter_id = corpus.chapter_id(genesis, 1)
+        assert corpus.verse_text(corpus.verse_id(chapter_id, 2)) == (
+            "The earth was formless—and void."
+        )
+        assert corpus.chapter_id(genesis, 3) is None
+        assert corpus.book_id("Exodus") is None
+
+        # Non 1-based numbering falls back to a scan
+        john = corpus.chapter_id(corpus.book_id("John"), 3)
+        assert john == 2
+        assert corpus.verse_text(corpus.verse_id(john, 16)) == (
+            "For God so loved the world."
+        )
+        assert corpus.verse_ref(3) == ("John", 3, 16)
+        assert corpus.chapter_ref(1) == ("Genesis", 2)
+
+    def test_chapter_text_is_one_slice(self):
+        """Test that chapter text joins its verses with single spaces."""
+        corpus = build_corpus()
+
+        assert corpus.chapter_text(0) == (
+            "In the beginning God created the heavens. "
+            "The earth was formless—and void."
+        )
+        assert corpus.text_range(1, 2) == (
+            "The earth was formless—and void. Thus the heavens were completed."
+        )
+
+    def test_verse_span(self):
+        """Test verse ranges within and across chapters."""
+        corpus = build_corpus()
+
+        assert corpus.verse_span(0, 2, 0, 2) == range(1, 2)
+        assert corpus.verse_span(0, 2, 1, 1) == range(1, 3)
+        assert corpus.verse_span(0, None, 1, None) == range(0, 3)
+        # An end past the last verse stops there
+        assert corpus.verse_span(0, 1, 0, 40) == range(0, 2)
+        assert corpus.verse_span(2, 16, 2, 18) == range(3, 4)
+        # Missing first verses and reversed ranges are empty
+        assert not corpus.verse_span(0, 3, 1, 1)
+        assert not corpus.verse_span(0, 2, 0, 1)
+        assert not corpus.verse_span(2, 1, 2, 15)
+
+    def test_ref_span(self):
+        """Test verse ranges between packed references."""
+        corpus = build_corpus()
+
+        assert corpus.ref_span(
+            VerseRef.of("Genesis", 1, 2), VerseRef.of("Genesis", 2, LAST_VERSE)
+        ) == range(1, 3)
+        assert corpus.ref_span(*PassageRef("Genesis", 1).bounds()) == range(0, 2)
+        assert corpus.ref_span(*PassageRef("John", 3, 16, 3, 40).bounds()) == range(
+            3, 4
+        )
+        # Both chapters must exist
+        assert not corpus.ref_span(*PassageRef("Genesis", 1, 1, 3).bounds())
+        assert not corpus.ref_span(*PassageRef("Exodus", 1).bounds())
+
+    def test_numbered_text(self):
+        """Test verse number markers, with the chapter after the first one."""
+        corpus = build_corpus()
+
+        assert numbered_text(
+            corpus.verse_ref(verse_id)[1:] + (corpus.verse_text(verse_id),)
+            for verse_id in range(1, 3)
+        ) == (
+            "2: The earth was formless—and void. "
+            "2:1: Thus the heavens were completed."
+        )
+        assert numbered_text([]) == ""
+
+    def test_mapped_corpus(self, tmp_path):
+        """Test that a memory-mapped corpus matches the built one."""
+        corpus = build_corpus()
+        meta, sections = corpus.to_sections()
+        write_sections(tmp_path / "corpus.bin", meta, sections)
+
+        mapped = Corpus.from_sections(SectionFile(tmp_path / "corpus.bin"))
+
+        assert mapped.books == corpus.books
+        for verse_id in range(corpus.num_verses):
+            assert mapped.verse_ref(verse_id) == corpus.verse_ref(verse_id)
+            assert mapped.verse_text(verse_id) == corpus.verse_text(verse_id)
+
+    @pytest.mark.parametrize("codec", ["zlib", "lzma"])
+    def test_compressed_corpus(self, tmp_path, codec):
+        """Test that block-compressed text reads like raw text, mapped or not."""
+        corpus = build_corpus()
+        compressed = corpus.compressed(codec, block_size=40)
+
+        assert compressed.compression == codec
+        assert len(compressed.text.block_starts) > 2
+        assert compressed.compressed(codec) is compressed
+        meta, sections = compressed.to_sections()
+        assert "text" not in sections
+        write_sections(tmp_path / "corpus.bin", meta, sections)
+        mapped = Corpus.from_sections(SectionFile(tmp_path / "corpus.bin"))
+
+        assert mapped.compression == codec
+        for chapter_id in range(corpus.num_chapters):
+            assert compressed.chapter_text(chapter_id) == corpus.chapter_text(
+                chapter_id
+            )
+            assert mapped.chapter_text(chapter_id) == corpus.chapter_text(chapter_id)
+        assert mapped.text_range(0, 3) == corpus.text_range(0, 3)
+        assert mapped.compressed("none").text == bytes(corpus.text)
+
+    def test_mapping_views(self):
+        """Test the nested dict-like views."""
+        corpus = build_corpus()
+        verses = CorpusVerses(corpus)
+        chapters = CorpusChapters(corpus)
+
+        assert list(verses) == ["Genesis", "John"]
+        assert len(verses["Genesis"]) == 2
+        assert list(verses["Genesis"][1]) == [1, 2]
+        assert verses["John"][3][16] == "For God so loved the world."
+        assert 2 in verses["Genesis"]
+        assert 5 not in verses["Genesis"][1]
+        assert "Exodus" not in verses
+        assert chapters["Genesis"][2] == "Thus the heavens were completed."
+        with pytest.raises(KeyError):
+            verses["Genesis"][9]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
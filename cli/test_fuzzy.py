@@ -0,0 +1,82 @@
+"""
+Tests for the fuzzy module.
+"""
+
+from .binfile import SectionFile, write_sections
+from .fuzzy import FuzzyVocabulary, edit_distance, max_edits
+
+WORDS = (
+    "nebuchadnezzar melchizedek philistines philistine the the the they then "
+    "there than ten tent king king kings kin sing wing ruler rule"
+).split()
+
+
+class TestEditDistance:
+    """Test cases for edit_distance."""
+
+    def test_distances(self):
+        """Test insertions, deletions, substitutions and transpositions."""
+        assert edit_distance("king", "king", 2) == 0
+        assert edit_distance("kin", "king", 2) == 1
+        assert edit_distance("king", "kign", 2) == 1
+        assert edit_distance("melchizadek", "melchizedek", 2) == 1
+        assert edit_distance("ruler", "rule", 0) == 1
+        # Gives up beyond the bound
+        assert edit_distance("philistines", "the", 2) == 3
+        assert edit_distance("abcdef", "badcfe", 2) == 3
+
+    def test_max_edits(self):
+        """Test the length-dependent edit allowance."""
+        assert [max_edits(word) for word in ["of", "the", "kings", "psalms"]] == [
+            0,
+            1,
+            1,
+            2,
+        ]
+
+
+class TestFuzzyVocabulary:
+    """Test cases for FuzzyVocabulary."""
+
+    def test_candidates(self):
+        """Test that misspellings resolve to the closest, most frequent words."""
+        vocabulary = FuzzyVocabulary.build(WORDS)
+
+        assert "king" in vocabulary and "kign" not in vocabulary
+        assert vocabulary.candidates("nebuchadnezar") == ["nebuchadnezzar"]
+        assert vocabulary.candidates("Melchizadek".lower()) == ["melchizedek"]
+        assert vocabulary.candidates("kign") == ["king", "kin"]
+        # Ties on distance prefer the more frequent word
+        assert vocabulary.candidates("thn", limit=2) == ["the", "ten"]
+        assert vocabulary.candidates("king") == ["king"]
+        assert vocabulary.candidates("xq") == []
+        assert vocabulary.candidates("zzzzzzzz") == []
+
+    def test_candidates_match_brute_force(self):
+        """Test that bigram filtering never drops a word within reach."""
+        vocabulary = FuzzyVocabulary.build(WORDS)
+
+        for word in ["thex", "kngs", "filistines", "rulre", "tne", "sign"]:
+            limit = max_edits(word)
+            expected = {
+                term
+                for term in vocabulary.terms
+                if edit_distance(word, term, limit) <= limit
+            }
+            assert set(vocabulary.candidates(word, limit=len(WORDS))) == expected
+
+    def test_section_round_trip(self, tmp_path):
+        """Test that the index survives writing and memory-mapping."""
+        vocabulary = FuzzyVocabulary.build(WORDS)
+        path = tmp_path / "fuzzy.bin"
+        meta, sections = vocabulary.to_sections()
+        write_sections(path, meta, sections)
+
+        section_file = SectionFile(path)
+        try:
+            loaded = FuzzyVocabulary.from_sections(section_file)
+            assert loaded.terms == vocabulary.terms
+            assert loaded.candidates("kign") == vocabulary.candidates("kign")
+        finally:
+            del loaded
+            section_file.close()
@@ -0,0 +1,217 @@
+"""
+Tests for the ingest module.
+"""
+
+import functools
+import http.server
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from .ingest import SourceStream, ingest, parse_verse_line
+from .scripture import BSBParser
+
+BSB_TEXT = """The Holy Bible, Berean Standard Bible, BSB
+This text of God's Word has been dedicated to the public domain.
+Verse\tBerean Standard Bible
+Genesis 1:1\tIn the beginning God created the heavens and the earth.
+Genesis 1:2\tNow the earth was formless and void.
+
+John 3:16\tFor God so loved the world that He gave His one and only Son.
+"""
+
+
+@pytest.fixture
+def http_source(tmp_path, monkeypatch):
+    """Serve a directory over a local HTTP stand-in for bereanbible.com."""
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    root = tmp_path / "www"
+    root.mkdir()
+    (root / "bsb.txt").write_text(BSB_TEXT, encoding="utf-8-sig")
+    handler = functools.partial(
+        http.server.SimpleHTTPRequestHandler, directory=str(root)
+    )
+    handler.func.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield root, f"http://127.0.0.1:{server.server_address[1]}/bsb.txt"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestParseVerseLine:
+    """Test cases for the line parser."""
+
+    def test_verse_lines(self):
+        """Test parsing of verse lines, including numbered books."""
+        assert parse_verse_line("John 3:16\tFor God so loved the world.") == (
+            "John",
+            3,
+            16,
+            "For God so loved the world.",
+        )
+        assert parse_verse_line("1 Samuel 1:1 Now there was a man.  ") == (
+            "1 Samuel",
+            1,
+            1,
+            "Now there was a man.",
+        )
+
+    def test_book_names_are_canonical(self):
+        """Test that variant book spellings map to the canonical names."""
+        assert parse_verse_line("Psalm 23:1\tThe LORD is my shepherd.")[0] == "Psalms"
+        assert parse_verse_line("Song of Songs 1:1 This is Solomon's Song.")[0] == (
+            "Song of Solomon"
+        )
+        assert parse_verse_line("Hezekiah 1:1\tUnknown.")[0] == "Hezekiah"
+
+    def test_skipped_lines(self):
+        """Test that headers and blank lines are skipped."""
+        assert parse_verse_line("") is None
+        assert parse_verse_line("Verse\tBerean Standard Bible") is None
+        assert parse_verse_line("The Holy Bible, Berean Standard Bible") is None
+        assert parse_verse_line("not a verse") is None
+
+
+class TestSourceStream:
+    """Test cases for local and HTTP sources."""
+
+    def test_local_file(self, tmp_path):
+        """Test ingest from a local file with a BOM."""
+        path = tmp_path / "bsb.txt"
+        path.write_text(BSB_TEXT, encoding="utf-8-sig")
+
+        stream = SourceStream(str(path))
+        corpus = ingest(stream).build()
+
+        assert corpus.books == ["Genesis", "John"]
+        assert corpus.num_verses == 3
+        assert len(stream.source_hash) == 64
+
+    def test_non_canonical_books(self, tmp_path, capsys):
+        """Test that variant spellings merge and unknown books are skipped."""
+        path = tmp_path / "psalms.txt"
+        path.write_text(
+            "Psalm 1:1\tBlessed is the man.\n"
+            "Psalms 1:2\tBut his delight is in the Law of the LORD.\n"
+            "Song of Songs 1:1\tThis is Solomon's Song of Songs.\n"
+            "Hezekiah 1:1\tNot a book.\n",
+            encoding="utf-8",
+        )
+
+        corpus = ingest(SourceStream(str(path))).build()
+
+        assert corpus.books == ["Psalms", "Song of Solomon"]
+        assert corpus.verse_ref(1) == ("Psalms", 1, 2)
+        assert "unknown books: Hezekiah" in capsys.readouterr().out
+
+    def test_local_directory(self, tmp_path):
+        """Test ingest from a directory of text files in name order."""
+        (tmp_path / "01-genesis.txt").write_text(
+            "Genesis 1:1\tIn the beginning.\n", encoding="utf-8"
+        )
+        (tmp_path / "02-john.txt").write_text(
+            "John 1:1\tIn the beginning was the Word.\n", encoding="utf-8"
+        )
+        (tmp_path / "notes.md").write_text("John 9:9 ignored\n", encoding="utf-8")
+
+        corpus = ingest(SourceStream(f"file://{tmp_path}")).build()
+
+        assert corpus.books == ["Genesis", "John"]
+
+    def test_missing_local_source(self, tmp_path):
+        """Test that a missing local source raises."""
+        with pytest.raises(FileNotFoundError):
+            list(SourceStream(str(tmp_path / "missing.txt")))
+
+    def test_http_stream_matches_local(self, http_source):
+        """Test that HTTP and local ingest produce the same corpus and hash."""
+        root, url = http_source
+
+        remote = SourceStream(url)
+        remote_corpus = ingest(remote).build()
+        local = SourceStream(str(root / "bsb.txt"))
+        local_corpus = ingest(local).build()
+
+        assert remote.source_hash == local.source_hash
+        assert bytes(remote_corpus.text) == bytes(local_corpus.text)
+        assert remote.last_modified
+
+    def test_http_conditional_request(self, http_source):
+        """Test that an unchanged source answers 304 and yields nothing."""
+        _, url = http_source
+        first = SourceStream(url)
+        ingest(first)
+
+        again = SourceStream(url, last_modified=first.last_modified)
+
+        assert ingest(again) is None
+        assert again.not_modified is True
+
+
+class TestParserRefresh:
+    """Test cases for BSBParser ingest and refresh."""
+
+    def test_offline_source(self, tmp_path):
+        """Test that the parser can be built entirely from a local file."""
+        path = tmp_path / "bsb.txt"
+        path.write_text(BSB_TEXT, encoding="utf-8")
+
+        parser = BSBParser(url=str(path), cache_dir=str(tmp_path / "cache"))
+
+        assert parser.get_verse("John", 3, 16).startswith("For God so loved")
+        assert parser.manifest.data["source_url"] == str(path)
+
+    def test_local_source_cache_is_reused(self, tmp_path, monkeypatch):
+        """Test that a cache indexed from a local file serves default runs."""
+        monkeypatch.delenv("GAMALIEL_BSB_SOURCE", raising=False)
+        path = tmp_path / "bsb.txt"
+        path.write_text(BSB_TEXT, encoding="utf-8")
+        cache_dir = str(tmp_path / "cache")
+        assert BSBParser(url=str(path), cache_dir=cache_dir).build_indexes() is True
+
+        with patch("requests.get") as mock_get:
+            parser = BSBParser(cache_dir=cache_dir)
+            assert parser.get_verse("John", 3, 16).startswith("For God so loved")
+            assert parser.search_semantic("loved")[0][:2] == ("John", 3)
+            mock_get.assert_not_called()
+
+            # An explicit source must match the cache
+            other = tmp_path / "other.txt"
+            other.write_text(BSB_TEXT.replace("loved", "cherished"), encoding="utf-8")
+            monkeypatch.setenv("GAMALIEL_BSB_SOURCE", str(other))
+            pinned = BSBParser(cache_dir=cache_dir)
+            assert pinned.get_verse("John", 3, 16).startswith("For God so cherished")
+            mock_get.assert_not_called()
+
+    def test_refresh_uses_conditional_request(self, http_source, tmp_path):
+        """Test that refresh skips unchanged sources and re-ingests changes."""
+        root, url = http_source
+        parser = BSBParser(url=url, cache_dir=str(tmp_path / "cache"))
+        assert parser.build_indexes() is True
+        assert parser.manifest.data["last_modified"]
+
+        assert parser.refresh() is False
+
+        # Make the file look newer than the cached copy
+        (root / "bsb.txt").write_text(
+            BSB_TEXT + "John 3:17\tFor God did not send His Son to condemn.\n",
+            encoding="utf-8",
+        )
+        os.utime(root / "bsb.txt", (2_000_000_000, 2_000_000_000))
+
+        assert parser.refresh() is True
+        assert parser.get_verse("John", 3, 17).startswith("For God did not send")
+        assert parser.search_semantic("condemn")[0][:2] == ("John", 3)
+
+        reloaded = BSBParser(url=url, cache_dir=str(tmp_path / "cache"))
+        assert reloaded.get_verse("John", 3, 17) is not None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
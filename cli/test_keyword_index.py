@@ -0,0 +1,100 @@
+"""
+Tests for the keyword index module.
+"""
+
+from .binfile import SectionFile, write_sections
+from .keyword_index import PositionalIndex
+from .text_analysis import tokenize_words
+
+VERSES = [
+    "In the beginning God created the heavens and the earth.",
+    "The earth was formless and void.",
+    "Abimelech king of the Philistines looked down.",
+    "The king of the king of the Philistines.",
+    "Philistines, Philistines!",
+]
+
+
+def build_index():
+    return PositionalIndex.build(tokenize_words(text) for text in VERSES)
+
+
+class TestPositionalIndex:
+    """Test cases for PositionalIndex."""
+
+    def test_build_layout(self):
+        """Test the CSR postings layout."""
+        index = build_index()
+
+        assert list(index.terms) == sorted(index.terms)
+        earth = index.term_ids["earth"]
+        postings = range(index.term_indptr[earth], index.term_indptr[earth + 1])
+        assert [index.post_verses[p] for p in postings] == [0, 1]
+        assert list(index.posting_positions(postings[0])) == [9]
+
+    def test_word_counts(self):
+        """Test whole-word occurrence counts."""
+        index = build_index()
+
+        assert index.word_counts("philistines") == {2: 1, 3: 1, 4: 2}
+        assert index.word_counts("philistine") == {}
+        assert index.word_counts("the", range(1, 3)) == {1: 1, 2: 1}
+
+    def test_phrase_counts(self):
+        """Test that phrases match consecutive positions only."""
+        index = build_index()
+
+        assert index.phrase_counts(["king", "of", "the"]) == {2: 1, 3: 2}
+        assert index.phrase_counts(["king", "of", "the", "philistines"]) == {
+            2: 1,
+            3: 1,
+        }
+        assert index.phrase_counts(["the", "king"]) == {3: 2}
+        assert index.phrase_counts(["philistines", "king"]) == {}
+        assert index.phrase_counts(["missing", "king"]) == {}
+        assert index.phrase_counts([]) == {}
+        assert index.phrase_counts(["king", "of"], range(3, 5)) == {3: 2}
+
+    def test_phrase_starts(self):
+        """Test the word positions where each phrase occurrence starts."""
+        index = build_index()
+
+        assert index.phrase_starts(["the", "king"]) == {3: [0, 3]}
+        assert index.phrase_starts(["philistines"], range(4, 5)) == {4: [0, 1]}
+        assert index.phrase_starts(["philistines", "king"]) == {}
+
+    def test_prefix_expansion(self):
+        """Test that prefixes expand to a contiguous run of sorted terms."""
+        index = build_index()
+
+        assert [index.terms[t] for t in index.prefix_terms("philistin")] == [
+            "philistines"
+        ]
+        assert [index.terms[t] for t in index.prefix_terms("th")] == ["the"]
+        assert [index.terms[t] for t in index.prefix_terms("k")] == ["king"]
+        assert list(index.prefix_terms("zz")) == []
+        assert len(index.prefix_terms("")) == len(index.terms)
+        assert index.document_frequency(index.term_ids["the"]) == 4
+
+        assert index.prefix_counts("philis") == {2: 1, 3: 1, 4: 2}
+        assert index.prefix_counts("b") == {0: 1}
+        assert index.prefix_counts("e", range(1, 2)) == {1: 1}
+
+    def test_section_round_trip(self, tmp_path):
+        """Test that an index survives writing and memory-mapping."""
+        index = build_index()
+        path = tmp_path / "keywords.bin"
+        meta, sections = index.to_sections()
+        write_sections(path, meta, sections)
+
+        section_file = SectionFile(path)
+        try:
+            loaded = PositionalIndex.from_sections(section_file)
+            assert loaded.terms == index.terms
+            assert loaded.phrase_counts(["of", "the", "philistines"]) == {
+                2: 1,
+                3: 1,
+            }
+        finally:
+            del loaded
+            section_file.close()
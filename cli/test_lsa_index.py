@@ -0,0 +1,125 @@
+"""
+Tests for the LSA index module.
+"""
+
+import pytest
+
+pytest.importorskip("scipy")
+
+from .binfile import SectionFile, write_sections  # noqa: E402
+from .lsa_index import LsaIndex  # noqa: E402
+from .semantic_index import TfidfIndex  # noqa: E402
+
+DOCUMENTS = [
+    (10, ["beginning", "created", "heavens", "earth", "earth"]),
+    (11, ["heavens", "earth", "completed", "seventh", "rested"]),
+    (12, ["beginning", "word", "word", "word", "god"]),
+    (13, ["god", "loved", "world", "gave", "son"]),
+    (14, ["son", "shepherd", "sheep", "loved", "gave"]),
+]
+
+VERSES = [
+    ["beginning", "created", "heavens"],
+    ["earth", "earth"],
+    ["seventh", "rested"],
+    ["word", "god"],
+    ["loved", "world", "son"],
+    ["shepherd", "sheep"],
+]
+
+
+class TestLsaIndex:
+    """Test cases for LsaIndex."""
+
+    def test_full_rank_matches_tfidf_ranking(self):
+        """Test that a full-rank factorization preserves the cosine ranking."""
+        semantic_index = TfidfIndex.build(DOCUMENTS)
+        index = LsaIndex.build(semantic_index, dims=16, dtype="float32")
+
+        assert index.dims == len(DOCUMENTS)
+        assert list(index.doc_keys) == [10, 11, 12, 13, 14]
+        for query in (["beginning", "word"], ["loved", "son", "earth"]):
+            expected = semantic_index.search(query, 10)
+            results = index.search(query, 10)
+            assert [d for d, _ in results] == [d for d, _ in expected]
+            # Dot products with every chapter are preserved; only the query
+            # norm shrinks (its part outside the chapters' span is dropped)
+            ratios = [s / e for (_, s), (_, e) in zip(results, expected)]
+            assert ratios == pytest.approx([ratios[0]] * len(ratios), rel=1e-4)
+
+    def test_int8_storage(self):
+        """Test that int8 vectors keep scores close to float32 ones."""
+        semantic_index = TfidfIndex.build(DOCUMENTS)
+        exact = LsaIndex.build(semantic_index, dims=3, dtype="float32")
+        quantized = LsaIndex.build(semantic_index, dims=3, dtype="int8")
+
+        assert quantized.dtype == "int8"
+        assert quantized.chapter_vectors.nbytes * 4 == exact.chapter_vectors.nbytes
+        exact_scores = dict(exact.search(["loved", "sheep"], 10, min_score=-1))
+        for doc_id, score in quantized.search(["loved", "sheep"], 10, min_score=-1):
+            assert score == pytest.approx(exact_scores[doc_id], abs=0.02)
+
+    def test_truncation_matches_related_terms(self):
+        """Test that a low-rank space matches documents without shared words."""
+        semantic_index = TfidfIndex.build(DOCUMENTS)
+        index = LsaIndex.build(semantic_index, dims=2, dtype="float32")
+
+        # "shepherd" only occurs in document 4, which shares "loved"/"gave"/
+        # "son" with document 3
+        results = dict(index.search(["shepherd"], 10))
+        assert 4 in results and 3 in results
+        assert [d for d, _ in semantic_index.search(["shepherd"], 10)] == [4]
+
+    def test_verse_search(self):
+        """Test that verses are folded into the chapter space."""
+        index = LsaIndex.build(TfidfIndex.build(DOCUMENTS), VERSES, dims=16)
+
+        assert index.verse_vectors.shape == (len(VERSES), index.dims)
+        assert index.search(["shepherd"], 1, granularity="verse")[0][0] == 5
+        assert index.search(["seventh"], 1, granularity="verse")[0][0] == 2
+
+    def test_doc_ranges(self):
+        """Test that scoped search only returns documents inside the ranges."""
+        index = LsaIndex.build(TfidfIndex.build(DOCUMENTS), VERSES, dims=16)
+
+        results = index.search(
+            ["loved", "son"], 10, doc_ranges=[range(0, 2), range(4, 5)]
+        )
+        assert [d for d, _ in results] == [4]
+        verses = index.search(
+            ["earth"], 10, granularity="verse", doc_ranges=[range(1, 3)]
+        )
+        assert verses[0][0] == 1
+        assert {d for d, _ in verses} <= {1, 2}
+
+    def test_search_errors(self):
+        """Test invalid granularities and missing verse vectors."""
+        index = LsaIndex.build(TfidfIndex.build(DOCUMENTS), dims=2)
+
+        assert index.search(["missing"]) == []
+        with pytest.raises(ValueError):
+            index.search(["god"], granularity="verse")
+        with pytest.raises(ValueError):
+            index.search(["god"], granularity="book")
+        with pytest.raises(ValueError):
+            LsaIndex.build(TfidfIndex.build(DOCUMENTS), dtype="float16")
+
+    def test_section_round_trip(self, tmp_path):
+        """Test that a memory-mapped index scores like the built one."""
+        index = LsaIndex.build(TfidfIndex.build(DOCUMENTS), VERSES, dims=3)
+        meta, sections = index.to_sections()
+        write_sections(tmp_path / "lsa.bin", meta, sections)
+
+        restored = LsaIndex.from_sections(SectionFile(tmp_path / "lsa.bin"))
+
+        assert restored.dims == 3
+        assert restored.dtype == "int8"
+        assert list(restored.doc_keys) == list(index.doc_keys)
+        for granularity in ("chapter", "verse"):
+            assert restored.search(
+                ["god", "loved"], 5, granularity=granularity
+            ) == index.search(["god", "loved"], 5, granularity=granularity)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,110 @@
+"""
+Tests for the cache manifest module.
+"""
+
+import json
+import os
+
+import pytest
+
+from .manifest import MANIFEST_VERSION, CacheManifest
+
+
+class TestCacheManifest:
+    """Test cases for CacheManifest."""
+
+    def test_record_and_verify(self, tmp_path):
+        """Test that recorded artifacts verify until they change."""
+        artifact = tmp_path / "index.bin"
+        artifact.write_bytes(b"index data")
+        manifest = CacheManifest(tmp_path / "manifest.json")
+        manifest.set_source("https://example.com/bsb.txt", "abc123")
+        manifest.record("index", artifact, 1, "tok1")
+
+        assert manifest.verify("index", artifact, 1, "tok1")
+        # Stale format or tokenizer
+        assert not manifest.verify("index", artifact, 2, "tok1")
+        assert not manifest.verify("index", artifact, 1, "tok2")
+        # Unknown artifact
+        assert not manifest.verify("other", artifact, 1, "tok1")
+
+        # Same size, different content: a rewrite changes the modification
+        # time, and a checksum catches content changed behind its back
+        recorded = artifact.stat()
+        artifact.write_bytes(b"INDEX DATA")
+        os.utime(artifact, ns=(recorded.st_atime_ns, recorded.st_mtime_ns + 1))
+        assert not manifest.verify("index", artifact, 1, "tok1")
+        os.utime(artifact, ns=(recorded.st_atime_ns, recorded.st_mtime_ns))
+        assert manifest.verify("index", artifact, 1, "tok1")
+        assert not manifest.verify("index", artifact, 1, "tok1", checksum=True)
+
+        artifact.unlink()
+        assert not manifest.verify("index", artifact, 1, "tok1")
+
+    def test_save_and_reload(self, tmp_path):
+        """Test that the manifest is persisted with its stamps."""
+        artifact = tmp_path / "text.bin"
+        artifact.write_bytes(b"text")
+        manifest = CacheManifest(tmp_path / "manifest.json")
+        manifest.set_source("https://example.com/bsb.txt", "abc123", etag='"v1"')
+        manifest.record("text", artifact, 1)
+        manifest.save()
+
+        data = json.loads((tmp_path / "manifest.json").read_text())
+        assert data["format_version"] == MANIFEST_VERSION
+        assert data["source_hash"] == "abc123"
+        assert data["etag"] == '"v1"'
+        assert data["artifacts"]["text"]["file"] == "text.bin"
+        assert len(data["artifacts"]["text"]["sha256"]) == 64
+        # No temporary files are left behind
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "manifest.json",
+            "text.bin",
+        ]
+
+        assert data["artifacts"]["text"]["mtime_ns"] == artifact.stat().st_mtime_ns
+
+        reloaded = CacheManifest(tmp_path / "manifest.json")
+        assert reloaded.matches_source("https://example.com/bsb.txt")
+        assert not reloaded.matches_source("https://example.com/other.txt")
+        assert reloaded.verify("text", artifact, 1)
+
+    def test_verify_without_mtime(self, tmp_path):
+        """Test that entries of older manifests are checked by checksum."""
+        artifact = tmp_path / "index.bin"
+        artifact.write_bytes(b"index data")
+        manifest = CacheManifest(tmp_path / "manifest.json")
+        manifest.set_source("https://example.com/bsb.txt", "abc123")
+        manifest.record("index", artifact, 1)
+        del manifest.data["artifacts"]["index"]["mtime_ns"]
+
+        assert manifest.verify("index", artifact, 1)
+        artifact.write_bytes(b"INDEX DATA")
+        assert not manifest.verify("index", artifact, 1)
+
+    def test_source_change_forgets_artifacts(self, tmp_path):
+        """Test that only a changed source invalidates every artifact."""
+        artifact = tmp_path / "index.bin"
+        artifact.write_bytes(b"index")
+        manifest = CacheManifest(tmp_path / "manifest.json")
+        manifest.set_source("https://example.com/bsb.txt", "abc123")
+        manifest.record("index", artifact, 1)
+
+        manifest.set_source("https://example.com/bsb.txt", "abc123")
+        assert manifest.verify("index", artifact, 1)
+
+        manifest.set_source("https://example.com/bsb.txt", "def456")
+        assert not manifest.verify("index", artifact, 1)
+
+    def test_unreadable_manifest(self, tmp_path):
+        """Test that corrupt or outdated manifests start empty."""
+        path = tmp_path / "manifest.json"
+        path.write_text("{not json")
+        assert CacheManifest(path).data["artifacts"] == {}
+
+        path.write_text(json.dumps({"format_version": 0, "artifacts": {"x": {}}}))
+        assert CacheManifest(path).data["artifacts"] == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,42 @@
+"""
+Tests for the passages module.
+"""
+
+from .corpus import CorpusBuilder
+from .passages import pack_span, passage_spans, select_non_overlapping, unpack_span
+
+
+def build_corpus(chapter_lengths):
+    builder = CorpusBuilder()
+    for chapter, length in enumerate(chapter_lengths, start=1):
+        for verse in range(1, length + 1):
+            builder.add_verse("Psalms", chapter, verse, f"Verse {chapter}:{verse}.")
+    return builder.build()
+
+
+class TestPassages:
+    """Test cases for passage spans."""
+
+    def test_pack_span_round_trip(self):
+        """Test that span keys decode to the original verse range."""
+        for first, last in [(0, 0), (7, 10), (31101, 31102)]:
+            assert unpack_span(pack_span(first, last)) == (first, last)
+
+    def test_passage_spans(self):
+        """Test verse and window coverage within chapter boundaries."""
+        corpus = build_corpus([1, 3, 7])
+        spans = list(passage_spans(corpus))
+
+        # Chapter 1 has a single verse and no windows
+        assert spans[0] == (0, 0)
+        # Chapter 2 is shorter than a window, so one window covers it all
+        assert spans[1:5] == [(1, 1), (2, 2), (3, 3), (1, 3)]
+        # Chapter 3 windows step by the stride and end on the last verse
+        assert spans[5:12] == [(v, v) for v in range(4, 11)]
+        assert spans[12:] == [(4, 7), (6, 9), (7, 10)]
+
+    def test_select_non_overlapping(self):
+        """Test that overlapping lower-ranked spans are skipped."""
+        spans = [(4, 7), (5, 5), (6, 9), (8, 8), (0, 0), (1, 3)]
+        assert select_non_overlapping(spans, 3) == [0, 3, 4]
+        assert select_non_overlapping(spans, 10) == [0, 3, 4, 5]
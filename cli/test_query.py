@@ -0,0 +1,212 @@
+"""
+Tests for the query module.
+"""
+
+import pytest
+
+from .corpus import CorpusBuilder
+from .keyword_index import PositionalIndex
+from .query import (
+    And,
+    IndexPostings,
+    KeywordQuery,
+    Near,
+    Not,
+    Or,
+    Prefix,
+    ScanPostings,
+    Term,
+)
+from .scan import CorpusScanner
+from .text_analysis import tokenize_words
+
+VERSES = [
+    "In the beginning God created the heavens and the earth.",
+    "The earth was formless and void.",
+    "Abimelech king of the Philistines looked down.",
+    "The king of the king of the Philistines.",
+    "Philistines, Philistines!",
+    "Love your enemies and pray for those who persecute you.",
+]
+
+
+def build_postings(verse_ranges=None):
+    index = PositionalIndex.build(tokenize_words(text) for text in VERSES)
+    return IndexPostings(index, verse_ranges)
+
+
+def build_scan_postings(query):
+    builder = CorpusBuilder()
+    for verse, text in enumerate(VERSES, start=1):
+        builder.add_verse("Genesis", 1, verse, text)
+    scanner = CorpusScanner.build(builder.build())
+    return ScanPostings(scanner, query.terms())
+
+
+def search(query, verse_ranges=None):
+    return dict(KeywordQuery.parse(query).evaluate(build_postings(verse_ranges)))
+
+
+class TestKeywordQuery:
+    """Test cases for KeywordQuery."""
+
+    def test_parse(self):
+        """Test operator precedence and term grouping."""
+        love, enemies = Term(("love",)), Term(("enemies",))
+        assert KeywordQuery.parse("love enemies").root == Or((love, enemies))
+        assert KeywordQuery.parse("love OR enemies").root == Or((love, enemies))
+        assert KeywordQuery.parse('"Love your"').root == Term(("love", "your"))
+        assert KeywordQuery.parse("a OR b AND NOT c").root == Or(
+            (Term(("a",)), And((Term(("b",)), Not(Term(("c",))))))
+        )
+        assert KeywordQuery.parse("love NEAR/2 enemies").root == Near(love, enemies, 2)
+        assert KeywordQuery.parse("(love OR hate) AND enemies").root == And(
+            (Or((love, Term(("hate",)))), enemies)
+        )
+        # Lowercase operators are ordinary words
+        assert KeywordQuery.parse("faith and works").root == Or(
+            (Term(("faith",)), Term(("and",)), Term(("works",)))
+        )
+        assert KeywordQuery.parse("-- ...").root is None
+
+    def test_filters(self):
+        """Test book: and chapter: scoping."""
+        query = KeywordQuery.parse('book:"1 John" love book:jhn')
+        assert query.root == Term(("love",))
+        assert query.scope.books == ["1 John", "jhn"]
+
+        query = KeywordQuery.parse("love book:Matthew chapter:5-7")
+        assert query.scope.book_range == "Matthew 5-7"
+        assert KeywordQuery.parse("love").scope is None
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "love AND",
+            "(love",
+            "love)",
+            "love NEAR/2 (a OR b)",
+            "chapter:5 love",
+            "chapter:five book:John",
+            'book:"" love',
+            "l*",
+            "*",
+            "king-of*",
+        ],
+    )
+    def test_syntax_errors(self, query):
+        """Test that malformed queries raise ValueError."""
+        with pytest.raises(ValueError):
+            KeywordQuery.parse(query)
+
+    def test_correct(self):
+        """Test that corrections expand words and repair phrases."""
+        corrections = {"kign": ["king", "kin"], "filistines": ["philistines"]}
+
+        query = KeywordQuery.parse("kign NOT filistines").correct(corrections)
+        assert query.root == Or(
+            (
+                Or((Term(("king",)), Term(("kin",)))),
+                Not(Term(("philistines",))),
+            )
+        )
+        query = KeywordQuery.parse('"kign of" NEAR/2 filistines book:Judges')
+        corrected = query.correct(corrections)
+        assert corrected.root == Near(Term(("king", "of")), Term(("philistines",)), 2)
+        assert corrected.scope is query.scope
+        assert KeywordQuery.parse("king").correct({}).root == Term(("king",))
+        assert search("kign AND filistines") == {}
+        assert dict(
+            KeywordQuery.parse("kign AND filistines")
+            .correct(corrections)
+            .evaluate(build_postings())
+        ) == search("king AND philistines")
+
+    def test_without(self):
+        """Test dropping stop words and listing the positive terms."""
+        stop_words = {"the", "of"}
+        query = KeywordQuery.parse('the king of "the Philistines" NOT of')
+        assert query.without(stop_words).root == Or(
+            (Term(("king",)), Term(("the", "philistines")))
+        )
+        assert query.terms(positive=True) == [
+            ("the",),
+            ("king",),
+            ("of",),
+            ("the", "philistines"),
+        ]
+        assert KeywordQuery.parse("king NOT samson").terms(positive=True) == [("king",)]
+        # Nothing but stop words (or exclusions) would remain
+        query = KeywordQuery.parse("the OR of")
+        assert query.without(stop_words) is query
+        query = KeywordQuery.parse("the NOT king")
+        assert query.without(stop_words) is query
+
+    def test_boolean_evaluation(self):
+        """Test OR counts, AND intersections and NOT exclusions."""
+        assert search("earth") == {0: 1, 1: 1}
+        assert search("earth philistines") == {0: 1, 1: 1, 2: 1, 3: 1, 4: 2}
+        assert search("earth AND formless") == {1: 2}
+        assert search("king AND philistines") == {2: 2, 3: 3}
+        assert search("philistines NOT king") == {4: 2}
+        assert search("(earth OR philistines) NOT (void OR abimelech)") == {
+            0: 1,
+            3: 1,
+            4: 2,
+        }
+        assert search('"king of the" philistines', [range(3, 5)]) == {3: 3, 4: 2}
+        with pytest.raises(ValueError):
+            search("NOT earth")
+        with pytest.raises(ValueError):
+            search("(NOT earth) AND (NOT void)")
+
+    def test_prefix(self):
+        """Test that wildcards expand through the sorted vocabulary."""
+        assert KeywordQuery.parse("Philistin* NOT king").root == Or(
+            (Prefix("philistin"), Not(Term(("king",))))
+        )
+        assert KeywordQuery.parse("enem*").terms() == []
+        assert search("philistin*") == {2: 1, 3: 1, 4: 2}
+        assert search("ea* AND form*") == {1: 2}
+        assert search("heav* OR pers*") == {0: 1, 5: 1}
+        assert search("zz*") == {}
+        with pytest.raises(ValueError):
+            search("love NEAR/2 enem*")
+
+        query = KeywordQuery.parse('"love your" OR (enem* NOT hate) OR love')
+        assert query.leaves() == [
+            Term(("love", "your")),
+            Prefix("enem"),
+            Term(("hate",)),
+            Term(("love",)),
+        ]
+        assert query.leaves(positive=True) == [
+            Term(("love", "your")),
+            Prefix("enem"),
+            Term(("love",)),
+        ]
+
+        query = KeywordQuery.parse("earth OR philistin*")
+        assert query.correct({"philistin": ["philistines"]}).root == query.root
+        with pytest.raises(ValueError):
+            query.evaluate(build_scan_postings(query))
+
+    def test_near(self):
+        """Test proximity in both directions, excluding overlaps."""
+        assert search("love NEAR/1 enemies") == {5: 1}
+        assert search("enemies NEAR/1 love") == {5: 1}
+        assert search("love NEAR/0 enemies") == {}
+        assert search('"love your" NEAR/0 enemies') == {5: 1}
+        assert search('king NEAR/0 "of the philistines"') == {2: 1, 3: 1}
+        assert search("king NEAR/3 king") == {3: 2}
+        assert search("earth NEAR/5 heavens") == {0: 1}
+
+    def test_scan_postings(self):
+        """Test that the scan engine evaluates the same boolean queries."""
+        for text in ["king AND philistines NOT abimelech", '"king of" earth']:
+            query = KeywordQuery.parse(text)
+            assert dict(query.evaluate(build_scan_postings(query))) == search(text)
+
+        query = KeywordQuery.parse("love NEAR/1 enemies")
+        with pytest.raises(ValueError):
+            query.evaluate(build_scan_postings(query))
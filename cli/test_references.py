@@ -0,0 +1,159 @@
+"""
+Tests for the references module.
+"""
+
+import pytest
+
+from .references import (
+    BOOKS,
+    LAST_VERSE,
+    PassageRef,
+    VerseRef,
+    book_number,
+    normalize_book,
+    parse_reference,
+    parse_references,
+)
+
+
+class TestBooks:
+    """Test cases for book name lookups."""
+
+    def test_canonical_order(self):
+        """Test that books are numbered in canonical order."""
+        assert len(BOOKS) == 66
+        assert book_number("Genesis") == 1
+        assert book_number("Matthew") == 40
+        assert book_number("Revelation") == 66
+        assert book_number("Unknown") is None
+
+    def test_abbreviations(self):
+        """Test codes, short forms and unambiguous prefixes."""
+        for name in ["gen", "Gen.", "GENESIS", "ge"]:
+            assert normalize_book(name) == "Genesis"
+        for name in ["Jn", "jhn", "john"]:
+            assert normalize_book(name) == "John"
+        assert normalize_book("1 Jn") == "1 John"
+        assert normalize_book("1cor") == "1 Corinthians"
+        assert normalize_book("Psalm") == "Psalms"
+        assert normalize_book("Song of Songs") == "Song of Solomon"
+        assert normalize_book("Phil") == "Philippians"
+        assert normalize_book("Phm") == "Philemon"
+
+    def test_ambiguous_and_unknown_names_unchanged(self):
+        """Test that names matching no single book are returned as given."""
+        assert normalize_book("Jo") == "Jo"
+        assert normalize_book("Unknown") == "Unknown"
+
+
+class TestVerseRef:
+    """Test cases for VerseRef."""
+
+    def test_packing(self):
+        """Test that a reference round trips through its integer."""
+        ref = VerseRef.of("Jn", 3, 16)
+        assert ref == 43_003_016
+        assert (ref.book_number, ref.book, ref.chapter, ref.verse) == (
+            43,
+            "John",
+            3,
+            16,
+        )
+        assert str(ref) == "John 3:16"
+        assert VerseRef(int(ref)) == ref
+
+    def test_canonical_ordering(self):
+        """Test that integer order is canonical order."""
+        refs = [
+            VerseRef.of("Revelation", 1, 1),
+            VerseRef.of("Psalms", 119, 176),
+            VerseRef.of("Psalms", 2, 1),
+            VerseRef.of("Genesis", 50, 26),
+        ]
+        assert [str(ref) for ref in sorted(refs)] == [
+            "Genesis 50:26",
+            "Psalms 2:1",
+            "Psalms 119:176",
+            "Revelation 1:1",
+        ]
+
+    def test_invalid(self):
+        """Test that unknown books and out of range numbers raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown book"):
+            VerseRef.of("Enoch", 1, 1)
+        with pytest.raises(ValueError, match="Invalid reference"):
+            VerseRef.of("John", 3, 1000)
+
+
+class TestParseReference:
+    """Test cases for parse_reference."""
+
+    def test_chapters_and_verses(self):
+        """Test whole chapters and single verses."""
+        assert parse_reference("Genesis 1") == PassageRef("Genesis", 1)
+        assert parse_reference("John 3:16") == PassageRef("John", 3, 16)
+        assert parse_reference(" 1 John  4:8 ") == PassageRef("1 John", 4, 8)
+        assert parse_reference("Song of Solomon 2") == PassageRef("Song of Solomon", 2)
+        assert parse_reference("Gen. 1:1") == PassageRef("Genesis", 1, 1)
+
+    def test_ranges(self):
+        """Test verse ranges, chapter ranges and ranges across chapters."""
+        assert parse_reference("Psalms 119:1-40") == PassageRef(
+            "Psalms", 119, 1, 119, 40
+        )
+        assert parse_reference("John 3-4") == PassageRef("John", 3, None, 4)
+        assert parse_reference("John 3:16-4:2") == PassageRef("John", 3, 16, 4, 2)
+        assert parse_reference("John 3:16 – 18") == PassageRef("John", 3, 16, 3, 18)
+
+    def test_bounds_and_str(self):
+        """Test range bounds as packed references and formatting."""
+        john = VerseRef.of("John", 3, 0)
+        assert parse_reference("John 3").bounds() == (john, john + LAST_VERSE)
+        first, last = parse_reference("Jn 3:16-4:2").bounds()
+        assert (first, last) == (VerseRef.of("John", 3, 16), VerseRef.of("John", 4, 2))
+        assert first <= VerseRef.of("John", 3, 36) <= last
+        assert parse_reference("John 3:16").bounds() == (first, first)
+
+        for reference in ["John 3", "John 3-4", "John 3:16", "John 3:16-18"]:
+            assert str(parse_reference(reference)) == reference
+        assert str(parse_reference("jn 3:16-4:2")) == "John 3:16-4:2"
+
+    @pytest.mark.parametrize(
+        "reference", ["", "John", "3:16", "John 3:", "John three", "John 3:16-"]
+    )
+    def test_invalid(self, reference):
+        """Test that malformed references raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid reference"):
+            parse_reference(reference)
+
+
+class TestParseReferences:
+    """Test cases for parse_references."""
+
+    def test_lists(self):
+        """Test lists of references across books."""
+        assert parse_references("Jn 3:16-18; Rom 8:28") == [
+            PassageRef("John", 3, 16, 3, 18),
+            PassageRef("Romans", 8, 28),
+        ]
+        assert parse_references("Genesis 1") == [PassageRef("Genesis", 1)]
+
+    def test_continuations(self):
+        """Test parts without a book, as verses or as chapters."""
+        assert parse_references("John 3:16, 18-20; 4:2, 5; 6") == [
+            PassageRef("John", 3, 16),
+            PassageRef("John", 3, 18, 3, 20),
+            PassageRef("John", 4, 2),
+            PassageRef("John", 4, 5),
+            PassageRef("John", 6),
+        ]
+        assert parse_references("Psalms 1, 23") == [
+            PassageRef("Psalms", 1),
+            PassageRef("Psalms", 23),
+        ]
+
+    @pytest.mark.parametrize("text", ["", "3:16; John 3", "John 3:16;", "John 3; x"])
+    def test_invalid(self, text):
+        """Test that malformed lists raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid reference"):
+            parse_references(text)
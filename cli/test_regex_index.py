@@ -0,0 +1,125 @@
+"""
+Tests for the regex index module.
+"""
+
+import re
+
+import pytest
+
+from .binfile import SectionFile, write_sections
+from .regex_index import AllOf, AnyOf, TrigramIndex, trigram_query
+
+VERSES = [
+    "Thus says the LORD of Hosts: Consider your ways.",
+    "The LORD of hosts is with us; the God of Jacob is our fortress.",
+    "Holy, holy, holy is the Lord God Almighty.",
+    "Jesus wept.",
+    "And the Son of Man came eating and drinking.",
+    "Truly this was the Son of God!",
+    "Grace, mercy, and peace from God the Father.",
+]
+
+
+def build_index():
+    return TrigramIndex.build(VERSES)
+
+
+def search(index, pattern, flags=0, verse_ranges=None):
+    compiled = re.compile(pattern, flags)
+    return [
+        verse_id
+        for verse_id in index.candidates(trigram_query(pattern, flags), verse_ranges)
+        if compiled.search(VERSES[verse_id])
+    ]
+
+
+class TestTrigramQuery:
+    """Test cases for trigram_query."""
+
+    def test_literals(self):
+        """Test required trigrams of literals, sequences and repeats."""
+        assert trigram_query("wept") == AllOf(("ept", "wep"))
+        assert trigram_query("(?i)WEPT") == AllOf(("ept", "wep"))
+        assert trigram_query("x{3}") == "xxx"
+        assert trigram_query(r"\bwept\b") == AllOf(("ept", "wep"))
+        assert trigram_query(r"wept\w+ Jesus") == AllOf(
+            ("ept", "wep", " je", "esu", "jes", "sus")
+        )
+        assert trigram_query("(wept)+") == AllOf(("ept", "wep"))
+
+    def test_alternatives(self):
+        """Test branches and character classes."""
+        assert trigram_query("Son of (Man|God)") == AnyOf(
+            (
+                AllOf((" go", " of", "f g", "god", "n o", "of ", "on ", "son")),
+                AllOf((" ma", " of", "f m", "man", "n o", "of ", "on ", "son")),
+            )
+        )
+        # Case variants fold to the same trigrams
+        assert trigram_query("[Hh]osts") == trigram_query("hosts")
+        assert trigram_query("grace|mercy") == AnyOf(
+            (AllOf(("ace", "gra", "rac")), AllOf(("erc", "mer", "rcy")))
+        )
+
+    def test_no_literals(self):
+        """Test patterns that leave every verse as a candidate."""
+        for pattern in ["ab", r"\d+:\d+", "a.*b", "(Jesus)?", "Jesus|.", "[^a]bc"]:
+            assert trigram_query(pattern) is None, pattern
+
+    def test_invalid_pattern(self):
+        """Test that invalid patterns raise re.error."""
+        with pytest.raises(re.error):
+            trigram_query("(unclosed")
+
+
+class TestTrigramIndex:
+    """Test cases for TrigramIndex."""
+
+    def test_candidates(self):
+        """Test that the prefilter narrows verses without losing matches."""
+        index = build_index()
+
+        query = trigram_query(r"\bLORD of (hosts|Hosts)\b")
+        assert list(index.candidates(query)) == [0, 1]
+        assert list(index.candidates(trigram_query("Jesus wept"))) == [3]
+        assert list(index.candidates(trigram_query("Pharaoh"))) == []
+        assert list(index.candidates(None)) == list(range(len(VERSES)))
+        assert list(index.candidates(None, [range(2, 4)])) == [2, 3]
+        assert list(index.candidates(trigram_query("God"), [range(2, 5)])) == [2]
+
+    def test_matches_full_scan(self):
+        """Test that prefiltered search equals matching every verse."""
+        index = build_index()
+
+        for pattern, flags in [
+            (r"\bLORD of (hosts|Hosts)\b", 0),
+            (r"LORD of hosts", 0),
+            (r"LORD of hosts", re.IGNORECASE),
+            (r"Son of (Man|God)", 0),
+            (r"holy, (holy, )+holy", re.IGNORECASE),
+            (r"(grace|peace)\W+\w+", 0),
+            (r"[A-Z]\w+ wept", 0),
+            (r"^\w+ \w+\.$", 0),
+        ]:
+            expected = [
+                verse_id
+                for verse_id, text in enumerate(VERSES)
+                if re.search(pattern, text, flags)
+            ]
+            assert search(index, pattern, flags) == expected, pattern
+
+    def test_section_round_trip(self, tmp_path):
+        """Test that an index survives writing and memory-mapping."""
+        index = build_index()
+        path = tmp_path / "trigrams.bin"
+        meta, sections = index.to_sections()
+        write_sections(path, meta, sections)
+
+        section_file = SectionFile(path)
+        try:
+            loaded = TrigramIndex.from_sections(section_file)
+            assert loaded.num_verses == len(VERSES)
+            assert search(loaded, "Son of (Man|God)") == [4, 5]
+        finally:
+            del loaded
+            section_file.close()
@@ -0,0 +1,86 @@
+"""
+Tests for the related chapters module.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from .binfile import SectionFile, write_sections
+from .related import RelatedChapters
+from .semantic_index import TfidfIndex
+
+CHAPTERS = [
+    "lord shepherd want green pastures still waters",
+    "shepherd sheep flock lost found rejoice",
+    "beginning created heavens earth light darkness",
+    "heavens earth completed seventh day rest",
+    "shepherd lord sheep pastures",
+]
+
+
+def build_graph(max_neighbors=2, keys=None):
+    keys = range(len(CHAPTERS)) if keys is None else keys
+    index = TfidfIndex.build((key, text.split()) for key, text in zip(keys, CHAPTERS))
+    return index, RelatedChapters.build(index, max_neighbors)
+
+
+class TestRelatedChapters:
+    """Test cases for RelatedChapters."""
+
+    def test_neighbors_match_semantic_search(self):
+        """Test that each row holds the chapter's own best search hits."""
+        index, graph = build_graph()
+        assert len(graph) == len(CHAPTERS)
+        for chapter_id, text in enumerate(CHAPTERS):
+            expected = [
+                (doc_id, score)
+                for doc_id, score in index.search(text.split(), 3)
+                if doc_id != chapter_id
+            ][:2]
+            related = graph.related(chapter_id)
+            assert [doc_id for doc_id, _ in related] == [d for d, _ in expected]
+            for (_, similarity), (_, score) in zip(related, expected):
+                assert similarity == pytest.approx(score, abs=1 / 255)
+
+    def test_build_without_scipy(self):
+        """Test that the per-query fallback builds the same graph."""
+        _, graph = build_graph()
+        with patch("cli.semantic_index.sparse", None):
+            _, fallback = build_graph()
+        for chapter_id in range(len(CHAPTERS)):
+            assert fallback.related(chapter_id) == graph.related(chapter_id)
+
+    def test_related(self):
+        """Test limits, unrelated chapters and unknown chapter ids."""
+        _, graph = build_graph()
+        assert [doc_id for doc_id, _ in graph.related(0)] == [4, 1]
+        assert [doc_id for doc_id, _ in graph.related(0, 1)] == [4]
+        assert graph.related(0, 0) == []
+        assert [doc_id for doc_id, _ in graph.related(2)] == [3]
+        assert graph.related(-1) == []
+        assert graph.related(len(CHAPTERS)) == []
+
+    def test_rows_follow_document_keys(self):
+        """Test that rows and neighbours are chapter ids, not document ids."""
+        _, graph = build_graph(keys=[10, 11, 12, 13, 14])
+        assert len(graph) == 15
+        assert graph.related(0) == []
+        assert [doc_id for doc_id, _ in graph.related(10)] == [14, 11]
+
+    def test_sections_round_trip(self, tmp_path):
+        """Test that the graph survives a section file round trip."""
+        _, graph = build_graph()
+        meta, sections = graph.to_sections()
+        assert meta == {"num_chapters": len(CHAPTERS)}
+        path = tmp_path / "related.bin"
+        write_sections(path, meta, sections)
+
+        section_file = SectionFile(path)
+        try:
+            loaded = RelatedChapters.from_sections(section_file)
+            for chapter_id in range(len(CHAPTERS)):
+                assert loaded.related(chapter_id) == graph.related(chapter_id)
+        finally:
+            del loaded
+            section_file.close()
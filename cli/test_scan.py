@@ -0,0 +1,77 @@
+"""
+Tests for the scan module.
+"""
+
+from collections import Counter
+
+from .corpus import CorpusBuilder
+from .keyword_index import PositionalIndex
+from .scan import CorpusScanner
+from .text_analysis import tokenize_words
+
+VERSES = [
+    "In the beginning God created the heavens and the earth.",
+    "The earth was formless and void.",
+    "Abimelech king of the Philistines looked down.",
+    "The king of the king of the Philistines.",
+    "Philistines, Philistines!",
+    "THE END of the earth",
+]
+
+
+def build_corpus():
+    builder = CorpusBuilder()
+    for verse, text in enumerate(VERSES, start=1):
+        builder.add_verse("Genesis", 1 + verse // 4, verse, text)
+    return builder.build()
+
+
+def index_counts(index, terms, verse_range=None):
+    counts = Counter()
+    for term in terms:
+        counts.update(index.phrase_counts(term, verse_range))
+    return counts
+
+
+class TestCorpusScanner:
+    """Test cases for CorpusScanner."""
+
+    def test_matches_positional_index(self):
+        """Test that one scan gives the same counts as the positional index."""
+        scanner = CorpusScanner.build(build_corpus())
+        index = PositionalIndex.build(tokenize_words(text) for text in VERSES)
+
+        for terms in [
+            [["the"]],
+            [["earth"], ["the"], ["philistines"]],
+            [["king", "of", "the"], ["king"], ["of", "the", "philistines"]],
+            [["the", "the"]],
+            [["philistines", "philistines"]],
+            [["the"], ["the"]],
+            [["philistine"]],
+            [["earth", "the"]],
+        ]:
+            assert scanner.verse_counts(terms) == index_counts(index, terms), terms
+            assert scanner.verse_counts(terms, [range(2, 4)]) == index_counts(
+                index, terms, range(2, 4)
+            ), terms
+
+    def test_term_counts(self):
+        """Test per-term counts from one pass, keeping empty terms aligned."""
+        scanner = CorpusScanner.build(build_corpus())
+
+        assert scanner.term_counts([["earth"], [], ["king", "of"]]) == [
+            {0: 1, 1: 1, 5: 1},
+            {},
+            {2: 1, 3: 2},
+        ]
+        assert scanner.term_counts([["the"]], [range(1, 2)]) == [{1: 1}]
+
+    def test_case_folded_text(self):
+        """Test that the folded text keeps one line per verse."""
+        scanner = CorpusScanner.build(build_corpus())
+
+        assert scanner.text.split("\n")[5] == "the end of the earth"
+        assert list(scanner.verse_starts)[:2] == [0, len(VERSES[0]) + 1]
+        assert scanner.verse_counts([[]]) == {}
+        assert scanner.verse_counts([["earth"]], []) == {}
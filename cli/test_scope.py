@@ -0,0 +1,92 @@
+"""
+Tests for the scope module.
+"""
+
+import pytest
+
+from .corpus import CorpusBuilder
+from .references import BOOKS
+from .scope import (
+    NEW_TESTAMENT_BOOKS,
+    SearchScope,
+    doc_id_ranges,
+    intersect_ranges,
+    merge_ranges,
+)
+
+
+def build_corpus():
+    builder = CorpusBuilder()
+    for book, chapters in [("Genesis", 3), ("Exodus", 2), ("Isaiah", 4), ("John", 3)]:
+        for chapter in range(1, chapters + 1):
+            builder.add_verse(book, chapter, 1, f"{book} {chapter}:1.")
+    return builder.build()
+
+
+class TestSearchScope:
+    """Test cases for SearchScope."""
+
+    def test_empty_scope(self):
+        """Test that an empty scope does not restrict the search."""
+        scope = SearchScope()
+        assert not scope
+        assert scope.chapter_ranges(build_corpus()) is None
+
+    def test_books_and_testament(self):
+        """Test book, book list and testament resolution."""
+        corpus = build_corpus()
+
+        assert SearchScope(book="Exodus").chapter_ranges(corpus) == [range(3, 5)]
+        assert SearchScope(books=["John", "Genesis", "Exodus"]).chapter_ranges(
+            corpus
+        ) == [range(0, 5), range(9, 12)]
+        assert SearchScope(testament="nt").chapter_ranges(corpus) == [range(9, 12)]
+        assert SearchScope(testament="OT").chapter_ranges(corpus) == [range(0, 9)]
+        assert len(NEW_TESTAMENT_BOOKS) == 27
+        assert "Malachi" not in NEW_TESTAMENT_BOOKS and BOOKS[-1] in NEW_TESTAMENT_BOOKS
+        # Criteria intersect; unknown books match nothing
+        assert SearchScope(book="John", testament="OT").chapter_ranges(corpus) == []
+        assert SearchScope(book="Leviticus").chapter_ranges(corpus) == []
+
+    def test_book_range(self):
+        """Test canonical ranges by book and by chapter."""
+        corpus = build_corpus()
+
+        def chapters(book_range):
+            return SearchScope(book_range=book_range).chapter_ranges(corpus)
+
+        assert chapters("Genesis-Exodus") == [range(0, 5)]
+        assert chapters("Isaiah 2-3") == [range(6, 8)]
+        assert chapters("Exodus 2-Isaiah 1") == [range(4, 6)]
+        assert chapters("John 3") == [range(11, 12)]
+        assert chapters("Isaiah") == [range(5, 9)]
+        assert chapters("Isaiah 9-10") == []
+        assert chapters("Exodus-Genesis") == []
+
+    def test_invalid_values(self):
+        """Test that malformed scopes raise ValueError."""
+        with pytest.raises(ValueError):
+            SearchScope(testament="apocrypha")
+        with pytest.raises(ValueError):
+            SearchScope(book_range="40-55")
+
+
+class TestRanges:
+    """Test cases for the range helpers."""
+
+    def test_merge_and_intersect(self):
+        """Test merging and intersecting sorted range lists."""
+        assert merge_ranges([range(5, 7), range(0, 2), range(2, 3), range(4, 4)]) == [
+            range(0, 3),
+            range(5, 7),
+        ]
+        assert intersect_ranges(
+            [range(0, 4), range(6, 10)], [range(2, 7), range(9, 12)]
+        ) == [range(2, 4), range(6, 7), range(9, 10)]
+
+    def test_doc_id_ranges(self):
+        """Test that block-ordered keys map to contiguous doc ids."""
+        # Two chapters of keys, unsorted inside each block
+        doc_keys = [10, 11, 12, 10, 20, 21, 20]
+        assert doc_id_ranges(doc_keys, [range(10, 20)]) == [range(0, 4)]
+        assert doc_id_ranges(doc_keys, [range(20, 30)]) == [range(4, 7)]
@@ -2,11 +2,23 @@
 Tests for the scripture module.
 """
 
+import os
 from unittest.mock import Mock, patch
 
 import pytest
 
-from .scripture import BSBParser, get_bsb_parser
+from .scope import SearchScope
+from .scripture import BSBParser, get_bsb_parser, reciprocal_rank_fusion
+
+
+def mock_bsb_response(text):
+    """Build a mock streaming HTTP response for bsb.txt content."""
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.headers = {}
+    mock_response.iter_lines.return_value = text.split("\n")
+    mock_response.raise_for_status.return_value = None
+    return mock_response
 
 
 class TestBSBParser:
@@ -30,6 +42,8 @@ class TestBSBParser:
         assert parser._normalize_book_name("mat") == "Matthew"
         assert parser._normalize_book_name("jhn") == "John"
         assert parser._normalize_book_name("rev") == "Revelation"
+        assert parser._normalize_book_name(" 1 Jn ") == "1 John"
+        assert parser._normalize_book_name("Rom.") == "Romans"
 
         # Test full names
         assert parser._normalize_book_name("Genesis") == "Genesis"
@@ -42,13 +56,12 @@ class TestBSBParser:
     def test_download_and_parse_success(self, mock_get):
         """Test successful download and parsing."""
         # Mock successful response with correct BSB format
-        mock_response = Mock()
-        mock_response.text = """Genesis 1:1 In the beginning God created the heavens and the earth.
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
 Genesis 1:2 The earth was formless and void, and darkness was over the surface of the deep.
 Genesis 2:1 Thus the heavens and the earth were completed, and all their hosts.
 Genesis 2:2 By the seventh day God completed His work which He had done."""
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        )
 
         # Create parser with a custom cache directory to avoid conflicts
         parser = BSBParser(cache_dir="/tmp/test_cache_success")
@@ -67,8 +80,8 @@ Genesis 2:2 By the seventh day God completed His work which He had done."""
     def test_download_and_parse_with_numbered_books(self, mock_get):
         """Test that books with numbers in their names are properly parsed."""
         # Mock response with numbered books that were previously failing
-        mock_response = Mock()
-        mock_response.text = """1 Samuel 1:1 Now there was a certain man of Ramathaim-zophim.
+        mock_get.return_value = mock_bsb_response(
+            """1 Samuel 1:1 Now there was a certain man of Ramathaim-zophim.
 1 Samuel 1:2 And he had two wives.
 2 Samuel 1:1 Now it came about after the death of Saul.
 1 Corinthians 1:1 Paul, called as an apostle of Christ Jesus.
@@ -80,8 +93,7 @@ Genesis 2:2 By the seventh day God completed His work which He had done."""
 1 John 1:1 What was from the beginning.
 2 John 1:1 The elder to the chosen lady.
 3 John 1:1 The elder to the beloved Gaius."""
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        )
 
         # Create parser with a custom cache directory to avoid conflicts
         parser = BSBParser(cache_dir="/tmp/test_cache")
@@ -174,13 +186,12 @@ class TestBSBParserIntegration:
     def test_full_parsing_workflow(self, mock_get):
         """Test the complete parsing workflow."""
         # Mock BSB text with multiple books and chapters in correct format
-        mock_response = Mock()
-        mock_response.text = """Genesis 1:1 In the beginning God created the heavens and the earth.
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
 Genesis 1:2 The earth was formless and void.
 Genesis 2:1 Thus the heavens and the earth were completed.
 Exodus 1:1 Now these are the names of the sons of Israel."""
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        )
 
         # Create parser with a custom cache directory to avoid conflicts
         parser = BSBParser(cache_dir="/tmp/test_cache_workflow")
@@ -210,6 +221,612 @@ Exodus 1:1 Now these are the names of the sons of Israel."""
         assert len(results) > 0
         assert any("God" in result[3] for result in results)
 
+    @patch("requests.get")
+    def test_keyword_search_workflow(self, mock_get, tmp_path):
+        """Test whole-word, phrase and book-filtered keyword search."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 26:1 Now there was a famine in the land.
+Genesis 26:8 Abimelech king of the Philistines looked down.
+Genesis 26:14 The Philistines envied him; the Philistines were many.
+Judges 15:3 Samson said to the Philistines, the king of the Philistines.
+Judges 16:5 The lords of the Philistines went up to her."""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+
+        results = parser.search_keyword("Philistines")
+        assert [(r[0], r[1], r[2]) for r in results] == [
+            ("Genesis", 26, 3),
+            ("Judges", 15, 2),
+            ("Judges", 16, 1),
+        ]
+        assert results[0][3][0] == (8, "Abimelech king of the Philistines looked down.")
+
+        # Whole words only
+        assert parser.search_keyword("Philistine") == []
+
+        # Quoted phrases match consecutive words
+        results = parser.search_keyword('"king of the Philistines"')
+        assert [(r[0], r[1], r[2]) for r in results] == [
+            ("Genesis", 26, 1),
+            ("Judges", 15, 1),
+        ]
+
+        # Book filter uses the index instead of post-filtering
+        results = parser.search_keyword("Philistines", book="jud")
+        assert [r[0] for r in results] == ["Judges", "Judges"]
+        assert parser.search_keyword("Philistines", max_results=1)[0][:2] == (
+            "Genesis",
+            26,
+        )
+
+        # Verse-level search returns canonical order
+        assert [r[:3] for r in parser.search_text("the philistines", 2)] == [
+            ("Genesis", 26, 8),
+            ("Genesis", 26, 14),
+        ]
+
+        # The scan engine answers the same queries without the index
+        scanner = BSBParser(cache_dir=str(tmp_path / "scan"))
+        for query, book in [
+            ("Philistines", None),
+            ('"king of the Philistines"', None),
+            ("Philistines king", "jud"),
+        ]:
+            assert scanner.search_keyword(
+                query, book=book, engine="scan"
+            ) == parser.search_keyword(query, book=book)
+        assert scanner.search_text("the philistines", 2, engine="scan") == (
+            parser.search_text("the philistines", 2)
+        )
+        assert scanner.keyword_index is None
+        with pytest.raises(ValueError):
+            scanner.search_keyword("Philistines", engine="grep")
+
+        # Boolean, proximity and filter syntax
+        results = parser.search_keyword("Philistines NOT Samson")
+        assert [(r[0], r[1], r[2]) for r in results] == [
+            ("Genesis", 26, 3),
+            ("Judges", 16, 1),
+        ]
+        results = parser.search_keyword("king AND Philistines book:Genesis")
+        assert [(r[0], r[1], r[2]) for r in results] == [("Genesis", 26, 2)]
+        results = parser.search_keyword("Samson NEAR/3 Philistines")
+        assert [(r[0], r[1], r[2]) for r in results] == [("Judges", 15, 1)]
+        assert parser.search_keyword("Samson NEAR/2 Philistines") == []
+        assert parser.search_keyword("famine book:Judges") == []
+        assert parser.search_keyword(
+            "envied OR lords", scope=SearchScope(testament="OT")
+        ) == parser.search_keyword("envied lords")
+        assert scanner.search_keyword(
+            "Philistines NOT Samson", engine="scan"
+        ) == parser.search_keyword("Philistines NOT Samson")
+        with pytest.raises(ValueError):
+            parser.search_keyword("NOT Samson")
+
+        # Wildcards expand to every word with the prefix
+        assert parser.search_keyword("Philistin* NOT Samson") == (
+            parser.search_keyword("Philistines NOT Samson")
+        )
+        assert [(r[0], r[1], r[2]) for r in parser.search_keyword("lo*")] == [
+            ("Genesis", 26, 1),
+            ("Judges", 16, 1),
+        ]
+
+        # Completion of book names (or abbreviations) and words
+        assert parser.complete("ju") == {"books": ["Judges"], "words": []}
+        assert parser.complete("gen") == {"books": ["Genesis"], "words": []}
+        assert parser.complete("Phil") == {"books": [], "words": ["philistines"]}
+        assert parser.complete("the", 2) == {"books": [], "words": ["the", "there"]}
+        assert parser.complete("  ") == {"books": [], "words": []}
+
+        # Misspelled words resolve to the closest spellings in the corpus
+        assert parser.keyword_corrections('Filistines NOT "Samsom said"') == {
+            "filistines": ["philistines"],
+            "samsom": ["samson"],
+        }
+        assert parser.keyword_corrections("Philistines OR qxz") == {}
+        assert parser.search_keyword("Filistines") == []
+        assert parser.search_keyword(
+            "Filistines NOT Samsom", fuzzy=True
+        ) == parser.search_keyword("Philistines NOT Samson")
+        assert parser.search_text("the filistines", 2, fuzzy=True) == (
+            parser.search_text("the philistines", 2)
+        )
+
+    @patch("requests.get")
+    def test_hybrid_search_workflow(self, mock_get, tmp_path):
+        """Test that keyword and semantic rankings fuse into one list."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
+Genesis 2:1 Thus the heavens and the earth were completed.
+Exodus 1:1 Now these are the names of the sons of Israel.
+John 1:1 In the beginning was the Word, and the Word was with God."""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+
+        query = "heavens Word"
+        results = parser.search_hybrid(query, 10)
+        keyword = [r[:2] for r in parser.search_keyword(query, 10)]
+        semantic = [r[:2] for r in parser.search_semantic(query, 10)]
+        assert len({r[:2] for r in results}) == len(results) == 3
+        for book, chapter, score, keyword_rank, semantic_rank, text in results:
+            ranks = [keyword_rank, semantic_rank]
+            for rank, ranking in zip(ranks, [keyword, semantic]):
+                expected = ranking.index((book, chapter)) + 1
+                assert rank == (expected if (book, chapter) in ranking else None)
+            assert score == pytest.approx(
+                sum(1 / (60 + rank) for rank in ranks if rank is not None)
+            )
+            assert text == parser.get_chapter(book, chapter)
+        assert [r[2] for r in results] == sorted((r[2] for r in results), reverse=True)
+
+        # Excluded terms are not scored semantically
+        results = parser.search_hybrid("beginning NOT Word")
+        assert [r[:2] + r[3:5] for r in results] == [
+            ("Genesis", 1, 1, 1),
+            ("John", 1, None, 2),
+        ]
+
+        # Stop words don't rank chapters by keyword when other words remain
+        results = parser.search_hybrid("the Word", 5)
+        assert [(r[0], r[3]) for r in results] == [("John", 1)]
+
+        # Scopes, query filters and spelling corrections apply to both sides
+        results = parser.search_hybrid("heavens", scope=SearchScope(book="Gen"))
+        assert {r[0] for r in results} == {"Genesis"}
+        assert parser.search_hybrid("heavens book:John") == []
+        assert parser.search_hybrid("Wrod", fuzzy=True)[0][:2] == ("John", 1)
+        with pytest.raises(ValueError):
+            parser.search_hybrid("(Word")
+        with pytest.raises(ValueError):
+            parser.search_hybrid("Word", scorer="bogus")
+
+    def test_reciprocal_rank_fusion(self):
+        """Test fused scores and per-ranking ranks."""
+        fused = reciprocal_rank_fusion([[7, 3, 5], [3, 9]], k=1)
+        assert [(item, ranks) for item, _, ranks in fused] == [
+            (3, (2, 1)),
+            (7, (1, None)),
+            (9, (None, 2)),
+            (5, (3, None)),
+        ]
+        assert fused[0][1] == pytest.approx(1 / 3 + 1 / 2)
+        assert reciprocal_rank_fusion([[], []]) == []
+
+    @patch("requests.get")
+    def test_regex_search_workflow(self, mock_get, tmp_path):
+        """Test trigram-prefiltered regex search over verses."""
+        mock_get.return_value = mock_bsb_response(
+            """Isaiah 6:3 Holy, holy, holy is the LORD of Hosts.
+Haggai 1:5 Now this is what the LORD of Hosts says: Consider your ways.
+Haggai 1:7 This is what the LORD of hosts says.
+Matthew 8:20 But the Son of Man has no place to lay His head.
+Mark 15:39 Truly this man was the Son of God!"""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+
+        results = parser.search_regex(r"\bLORD of (hosts|Hosts)\b")
+        assert [r[:3] for r in results] == [
+            ("Isaiah", 6, 3),
+            ("Haggai", 1, 5),
+            ("Haggai", 1, 7),
+        ]
+        assert results[0][3] == "Holy, holy, holy is the LORD of Hosts."
+        assert parser.search_regex("LORD of hosts", 5) == [results[2]]
+        assert parser.search_regex("lord of hosts", 2, ignore_case=True) == (
+            results[:2]
+        )
+        assert [r[0] for r in parser.search_regex(r"Son of \w+")] == [
+            "Matthew",
+            "Mark",
+        ]
+        assert parser.search_regex(r"Son of \w+", scope=SearchScope(book="Mark")) == [
+            ("Mark", 15, 39, "Truly this man was the Son of God!")
+        ]
+        assert len(parser.search_regex(r"\.$")) == 4
+        with pytest.raises(ValueError):
+            parser.search_regex("(unclosed")
+
+        # The trigram index is cached with the other components
+        cached = BSBParser(cache_dir=str(tmp_path))
+        assert cached.search_regex("Son of (Man|God)") == parser.search_regex(
+            "Son of (Man|God)"
+        )
+        assert cached.manifest.data["artifacts"]["regex_index"]
+
+    @patch("requests.get")
+    def test_semantic_search_workflow(self, mock_get, tmp_path):
+        """Test semantic search over the sparse chapter index."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
+Genesis 2:1 Thus the heavens and the earth were completed.
+Exodus 1:1 Now these are the names of the sons of Israel.
+John 1:1 In the beginning was the Word, and the Word was with God."""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+        assert parser.download_and_parse() is True
+
+        results = parser.search_semantic("sons of Israel", 5)
+        assert results[0][:2] == ("Exodus", 1)
+        assert "names of the sons" in results[0][3]
+        assert parser.search_semantic("zzzz", 5) == []
+
+        # Reloading from cache gives identical rankings
+        cached = BSBParser(cache_dir=str(tmp_path))
+        assert cached.search_semantic("beginning heavens", 5) == parser.search_semantic(
+            "beginning heavens", 5
+        )
+
+        # Batched search returns the same chapters per query
+        queries = ["sons of Israel", "beginning heavens", "zzzz"]
+        batch = cached.search_semantic_many(queries, 5, scorer="bm25")
+        for query, results in zip(queries, batch):
+            expected = cached.search_semantic(query, 5, scorer="bm25")
+            assert [r[:2] for r in results] == [r[:2] for r in expected]
+
+    @patch("requests.get")
+    def test_passage_workflow(self, mock_get, tmp_path):
+        """Test verse ranges within and across chapters."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
+Genesis 1:2 The earth was formless and void.
+Genesis 2:1 Thus the heavens and the earth were completed.
+Genesis 2:2 And by the seventh day God had finished His work.
+Exodus 1:1 Now these are the names of the sons of Israel."""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+        assert parser.get_passage("Genesis", 1, 2, 2, 1) == (
+            "Genesis",
+            1,
+            2,
+            2,
+            1,
+            "The earth was formless and void. "
+            "Thus the heavens and the earth were completed.",
+        )
+        assert parser.get_passage("gen", 1, 2) == (
+            "Genesis",
+            1,
+            2,
+            1,
+            2,
+            "The earth was formless and void.",
+        )
+        # Whole chapters, and ends clamped to the last verse
+        assert parser.get_passage("Genesis", 1, None, 2)[5] == " ".join(
+            [parser.get_chapter("Genesis", 1), parser.get_chapter("Genesis", 2)]
+        )
+        assert parser.get_passage("Genesis", 2, 1, None, 40)[1:5] == (2, 1, 2, 2)
+        # Numbered verses, with chapters after the first
+        assert parser.get_passage("Genesis", 1, 2, 2, 1, numbered=True)[5] == (
+            "2: The earth was formless and void. "
+            "2:1: Thus the heavens and the earth were completed."
+        )
+        # Ranges never run into the next book
+        assert parser.get_passage("Genesis", 2, 2, 3, 1) is None
+        assert parser.get_passage("Genesis", 1, 3) is None
+        assert parser.get_passage("Genesis", 2, 2, 1, 1) is None
+        assert parser.get_passage("Leviticus", 1, 1) is None
+
+    @patch("requests.get")
+    def test_related_chapters_workflow(self, mock_get, tmp_path):
+        """Test related chapter lookups from the precomputed graph."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
+Genesis 2:1 Thus the heavens and the earth were completed.
+Exodus 1:1 Now these are the names of the sons of Israel.
+John 1:1 In the beginning was the Word, and the Word was with God."""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+        related = parser.related_chapters("Genesis", 1, 5)
+        assert [r[:2] for r in related] == [("Genesis", 2), ("John", 1)]
+        assert related[0][2] > related[1][2] > 0
+        assert related[0][3].startswith("Thus the heavens")
+        assert [r[:2] for r in parser.related_chapters("gen", 1, 1)] == [("Genesis", 2)]
+        assert parser.related_chapters("Exodus", 1) == []
+        assert parser.related_chapters("Genesis", 50) == []
+
+        # The graph is cached and looked up without any search
+        cached = BSBParser(cache_dir=str(tmp_path))
+        with patch.object(cached, "_build_chapter_graph") as mock_build:
+            assert cached.related_chapters("Genesis", 1, 5) == related
+            mock_build.assert_not_called()
+        assert cached.semantic_index is None
+
+    @patch("requests.get")
+    def test_snippet_workflow(self, mock_get, tmp_path):
+        """Test highlighted verse previews and precomputed chapter leads."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 26:1 Now there was a famine in the land, besides the earlier famine.
+Genesis 26:2 The LORD appeared to Isaac and said, Do not go down to Egypt.
+Genesis 26:3 Stay in this land as a foreigner, and I will be with you.
+Genesis 26:8 Abimelech king of the Philistines looked down from the window.
+Genesis 26:14 He owned so many flocks that the Philistines envied him.
+John 11:35 Jesus wept."""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+        assert parser.snippet("Philistines", "Genesis", 26) == (
+            "8: Abimelech king of the **Philistines** looked down from the window. "
+            "14: ...owned so many flocks that the **Philistines** envied him."
+        )
+        # Verses with the most matched words first; phrases and prefixes
+        assert parser.snippet("famine OR land", "Genesis", 26, max_verses=1) == (
+            "1: Now there was a **famine** in the **land**, besides the earlier "
+            "**famine**."
+        )
+        assert parser.snippet('"king of the" OR Philist*', "Gen", 26, 1) == (
+            "8: Abimelech **king of the Philistines** looked down from the window."
+        )
+        # Stop words are not highlighted, misspellings only with fuzzy
+        assert parser.snippet("the wept", "John", 11) == "35: Jesus **wept**."
+        assert parser.snippet("wepp", "John", 11, fuzzy=True) == "35: Jesus **wept**."
+
+        # Chapters without matches get their precomputed lead
+        assert parser.snippet("wepp", "John", 11) == "Jesus wept."
+        lead = parser.snippet("zzzz (", "Genesis", 26)
+        assert lead.startswith("Now there was a famine") and lead.endswith("...")
+        assert parser.snippet("wept", "John", 99) is None
+
+        # Searches return the previews and corrections of one correction pass
+        with patch.object(
+            parser, "_corrections", wraps=parser._corrections
+        ) as mock_corrections:
+            keyword = parser.search_keyword_previews("Philistines OR wepp", fuzzy=True)
+            hybrid = parser.search_hybrid_previews("Philistines OR wepp", fuzzy=True)
+            assert mock_corrections.call_count == 2
+        assert keyword.corrections == hybrid.corrections == {"wepp": ["wept"]}
+        assert keyword.results == parser.search_keyword(
+            "Philistines OR wepp", fuzzy=True
+        )
+        assert hybrid.results == parser.search_hybrid("Philistines OR wepp", fuzzy=True)
+        for search in (keyword, hybrid):
+            assert search.previews == [
+                parser.snippet("Philistines OR wepp", book, chapter, fuzzy=True)
+                for book, chapter, *_ in search.results
+            ]
+        assert "35: Jesus **wept**." in keyword.previews
+
+        cached = BSBParser(cache_dir=str(tmp_path))
+        with patch.object(cached, "_build_snippets") as mock_build:
+            assert cached.snippet("zzzz", "Genesis", 26) == lead
+            mock_build.assert_not_called()
+
+    @patch("requests.get")
+    def test_passage_search_workflow(self, mock_get, tmp_path):
+        """Test that passage search returns tight, non-overlapping verse ranges."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
+Genesis 1:2 Now the earth was formless and void.
+Genesis 1:3 And God said, Let there be light, and there was light.
+Genesis 1:4 And God saw that the light was good.
+Genesis 1:5 God called the light day, and the darkness He called night.
+Genesis 1:6 And God said, Let there be an expanse between the waters.
+John 3:16 For God so loved the world that He gave His one and only Son."""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+        results = parser.search_passages("light darkness night", 3)
+        assert results[0][:4] == ("Genesis", 1, 5, 5)
+        assert results[0][5].startswith("God called the light day")
+        spans = [(r[2], r[3]) for r in results]
+        for i, (first, last) in enumerate(spans):
+            assert all(last < f or l < first for f, l in spans[i + 1 :])
+
+        # The passage index is cached alongside the chapter index
+        cached = BSBParser(cache_dir=str(tmp_path))
+        with patch.object(cached, "_build_passage_index") as mock_build:
+            assert cached.search_passages("light darkness night", 3) == results
+            mock_build.assert_not_called()
+        assert cached.search_passages("zzzz", 3) == []
+
+    @patch("requests.get")
+    def test_scoped_search_workflow(self, mock_get, tmp_path):
+        """Test that scoped searches return full pages from inside the scope."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
+Genesis 2:1 Thus the heavens and the earth were completed.
+Genesis 3:1 Now the serpent was more crafty than any beast of the field.
+Exodus 1:1 Now these are the names of the sons of Israel.
+Matthew 1:1 This is the record of the genealogy of Jesus Christ, the son of David.
+John 1:1 In the beginning was the Word, and the Word was with God.
+John 3:16 For God so loved the world that He gave His one and only Son."""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+        unscoped = parser.search_semantic("beginning God heavens", 1)
+        assert unscoped[0][:2] == ("Genesis", 1)
+
+        results = parser.search_semantic(
+            "beginning God heavens", 1, scope=SearchScope(testament="NT")
+        )
+        assert [r[:2] for r in results] == [("John", 1)]
+        results = parser.search_semantic_many(
+            ["heavens earth"], 5, scope=SearchScope(book_range="Genesis 2-Exodus")
+        )[0]
+        assert [r[:2] for r in results] == [("Genesis", 2)]
+
+        passages = parser.search_passages(
+            "son", 2, scope=SearchScope(books=["Matthew", "John"])
+        )
+        assert sorted(p[:4] for p in passages) == [
+            ("John", 3, 16, 16),
+            ("Matthew", 1, 1, 1),
+        ]
+
+        keywords = parser.search_keyword("the", 10, scope=SearchScope(book="gen"))
+        assert [k[:2] for k in keywords] == [
+            ("Genesis", 1),
+            ("Genesis", 2),
+            ("Genesis", 3),
+        ]
+        assert (
+            parser.search_keyword(
+                "the", 10, book="John", scope=SearchScope(testament="OT")
+            )
+            == []
+        )
+
+    @patch("requests.get")
+    def test_lsa_search_workflow(self, mock_get, tmp_path):
+        """Test chapter and verse search over the LSA embeddings."""
+        pytest.importorskip("scipy")
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
+Genesis 2:1 Thus the heavens and the earth were completed.
+Exodus 1:1 Now these are the names of the sons of Israel.
+John 1:1 In the beginning was the Word, and the Word was with God.
+John 3:16 For God so loved the world that He gave His one and only Son."""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+        results = parser.search_semantic("sons of Israel", 5, scorer="lsa")
+        assert results[0][:2] == ("Exodus", 1)
+
+        verses = parser.search_semantic_verses("loved world", 1)
+        assert verses[0][:3] == ("John", 3, 16)
+        assert verses[0][4].startswith("For God so loved")
+
+        # The embeddings are cached next to the other indexes
+        cached = BSBParser(cache_dir=str(tmp_path))
+        with patch.object(cached, "_build_lsa_index") as mock_build:
+            assert cached.search_semantic("sons of Israel", 5, scorer="lsa") == results
+            mock_build.assert_not_called()
+
+    @patch("requests.get")
+    def test_components_load_lazily(self, mock_get, tmp_path):
+        """Test that text lookups never load the semantic index."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
+John 3:16 For God so loved the world that He gave His one and only Son."""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+        assert parser.get_chapter("John", 3).startswith("For God so loved")
+        assert parser.semantic_index is None
+        assert not (tmp_path / "bsb_semantic.bin").exists()
+
+        # First semantic search builds and caches the index
+        assert parser.search_semantic("loved world")[0][:2] == ("John", 3)
+        assert (tmp_path / "bsb_semantic.bin").exists()
+
+        # A fresh parser maps the text only, then maps the cached index
+        cached = BSBParser(cache_dir=str(tmp_path))
+        with patch.object(cached, "_build_semantic_index") as mock_build:
+            assert cached.get_verse("Genesis", 1, 1).startswith("In the beginning")
+            assert cached.list_books() == ["Genesis", "John"]
+            assert cached.semantic_index is None
+            assert cached.search_semantic("loved world")[0][:2] == ("John", 3)
+            mock_build.assert_not_called()
+        assert mock_get.call_count == 1
+
+    @patch("requests.get")
+    def test_compressed_text_workflow(self, mock_get, tmp_path):
+        """Test a block-compressed text cache and switching compression."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
+Genesis 1:2 The earth was formless and void.
+John 3:16 For God so loved the world that He gave His one and only Son."""
+        )
+
+        raw = BSBParser(cache_dir=str(tmp_path))
+        assert raw.download_and_parse() is True
+
+        compressed = BSBParser(cache_dir=str(tmp_path), compression="zlib")
+        assert compressed.get_chapter("Genesis", 1) == raw.get_chapter("Genesis", 1)
+        assert compressed.corpus.compression == "none"
+
+        # The cache was rewritten in blocks, and is mapped as such next time
+        reloaded = BSBParser(cache_dir=str(tmp_path), compression="zlib")
+        assert reloaded.get_verse("John", 3, 16) == raw.get_verse("John", 3, 16)
+        assert reloaded.corpus.compression == "zlib"
+        assert reloaded.search_keyword("loved")[0][:2] == ("John", 3)
+        assert mock_get.call_count == 1
+
+        with pytest.raises(ValueError, match="Unknown compression"):
+            BSBParser(cache_dir=str(tmp_path), compression="brotli")
+
+    @patch("requests.get")
+    def test_loading_skips_checksums(self, mock_get, tmp_path):
+        """Test that loads compare file stamps and ``build_indexes`` checksums."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
+John 3:16 For God so loved the world that He gave His one and only Son."""
+        )
+        assert BSBParser(cache_dir=str(tmp_path)).build_indexes() is True
+
+        cached = BSBParser(cache_dir=str(tmp_path))
+        with patch("cli.manifest.file_sha256") as mock_hash:
+            assert cached.search_semantic("loved world")[0][:2] == ("John", 3)
+            mock_hash.assert_not_called()
+
+        # Same-size corruption with the old stamp is only caught by a checksum
+        path = tmp_path / "bsb_semantic.bin"
+        stat = path.stat()
+        path.write_bytes(bytes(stat.st_size))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        checked = BSBParser(cache_dir=str(tmp_path))
+        with patch.object(
+            checked, "_build_semantic_index", wraps=checked._build_semantic_index
+        ) as mock_build:
+            assert checked.build_indexes() is True
+            mock_build.assert_called_once()
+        assert mock_get.call_count == 1
+
+    @patch("requests.get")
+    def test_invalid_artifacts_rebuild_individually(self, mock_get, tmp_path):
+        """Test that stale or corrupt caches trigger only partial rebuilds."""
+        mock_get.return_value = mock_bsb_response(
+            """Genesis 1:1 In the beginning God created the heavens and the earth.
+John 3:16 For God so loved the world that He gave His one and only Son."""
+        )
+
+        parser = BSBParser(cache_dir=str(tmp_path))
+        assert parser.build_indexes() is True
+        assert mock_get.call_count == 1
+        manifest = parser.manifest.data
+        assert manifest["source_url"] == parser.url
+        assert set(manifest["artifacts"]) == {"text"} | set(BSBParser.COMPONENTS)
+
+        # A corrupt index is rebuilt without re-downloading the text
+        (tmp_path / "bsb_semantic.bin").write_bytes(b"garbage")
+        rebuilt = BSBParser(cache_dir=str(tmp_path))
+        with patch.object(
+            rebuilt, "_build_semantic_index", wraps=rebuilt._build_semantic_index
+        ) as mock_build:
+            assert rebuilt.search_semantic("loved world")[0][:2] == ("John", 3)
+            mock_build.assert_called_once()
+        assert mock_get.call_count == 1
+
+        # A corrupt text cache re-downloads, but the unchanged source keeps
+        # the index valid
+        (tmp_path / "bsb_text.bin").write_bytes(b"garbage")
+        redownloaded = BSBParser(cache_dir=str(tmp_path))
+        with patch.object(redownloaded, "_build_semantic_index") as mock_build:
+            assert redownloaded.build_indexes() is True
+            mock_build.assert_not_called()
+        assert mock_get.call_count == 2
+
+        # A tokenizer change invalidates the index only
+        components = {
+            "semantic_index": BSBParser.COMPONENTS["semantic_index"][:2]
+            + ("new-tokenizer",)
+        }
+        with patch.object(BSBParser, "COMPONENTS", components):
+            upgraded = BSBParser(cache_dir=str(tmp_path))
+            with patch.object(
+                upgraded, "_build_semantic_index", wraps=upgraded._build_semantic_index
+            ) as mock_build:
+                upgraded.build_indexes()
+                mock_build.assert_called_once()
+        assert mock_get.call_count == 2
+
 
 class TestGlobalFunctions:
     """Test cases for global functions."""
@@ -220,6 +837,12 @@ class TestGlobalFunctions:
         parser2 = get_bsb_parser()
         assert parser1 is parser2
         assert isinstance(parser1, BSBParser)
+        assert get_bsb_parser("bsb") is parser1
+
+    def test_get_bsb_parser_unknown_translation(self):
+        """Test that get_bsb_parser rejects unknown translations."""
+        with pytest.raises(ValueError, match="Unknown translation"):
+            get_bsb_parser("NO-SUCH-BIBLE")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,289 @@
+"""
+Tests for the semantic index module.
+"""
+
+import math
+import random
+
+import pytest
+
+from .binfile import SectionFile, write_sections
+from . import semantic_index
+from .semantic_index import TfidfIndex
+
+DOCUMENTS = [
+    (0, ["beginning", "created", "heavens", "earth", "earth"]),
+    (1, ["heavens", "earth", "completed", "seventh", "rested"]),
+    (2, ["beginning", "word", "word", "word", "god"]),
+    (3, ["god", "loved", "world", "gave", "son"]),
+]
+
+
+def dense_cosine(index, tokens, doc_id, documents=DOCUMENTS):
+    """Reference dense TF-IDF cosine similarity."""
+    vocabulary = sorted(index.terms)
+    doc_tokens = documents[doc_id][1]
+    query_vector = [
+        tokens.count(w) / len(tokens) * index.idf[index.term_ids[w]] for w in vocabulary
+    ]
+    doc_vector = [
+        doc_tokens.count(w) / len(doc_tokens) * index.idf[index.term_ids[w]]
+        for w in vocabulary
+    ]
+    dot = sum(a * b for a, b in zip(query_vector, doc_vector))
+    norm = math.sqrt(sum(a * a for a in query_vector)) * math.sqrt(
+        sum(b * b for b in doc_vector)
+    )
+    return dot / norm if norm else 0.0
+
+
+def reference_bm25(tokens, doc_id, k1=1.2, b=0.75, documents=DOCUMENTS):
+    """Reference Okapi BM25 computed directly from the documents."""
+    average_length = sum(len(t) for _, t in documents) / len(documents)
+    doc_tokens = documents[doc_id][1]
+    score = 0.0
+    for word in tokens:
+        df = sum(1 for _, t in documents if word in t)
+        tf = doc_tokens.count(word)
+        if not tf:
+            continue
+        idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+        score += (
+            idf
+            * tf
+            * (k1 + 1)
+            / (tf + k1 * (1 - b + b * len(doc_tokens) / average_length))
+        )
+    return score
+
+
+class TestTfidfIndex:
+    """Test cases for TfidfIndex."""
+
+    def test_build_sparse_layout(self):
+        """Test that the index stores only non-zero postings."""
+        index = TfidfIndex.build(DOCUMENTS)
+
+        assert len(index) == 4
+        assert list(index.terms) == sorted(index.terms)
+        assert index.term_ids["earth"] == index.terms.index("earth")
+        # One posting per distinct (document, term) pair
+        assert len(index.doc_terms) == sum(len(set(t)) for _, t in DOCUMENTS)
+        assert len(index.term_docs) == len(index.doc_terms)
+        assert list(index.doc_lengths) == [5, 5, 5, 5]
+
+        # Term postings are sorted by document id
+        earth = index.term_ids["earth"]
+        start, end = index.term_indptr[earth], index.term_indptr[earth + 1]
+        assert list(index.term_docs[start:end]) == [0, 1]
+
+    def test_search_matches_dense_cosine(self):
+        """Test that sparse scoring matches a dense cosine computation."""
+        index = TfidfIndex.build(DOCUMENTS)
+        query = ["beginning", "word", "heavens"]
+
+        results = index.search(query, max_results=10)
+
+        assert results[0][0] == 2
+        for doc_id, score in results:
+            assert score == pytest.approx(dense_cosine(index, query, doc_id))
+        assert [score for _, score in results] == sorted(
+            (score for _, score in results), reverse=True
+        )
+
+    def test_search_unknown_terms(self):
+        """Test that queries without indexed terms return nothing."""
+        index = TfidfIndex.build(DOCUMENTS)
+
+        assert index.search(["nonexistent"]) == []
+        assert index.search([]) == []
+
+    def test_search_max_results(self):
+        """Test that results are truncated to max_results."""
+        index = TfidfIndex.build(DOCUMENTS)
+
+        results = index.search(["earth", "god"], max_results=2)
+
+        assert len(results) == 2
+
+    def test_bm25_matches_reference(self):
+        """Test BM25 scoring against a direct computation."""
+        index = TfidfIndex.build(DOCUMENTS)
+        query = ["word", "god", "earth"]
+
+        for k1, b in ((1.2, 0.75), (2.0, 0.0), (0.5, 1.0)):
+            results = index.search(query, 10, scorer="bm25", k1=k1, b=b)
+            assert {doc_id for doc_id, _ in results} == {0, 1, 2, 3}
+            for doc_id, score in results:
+                assert score == pytest.approx(reference_bm25(query, doc_id, k1, b))
+
+    def test_bm25_length_normalization(self):
+        """Test that b penalizes long documents for the same term count."""
+        index = TfidfIndex.build(
+            [(0, ["praise", "nations"]), (1, ["praise"] + ["statutes"] * 20)]
+        )
+
+        normalized = dict(index.search(["praise"], scorer="bm25", b=0.75))
+        unnormalized = dict(index.search(["praise"], scorer="bm25", b=0.0))
+
+        assert normalized[0] > normalized[1]
+        assert unnormalized[0] == pytest.approx(unnormalized[1])
+
+    @pytest.mark.parametrize("scorer", ["tfidf", "bm25"])
+    def test_top_k_matches_exhaustive_ranking(self, scorer):
+        """Test that MaxScore pruning returns the exhaustive top k."""
+        rng = random.Random(7)
+        vocabulary = [f"w{i}" for i in range(40)]
+        documents = [
+            (
+                doc_id,
+                rng.choices(
+                    vocabulary,
+                    weights=[1 / (i + 1) for i in range(40)],
+                    k=rng.randint(3, 60),
+                ),
+            )
+            for doc_id in range(120)
+        ]
+        index = TfidfIndex.build(documents)
+
+        for _ in range(20):
+            query = rng.sample(vocabulary[:25], rng.randint(1, 5))
+            if scorer == "tfidf":
+                scores = [dense_cosine(index, query, d, documents) for d in range(120)]
+            else:
+                scores = [
+                    reference_bm25(query, d, documents=documents) for d in range(120)
+                ]
+            expected = sorted(
+                ((d, s) for d, s in enumerate(scores) if s > 0.01),
+                key=lambda hit: (-hit[1], hit[0]),
+            )
+
+            for k in (1, 3, 10, 200):
+                results = index.search(query, k, scorer=scorer)
+                assert [s for _, s in results] == pytest.approx(
+                    [s for _, s in expected[:k]]
+                )
+                assert [d for d, _ in results] == [d for d, _ in expected[:k]]
+
+    @pytest.mark.parametrize("scorer", ["tfidf", "bm25"])
+    @pytest.mark.parametrize("vectorized", [True, False])
+    def test_search_many_matches_search(self, scorer, vectorized, monkeypatch):
+        """Test that batched scoring returns the single-query top k."""
+        if vectorized:
+            pytest.importorskip("scipy")
+        else:
+            monkeypatch.setattr(semantic_index, "sparse", None)
+        rng = random.Random(11)
+        vocabulary = [f"w{i}" for i in range(30)]
+        documents = [
+            (doc_id, rng.choices(vocabulary, k=rng.randint(3, 40)))
+            for doc_id in range(80)
+        ]
+        index = TfidfIndex.build(documents)
+        queries = [rng.sample(vocabulary, rng.randint(1, 4)) for _ in range(40)]
+        queries += [[], ["missing"], ["w1", "w1", "w2"]]
+
+        batch = index.search_many(queries, 4, scorer=scorer, k1=1.5, b=0.5)
+
+        assert len(batch) == len(queries)
+        for tokens, results in zip(queries, batch):
+            expected = index.search(tokens, 4, scorer=scorer, k1=1.5, b=0.5)
+            assert [d for d, _ in results] == [d for d, _ in expected]
+            assert [s for _, s in results] == pytest.approx([s for _, s in expected])
+
+    @pytest.mark.parametrize("scorer", ["tfidf", "bm25"])
+    @pytest.mark.parametrize("vectorized", [True, False])
+    def test_doc_ranges_match_filtered_ranking(self, scorer, vectorized, monkeypatch):
+        """Test that scoped search equals filtering the full ranking."""
+        if vectorized:
+            pytest.importorskip("scipy")
+        else:
+            monkeypatch.setattr(semantic_index, "sparse", None)
+        rng = random.Random(5)
+        vocabulary = [f"w{i}" for i in range(30)]
+        documents = [
+            (doc_id, rng.choices(vocabulary, k=rng.randint(3, 40)))
+            for doc_id in range(80)
+        ]
+        index = TfidfIndex.build(documents)
+        doc_ranges = [range(3, 17), range(40, 41), range(60, 80)]
+        in_scope = {d for r in doc_ranges for d in r}
+        queries = [rng.sample(vocabulary, rng.randint(1, 4)) for _ in range(20)]
+
+        batch = index.search_many(queries, 5, scorer=scorer, doc_ranges=doc_ranges)
+        for tokens, batch_results in zip(queries, batch):
+            expected = [
+                hit
+                for hit in index.search(tokens, 80, scorer=scorer)
+                if hit[0] in in_scope
+            ][:5]
+            results = index.search(tokens, 5, scorer=scorer, doc_ranges=doc_ranges)
+            assert [d for d, _ in results] == [d for d, _ in expected]
+            assert [d for d, _ in batch_results] == [d for d, _ in expected]
+            assert [s for _, s in batch_results] == pytest.approx(
+                [s for _, s in expected]
+            )
+
+        assert index.search(["w1"], 5, doc_ranges=[]) == []
+
+    @pytest.mark.parametrize("vectorized", [True, False])
+    def test_similar_documents_match_search(self, vectorized, monkeypatch):
+        """Test that every document's neighbours are its own search hits."""
+        if vectorized:
+            pytest.importorskip("scipy")
+        else:
+            monkeypatch.setattr(semantic_index, "sparse", None)
+        rng = random.Random(3)
+        vocabulary = [f"w{i}" for i in range(30)]
+        documents = [
+            (doc_id, rng.choices(vocabulary, k=rng.randint(3, 40)))
+            for doc_id in range(80)
+        ]
+        documents.append((80, ["unique"]))
+        index = TfidfIndex.build(documents)
+
+        similar = index.similar_documents(4)
+
+        assert len(similar) == len(documents)
+        for (doc_id, tokens), results in zip(documents, similar):
+            expected = [hit for hit in index.search(tokens, 5) if hit[0] != doc_id][:4]
+            assert [d for d, _ in results] == [d for d, _ in expected]
+            assert [s for _, s in results] == pytest.approx([s for _, s in expected])
+        assert similar[80] == []
+        assert index.similar_documents(0) == [[] for _ in documents]
+
+    def test_search_zero_results(self):
+        """Test that max_results=0 returns nothing."""
+        index = TfidfIndex.build(DOCUMENTS)
+
+        assert index.search(["god"], max_results=0) == []
+
+    def test_unknown_scorer(self):
+        """Test that an unknown scorer is rejected."""
+        index = TfidfIndex.build(DOCUMENTS)
+
+        with pytest.raises(ValueError):
+            index.search(["god"], scorer="dense")
+        with pytest.raises(ValueError):
+            index.search_many([["god"]], scorer="dense")
+
+    def test_section_round_trip(self, tmp_path):
+        """Test that a memory-mapped index scores like the built one."""
+        index = TfidfIndex.build(DOCUMENTS)
+        meta, sections = index.to_sections()
+        write_sections(tmp_path / "index.bin", meta, sections)
+
+        restored = TfidfIndex.from_sections(SectionFile(tmp_path / "index.bin"))
+
+        assert restored.term_ids == index.term_ids
+        assert list(restored.doc_keys) == [0, 1, 2, 3]
+        assert restored.search(["god", "earth"]) == index.search(["god", "earth"])
+        assert restored.search(["god", "earth"], scorer="bm25") == index.search(
+            ["god", "earth"], scorer="bm25"
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
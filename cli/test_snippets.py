@@ -0,0 +1,87 @@
+"""
+Tests for the snippets module.
+"""
+
+from .binfile import SectionFile, write_sections
+from .snippets import SnippetStore, highlight, truncate
+
+JOHN_3_16 = (
+    "For God so loved the world that He gave His one and only Son, that "
+    "everyone who believes in Him shall not perish but have eternal life."
+)
+
+
+class TestTruncate:
+    """Test cases for truncate."""
+
+    def test_short_text_unchanged(self):
+        """Test that text within the limit is returned as is."""
+        assert truncate("Jesus wept.") == "Jesus wept."
+        assert truncate(JOHN_3_16, len(JOHN_3_16)) == JOHN_3_16
+
+    def test_cut_at_word_boundary(self):
+        """Test that long text is cut between words, ellipsis included."""
+        snippet = truncate(JOHN_3_16, 40)
+        assert snippet == "For God so loved the world that He..."
+        assert len(snippet) <= 40
+        assert truncate("x" * 50, 10) == "xxxxxxx..."
+
+
+class TestHighlight:
+    """Test cases for highlight."""
+
+    def test_marks_words(self):
+        """Test that marked words are emphasized and the verse trimmed around them."""
+        assert highlight(JOHN_3_16, [3]) == (
+            "For God so **loved** the world that He gave His..."
+        )
+        assert highlight("Jesus wept.", [1]) == "Jesus **wept**."
+
+    def test_phrases_marked_as_one_run(self):
+        """Test that consecutive positions share one pair of markers."""
+        assert highlight(JOHN_3_16, [20, 21, 22]) == (
+            "...that everyone who believes in Him **shall not perish** but have "
+            "eternal life."
+        )
+
+    def test_window_spans_all_matches(self):
+        """Test that the excerpt reaches from the first to the last match."""
+        snippet = highlight(JOHN_3_16, [0, 26])
+        assert snippet.startswith("**For** God")
+        assert snippet.endswith("eternal **life**.")
+
+    def test_max_words(self):
+        """Test that long excerpts are capped, dropping later matches."""
+        assert highlight(JOHN_3_16, [3, 26], max_words=5) == (
+            "For God so **loved** the..."
+        )
+
+    def test_no_matches(self):
+        """Test that text without marked words falls back to truncation."""
+        assert highlight(JOHN_3_16, []) == truncate(JOHN_3_16)
+        assert highlight("Jesus wept.", [5]) == "Jesus wept."
+
+
+class TestSnippetStore:
+    """Test cases for SnippetStore."""
+
+    def test_leads(self, tmp_path):
+        """Test chapter leads, also after a section file round trip."""
+        chapters = [JOHN_3_16 * 3, "Jesus wept.", "Ἐν ἀρχῇ ἦν ὁ λόγος"]
+        store = SnippetStore.build(chapters)
+        assert len(store) == 3
+        assert store.lead(0) == truncate(JOHN_3_16 * 3)
+        assert store.lead(1) == "Jesus wept."
+
+        meta, sections = store.to_sections()
+        path = tmp_path / "snippets.bin"
+        write_sections(path, meta, sections)
+        section_file = SectionFile(path)
+        try:
+            loaded = SnippetStore.from_sections(section_file)
+            assert [loaded.lead(i) for i in range(3)] == [
+                store.lead(i) for i in range(3)
+            ]
+        finally:
+            del loaded
+            section_file.close()
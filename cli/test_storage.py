@@ -0,0 +1,234 @@
+"""
+Tests for the storage module.
+"""
+
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from .query import KeywordQuery
+from .scope import SearchScope
+from .scripture import BSBParser
+from .storage import FTS5_AVAILABLE, SqliteBackend, to_fts5
+from .test_scripture import mock_bsb_response
+from .translations import Translation, TranslationRegistry
+
+if not FTS5_AVAILABLE:
+    pytest.skip("SQLite was built without FTS5", allow_module_level=True)
+
+BSB_TEXT = """Genesis 1:1 In the beginning God created the heavens and the earth.
+Genesis 1:2 Now the earth was formless and void, and darkness was over the surface of the deep.
+Genesis 1:3 And God said, "Let there be light," and there was light.
+Genesis 2:1 Thus the heavens and the earth were completed in all their vast array.
+Genesis 26:14 He owned so many flocks and herds and servants that the Philistines envied him.
+John 1:1 In the beginning was the Word, and the Word was with God, and the Word was God.
+John 1:2 He was with God in the beginning.
+John 1:5 The Light shines in the darkness, and the darkness has not overcome it."""
+
+
+@pytest.fixture
+def parser_and_backend(tmp_path):
+    with patch("requests.get", return_value=mock_bsb_response(BSB_TEXT)):
+        parser = BSBParser(cache_dir=str(tmp_path))
+        backend = SqliteBackend.open_or_build(tmp_path / "bsb.sqlite", parser)
+    yield parser, backend
+    backend.close()
+    parser.close()
+
+
+class TestToFts5:
+    """Test cases for to_fts5."""
+
+    @pytest.mark.parametrize(
+        "query, expression",
+        [
+            ("light", '"light"'),
+            ('"in the beginning"', '"in the beginning"'),
+            ("righteous*", '"righteous" *'),
+            ("faith AND works", '("faith" AND "works")'),
+            ("king ruler", '("king" OR "ruler")'),
+            ("Philistines NOT Samson", '(("philistines") NOT "samson")'),
+            ("love NEAR/3 enemies", 'NEAR("love" "enemies", 3)'),
+        ],
+    )
+    def test_expressions(self, query, expression):
+        """Test that each query construct maps to its FTS5 syntax."""
+        assert to_fts5(KeywordQuery.parse(query).root) == expression
+
+    def test_not_alone(self):
+        """Test that a query excluding everything is rejected."""
+        with pytest.raises(ValueError, match="NOT needs a term"):
+            to_fts5(KeywordQuery.parse("NOT light").root)
+
+
+class TestSqliteBackend:
+    """Test cases for SqliteBackend."""
+
+    def test_text_matches_parser(self, parser_and_backend):
+        """Test verse, chapter, passage and book lookups against the parser."""
+        parser, backend = parser_and_backend
+
+        assert backend.list_books() == parser.list_books() == ["Genesis", "John"]
+        for book, chapter in [("Genesis", 1), ("gen", 26), ("Jn", 1), ("John", 2)]:
+            assert backend.get_chapter(book, chapter) == parser.get_chapter(
+                book, chapter
+            )
+        assert backend.get_verse("John", 1, 5) == parser.get_verse("John", 1, 5)
+        assert backend.get_verse("John", 1, 3) is None
+        assert backend.get_verse("Jn", 1, 5) == parser.get_verse("Jn", 1, 5)
+        assert backend.get_verse("Unknown", 1, 1) is None
+        for args in [
+            ("Genesis", 1, 2, 2, 1),
+            ("Genesis", 1, 2),
+            ("Genesis", 1, None, 2),
+            ("John", 1, 2, None, 40),
+            ("John", 1, 3),
+            ("Genesis", 1, 9),
+            ("Genesis", 2, 1, 1, 1),
+            ("Genesis", 1, 1, 5, 1),
+            ("Genesis", 1, 9, 2, 1),
+            ("Exodus", 1),
+        ]:
+            assert backend.get_passage(*args) == parser.get_passage(*args)
+            assert backend.get_passage(*args, numbered=True) == (
+                parser.get_passage(*args, numbered=True)
+            )
+
+    def test_keyword_search(self, parser_and_backend):
+        """Test that keyword queries find the chapters the parser finds."""
+        parser, backend = parser_and_backend
+
+        for query in [
+            "darkness",
+            '"the beginning"',
+            "God AND light",
+            "light NOT darkness",
+            "herd*",
+            "beginning book:John",
+        ]:
+            assert backend.search_keyword(query) == parser.search_keyword(query), query
+
+        # The ranking counts every occurrence, like the positional index
+        assert [r[:3] for r in backend.search_keyword("light darkness")] == [
+            ("Genesis", 1, 3),
+            ("John", 1, 3),
+        ]
+        assert backend.search_keyword("God", book="John")[0][:3] == ("John", 1, 3)
+        assert backend.search_keyword("God", 1) == backend.search_keyword("God")[:1]
+        assert backend.search_keyword("God", scope=SearchScope(testament="NT")) == (
+            backend.search_keyword("God", book="John")
+        )
+        assert backend.search_keyword("God", book="Exodus") == []
+        with pytest.raises(ValueError):
+            backend.search_keyword("NOT God")
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "word NEAR/2 god",
+            "god NEAR/5 light",
+            "beginning NEAR/3 god",
+            "the NEAR/1 darkness",
+            '"the word" NEAR/4 god',
+            "darkness NEAR/2 light OR herds",
+        ],
+    )
+    def test_near_matches_parser(self, parser_and_backend, query):
+        """Test that each NEAR match counts once, like the positional index."""
+        parser, backend = parser_and_backend
+
+        assert backend.search_keyword(query) == parser.search_keyword(query)
+
+    def test_semantic_search(self, parser_and_backend):
+        """Test BM25 chapter ranking over stemmed words."""
+        _, backend = parser_and_backend
+
+        # "shining lights" matches "Light shines" and "light" after stemming
+        results = backend.search_semantic("shining lights", 5)
+        assert [r[:2] for r in results] == [("John", 1), ("Genesis", 1)]
+        assert results[0][2] > results[1][2] > 0
+        assert results[0][3] == backend.get_chapter("John", 1)
+        assert [
+            r[:2]
+            for r in backend.search_semantic("light", scope=SearchScope(book="John"))
+        ] == [("John", 1)]
+        assert backend.search_semantic("the and of") == []
+        # Only FTS5 BM25 with its fixed parameters is available
+        for scorer in ("tfidf", "lsa"):
+            with pytest.raises(ValueError, match="not supported"):
+                backend.search_semantic("light", scorer=scorer)
+        with pytest.raises(ValueError, match="k1=1.2 and b=0.75"):
+            backend.search_semantic("light", scorer="bm25", k1=2.0)
+
+    def test_snippet(self, parser_and_backend):
+        """Test highlighted previews and the lead fallback."""
+        parser, backend = parser_and_backend
+
+        assert backend.snippet("Philistines", "Genesis", 26) == parser.snippet(
+            "Philistines", "Genesis", 26
+        )
+        assert backend.snippet("word", "John", 1) == (
+            "1: In the beginning was the **Word**, and the **Word** was with God, "
+            "and the **Word** was God."
+        )
+        assert backend.snippet("zebra", "John", 1) == parser.snippet("zebra", "John", 1)
+        assert backend.snippet("light", "Exodus", 1) is None
+
+        # Searches preview all their results at once, without corrections
+        for query in ["Philistines", "light OR zebra", "God book:John"]:
+            previewed = backend.search_keyword_previews(query)
+            assert previewed == parser.search_keyword_previews(query), query
+            assert previewed.results == backend.search_keyword(query)
+            assert previewed.previews == [
+                backend.snippet(query, book, chapter)
+                for book, chapter, *_ in previewed.results
+            ]
+        assert backend.search_keyword_previews("Philistins", fuzzy=True) == (
+            [],
+            [],
+            {},
+        )
+
+    def test_open_or_build_reuses_database(self, parser_and_backend, tmp_path):
+        """Test that a current database is opened without loading the text."""
+        parser, backend = parser_and_backend
+
+        cached = BSBParser(cache_dir=str(tmp_path))
+        with patch.object(cached, "download_and_parse") as mock_load:
+            reopened = SqliteBackend.open_or_build(tmp_path / "bsb.sqlite", cached)
+            mock_load.assert_not_called()
+        assert reopened.source_hash == parser.manifest.source_hash
+        assert reopened.get_verse("John", 1, 1) == backend.get_verse("John", 1, 1)
+        reopened.close()
+
+        # A database of other text is rebuilt
+        cached.manifest.data["source_hash"] = "changed"
+        with patch.object(cached, "download_and_parse", return_value=True):
+            cached._set_corpus(parser.corpus)
+            rebuilt = SqliteBackend.open_or_build(tmp_path / "bsb.sqlite", cached)
+        assert rebuilt.source_hash == "changed"
+        rebuilt.close()
+        cached.close()
+
+    def test_parser_owns_backend(self, tmp_path):
+        """Test that the backend is shared by a parser and closed with it."""
+        with patch("requests.get", return_value=mock_bsb_response(BSB_TEXT)):
+            registry = TranslationRegistry(
+                lambda source, cache_dir: BSBParser(url=source, cache_dir=cache_dir),
+                tmp_path,
+                max_resident=1,
+            )
+            registry.register(Translation("KJV", "KJV", "kjv.txt"))
+            parser = registry.get()
+            backend = parser.sqlite_backend()
+            assert parser.sqlite_backend() is backend
+            assert (
+                backend.get_verse("John", 1, 2) == "He was with God in the beginning."
+            )
+
+            # Evicting the translation closes its database
+            registry.get("KJV")
+        assert registry.resident() == ["KJV"]
+        with pytest.raises(sqlite3.ProgrammingError):
+            backend.get_verse("John", 1, 2)
@@ -2,18 +2,27 @@
 Tests for the tools module.
 """
 
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 import pytest
 from cli.tools import (
     SCRIPTURE_TOOLS,
     execute_tool,
+    get_backend,
     get_scripture,
     get_scripture_context,
     list_bible_books,
+    list_bible_translations,
+    search_scripture_hybrid,
     search_scripture_keyword,
+    search_scripture_regex,
     search_scripture_semantic,
+    search_scripture_semantic_many,
 )
+from cli.scripture import BSBParser
+from cli.storage import FTS5_AVAILABLE, PreviewedSearch
+from cli.test_scripture import mock_bsb_response
+from cli.translations import Translation, TranslationRegistry
 
 
 class TestScriptureTools:
@@ -24,8 +33,10 @@ class TestScriptureTools:
         """Test successful chapter retrieval with verse parameter."""
         # Mock parser
         mock_parser = Mock()
-        mock_parser.get_chapter.return_value = "For God so loved the world..."
-        mock_parser.get_verse.return_value = "For God so loved the world that He gave His one and only Son..."
+        mock_parser.get_passage.side_effect = [
+            ("John", 3, 16, 3, 16, "16: For God so loved the world that He gave His one and only Son..."),
+            ("John", 3, 1, 3, 36, "For God so loved the world..."),
+        ]
         mock_get_parser.return_value = mock_parser
 
         result = get_scripture("John", 3, 16)
@@ -36,8 +47,26 @@ class TestScriptureTools:
         assert result["highlighted_text"] == "16: For God so loved the world that He gave His one and only Son..."
         assert result["text"] == "For God so loved the world..."
         assert result["reference"] == "John 3:16-16"
-        mock_parser.get_chapter.assert_called_once_with("John", 3)
-        mock_parser.get_verse.assert_called_once_with("John", 3, 16)
+        assert mock_parser.get_passage.call_args_list == [call("John", 3, 16, None, 16, numbered=True), call("John", 3, None, 3)]
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_get_scripture_cross_chapter_range(self, mock_get_parser):
+        """Test a verse range spanning two chapters."""
+        mock_parser = Mock()
+        mock_parser.get_passage.side_effect = [
+            ("John", 3, 36, 4, 2, "36: Whoever believes in the Son has eternal life... 4:2: (although it was not Jesus who baptized, but His disciples)."),
+            ("John", 3, 1, 4, 54, "Now there was a Pharisee named Nicodemus..."),
+        ]
+        mock_get_parser.return_value = mock_parser
+
+        result = get_scripture("John", 3, 36, 2, end_chapter=4)
+
+        assert result["verse_range"] == "36-4:2"
+        assert result["reference"] == "John 3:36-4:2"
+        assert result["highlighted_text"].startswith("36: Whoever believes in the Son")
+        assert result["text"] == "Now there was a Pharisee named Nicodemus..."
+        assert mock_parser.get_passage.call_args_list == [call("John", 3, 36, 4, 2, numbered=True), call("John", 3, None, 4)]
+        mock_parser.get_verse.assert_not_called()
 
     @patch("cli.tools.get_bsb_parser")
     def test_get_scripture_chapter_success(self, mock_get_parser):
@@ -55,13 +84,25 @@ class TestScriptureTools:
         assert result["reference"] == "Genesis 1"
         mock_parser.get_chapter.assert_called_once_with("Genesis", 1)
 
+    @patch("cli.tools.get_bsb_parser")
+    def test_get_scripture_abbreviated_book(self, mock_get_parser):
+        """Test that abbreviated book names are answered under the full name."""
+        mock_parser = Mock()
+        mock_parser.get_chapter.return_value = "Now there was a Pharisee named Nicodemus..."
+        mock_get_parser.return_value = mock_parser
+
+        result = get_scripture("Jn", 3)
+
+        assert result["book"] == "John"
+        assert result["reference"] == "John 3"
+        mock_parser.get_chapter.assert_called_once_with("John", 3)
+
     @patch("cli.tools.get_bsb_parser")
     def test_get_scripture_verse_not_found(self, mock_get_parser):
         """Test verse not found scenario."""
         # Mock parser
         mock_parser = Mock()
-        mock_parser.get_chapter.return_value = "For God so loved the world..."
-        mock_parser.get_verse.return_value = None
+        mock_parser.get_passage.return_value = None
         mock_get_parser.return_value = mock_parser
 
         result = get_scripture("John", 3, 999)
@@ -101,9 +142,7 @@ class TestScriptureTools:
                 "Whoever does not love does not know God, because God is love.",
             ),
         ]
-        mock_parser.get_chapter.return_value = (
-            "For God so loved the world that He gave His one and only Son..."
-        )
+        mock_parser.snippet.return_value = "16: For God so **loved** the world..."
         mock_get_parser.return_value = mock_parser
 
         result = search_scripture_semantic("love")
@@ -118,9 +157,17 @@ class TestScriptureTools:
         assert first_result["chapter"] == 3
         assert first_result["similarity"] == 0.8
         assert "For God so loved the world" in first_result["text"]
+        assert first_result["preview"] == "16: For God so **loved** the world..."
         assert first_result["reference"] == "John 3"
 
-        mock_parser.search_semantic.assert_called_once_with("love", 5)
+        mock_parser.search_semantic.assert_called_once_with("love", 5, scorer="tfidf", k1=1.2, b=0.75, scope=None)
+        # Previews come from the snippet store, not a second chapter lookup
+        mock_parser.snippet.assert_any_call("love", "1 John", 4)
+        mock_parser.get_chapter.assert_not_called()
+
+        compact = search_scripture_semantic("love", compact=True)["results"][0]
+        assert "text" not in compact
+        assert compact["preview"] == "16: For God so **loved** the world..."
 
     @patch("cli.tools.get_bsb_parser")
     def test_search_scripture_semantic_with_book_filter(self, mock_get_parser):
@@ -142,11 +189,12 @@ class TestScriptureTools:
         # Verify all results are from Genesis
         for item in result["results"]:
             assert item["book"] == "Genesis"
-        # Verify parser was called with higher limit for filtering
+        # The book filter is pushed down into the index, without over-fetching
         mock_parser.search_semantic.assert_called_once()
         call_args = mock_parser.search_semantic.call_args
         assert call_args[0][0] == "God"
-        assert call_args[0][1] == 15  # n_results * 3 when book filter is used
+        assert call_args[0][1] == 5
+        assert call_args[1]["scope"].book == "Genesis"
 
     @patch("cli.tools.get_bsb_parser")
     def test_search_scripture_semantic_with_n_results(self, mock_get_parser):
@@ -164,7 +212,7 @@ class TestScriptureTools:
         assert result["query"] == "love"
         assert result["count"] == 10
         assert len(result["results"]) == 10
-        mock_parser.search_semantic.assert_called_once_with("love", 10)
+        mock_parser.search_semantic.assert_called_once_with("love", 10, scorer="tfidf", k1=1.2, b=0.75, scope=None)
 
     @patch("cli.tools.get_bsb_parser")
     def test_search_scripture_semantic_with_n_results_max_limit(self, mock_get_parser):
@@ -181,7 +229,106 @@ class TestScriptureTools:
 
         assert result["count"] == 20  # Should be capped at 20
         assert len(result["results"]) == 20
-        mock_parser.search_semantic.assert_called_once_with("love", 20)
+        mock_parser.search_semantic.assert_called_once_with("love", 20, scorer="tfidf", k1=1.2, b=0.75, scope=None)
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_semantic_bm25(self, mock_get_parser):
+        """Test semantic search with the BM25 scorer."""
+        mock_parser = Mock()
+        mock_parser.search_semantic.return_value = [
+            ("Psalms", 117, 3.2, "Praise the LORD, all you nations!"),
+        ]
+        mock_parser.get_chapter.return_value = "Praise the LORD, all you nations!"
+        mock_get_parser.return_value = mock_parser
+
+        result = search_scripture_semantic("praise nations", scorer="bm25", k1=1.5, b=0.5)
+
+        mock_parser.search_semantic.assert_called_once_with("praise nations", 5, scorer="bm25", k1=1.5, b=0.5, scope=None)
+        assert result["results"][0]["similarity"] == 3.2
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_semantic_unknown_scorer(self, mock_get_parser):
+        """Test semantic search with an unknown scorer."""
+        mock_get_parser.return_value = Mock()
+
+        result = search_scripture_semantic("love", scorer="dense")
+
+        assert "error" in result
+        mock_get_parser.return_value.search_semantic.assert_not_called()
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_semantic_passages(self, mock_get_parser):
+        """Test passage-granularity results carry verse ranges."""
+        mock_parser = Mock()
+        mock_parser._normalize_book_name = lambda x: x.lower()
+        mock_parser.search_passages.return_value = [
+            ("Genesis", 1, 3, 5, 0.6, "And God said, Let there be light..."),
+            ("John", 3, 16, 16, 0.5, "For God so loved the world..."),
+        ]
+        mock_get_parser.return_value = mock_parser
+
+        result = search_scripture_semantic("light", n_results=2, granularity="passage")
+
+        mock_parser.search_passages.assert_called_once_with("light", 2, scorer="tfidf", k1=1.2, b=0.75, scope=None)
+        mock_parser.search_semantic.assert_not_called()
+        assert result["count"] == 2
+        assert result["results"][0]["reference"] == "Genesis 1:3-5"
+        assert result["results"][0]["verse_start"] == 3
+        assert result["results"][0]["verse_end"] == 5
+        assert result["results"][0]["text"].startswith("And God said")
+
+        assert result["results"][1]["reference"] == "John 3:16"
+
+        compact = search_scripture_semantic("light", granularity="passage", compact=True)
+        assert "text" not in compact["results"][0]
+        assert compact["results"][0]["preview"] == "And God said, Let there be light..."
+
+        assert "error" in search_scripture_semantic("love", granularity="book")
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_semantic_many(self, mock_get_parser):
+        """Test batched semantic search returns one result per query."""
+        mock_parser = Mock()
+        mock_parser._normalize_book_name = lambda x: x.lower()
+        mock_parser.search_semantic_many.return_value = [
+            [("John", 3, 0.8, "For God so loved..."), ("John", 1, 0.7, "In the beginning...")],
+            [],
+        ]
+        mock_parser.get_chapter.return_value = "Content"
+        mock_get_parser.return_value = mock_parser
+
+        results = search_scripture_semantic_many(["love", "nothing"], book="John", n_results=2, scorer="bm25")
+
+        mock_parser.search_semantic_many.assert_called_once()
+        call_args = mock_parser.search_semantic_many.call_args
+        assert call_args[0] == (["love", "nothing"], 2)
+        assert call_args[1]["scope"].book == "John"
+        assert [r["query"] for r in results] == ["love", "nothing"]
+        assert [r["reference"] for r in results[0]["results"]] == ["John 3", "John 1"]
+        assert results[1]["count"] == 0
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_semantic_scope(self, mock_get_parser):
+        """Test testament, book list and range scopes reach the parser."""
+        mock_parser = Mock()
+        mock_parser.search_semantic.return_value = []
+        mock_get_parser.return_value = mock_parser
+
+        search_scripture_semantic("comfort", testament="OT", books=["Isaiah"], book_range="Isaiah 40-55")
+
+        scope = mock_parser.search_semantic.call_args[1]["scope"]
+        assert (scope.testament, scope.books, scope.book_range) == ("OT", ["Isaiah"], "Isaiah 40-55")
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_invalid_scope(self, mock_get_parser):
+        """Test that malformed scopes are reported without searching."""
+        mock_get_parser.return_value = Mock()
+
+        assert "error" in search_scripture_semantic("love", testament="apocrypha")
+        assert "error" in search_scripture_keyword("love", book_range="40-55")
+        assert "error" in search_scripture_semantic_many(["love"], testament="apocrypha")[0]
+        mock_get_parser.return_value.search_semantic.assert_not_called()
+        mock_get_parser.return_value.search_keyword_previews.assert_not_called()
 
     @patch("cli.tools.get_bsb_parser")
     def test_search_scripture_semantic_with_invalid_book(self, mock_get_parser):
@@ -219,6 +366,97 @@ class TestScriptureTools:
 
         mock_parser.list_books.assert_called_once()
 
+    @patch("cli.tools.get_bsb_parser")
+    def test_tools_use_requested_translation(self, mock_get_parser):
+        """Test that bible_id selects the parser of that translation."""
+        mock_parser = Mock()
+        mock_parser.list_books.return_value = ["Genesis"]
+        mock_parser.get_chapter.return_value = "In the beginning God created..."
+        mock_parser.search_regex.return_value = []
+        mock_get_parser.return_value = mock_parser
+
+        list_bible_books(bible_id="KJV")
+        get_scripture("Genesis", 1, bible_id="KJV")
+        search_scripture_regex("God", bible_id="KJV")
+        get_scripture_context("Genesis", 1, bible_id="KJV")
+
+        assert [c.args for c in mock_get_parser.call_args_list] == [("KJV",)] * 4
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_unknown_translation(self, mock_get_parser):
+        """Test that an unknown bible_id is reported as an error."""
+        mock_get_parser.side_effect = ValueError("Unknown translation: NIV. Use one of: BSB")
+
+        for result in [
+            get_scripture("John", 3, bible_id="NIV"),
+            search_scripture_keyword("love", bible_id="NIV"),
+            search_scripture_semantic("love", bible_id="NIV"),
+            list_bible_books(bible_id="NIV"),
+            *search_scripture_semantic_many(["love", "faith"], bible_id="NIV"),
+        ]:
+            assert result == {"error": "Unknown translation: NIV. Use one of: BSB"}
+
+    @patch("cli.tools.get_sqlite_backend")
+    @patch("cli.tools.get_bsb_parser")
+    def test_storage_backend_selection(self, mock_get_parser, mock_get_sqlite):
+        """Test that GAMALIEL_STORAGE picks the backend of the core tools."""
+        with patch.dict("os.environ", {"GAMALIEL_STORAGE": "sqlite"}):
+            assert get_backend("KJV") is mock_get_sqlite.return_value
+            mock_get_sqlite.assert_called_once_with("KJV")
+
+            # Passage search needs the index files
+            mock_get_parser.return_value.search_passages.return_value = []
+            search_scripture_semantic("love", granularity="passage", bible_id="KJV")
+            mock_get_parser.assert_called_once_with("KJV")
+
+        with patch.dict("os.environ", {"GAMALIEL_STORAGE": "files"}):
+            assert get_backend() is mock_get_parser.return_value
+        with patch.dict("os.environ", {"GAMALIEL_STORAGE": "redis"}):
+            with pytest.raises(ValueError, match="Unknown storage backend: redis"):
+                get_backend()
+            assert get_scripture("John", 3) == {
+                "error": "Unknown storage backend: redis. Use one of: files, sqlite"
+            }
+
+    @patch("cli.tools.get_backend")
+    def test_search_scripture_semantic_unsupported_scorer(self, mock_get_backend):
+        """Test that scorers a backend cannot rank with are reported as errors."""
+        mock_get_backend.return_value.search_semantic.side_effect = ValueError("Unknown scorer: bm25")
+
+        result = search_scripture_semantic("love", scorer="bm25")
+
+        assert result == {"error": "Unknown scorer: bm25"}
+
+    @pytest.mark.skipif(not FTS5_AVAILABLE, reason="SQLite was built without FTS5")
+    def test_search_scripture_semantic_sqlite_default(self, tmp_path):
+        """Test that a default semantic search ranks with the SQLite backend's scorer."""
+        with patch("requests.get", return_value=mock_bsb_response(
+            "John 13:34 A new commandment I give you: Love one another.\nGenesis 1:1 In the beginning God created the heavens and the earth."
+        )):
+            parser = BSBParser(cache_dir=str(tmp_path))
+            with patch("cli.tools.get_bsb_parser", return_value=parser), patch.dict("os.environ", {"GAMALIEL_STORAGE": "sqlite"}):
+                result = execute_tool("search_scripture_semantic", query="love one another", n_results=2)
+                # An explicitly requested scorer the backend lacks is still an error
+                unsupported = execute_tool("search_scripture_semantic", query="love", scorer="tfidf")
+        parser.close()
+
+        assert [r["reference"] for r in result["results"]] == ["John 13"]
+        assert unsupported == {"error": "Scorer tfidf is not supported by the SQLite backend. Use one of: bm25"}
+
+    @patch("cli.tools.get_translation_registry")
+    def test_list_bible_translations(self, mock_get_registry, tmp_path):
+        """Test that registered translations are listed, BSB first."""
+        registry = TranslationRegistry(Mock(), tmp_path)
+        registry.register(Translation("KJV", "King James Version", "/data/kjv.txt"))
+        mock_get_registry.return_value = registry
+
+        result = list_bible_translations()
+
+        assert result["count"] == 2
+        assert [t["id"] for t in result["translations"]] == ["BSB", "KJV"]
+        assert result["translations"][0]["name"] == "Berean Standard Bible"
+        assert result["translations"][1]["language"] == "English"
+
     @patch("cli.tools.get_bsb_parser")
     def test_get_scripture_context_success(self, mock_get_parser):
         """Test successful context retrieval."""
@@ -240,7 +478,7 @@ class TestScriptureTools:
         mock_parser.get_chapter.side_effect = mock_get_chapter
         mock_get_parser.return_value = mock_parser
 
-        result = get_scripture_context("John", 3, 1)
+        result = get_scripture_context("John", 3)
 
         assert result["book"] == "John"
         assert result["chapter"] == 3
@@ -276,7 +514,7 @@ class TestScriptureTools:
         mock_parser.get_chapter.side_effect = mock_get_chapter
         mock_get_parser.return_value = mock_parser
 
-        result = get_scripture_context("Genesis", 1, 1)
+        result = get_scripture_context("Genesis", 1)
 
         assert result["book"] == "Genesis"
         assert result["chapter"] == 1
@@ -289,6 +527,33 @@ class TestScriptureTools:
         assert "next" in result["context"]
         assert result["context"]["next"]["chapter"] == 2
 
+    @patch("cli.tools.get_bsb_parser")
+    def test_get_scripture_context_related(self, mock_get_parser):
+        """Test that related chapters come from the precomputed similarity graph."""
+        mock_parser = Mock()
+        mock_parser.get_chapter.side_effect = lambda book, chapter: f"{book} {chapter} content"
+        mock_parser.related_chapters.return_value = [
+            ("Psalms", 23, 0.4216, "The LORD is my shepherd; I shall not want."),
+            ("Ezekiel", 34, 0.3102, "Then the word of the LORD came to me."),
+        ]
+        mock_get_parser.return_value = mock_parser
+
+        result = get_scripture_context("John", 10, related=2)
+
+        mock_parser.related_chapters.assert_called_once_with("John", 10, 2)
+        assert result["context"]["next"]["chapter"] == 11
+        related = result["context"]["related"]
+        assert [r["reference"] for r in related] == ["Psalms 23", "Ezekiel 34"]
+        assert related[0]["similarity"] == 0.422
+        assert related[0]["text"].startswith("The LORD is my shepherd")
+
+        # Capped to prevent token overflow; not looked up unless requested
+        get_scripture_context("John", 10, related=50)
+        mock_parser.related_chapters.assert_called_with("John", 10, 10)
+        mock_parser.related_chapters.reset_mock()
+        assert "related" not in get_scripture_context("John", 10)["context"]
+        mock_parser.related_chapters.assert_not_called()
+
     @patch("cli.tools.get_bsb_parser")
     def test_get_scripture_context_chapter_not_found(self, mock_get_parser):
         """Test context retrieval when chapter not found."""
@@ -297,7 +562,7 @@ class TestScriptureTools:
         mock_parser.get_chapter.return_value = None
         mock_get_parser.return_value = mock_parser
 
-        result = get_scripture_context("John", 999, 1)
+        result = get_scripture_context("John", 999)
 
         assert "error" in result
         assert "Chapter not found" in result["error"]
@@ -311,54 +576,81 @@ class TestKeywordSearch:
         """Test keyword search with single word."""
         # Mock parser
         mock_parser = Mock()
-        mock_parser._normalize_book_name = lambda x: x.lower()
-        
-        # Mock search_text to return some results
-        def mock_search_text(query, max_results):
-            if query.lower() == "philistines":
-                return [
-                    ("Genesis", 26, 1, "Now there was a famine in the land, besides the former famine..."),
-                    ("Genesis", 26, 8, "When he had been there a long time, Abimelech king of the Philistines..."),
-                    ("Genesis", 21, 32, "So they made a covenant at Beersheba..."),
-                ]
-            return []
-        
-        mock_parser.search_text = mock_search_text
+        mock_parser.search_keyword_previews.return_value = PreviewedSearch(
+            [
+                ("Genesis", 26, 2, [
+                    (1, "Now there was a famine in the land, besides the former famine..."),
+                    (8, "When he had been there a long time, Abimelech king of the Philistines..."),
+                ]),
+                ("Genesis", 21, 1, [(32, "So they made a covenant at Beersheba...")]),
+            ],
+            [
+                "8: ...Abimelech king of the **Philistines** looked down...",
+                "32: ...Phicol the commander of his army returned to the land of the **Philistines**.",
+            ],
+            {},
+        )
         mock_parser.get_chapter = lambda book, chapter: f"Chapter {chapter} text for {book}"
         mock_get_parser.return_value = mock_parser
 
         result = search_scripture_keyword("Philistines", n_results=5)
 
-        assert result["count"] > 0
+        mock_parser.search_keyword_previews.assert_called_once_with("Philistines", 5, scope=None, fuzzy=True)
+        assert result["count"] == 2
         assert "results" in result
-        assert len(result["results"]) > 0
         # Results should have match_count
-        assert "match_count" in result["results"][0]
+        assert result["results"][0]["match_count"] == 2
+        assert result["results"][0]["reference"] == "Genesis 26"
+        assert result["results"][0]["text"] == "Chapter 26 text for Genesis"
+        # Previews highlight the matches found in the index postings
+        assert result["results"][0]["preview"].startswith("8: ...Abimelech king of the **Philistines**")
+        assert result["results"][1]["preview"].startswith("32: ...Phicol")
+        # The previews come with the search, without re-running the query per chapter
+        mock_parser.snippet.assert_not_called()
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_keyword_compact(self, mock_get_parser):
+        """Test that compact results skip the full chapter text."""
+        mock_parser = Mock()
+        mock_parser.search_keyword_previews.return_value = PreviewedSearch(
+            [("Genesis", 26, 2, [(1, "Now there was a famine in the land.")])],
+            ["1: Now there was a **famine** in the land."],
+            {},
+        )
+        mock_get_parser.return_value = mock_parser
+
+        result = search_scripture_keyword("famine", compact=True)
+
+        mock_parser.get_chapter.assert_not_called()
+        assert result["results"] == [
+            {
+                "book": "Genesis",
+                "chapter": 26,
+                "match_count": 2,
+                "preview": "1: Now there was a **famine** in the land.",
+                "reference": "Genesis 26",
+            }
+        ]
 
     @patch("cli.tools.get_bsb_parser")
     def test_search_scripture_keyword_with_book_filter(self, mock_get_parser):
         """Test keyword search with book filter."""
         # Mock parser
         mock_parser = Mock()
-        mock_parser._normalize_book_name = lambda x: x.lower()
-        
-        def mock_search_text(query, max_results):
-            if query.lower() == "philistines":
-                return [
-                    ("Genesis", 26, 1, "Now there was a famine..."),
-                    ("Genesis", 26, 8, "Abimelech king of the Philistines..."),
-                    ("Judges", 15, 3, "Samson and the Philistines..."),  # Should be filtered out
-                ]
-            return []
-        
-        mock_parser.search_text = mock_search_text
+        mock_parser.search_keyword_previews.return_value = PreviewedSearch(
+            [("Genesis", 26, 1, [(8, "Abimelech king of the Philistines...")])], [None], {}
+        )
         mock_parser.get_chapter = lambda book, chapter: f"Chapter {chapter} text"
         mock_get_parser.return_value = mock_parser
 
         result = search_scripture_keyword("Philistines", book="Genesis", n_results=5)
 
+        # The book filter is applied by the index, without over-fetching
+        mock_parser.search_keyword_previews.assert_called_once()
+        call_args = mock_parser.search_keyword_previews.call_args
+        assert call_args[0] == ("Philistines", 5)
+        assert call_args[1]["scope"].book == "Genesis"
         assert result["count"] > 0
-        # All results should be from Genesis
         for r in result["results"]:
             assert r["book"].lower() == "genesis"
 
@@ -367,24 +659,179 @@ class TestKeywordSearch:
         """Test keyword search with quoted phrase."""
         # Mock parser
         mock_parser = Mock()
-        mock_parser._normalize_book_name = lambda x: x.lower()
-        
-        def mock_search_text(query, max_results):
-            if "king" in query.lower() and "philistines" in query.lower():
-                return [
-                    ("Genesis", 26, 8, "Abimelech king of the Philistines..."),
-                ]
-            return []
-        
-        mock_parser.search_text = mock_search_text
+        mock_parser.search_keyword_previews.return_value = PreviewedSearch(
+            [("Genesis", 26, 1, [(8, "Abimelech king of the Philistines...")])], [None], {}
+        )
         mock_parser.get_chapter = lambda book, chapter: f"Chapter {chapter} text"
         mock_get_parser.return_value = mock_parser
 
         result = search_scripture_keyword('"king of the Philistines"', n_results=3)
 
+        mock_parser.search_keyword_previews.assert_called_once_with('"king of the Philistines"', 3, scope=None, fuzzy=True)
         assert result["count"] > 0
         assert "results" in result
 
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_keyword_reports_corrections(self, mock_get_parser):
+        """Test that misspelled words are searched and reported with their corrections."""
+        mock_parser = Mock()
+        results = [
+            ("Daniel", 1, 1, [(1, "In the third year of the reign of Jehoiakim king of Judah, Nebuchadnezzar...")]),
+        ]
+        mock_parser.search_keyword_previews.return_value = PreviewedSearch(
+            results, [None], {"nebuchadnezar": ["nebuchadnezzar"]}
+        )
+        mock_parser.get_chapter = lambda book, chapter: f"Chapter {chapter} text"
+        mock_get_parser.return_value = mock_parser
+
+        result = search_scripture_keyword("Nebuchadnezar")
+
+        mock_parser.search_keyword_previews.assert_called_once_with("Nebuchadnezar", 10, scope=None, fuzzy=True)
+        assert result["corrections"] == {"nebuchadnezar": ["nebuchadnezzar"]}
+        assert result["results"][0]["reference"] == "Daniel 1"
+
+        # Correctly spelled queries report no corrections
+        mock_parser.search_keyword_previews.return_value = PreviewedSearch(results, [None], {})
+        assert "corrections" not in search_scripture_keyword("Nebuchadnezzar")
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_keyword_invalid_query(self, mock_get_parser):
+        """Test that query syntax errors are returned as errors."""
+        mock_parser = Mock()
+        mock_parser.search_keyword_previews.side_effect = ValueError("Missing ')' in query: (king")
+        mock_get_parser.return_value = mock_parser
+
+        result = search_scripture_keyword("(king")
+
+        assert result == {"error": "Invalid query: Missing ')' in query: (king"}
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_keyword_caps_n_results(self, mock_get_parser):
+        """Test that n_results is capped before searching."""
+        mock_parser = Mock()
+        mock_parser.search_keyword_previews.return_value = PreviewedSearch([], [], {})
+        mock_get_parser.return_value = mock_parser
+
+        result = search_scripture_keyword("Philistines", n_results=100)
+
+        mock_parser.search_keyword_previews.assert_called_once_with("Philistines", 20, scope=None, fuzzy=True)
+        assert result["count"] == 0
+
+
+class TestHybridSearch:
+    """Test cases for hybrid search."""
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_hybrid(self, mock_get_parser):
+        """Test that fused chapters are returned once with their ranks."""
+        mock_parser = Mock()
+        mock_parser.search_hybrid_previews.return_value = PreviewedSearch(
+            [
+                ("Matthew", 5, 0.0328, 1, 1, "Blessed are the poor in spirit..."),
+                ("Luke", 6, 0.0161, None, 2, "Looking up at His disciples..."),
+            ],
+            ["Matthew 5 preview", "Luke 6 preview"],
+            {},
+        )
+        mock_get_parser.return_value = mock_parser
+
+        result = search_scripture_hybrid("love your enemies", testament="NT", n_results=50, scorer="bm25")
+
+        call_args = mock_parser.search_hybrid_previews.call_args
+        assert call_args[0] == ("love your enemies", 20)
+        assert call_args[1]["scorer"] == "bm25"
+        assert call_args[1]["scope"].testament == "NT"
+        assert call_args[1]["fuzzy"] is True
+        assert result["count"] == 2
+        assert "corrections" not in result
+        assert result["results"][1] == {
+            "book": "Luke",
+            "chapter": 6,
+            "score": 0.0161,
+            "keyword_rank": None,
+            "semantic_rank": 2,
+            "text": "Looking up at His disciples...",
+            "preview": "Luke 6 preview",
+            "reference": "Luke 6",
+        }
+        mock_parser.snippet.assert_not_called()
+
+        # Compact results carry the preview only
+        result = search_scripture_hybrid("love your enemies", compact=True)
+        assert "text" not in result["results"][0]
+        assert result["results"][0]["preview"] == "Matthew 5 preview"
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_hybrid_errors(self, mock_get_parser):
+        """Test invalid scorers, scopes and queries."""
+        mock_parser = Mock()
+        mock_parser.search_hybrid_previews.side_effect = ValueError("Missing ')' in query: (love")
+        mock_get_parser.return_value = mock_parser
+
+        assert "Unknown scorer" in search_scripture_hybrid("love", scorer="bogus")["error"]
+        assert "error" in search_scripture_hybrid("love", testament="Apocrypha")
+        mock_parser.search_hybrid_previews.assert_not_called()
+        assert search_scripture_hybrid("(love") == {"error": "Invalid query: Missing ')' in query: (love"}
+
+
+class TestRegexSearch:
+    """Test cases for regex search."""
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_regex(self, mock_get_parser):
+        """Test that matching verses are returned with references."""
+        mock_parser = Mock()
+        mock_parser.search_regex.return_value = [
+            ("Haggai", 1, 5, "Now this is what the LORD of Hosts says: Consider your ways."),
+            ("Haggai", 1, 7, "This is what the LORD of Hosts says."),
+        ]
+        mock_get_parser.return_value = mock_parser
+
+        result = search_scripture_regex(r"LORD of (hosts|Hosts)", book="Hag", n_results=5)
+
+        call_args = mock_parser.search_regex.call_args
+        assert call_args[0] == (r"LORD of (hosts|Hosts)", 5)
+        assert call_args[1]["scope"].book == "Hag"
+        assert call_args[1]["ignore_case"] is False
+        assert result["count"] == 2
+        assert result["results"][1] == {
+            "book": "Haggai",
+            "chapter": 1,
+            "verse": 7,
+            "text": "This is what the LORD of Hosts says.",
+            "reference": "Haggai 1:7",
+        }
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_regex_caps_n_results(self, mock_get_parser):
+        """Test that n_results is capped and case folding is passed through."""
+        mock_parser = Mock()
+        mock_parser.search_regex.return_value = []
+        mock_get_parser.return_value = mock_parser
+
+        result = search_scripture_regex("jesus wept", n_results=500, ignore_case=True)
+
+        mock_parser.search_regex.assert_called_once_with("jesus wept", 50, scope=None, ignore_case=True)
+        assert result == {"pattern": "jesus wept", "results": [], "count": 0}
+
+    @patch("cli.tools.get_bsb_parser")
+    def test_search_scripture_regex_errors(self, mock_get_parser):
+        """Test that invalid patterns and scopes are returned as errors."""
+        mock_parser = Mock()
+        mock_parser.search_regex.side_effect = ValueError("Invalid pattern: missing ), unterminated subpattern at position 0")
+        mock_get_parser.return_value = mock_parser
+
+        assert search_scripture_regex("(king") == {"error": "Invalid pattern: missing ), unterminated subpattern at position 0"}
+        assert "error" in search_scripture_regex("king", testament="Apocrypha")
+
+    def test_search_scripture_regex_tool_schema(self):
+        """Test search_scripture_regex tool schema."""
+        regex_tool = next(t for t in SCRIPTURE_TOOLS if t["function"]["name"] == "search_scripture_regex")
+
+        properties = regex_tool["function"]["parameters"]["properties"]
+        assert {"pattern", "ignore_case", "book", "n_results", "testament", "books", "book_range"} <= set(properties)
+        assert regex_tool["function"]["parameters"]["required"] == ["pattern"]
+
 
 class TestToolExecution:
     """Test cases for tool execution system."""
@@ -468,7 +915,7 @@ class TestToolSchema:
     def test_scripture_tools_schema_structure(self):
         """Test that SCRIPTURE_TOOLS has correct structure."""
         assert isinstance(SCRIPTURE_TOOLS, list)
-        assert len(SCRIPTURE_TOOLS) == 4  # get_scripture, search_scripture_semantic, search_scripture_keyword, list_bible_translations
+        assert len(SCRIPTURE_TOOLS) == 7  # get_scripture, get_scripture_context, search_scripture_semantic, search_scripture_keyword, search_scripture_hybrid, search_scripture_regex, list_bible_translations
 
         # Check each tool has required fields
         for tool in SCRIPTURE_TOOLS:
@@ -495,6 +942,14 @@ class TestToolSchema:
         assert "chapter" in required
         assert "begin_verse" not in required  # Optional
 
+    def test_get_scripture_context_tool_schema(self):
+        """Test get_scripture_context tool schema."""
+        context_tool = next(t for t in SCRIPTURE_TOOLS if t["function"]["name"] == "get_scripture_context")
+
+        properties = context_tool["function"]["parameters"]["properties"]
+        assert set(properties) == {"book", "chapter", "related", "bible_id"}
+        assert context_tool["function"]["parameters"]["required"] == ["book", "chapter"]
+
     def test_search_scripture_tool_schema(self):
         """Test search_scripture_semantic tool schema."""
         search_tool = next(
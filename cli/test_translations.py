@@ -0,0 +1,108 @@
+"""
+Tests for the translations module.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from .translations import (
+    DEFAULT_TRANSLATION,
+    Translation,
+    TranslationRegistry,
+    parse_translations,
+)
+
+
+def make_registry(tmp_path, max_resident=2):
+    factory = Mock(side_effect=lambda source, cache_dir: Mock(source=source))
+    registry = TranslationRegistry(factory, tmp_path, max_resident)
+    registry.register(Translation("KJV", "King James Version", "/data/kjv.txt"))
+    registry.register(Translation("web", "World English Bible", "/data/web.txt"))
+    return registry, factory
+
+
+class TestParseTranslations:
+    """Test cases for parse_translations."""
+
+    def test_pairs(self):
+        """Test that ID=source pairs are parsed, ids upper-cased."""
+        assert parse_translations(
+            " kjv=/data/kjv.txt, WEB=https://example.org/web.txt,"
+        ) == [
+            Translation("KJV", "KJV", "/data/kjv.txt"),
+            Translation("WEB", "WEB", "https://example.org/web.txt"),
+        ]
+        assert parse_translations("") == []
+
+    @pytest.mark.parametrize("value", ["KJV", "=/data/kjv.txt", "KJV="])
+    def test_invalid(self, value):
+        """Test that pairs without an id or source raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid translation"):
+            parse_translations(value)
+
+
+class TestTranslationRegistry:
+    """Test cases for TranslationRegistry."""
+
+    def test_lazy_per_translation_caches(self, tmp_path):
+        """Test that parsers are created on first use, each in its own cache."""
+        registry, factory = make_registry(tmp_path)
+        assert [t.bible_id for t in registry.translations()] == ["BSB", "KJV", "WEB"]
+        factory.assert_not_called()
+
+        bsb = registry.get()
+        assert registry.get("bsb") is bsb
+        assert registry.get("KJV").source == "/data/kjv.txt"
+        assert factory.call_args_list[0].args == (None, tmp_path)
+        assert factory.call_args_list[1].args == ("/data/kjv.txt", tmp_path / "kjv")
+        assert factory.call_count == 2
+        assert registry.resident() == [DEFAULT_TRANSLATION, "KJV"]
+
+    def test_lru_residency(self, tmp_path):
+        """Test that the least recently used translation is closed and dropped."""
+        registry, factory = make_registry(tmp_path, max_resident=2)
+        bsb = registry.get("BSB")
+        kjv = registry.get("KJV")
+        registry.get("BSB")
+        web = registry.get("WEB")
+
+        assert registry.resident() == ["BSB", "WEB"]
+        kjv.close.assert_called_once()
+        bsb.close.assert_not_called()
+        web.close.assert_not_called()
+
+        # An evicted translation is loaded again on demand
+        assert registry.get("KJV") is not kjv
+        assert registry.resident() == ["WEB", "KJV"]
+        bsb.close.assert_called_once()
+        assert factory.call_count == 4
+
+    def test_unknown_translation(self, tmp_path):
+        """Test that unknown ids raise ValueError naming the known ones."""
+        registry, factory = make_registry(tmp_path)
+        with pytest.raises(
+            ValueError, match="Unknown translation: NIV. Use one of: BSB, KJV, WEB"
+        ):
+            registry.get("niv")
+        factory.assert_not_called()
+
+    def test_register_replaces_loaded_translation(self, tmp_path):
+        """Test that re-registering an id drops its loaded parser."""
+        registry, _ = make_registry(tmp_path)
+        kjv = registry.get("KJV")
+        registry.register(Translation("KJV", "King James Version", "/data/kjv2.txt"))
+
+        kjv.close.assert_called_once()
+        assert registry.get("KJV").source == "/data/kjv2.txt"
+
+    def test_from_env(self, tmp_path):
+        """Test configuration from environment variables."""
+        env = {
+            "GAMALIEL_TRANSLATIONS": "KJV=/data/kjv.txt",
+            "GAMALIEL_MAX_TRANSLATIONS": "1",
+        }
+        with patch.dict("os.environ", env):
+            registry = TranslationRegistry.from_env(Mock(), tmp_path)
+        assert registry.max_resident == 1
+        assert [t.bible_id for t in registry.translations()] == ["BSB", "KJV"]
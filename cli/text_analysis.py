@@ -0,0 +1,149 @@
+"""
+Text analysis helpers shared by the scripture indexes.
+"""
+
+import hashlib
+import re
+from typing import List, Tuple
+
+# Words ignored by the semantic (TF-IDF) index
+STOP_WORDS = frozenset(
+    {
+        "the",
+        "and",
+        "of",
+        "to",
+        "in",
+        "a",
+        "is",
+        "that",
+        "it",
+        "with",
+        "as",
+        "for",
+        "was",
+        "on",
+        "be",
+        "at",
+        "this",
+        "by",
+        "i",
+        "have",
+        "or",
+        "an",
+        "he",
+        "from",
+        "they",
+        "we",
+        "say",
+        "her",
+        "she",
+        "will",
+        "my",
+        "one",
+        "all",
+        "would",
+        "there",
+        "their",
+        "what",
+        "so",
+        "up",
+        "out",
+        "if",
+        "about",
+        "who",
+        "get",
+        "which",
+        "go",
+        "me",
+        "when",
+        "make",
+        "can",
+        "like",
+        "time",
+        "no",
+        "just",
+        "him",
+        "know",
+        "take",
+        "people",
+        "into",
+        "year",
+        "your",
+        "good",
+        "some",
+        "could",
+        "them",
+        "see",
+        "other",
+        "than",
+        "then",
+        "now",
+        "look",
+        "only",
+        "come",
+        "its",
+        "over",
+        "think",
+        "also",
+        "back",
+        "after",
+        "use",
+        "two",
+        "how",
+        "our",
+        "work",
+        "first",
+        "well",
+        "way",
+        "even",
+        "new",
+        "want",
+        "because",
+        "any",
+        "these",
+        "give",
+        "day",
+        "most",
+        "us",
+    }
+)
+
+MIN_TERM_LENGTH = 3
+
+_SEMANTIC_TOKEN_RE = re.compile(r"\b[a-zA-Z]+\b")
+
+# Keyword search matches whole words, so every word is kept
+_WORD_RE = re.compile(r"\w+")
+
+
+def fingerprint(*parts) -> str:
+    """Short stable hash of build parameters, used to stamp cached indexes."""
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+# Changes whenever the semantic tokenizer or stop-word list changes, which
+# invalidates every index built from its tokens.
+SEMANTIC_TOKENIZER_HASH = fingerprint(
+    _SEMANTIC_TOKEN_RE.pattern, sorted(STOP_WORDS), MIN_TERM_LENGTH
+)
+KEYWORD_TOKENIZER_HASH = fingerprint(_WORD_RE.pattern, "lower")
+
+
+def tokenize_semantic(text: str) -> List[str]:
+    """Tokenize text into words, removing common stop words."""
+    return [
+        word
+        for word in _SEMANTIC_TOKEN_RE.findall(text.lower())
+        if len(word) >= MIN_TERM_LENGTH and word not in STOP_WORDS
+    ]
+
+
+def tokenize_words(text: str) -> List[str]:
+    """Split text into lowercase whole words for keyword search."""
+    return _WORD_RE.findall(text.lower())
+
+
+def word_spans(text: str) -> List[Tuple[int, int]]:
+    """Character ``(start, end)`` spans of the words of ``tokenize_words``."""
+    return [match.span() for match in _WORD_RE.finditer(text)]
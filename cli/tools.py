@@ -3,235 +3,424 @@ Scripture tools for the Gamaliel Prompts CLI tool.
 Simplified versions compatible with existing prompt templates.
 """
 
-from typing import Any, Dict, Optional
-
-from .scripture import get_bsb_parser
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from .references import normalize_book
+from .scope import TESTAMENTS, SearchScope
+from .scripture import (
+    SEMANTIC_SCORERS,
+    STORAGE_BACKENDS,
+    get_bsb_parser,
+    get_sqlite_backend,
+    get_translation_registry,
+)
+from .semantic_index import BM25_B, BM25_K1
+from .snippets import truncate
+from .storage import SQLITE_SCORERS, ScriptureBackend, SqliteBackend
+
+
+def get_backend(bible_id: Optional[str] = None) -> ScriptureBackend:
+    """Storage backend of the core tools (get, keyword and semantic search, books).
+
+    The cached index files by default, or a SQLite FTS5 database shared by
+    every process with GAMALIEL_STORAGE=sqlite.  Hybrid, regex, passage and
+    related-chapter search always use the index files.  Raises ValueError for
+    unknown translations or storage backends.
+    """
+    storage = os.getenv("GAMALIEL_STORAGE", "files")
+    if storage not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {storage}. Use one of: {', '.join(STORAGE_BACKENDS)}")
+    if storage == "sqlite":
+        return get_sqlite_backend(bible_id)
+    return get_bsb_parser(bible_id)
 
 
 def get_scripture(
-    book: str, chapter: int, begin_verse: Optional[int] = None, end_verse: Optional[int] = None, bible_id: Optional[str] = None
+    book: str, chapter: int, begin_verse: Optional[int] = None, end_verse: Optional[int] = None, bible_id: Optional[str] = None, end_chapter: Optional[int] = None
 ) -> Dict[str, Any]:
-    """Get specific scripture passage. Always returns full chapter for proper context."""
+    """Get specific scripture passage. Always returns full chapter for proper context.
 
-    parser = get_bsb_parser()
+    A verse range may span chapters: ``end_chapter``/``end_verse`` give its end
+    (e.g. John 3:16-4:2).  The range is resolved to verse ids and read as one
+    slice of the corpus text.
+    """
 
-    # Always get the full chapter for proper context
-    chapter_text = parser.get_chapter(book, chapter)
-    if not chapter_text:
-        return {"error": f"Chapter not found: {book} {chapter}"}
+    try:
+        parser = get_backend(bible_id)
+    except ValueError as e:
+        return {"error": str(e)}
+    book = normalize_book(book.strip())
 
     # If verse range was requested, highlight it in the response
-    if begin_verse or end_verse:
+    if begin_verse or end_verse or end_chapter:
         start_verse = begin_verse or 1
-        end_verse = end_verse or start_verse
-
-        # Get the verse range text for reference
-        verse_texts = []
-        for v in range(start_verse, end_verse + 1):
-            verse_text = parser.get_verse(book, chapter, v)
-            if verse_text:
-                verse_texts.append(f"{v}: {verse_text}")
-
-        if verse_texts:
-            return {
-                "book": book,
-                "chapter": chapter,
-                "verse_range": f"{start_verse}-{end_verse}",
-                "highlighted_text": " ".join(verse_texts),
-                "text": chapter_text,  # Full chapter text for context
-                "reference": f"{book} {chapter}:{start_verse}-{end_verse}",
-                "note": f"Highlighted verses {start_verse}-{end_verse}",
-            }
+        if end_chapter is None:
+            end_verse = end_verse or start_verse
+            end = f"{end_verse}"
         else:
-            return {"error": f"Verse range not found: {book} {chapter}:{start_verse}-{end_verse}"}
-    else:
+            end = f"{end_chapter}:{end_verse}" if end_verse else f"{end_chapter}"
+
+        passage = parser.get_passage(book, chapter, start_verse, end_chapter, end_verse, numbered=True)
+        if not passage:
+            return {"error": f"Verse range not found: {book} {chapter}:{start_verse}-{end}"}
+        book_name, first_chapter, first_verse, last_chapter, last_verse, passage_text = passage
+
+        # The full chapters the passage spans, as one slice as well
+        chapters = parser.get_passage(book, first_chapter, None, last_chapter)
+        verse_range = f"{first_verse}-{last_verse}" if first_chapter == last_chapter else f"{first_verse}-{last_chapter}:{last_verse}"
         return {
-            "book": book,
-            "chapter": chapter,
-            "text": chapter_text,
-            "reference": f"{book} {chapter}",
+            "book": book_name,
+            "chapter": first_chapter,
+            "verse_range": verse_range,
+            "highlighted_text": passage_text,
+            "text": chapters[5] if chapters else passage_text,  # Full chapter text for context
+            "reference": f"{book_name} {first_chapter}:{verse_range}",
+            "note": f"Highlighted verses {verse_range}",
         }
 
+    # Always get the full chapter for proper context
+    chapter_text = parser.get_chapter(book, chapter)
+    if not chapter_text:
+        return {"error": f"Chapter not found: {book} {chapter}"}
+    return {
+        "book": book,
+        "chapter": chapter,
+        "text": chapter_text,
+        "reference": f"{book} {chapter}",
+    }
 
-def search_scripture_keyword(query: str, book: Optional[str] = None, n_results: int = 10, bible_id: Optional[str] = None) -> Dict[str, Any]:
+
+def _search_scope(book: Optional[str], books: Optional[List[str]], testament: Optional[str], book_range: Optional[str]) -> Optional[SearchScope]:
+    """Build the search scope of a tool call (None when the whole Bible is searched)."""
+    scope = SearchScope(book=book, books=books, testament=testament, book_range=book_range)
+    return scope if scope else None
+
+
+def search_scripture_keyword(query: str, book: Optional[str] = None, n_results: int = 10, bible_id: Optional[str] = None, testament: Optional[str] = None, books: Optional[List[str]] = None, book_range: Optional[str] = None, compact: bool = False) -> Dict[str, Any]:
     """Search scripture using keyword/exact text matching.
     
     Args:
-        query: Search query text (can be single words, phrases, or multiple keywords)
+        query: Search query text: words, "exact phrases", prefix*, AND/OR/NOT, NEAR/n and
+            book:/chapter: filters (e.g., 'faith AND works book:James')
         book: Optional book name to filter results (e.g., "Genesis", "GEN", "Gen")
         n_results: Number of results to return (default: 10, max: 20)
-        bible_id: Bible translation ID (defaults to BSB for CLI)
+        bible_id: Bible translation ID (defaults to BSB; see list_bible_translations)
+        testament: Optional "OT" or "NT" to search one testament only
+        books: Optional list of book names to search
+        book_range: Optional canonical range (e.g., "Genesis-Deuteronomy", "Isaiah 40-55")
+        compact: Return only the highlighted previews, without the full chapter text
     
     Returns:
-        Dictionary containing search results with full chapter text and metadata, ranked by occurrence count
+        Dictionary containing search results with full chapter text and metadata, ranked by occurrence count,
+        and the spelling corrections applied to misspelled words (if any)
     """
-    import re
-    
     # Enforce max limit to prevent token overflow
     MAX_N_RESULTS = 20
     if n_results > MAX_N_RESULTS:
         n_results = MAX_N_RESULTS
 
-    parser = get_bsb_parser()
-    
-    # Parse query: handle quoted phrases vs word search
-    query_lower = query.lower().strip()
-    quoted_phrases = re.findall(r'"([^"]+)"', query)
-    
-    if quoted_phrases:
-        # Exact phrase search
-        search_terms = quoted_phrases
-        is_phrase_search = True
-    else:
-        # Extract words for word-by-word search
-        query_words = re.findall(r'\w+', query_lower)
-        if len(query_words) == 1:
-            search_terms = [query_lower]
-            is_phrase_search = False
-        else:
-            search_terms = query_words
-            is_phrase_search = False
-    
-    # Normalize book name for filtering if provided
-    normalized_book = None
-    if book:
-        normalized_book = parser._normalize_book_name(book)
-    
-    # Search each term and aggregate results by chapter
-    chapter_matches = {}  # (book, chapter) -> count
-    
-    for term in search_terms:
-        # Get more results if filtering by book or doing word search
-        search_limit = (n_results * 10) if (normalized_book or not is_phrase_search) else (n_results * 5)
-        results = parser.search_text(term, search_limit)
-        
-        for result_book, chapter, verse, verse_text in results:
-            # Filter by book if specified
-            if normalized_book:
-                result_book_normalized = parser._normalize_book_name(result_book)
-                if result_book_normalized != normalized_book:
-                    continue
-            
-            key = (result_book, chapter)
-            if key not in chapter_matches:
-                chapter_matches[key] = {
-                    "book": result_book,
-                    "chapter": chapter,
-                    "count": 0,
-                    "verses": []
-                }
-            
-            # Count matches
-            verse_text_lower = verse_text.lower()
-            if is_phrase_search:
-                # Count exact phrase occurrences
-                count = verse_text_lower.count(term.lower())
-            else:
-                # Count whole word matches
-                count = len(re.findall(r'\b' + re.escape(term.lower()) + r'\b', verse_text_lower))
-            
-            chapter_matches[key]["count"] += count
-            if count > 0:
-                chapter_matches[key]["verses"].append((verse, verse_text))
+    try:
+        scope = _search_scope(book, books, testament, book_range)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    try:
+        parser = get_backend(bible_id)
+    except ValueError as e:
+        return {"error": str(e)}
     
-    # Sort by occurrence count (descending)
-    sorted_chapters = sorted(chapter_matches.values(), key=lambda x: x["count"], reverse=True)
+    # The query is compiled to postings operations on the positional index,
+    # which also applies the scope and counts matches per chapter; misspelled
+    # words are resolved to their closest spellings first, once for the
+    # search and the previews
+    try:
+        ranked_chapters, previews, corrections = parser.search_keyword_previews(query, n_results, scope=scope, fuzzy=True)
+    except ValueError as e:
+        return {"error": f"Invalid query: {e}"}
     
     # Format results
     formatted_results = []
-    for chapter_data in sorted_chapters[:n_results]:
-        book_name = chapter_data["book"]
-        chapter_num = chapter_data["chapter"]
-        
-        # Get full chapter text
-        chapter_text = parser.get_chapter(book_name, chapter_num)
-        if not chapter_text:
-            continue
-        
-        # Create preview from first few verses
-        verses = chapter_data["verses"][:3]
-        preview_lines = [f"{v[0]}: {v[1][:50]}..." for v in verses]
-        preview = " ".join(preview_lines)
-        
-        formatted_results.append(
-            {
-                "book": book_name,
-                "chapter": chapter_num,
-                "match_count": chapter_data["count"],
-                "text": chapter_text,  # Full chapter text as expected by agent
-                "preview": preview,
-                "reference": f"{book_name} {chapter_num}",
-            }
-        )
+    for (book_name, chapter_num, match_count, matched_verses), preview in zip(ranked_chapters, previews):
+        result = {
+            "book": book_name,
+            "chapter": chapter_num,
+            "match_count": match_count,
+        }
+        if not compact:
+            # Get full chapter text
+            chapter_text = parser.get_chapter(book_name, chapter_num)
+            if not chapter_text:
+                continue
+            result["text"] = chapter_text  # Full chapter text as expected by agent
+
+        # The best matching verses, matched words highlighted from the index postings
+        result["preview"] = preview
+        result["reference"] = f"{book_name} {chapter_num}"
+        formatted_results.append(result)
     
-    return {
+    result = {
         "query": query,
         "results": formatted_results,
         "count": len(formatted_results),
     }
+    if corrections:
+        result["corrections"] = corrections
+    return result
+
+
+def search_scripture_hybrid(query: str, book: Optional[str] = None, n_results: int = 5, bible_id: Optional[str] = None, scorer: str = "tfidf", testament: Optional[str] = None, books: Optional[List[str]] = None, book_range: Optional[str] = None, compact: bool = False) -> Dict[str, Any]:
+    """Search scripture with keyword and semantic search at once.
+    
+    Args:
+        query: Search query text; the keyword query language applies (words, "exact phrases", prefix*, AND/OR/NOT, NEAR/n, book:/chapter: filters)
+        book: Optional book name to filter results (e.g., "Genesis", "GEN", "Gen")
+        n_results: Number of results to return (default: 5, max: 20)
+        bible_id: Bible translation ID (defaults to BSB; see list_bible_translations)
+        scorer: Semantic ranking function ("tfidf", "bm25" or "lsa")
+        testament: Optional "OT" or "NT" to search one testament only
+        books: Optional list of book names to search
+        book_range: Optional canonical range (e.g., "Genesis-Deuteronomy", "Isaiah 40-55")
+        compact: Return only the highlighted previews, without the full chapter text
+    
+    Returns:
+        Dictionary containing one deduplicated list of chapters ranked by reciprocal rank fusion
+    """
+    # Enforce max limit to prevent token overflow
+    MAX_N_RESULTS = 20
+    if n_results > MAX_N_RESULTS:
+        n_results = MAX_N_RESULTS
+
+    if scorer not in SEMANTIC_SCORERS:
+        return {"error": f"Unknown scorer: {scorer}. Use one of: {', '.join(SEMANTIC_SCORERS)}"}
+
+    try:
+        scope = _search_scope(book, books, testament, book_range)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    try:
+        parser = get_bsb_parser(bible_id)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    # Both rankings come from the cached indexes over the same scoped
+    # chapters; each chapter is returned once
+    try:
+        fused, previews, corrections = parser.search_hybrid_previews(query, n_results, scorer=scorer, scope=scope, fuzzy=True)
+    except ValueError as e:
+        return {"error": f"Invalid query: {e}"}
+
+    results = []
+    for (book_name, chapter_num, score, keyword_rank, semantic_rank, chapter_text), preview in zip(fused, previews):
+        item = {
+            "book": book_name,
+            "chapter": chapter_num,
+            "score": round(score, 4),
+            "keyword_rank": keyword_rank,
+            "semantic_rank": semantic_rank,
+        }
+        if not compact:
+            item["text"] = chapter_text
+        item["preview"] = preview
+        item["reference"] = f"{book_name} {chapter_num}"
+        results.append(item)
+    result = {
+        "query": query,
+        "results": results,
+        "count": len(results),
+    }
+    if corrections:
+        result["corrections"] = corrections
+    return result
+
+
+def search_scripture_regex(pattern: str, book: Optional[str] = None, n_results: int = 20, bible_id: Optional[str] = None, ignore_case: bool = False, testament: Optional[str] = None, books: Optional[List[str]] = None, book_range: Optional[str] = None) -> Dict[str, Any]:
+    """Search scripture verses with a regular expression.
+    
+    Args:
+        pattern: Python regular expression matched against each verse (e.g., "LORD of (hosts|Hosts)")
+        book: Optional book name to filter results (e.g., "Genesis", "GEN", "Gen")
+        n_results: Number of verses to return (default: 20, max: 50)
+        bible_id: Bible translation ID (defaults to BSB; see list_bible_translations)
+        ignore_case: Match case-insensitively
+        testament: Optional "OT" or "NT" to search one testament only
+        books: Optional list of book names to search
+        book_range: Optional canonical range (e.g., "Genesis-Deuteronomy", "Isaiah 40-55")
+    
+    Returns:
+        Dictionary containing the matching verses in canonical order
+    """
+    # Verses are short, so more of them fit in a response than chapters
+    MAX_N_RESULTS = 50
+    if n_results > MAX_N_RESULTS:
+        n_results = MAX_N_RESULTS
+
+    try:
+        scope = _search_scope(book, books, testament, book_range)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    try:
+        parser = get_bsb_parser(bible_id)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    # The trigram index narrows the search to verses containing the
+    # pattern's literals before the regex runs
+    try:
+        matches = parser.search_regex(pattern, n_results, scope=scope, ignore_case=ignore_case)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    results = [
+        {
+            "book": book_name,
+            "chapter": chapter,
+            "verse": verse,
+            "text": text,
+            "reference": f"{book_name} {chapter}:{verse}",
+        }
+        for book_name, chapter, verse, text in matches
+    ]
+    return {
+        "pattern": pattern,
+        "results": results,
+        "count": len(results),
+    }
 
 
-def search_scripture_semantic(query: str, book: Optional[str] = None, n_results: int = 5, bible_id: Optional[str] = None) -> Dict[str, Any]:
-    """Search scripture using semantic search with TF-IDF embeddings.
+def search_scripture_semantic(query: str, book: Optional[str] = None, n_results: int = 5, bible_id: Optional[str] = None, scorer: Optional[str] = None, k1: float = BM25_K1, b: float = BM25_B, granularity: str = "chapter", testament: Optional[str] = None, books: Optional[List[str]] = None, book_range: Optional[str] = None, compact: bool = False) -> Dict[str, Any]:
+    """Search scripture using semantic search with TF-IDF embeddings or BM25.
     
     Args:
         query: Search query text
         book: Optional book name to filter results (e.g., "Genesis", "GEN", "Gen")
         n_results: Number of results to return (default: 5, max: 20)
-        bible_id: Bible translation ID (defaults to BSB for CLI)
+        bible_id: Bible translation ID (defaults to BSB; see list_bible_translations)
+        scorer: Ranking function, "tfidf" (cosine similarity), "bm25" or "lsa"
+            (latent semantic embeddings, needs the "fast" extra); defaults to
+            the storage backend's own ranking (tfidf, or bm25 on SQLite)
+        k1: BM25 term frequency saturation
+        b: BM25 document length normalization
+        granularity: "chapter" (full chapter text) or "passage" (only the
+            matching verse range, e.g. "John 3:16-18")
+        testament: Optional "OT" or "NT" to search one testament only
+        books: Optional list of book names to search
+        book_range: Optional canonical range (e.g., "Genesis-Deuteronomy", "Isaiah 40-55")
+        compact: Return only the highlighted previews, without the chapter or passage text
     
     Returns:
-        Dictionary containing search results with full chapter text and metadata
+        Dictionary containing search results with chapter or passage text and metadata
     """
     # Enforce max limit to prevent token overflow
     MAX_N_RESULTS = 20
     if n_results > MAX_N_RESULTS:
         n_results = MAX_N_RESULTS
 
-    parser = get_bsb_parser()
+    if scorer is not None and scorer not in SEMANTIC_SCORERS:
+        return {"error": f"Unknown scorer: {scorer}. Use one of: {', '.join(SEMANTIC_SCORERS)}"}
+    try:
+        scope = _search_scope(book, books, testament, book_range)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    if granularity not in ("chapter", "passage"):
+        return {"error": f"Unknown granularity: {granularity}. Use 'chapter' or 'passage'"}
+    try:
+        # Passages are only indexed by the cached index files
+        parser = get_bsb_parser(bible_id) if granularity == "passage" else get_backend(bible_id)
+    except ValueError as e:
+        return {"error": str(e)}
+    if scorer is None:
+        scorer = SQLITE_SCORERS[0] if isinstance(parser, SqliteBackend) else "tfidf"
+
+    # The scope is applied inside the index, so every page is full
+    if granularity == "passage":
+        results = parser.search_passages(query, n_results, scorer=scorer, k1=k1, b=b, scope=scope)
+        return _format_passage_results(parser, query, results, compact)
+    try:
+        results = parser.search_semantic(query, n_results, scorer=scorer, k1=k1, b=b, scope=scope)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return _format_semantic_results(parser, query, results, compact)
+
+
+def search_scripture_semantic_many(queries: List[str], book: Optional[str] = None, n_results: int = 5, bible_id: Optional[str] = None, scorer: str = "tfidf", k1: float = BM25_K1, b: float = BM25_B, testament: Optional[str] = None, books: Optional[List[str]] = None, book_range: Optional[str] = None, compact: bool = False) -> List[Dict[str, Any]]:
+    """Run search_scripture_semantic for a batch of queries (e.g. offline evaluation).
     
-    # Use higher n_results initially if book filter is specified, since we'll filter after
-    search_limit = n_results * 3 if book else n_results
-    results = parser.search_semantic(query, search_limit)
+    All queries are scored together, using sparse matrix products when NumPy/SciPy
+    are installed (the "fast" extra).
+    
+    Returns:
+        One search_scripture_semantic result dictionary per query, in order
+    """
+    # Enforce max limit to prevent token overflow
+    MAX_N_RESULTS = 20
+    if n_results > MAX_N_RESULTS:
+        n_results = MAX_N_RESULTS
 
-    # Normalize book name for filtering if provided
-    normalized_book = None
-    if book:
-        normalized_book = parser._normalize_book_name(book)
+    if scorer not in SEMANTIC_SCORERS:
+        error = {"error": f"Unknown scorer: {scorer}. Use one of: {', '.join(SEMANTIC_SCORERS)}"}
+        return [error for _ in queries]
+    try:
+        scope = _search_scope(book, books, testament, book_range)
+    except ValueError as e:
+        return [{"error": str(e)} for _ in queries]
+
+    try:
+        parser = get_bsb_parser(bible_id)
+    except ValueError as e:
+        return [{"error": str(e)} for _ in queries]
+    batch_results = parser.search_semantic_many(queries, n_results, scorer=scorer, k1=k1, b=b, scope=scope)
+
+    return [
+        _format_semantic_results(parser, query, results, compact)
+        for query, results in zip(queries, batch_results)
+    ]
 
+
+def _format_semantic_results(parser, query: str, results: List[Tuple[str, int, float, str]], compact: bool = False) -> Dict[str, Any]:
+    """Format semantic search hits for the agent."""
     formatted_results = []
     for result_book, chapter, similarity, chapter_text in results:
-        # Filter by book if specified (BSB parser doesn't support book filtering at search level)
-        if normalized_book:
-            result_book_normalized = parser._normalize_book_name(result_book)
-            if result_book_normalized != normalized_book:
-                continue
-        
-        # Extract first few verses for context
-        verses = parser.get_chapter(result_book, chapter)
-        if verses:
-            # Get first 3 verses as preview
-            verse_lines = verses.split(".")[:3]
-            preview = ". ".join(verse_lines) + ("..." if len(verse_lines) >= 3 else "")
-        else:
-            preview = (
-                chapter_text[:200] + "..." if len(chapter_text) > 200 else chapter_text
-            )
+        result = {
+            "book": result_book,
+            "chapter": chapter,
+            "similarity": round(similarity, 4),
+        }
+        if not compact:
+            result["text"] = chapter_text  # Full chapter text as expected by agent
+        # Verses with the query's words highlighted, or the chapter's precomputed lead
+        result["preview"] = parser.snippet(query, result_book, chapter)
+        result["reference"] = f"{result_book} {chapter}"
+        formatted_results.append(result)
 
-        formatted_results.append(
-            {
-                "book": result_book,
-                "chapter": chapter,
-                "similarity": round(similarity, 4),
-                "text": chapter_text,  # Full chapter text as expected by agent
-                "preview": preview,
-                "reference": f"{result_book} {chapter}",
-            }
-        )
-        
-        # Stop once we have enough results
-        if len(formatted_results) >= n_results:
-            break
+    return {
+        "query": query,
+        "results": formatted_results,
+        "count": len(formatted_results),
+    }
+
+
+def _format_passage_results(parser, query: str, results: List[Tuple[str, int, int, int, float, str]], compact: bool = False) -> Dict[str, Any]:
+    """Format passage search hits for the agent."""
+    formatted_results = []
+    for result_book, chapter, verse_start, verse_end, similarity, passage_text in results:
+        verses = str(verse_start) if verse_start == verse_end else f"{verse_start}-{verse_end}"
+        result = {
+            "book": result_book,
+            "chapter": chapter,
+            "verse_start": verse_start,
+            "verse_end": verse_end,
+            "similarity": round(similarity, 4),
+        }
+        if not compact:
+            result["text"] = passage_text  # Only the matching verses
+        result["preview"] = truncate(passage_text)
+        result["reference"] = f"{result_book} {chapter}:{verses}"
+        formatted_results.append(result)
 
     return {
         "query": query,
@@ -241,34 +430,51 @@ def search_scripture_semantic(query: str, book: Optional[str] = None, n_results:
 
 
 def list_bible_translations() -> Dict[str, Any]:
-    """List available Bible translations (this CLI implementation only supports BSB)."""
+    """List available Bible translations (BSB, plus any configured in $GAMALIEL_TRANSLATIONS)."""
+    translations = get_translation_registry().translations()
     return {
         "translations": [
             {
-                "id": "BSB",
-                "name": "Berean Standard Bible",
-                "description": "Modern English translation with strong textual basis",
-                "language": "English"
+                "id": translation.bible_id,
+                "name": translation.name,
+                "description": translation.description,
+                "language": translation.language
             }
+            for translation in translations
         ],
-        "count": 1,
-        "note": "This CLI implementation only supports BSB translation"
+        "count": len(translations),
     }
 
 
-def list_bible_books() -> Dict[str, Any]:
+def list_bible_books(bible_id: Optional[str] = None) -> Dict[str, Any]:
     """List available Bible books."""
-    parser = get_bsb_parser()
+    try:
+        parser = get_backend(bible_id)
+    except ValueError as e:
+        return {"error": str(e)}
     books = parser.list_books()
 
     return {"books": books, "count": len(books)}
 
 
 def get_scripture_context(
-    book: str, chapter: int, context_verses: int = 2
+    book: str, chapter: int, related: int = 0, bible_id: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Get scripture with surrounding context."""
-    parser = get_bsb_parser()
+    """Get scripture with surrounding context: the previous and next chapters.
+
+    Args:
+        related: Number of most similar chapters to include as context["related"]
+            (default: 0, max: 10), read from the precomputed similarity graph
+    """
+    # Enforce max limit to prevent token overflow
+    MAX_RELATED = 10
+    if related > MAX_RELATED:
+        related = MAX_RELATED
+
+    try:
+        parser = get_backend(bible_id)
+    except ValueError as e:
+        return {"error": str(e)}
 
     # Get the main chapter
     chapter_text = parser.get_chapter(book, chapter)
@@ -289,6 +495,19 @@ def get_scripture_context(
     if next_text:
         context["next"] = {"chapter": chapter + 1, "text": next_text}
 
+    # Thematically related chapters anywhere in the Bible
+    if related > 0:
+        context["related"] = [
+            {
+                "book": related_book,
+                "chapter": related_chapter,
+                "similarity": round(similarity, 3),
+                "text": related_text,
+                "reference": f"{related_book} {related_chapter}",
+            }
+            for related_book, related_chapter, similarity, related_text in get_bsb_parser(bible_id).related_chapters(book, chapter, related)
+        ]
+
     return {
         "book": book,
         "chapter": chapter,
@@ -321,9 +540,39 @@ SCRIPTURE_TOOLS = [
                         "type": "integer",
                         "description": "Ending verse number (optional)",
                     },
+                    "end_chapter": {
+                        "type": "integer",
+                        "description": "Chapter of the ending verse, for ranges that span chapters such as John 3:16-4:2 (optional)",
+                    },
                     "bible_id": {
                         "type": "string",
-                        "description": "Bible translation ID (defaults to 'BSB' for this CLI implementation)",
+                        "description": "Bible translation ID from list_bible_translations (default: 'BSB')",
+                    },
+                },
+                "required": ["book", "chapter"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_scripture_context",
+            "description": "Get a full chapter with the previous and next chapters as context, and optionally the chapters most similar to it anywhere in the Bible.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "book": {
+                        "type": "string",
+                        "description": "Bible book name (e.g., 'John', 'Genesis')",
+                    },
+                    "chapter": {"type": "integer", "description": "Chapter number"},
+                    "related": {
+                        "type": "integer",
+                        "description": "Number of thematically related chapters to include, from a precomputed similarity graph (default: 0, max: 10)",
+                    },
+                    "bible_id": {
+                        "type": "string",
+                        "description": "Bible translation ID from list_bible_translations (default: 'BSB')",
                     },
                 },
                 "required": ["book", "chapter"],
@@ -350,9 +599,37 @@ SCRIPTURE_TOOLS = [
                         "type": "integer",
                         "description": "Number of results to return (default: 5, max: 20). Use 5-10 for general queries, 10-15 for book-specific queries.",
                     },
+                    "testament": {
+                        "type": "string",
+                        "enum": list(TESTAMENTS),
+                        "description": "Optional testament to search ('OT' or 'NT'). Use when the query is about one testament only.",
+                    },
+                    "books": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional list of books to search (e.g., ['Matthew', 'Mark', 'Luke', 'John'] for the Gospels).",
+                    },
+                    "book_range": {
+                        "type": "string",
+                        "description": "Optional canonical range to search, by book or chapter (e.g., 'Genesis-Deuteronomy', 'Isaiah 40-55', 'Matthew 5-7').",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "Return only short previews with the matched words highlighted instead of the full chapter text (default: false).",
+                    },
+                    "granularity": {
+                        "type": "string",
+                        "enum": ["chapter", "passage"],
+                        "description": "Result size (default: 'chapter'). 'passage' returns only the matching verse range (e.g. 'John 3:16-18'), which keeps results short; use it when looking for a specific statement rather than a whole narrative.",
+                    },
+                    "scorer": {
+                        "type": "string",
+                        "enum": list(SEMANTIC_SCORERS),
+                        "description": "Ranking function (default: 'tfidf', or 'bm25' with SQLite storage). 'bm25' normalizes for chapter length, favoring short focused chapters over long ones that mention a term in passing. 'lsa' (when available) matches related concepts, not only the exact words.",
+                    },
                     "bible_id": {
                         "type": "string",
-                        "description": "Bible translation ID (defaults to 'BSB' for this CLI implementation)",
+                        "description": "Bible translation ID from list_bible_translations (default: 'BSB')",
                     },
                 },
                 "required": ["query"],
@@ -363,13 +640,13 @@ SCRIPTURE_TOOLS = [
         "type": "function",
         "function": {
             "name": "search_scripture_keyword",
-            "description": "Search scripture using keyword/exact text matching. Returns chapters ranked by occurrence count. Fast and accurate for specific terms.",
+            "description": "Search scripture using keyword/exact text matching. Returns chapters ranked by occurrence count. Fast and accurate for specific terms. Supports a query language to express a precise search in one call. Misspelled words are matched to their closest spellings (reported under 'corrections').",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "query": {
                         "type": "string",
-                        "description": "Search query text - can be single words, phrases (use quotes for exact phrases), or multiple keywords",
+                        "description": "Search query text. Plain words match any of them; \"exact phrase\" in quotes; word* for any word starting with it (e.g. righteous*); AND (same verse), OR, NOT to exclude; NEAR/n for words within n words of each other; parentheses for grouping; book:Name and chapter:N or chapter:N-M to scope (quote multi-word books, e.g. book:\"1 John\"). Example: 'love NEAR/3 enemies book:Matthew chapter:5-7'. Operators must be upper case.",
                     },
                     "book": {
                         "type": "string",
@@ -379,20 +656,137 @@ SCRIPTURE_TOOLS = [
                         "type": "integer",
                         "description": "Number of results to return (default: 10, max: 20). Results are ranked by occurrence count.",
                     },
+                    "testament": {
+                        "type": "string",
+                        "enum": list(TESTAMENTS),
+                        "description": "Optional testament to search ('OT' or 'NT'). Use when the query is about one testament only.",
+                    },
+                    "books": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional list of books to search (e.g., ['Matthew', 'Mark', 'Luke', 'John'] for the Gospels).",
+                    },
+                    "book_range": {
+                        "type": "string",
+                        "description": "Optional canonical range to search, by book or chapter (e.g., 'Genesis-Deuteronomy', 'Isaiah 40-55', 'Matthew 5-7').",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "Return only short previews with the matched words highlighted instead of the full chapter text (default: false).",
+                    },
+                    "bible_id": {
+                        "type": "string",
+                        "description": "Bible translation ID from list_bible_translations (default: 'BSB')",
+                    },
+                },
+                "required": ["query"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_scripture_hybrid",
+            "description": "Search scripture with keyword and semantic search in one call. Returns one deduplicated list of chapters ranked by reciprocal rank fusion of both rankings, with each chapter's keyword and semantic rank. Prefer this over calling search_scripture_keyword and search_scripture_semantic for the same question.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Search query text. Plain words match any of them; the keyword query language also applies (\"exact phrase\", word*, AND/OR/NOT, NEAR/n, book:Name chapter:N-M). Misspelled words are matched to their closest spellings (reported under 'corrections').",
+                    },
+                    "book": {
+                        "type": "string",
+                        "description": "Optional book name or ID to filter results to a specific book (e.g., 'Genesis', 'GEN', 'Gen').",
+                    },
+                    "n_results": {
+                        "type": "integer",
+                        "description": "Number of results to return (default: 5, max: 20).",
+                    },
+                    "scorer": {
+                        "type": "string",
+                        "enum": list(SEMANTIC_SCORERS),
+                        "description": "Semantic ranking function (default: 'tfidf'); see search_scripture_semantic.",
+                    },
+                    "testament": {
+                        "type": "string",
+                        "enum": list(TESTAMENTS),
+                        "description": "Optional testament to search ('OT' or 'NT').",
+                    },
+                    "books": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional list of books to search (e.g., ['Matthew', 'Mark', 'Luke', 'John'] for the Gospels).",
+                    },
+                    "book_range": {
+                        "type": "string",
+                        "description": "Optional canonical range to search, by book or chapter (e.g., 'Genesis-Deuteronomy', 'Isaiah 40-55', 'Matthew 5-7').",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "Return only short previews with the matched words highlighted instead of the full chapter text (default: false).",
+                    },
                     "bible_id": {
                         "type": "string",
-                        "description": "Bible translation ID (defaults to 'BSB' for this CLI implementation)",
+                        "description": "Bible translation ID from list_bible_translations (default: 'BSB')",
                     },
                 },
                 "required": ["query"],
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_scripture_regex",
+            "description": "Search scripture verses with a regular expression. Returns matching verses in canonical order. Use for exact wording patterns that keyword search cannot express (alternatives, optional letters, word boundaries).",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "pattern": {
+                        "type": "string",
+                        "description": "Python regular expression matched against each verse, e.g. '\\bLORD of (hosts|Hosts)\\b'. Case-sensitive unless ignore_case is set. Include literal words where possible: they make the search fast.",
+                    },
+                    "ignore_case": {
+                        "type": "boolean",
+                        "description": "Match case-insensitively (default: false).",
+                    },
+                    "book": {
+                        "type": "string",
+                        "description": "Optional book name or ID to filter results to a specific book (e.g., 'Genesis', 'GEN', 'Gen').",
+                    },
+                    "n_results": {
+                        "type": "integer",
+                        "description": "Number of verses to return (default: 20, max: 50).",
+                    },
+                    "testament": {
+                        "type": "string",
+                        "enum": list(TESTAMENTS),
+                        "description": "Optional testament to search ('OT' or 'NT').",
+                    },
+                    "books": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional list of books to search (e.g., ['Matthew', 'Mark', 'Luke', 'John'] for the Gospels).",
+                    },
+                    "book_range": {
+                        "type": "string",
+                        "description": "Optional canonical range to search, by book or chapter (e.g., 'Genesis-Deuteronomy', 'Isaiah 40-55', 'Matthew 5-7').",
+                    },
+                    "bible_id": {
+                        "type": "string",
+                        "description": "Bible translation ID from list_bible_translations (default: 'BSB')",
+                    },
+                },
+                "required": ["pattern"],
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
             "name": "list_bible_translations",
-            "description": "Get list of available Bible translations (this CLI implementation only supports BSB)",
+            "description": "Get list of available Bible translations; their ids are accepted as bible_id by the other tools",
             "parameters": {"type": "object", "properties": {}},
         },
     },
@@ -405,6 +799,8 @@ def execute_tool(tool_name: str, **kwargs) -> Dict[str, Any]:
         "get_scripture": get_scripture,
         "search_scripture_semantic": search_scripture_semantic,
         "search_scripture_keyword": search_scripture_keyword,
+        "search_scripture_hybrid": search_scripture_hybrid,
+        "search_scripture_regex": search_scripture_regex,
         "list_bible_translations": list_bible_translations,
         "list_bible_books": list_bible_books,
         "get_scripture_context": get_scripture_context,
@@ -0,0 +1,145 @@
+"""
+Bible translations: a registry of sources with per-translation caches.
+
+Every translation is ingested from a source in the BSB text format
+("Book C:V text" lines) into its own cache directory, so each one has its
+own corpus and index files.  They all use the canonical book names, which
+makes ``VerseRef`` values (see ``references``) comparable across
+translations.
+
+Parsers are created lazily, on the first request for a translation, and at
+most ``max_resident`` of them are kept loaded: the least recently used one
+is closed and dropped when another is needed.  Its cache stays on disk, so
+loading it again only maps the files.
+
+Extra translations are configured as ``ID=source`` pairs separated by
+commas, e.g. ``GAMALIEL_TRANSLATIONS="KJV=/data/kjv.txt,WEB=https://..."``.
+"""
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+DEFAULT_TRANSLATION = "BSB"
+
+# Loaded translations kept in memory at once
+MAX_RESIDENT_TRANSLATIONS = 2
+
+
+class Translation(NamedTuple):
+    """A registered translation and where its text comes from."""
+
+    bible_id: str
+    name: str
+    source: Optional[str] = None
+    language: str = "English"
+    description: str = ""
+
+
+BSB = Translation(
+    DEFAULT_TRANSLATION,
+    "Berean Standard Bible",
+    description="Modern English translation with strong textual basis",
+)
+
+
+def parse_translations(value: str) -> List[Translation]:
+    """Parse ``ID=source`` pairs separated by commas.
+
+    Raises ``ValueError`` for pairs without an id or a source.
+    """
+    translations = []
+    for pair in value.split(","):
+        if not pair.strip():
+            continue
+        bible_id, _, source = pair.partition("=")
+        if not bible_id.strip() or not source.strip():
+            raise ValueError(f"Invalid translation: {pair.strip()}. Use ID=source")
+        bible_id = bible_id.strip().upper()
+        translations.append(Translation(bible_id, bible_id, source.strip()))
+    return translations
+
+
+class TranslationRegistry:
+    """Translations by ``bible_id``, loaded lazily with LRU residency.
+
+    ``parser_factory(source, cache_dir)`` creates the parser of a
+    translation.  The default translation keeps ``cache_dir`` itself, every
+    other one gets a subdirectory named after its id.
+    """
+
+    def __init__(
+        self,
+        parser_factory: Callable[[Optional[str], Path], Any],
+        cache_dir: Path,
+        max_resident: int = MAX_RESIDENT_TRANSLATIONS,
+    ):
+        self.parser_factory = parser_factory
+        self.cache_dir = Path(cache_dir)
+        self.max_resident = max(max_resident, 1)
+        self._translations: Dict[str, Translation] = {}
+        self._parsers: "OrderedDict[str, Any]" = OrderedDict()
+        self.register(BSB)
+
+    def register(self, translation: Translation):
+        """Add a translation, or replace the one with the same id."""
+        bible_id = translation.bible_id.upper()
+        self._translations[bible_id] = translation._replace(bible_id=bible_id)
+        parser = self._parsers.pop(bible_id, None)
+        if parser is not None:
+            parser.close()
+
+    def translations(self) -> List[Translation]:
+        """Return the registered translations, the default one first."""
+        return list(self._translations.values())
+
+    def resident(self) -> List[str]:
+        """Return the ids of the loaded translations, least recently used first."""
+        return list(self._parsers)
+
+    def cache_dir_for(self, bible_id: str) -> Path:
+        """Return the cache directory of a translation."""
+        bible_id = bible_id.upper()
+        if bible_id == DEFAULT_TRANSLATION:
+            return self.cache_dir
+        return self.cache_dir / bible_id.lower()
+
+    def get(self, bible_id: Optional[str] = None):
+        """Return the parser of a translation, creating it on first use.
+
+        Raises ``ValueError`` for unknown ids.
+        """
+        bible_id = (bible_id or DEFAULT_TRANSLATION).strip().upper()
+        parser = self._parsers.get(bible_id)
+        if parser is not None:
+            self._parsers.move_to_end(bible_id)
+            return parser
+
+        translation = self._translations.get(bible_id)
+        if translation is None:
+            raise ValueError(
+                f"Unknown translation: {bible_id}. "
+                f"Use one of: {', '.join(self._translations)}"
+            )
+        while len(self._parsers) >= self.max_resident:
+            _, evicted = self._parsers.popitem(last=False)
+            evicted.close()
+        parser = self.parser_factory(translation.source, self.cache_dir_for(bible_id))
+        self._parsers[bible_id] = parser
+        return parser
+
+    @classmethod
+    def from_env(
+        cls, parser_factory: Callable[[Optional[str], Path], Any], cache_dir: Path
+    ) -> "TranslationRegistry":
+        """Create a registry from ``GAMALIEL_TRANSLATIONS`` and
+        ``GAMALIEL_MAX_TRANSLATIONS``."""
+        registry = cls(
+            parser_factory,
+            cache_dir,
+            int(os.getenv("GAMALIEL_MAX_TRANSLATIONS", MAX_RESIDENT_TRANSLATIONS)),
+        )
+        for translation in parse_translations(os.getenv("GAMALIEL_TRANSLATIONS", "")):
+            registry.register(translation)
+        return registry
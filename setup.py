@@ -36,6 +36,11 @@ setup(
         "python-dotenv>=1.0",
     ],
     extras_require={
+        # Batched semantic scoring (search_semantic_many)
+        "fast": [
+            "numpy",
+            "scipy",
+        ],
         "dev": [
             "pytest",
             "pytest-cov",